@@ -0,0 +1,7 @@
+"""Make the flat tools/ modules importable the way the orchestrators import them."""
+import os
+import sys
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools')
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
@@ -0,0 +1,53 @@
+import json
+import random
+
+import fake_copilot
+from run_benchmarks import compare_with_baseline
+
+
+def test_fake_copilot_parses_rewritten_and_slash_prompts():
+    rewritten = "Follow instructions in #file: .github/prompts/task-clone-repo.prompt.md checklist_path='tasks/a b_repo_checklist.md' note='it\\'s'"
+
+    assert fake_copilot.parse_prompt(rewritten) == ('task-clone-repo', {'checklist_path': 'tasks/a b_repo_checklist.md', 'note': "it's"})
+    assert fake_copilot.parse_prompt("/generate-repo-task-checklists input='repos.txt'") == ('generate-repo-task-checklists', {'input': 'repos.txt'})
+
+
+def test_fake_copilot_latency_respects_the_distribution_bounds():
+    rng = random.Random(1)
+
+    assert fake_copilot.sample_latency_ms({'distribution': 'fixed', 'median_ms': 7}, rng) == 7
+    assert all(2 <= fake_copilot.sample_latency_ms({'distribution': 'uniform', 'min_ms': 2, 'max_ms': 4}, rng) <= 4 for _ in range(50))
+    assert all(fake_copilot.sample_latency_ms({'median_ms': 20, 'sigma': 3, 'max_ms': 30}, rng) <= 30 for _ in range(50))
+
+
+def test_fake_copilot_marks_tasks_and_fills_variables_once_complete(tmp_path):
+    path = tmp_path / 'demo_repo_checklist.md'
+    path.write_text(fake_copilot.REPO_CHECKLIST_TEMPLATE.format(repo_name='demo', repo_url='https://x/demo', timestamp='t')
+                    + '- {{solutions}} →\n', encoding='utf-8')
+
+    fake_copilot.mutate_checklist('task-clone-repo', str(path))
+    text = path.read_text(encoding='utf-8')
+    assert '- [x] (1)' in text and '- [ ] (2)' in text
+    assert '- {{solutions}} →\n' in text
+
+    fake_copilot.mutate_checklist('execute-repo-task', str(path))
+    text = path.read_text(encoding='utf-8')
+    assert '- [ ]' not in text
+    assert '- {{solutions}} → bench-value' in text
+    assert (tmp_path / 'demo_Bench_solution_checklist.md').is_file()
+
+
+def test_baseline_comparison_flags_only_regressions_beyond_tolerance(tmp_path):
+    def result(overhead, rss, fds=10, target='run_all_repos'):
+        return {'target': target, 'fleet_size': 3, 'mode': 'steps', 'jobs': 2,
+                'per_stage_overhead_ms': overhead, 'peak_rss_kb': rss, 'peak_fds': fds}
+
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'results': [result(100.0, 1000)]}), encoding='utf-8')
+
+    assert compare_with_baseline([result(108.0, 1090, fds=12)], str(baseline), 0.1) == []
+    assert compare_with_baseline([result(200.0, 2000, target='run_single_file')], str(baseline), 0.1) == []
+    assert compare_with_baseline([result(130.0, 1200)], str(baseline), 0.1) == [
+        'run_all_repos n=3 jobs=2: per_stage_overhead_ms 100.0 -> 130.0',
+        'run_all_repos n=3 jobs=2: peak_rss_kb 1000 -> 1200',
+    ]
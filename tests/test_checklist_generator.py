@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from checklist_generator import MASTER_CHECKLIST, generate_repo_checklists
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    tasks, output, temp_script = (tmp_path / name for name in ('tasks', 'output', 'temp-script'))
+    repos = tmp_path / 'repos.txt'
+    repos.write_text('# comment\nhttps://example.com/org/alpha.git\nhttps://example.com/_git/beta\n\n', encoding='utf-8')
+    return tasks, output, temp_script, repos
+
+
+def _generate(dirs, **kwargs):
+    tasks, output, temp_script, repos = dirs
+    return generate_repo_checklists(
+        str(repos), tasks_dir=str(tasks), output_dir=str(output), temp_script_dir=str(temp_script), **kwargs
+    )
+
+
+def test_reset_purges_previous_run_state(dirs):
+    tasks, output, temp_script, _repos = dirs
+    _generate(dirs)
+    (tasks / 'alpha_App_solution_checklist.md').write_text('old', encoding='utf-8')
+    (tasks / 'gone_repo_checklist.md').write_text('old', encoding='utf-8')
+    (output / 'alpha_task1_clone-repo.json').write_text('{}', encoding='utf-8')
+    (temp_script / 'nested').mkdir()
+    (temp_script / 'nested' / 'run.ps1').write_text('', encoding='utf-8')
+
+    contract = _generate(dirs)
+
+    assert contract['status'] == 'SUCCESS'
+    assert sorted(os.listdir(tasks)) == sorted([MASTER_CHECKLIST, 'alpha_repo_checklist.md', 'beta_repo_checklist.md'])
+    assert sorted(contract['stale_task_files_removed']) == ['alpha_App_solution_checklist.md', 'gone_repo_checklist.md']
+    assert os.listdir(output) == ['reset_task5_generate-repo-checklists.json']
+    assert os.listdir(temp_script) == []
+
+
+def test_reset_leaves_unchanged_checklists_untouched(dirs):
+    tasks = dirs[0]
+    _generate(dirs)
+    path = tasks / 'alpha_repo_checklist.md'
+    os.utime(path, (1, 1))
+
+    contract = _generate(dirs)
+
+    assert contract['repositories_unchanged'] == 2
+    assert os.stat(path).st_mtime == 1
+
+
+def test_append_keeps_solution_checklists_and_output(dirs):
+    tasks, output, _temp_script, _repos = dirs
+    _generate(dirs)
+    (tasks / 'alpha_App_solution_checklist.md').write_text('keep', encoding='utf-8')
+    (output / 'alpha_task1_clone-repo.json').write_text('{}', encoding='utf-8')
+
+    contract = _generate(dirs, append=True)
+
+    assert contract['repositories_processed'] == 0
+    assert (tasks / 'alpha_App_solution_checklist.md').read_text(encoding='utf-8') == 'keep'
+    assert (output / 'alpha_task1_clone-repo.json').exists()
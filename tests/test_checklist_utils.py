@@ -0,0 +1,82 @@
+import os
+import re
+
+import pytest
+
+from checklist_utils import (
+    ChecklistDocument,
+    clear_checklist_cache,
+    extract_tasks,
+    extract_variables,
+    load_checklist,
+    task_key,
+)
+
+TASK_PATTERN = re.compile(r"^- \[(x| )\].*?@(task-[a-z\-]+)")
+
+CHECKLIST = """# demo Repo Checklist
+Generated: 2025-01-01T00:00:00Z
+
+## Repo Tasks (Sequential Pipeline)
+- [x] Clone repo @task-clone-repo
+- [ ] Find solutions @task-find-solutions
+- [ ] Find solutions again @task-find-solutions
+
+## Repo Variables Available
+- {{repo_name}} → demo
+- {{solutions_json}} → output/demo_task2_find-solutions.json
+- {{readme_content}} → (blank)
+
+## Notes
+- [x] Not a pipeline task @task-notes
+"""
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_checklist_cache()
+    yield
+    clear_checklist_cache()
+
+
+def test_document_matches_the_line_based_helpers():
+    lines = CHECKLIST.splitlines()
+    doc = ChecklistDocument(lines)
+    headers = ['## Repo Tasks']
+
+    assert doc.tasks(headers, TASK_PATTERN) == extract_tasks(lines, headers, TASK_PATTERN)
+    assert doc.tasks(headers, TASK_PATTERN) == {'task-clone-repo': True, 'task-find-solutions': False}
+    assert doc.variables(['## Repo Variables']) == extract_variables(lines, ['## Repo Variables'])
+    assert doc.variables(['## Repo Variables']) == {
+        'repo_name': 'demo',
+        'solutions_json': 'output/demo_task2_find-solutions.json',
+        'readme_content': '(blank)',
+    }
+
+
+def test_task_states_cover_every_section():
+    doc = ChecklistDocument(CHECKLIST.splitlines())
+
+    assert doc.task_states() == {'task-clone-repo': True, 'task-find-solutions': False, 'task-notes': True}
+
+
+def test_load_checklist_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / 'demo_repo_checklist.md'
+    path.write_text(CHECKLIST, encoding='utf-8')
+
+    first = load_checklist(str(path))
+    assert load_checklist(str(path)) is first
+
+    path.write_text(CHECKLIST.replace('- [ ] Find solutions @', '- [x] Find solutions @'), encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = load_checklist(str(path))
+
+    assert second is not first
+    assert second.task_states()['task-find-solutions'] is True
+    assert load_checklist(str(tmp_path / 'missing.md')) is None
+
+
+def test_task_key_normalizes_prompt_names_and_handles():
+    assert task_key('/task-clone-repo') == task_key('@task-clone-repo') == task_key('clone-repo') == 'clone-repo'
+    assert task_key('Generate-Repo-Task-Checklists') == 'generate-repo-task-checklists'
@@ -0,0 +1,106 @@
+import asyncio
+import shlex
+import sys
+import time
+
+import pytest
+
+import copilot_executor
+from copilot_executor import CopilotExecutor
+
+
+def _python(code):
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(code)}"
+
+
+@pytest.fixture
+def executor(tmp_path):
+    with CopilotExecutor(log_file=str(tmp_path / 'run.log')) as executor:
+        yield executor
+
+
+def test_async_and_sync_paths_return_the_same_result(executor):
+    command = _python("import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)")
+
+    sync_result = executor.execute_command(command)
+    async_result = asyncio.run(executor.execute_command_async(command))
+
+    assert sync_result == async_result == (3, 'out\n', 'err\n')
+
+
+def test_async_calls_share_the_per_loop_concurrency_limit(executor, monkeypatch):
+    monkeypatch.setattr(copilot_executor, '_async_semaphores', copilot_executor.weakref.WeakKeyDictionary())
+    copilot_executor.set_async_concurrency(2)
+    try:
+        async def run_all():
+            commands = [_python(f"import time; time.sleep(0.2); print({i})") for i in range(5)]
+            return await asyncio.gather(*(executor.execute_command_async(c) for c in commands))
+
+        started = time.monotonic()
+        results = asyncio.run(run_all())
+        elapsed = time.monotonic() - started
+    finally:
+        copilot_executor.set_async_concurrency(copilot_executor.DEFAULT_ASYNC_CONCURRENCY)
+
+    assert [r[1] for r in results] == [f"{i}\n" for i in range(5)]
+    assert elapsed >= 0.55  # five 0.2s calls, at most two at a time: three waves
+    with pytest.raises(ValueError):
+        copilot_executor.set_async_concurrency(0)
+
+
+def test_output_excerpt_keeps_head_and_tail_and_counts_the_rest():
+    excerpt = copilot_executor.OutputExcerpt(head_chars=10, tail_lines=2)
+    for i in range(10):
+        excerpt.append(f"line{i}\n")
+
+    assert excerpt.total_lines == 10
+    assert excerpt.total_bytes == 60
+    # head: "line0\n" + "line" (10 chars); the rest of line1 enters the tail window
+    assert excerpt.text() == "line0\nline\n... [7 lines omitted] ...\nline8\nline9\n"
+
+
+def test_output_excerpt_without_overflow_is_the_full_text():
+    excerpt = copilot_executor.OutputExcerpt(head_chars=100, tail_lines=5)
+    excerpt.append("a\n")
+    excerpt.append("b\n")
+
+    assert excerpt.text() == "a\nb\n"
+
+
+def test_full_output_is_streamed_to_the_log_but_only_an_excerpt_is_returned(executor):
+    rows = 2000  # well past EXCERPT_HEAD_CHARS + EXCERPT_TAIL_LINES
+    command = _python(f"import sys\nfor i in range({rows}): print(f'row{{i}}')\nprint('oops', file=sys.stderr)")
+
+    exit_code, stdout, stderr = executor.execute_command(command)
+    executor.sink.flush()
+    log = open(executor.log_file, encoding='utf-8').read()
+
+    assert exit_code == 0
+    assert stdout.startswith('row0\nrow1\n')
+    assert stdout.endswith(f'row{rows - 1}\n')
+    assert 'lines omitted' in stdout
+    assert len(stdout) < sum(len(f"row{i}\n") for i in range(rows))
+    assert all(f"row{i}\n" in log for i in range(rows))
+    assert '[stderr] oops\n' in log
+    assert f'stdout: {rows} lines' in log
+    assert executor.last_metrics['stdout_bytes'] == sum(len(f"row{i}\n") for i in range(rows))
+
+
+def test_idle_watchdog_kills_a_silent_command(executor):
+    command = _python("import time; print('started', flush=True); time.sleep(30)")
+
+    started = time.monotonic()
+    result = executor.execute_command(command, timeout=60, idle_timeout=0.5)
+
+    assert result[0] == -1
+    assert executor.last_metrics['termination'] == 'idle'
+    assert time.monotonic() - started < 10
+
+
+def test_hard_timeout_applies_even_while_output_continues(executor):
+    command = _python("import time\nwhile True:\n    print('tick', flush=True)\n    time.sleep(0.05)")
+
+    result = asyncio.run(executor.execute_command_async(command, timeout=0.5, idle_timeout=5))
+
+    assert result[0] == -1
+    assert executor.last_metrics['termination'] == 'timeout'
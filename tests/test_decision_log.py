@@ -0,0 +1,77 @@
+import csv
+import threading
+
+import pytest
+
+from decision_log import DECISION_HEADER, DecisionLogWriter, append_rows, compact
+
+
+def _rows(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_writer_batches_rows_and_escapes_csv(tmp_path):
+    path = str(tmp_path / 'results' / 'decision-log.csv')
+    writer = DecisionLogWriter(path, batch_size=2, flush_interval=3600)
+
+    writer.log('@task-clone-repo', 'SUCCESS', 'cloned, "fast"', repo_name='demo', timestamp='2025-01-01T00:00:00Z')
+    assert not (tmp_path / 'results' / 'decision-log.csv').exists()
+    writer.log('@task-find-solutions', 'SUCCESS', 'line1\nline2', repo_name='demo', timestamp='2025-01-01T00:01:00Z')
+    writer.close()
+
+    assert _rows(path) == [
+        DECISION_HEADER,
+        ['2025-01-01T00:00:00Z', 'demo', '', '@task-clone-repo', 'cloned, "fast"', 'SUCCESS'],
+        ['2025-01-01T00:01:00Z', 'demo', '', '@task-find-solutions', 'line1\nline2', 'SUCCESS'],
+    ]
+    with pytest.raises(ValueError, match="'status'"):
+        writer.log('@task-clone-repo', ' ')
+
+
+def test_concurrent_writers_never_interleave_rows(tmp_path):
+    path = str(tmp_path / 'decision-log.csv')
+
+    def worker(n):
+        with DecisionLogWriter(path, batch_size=7, flush_interval=3600) as writer:
+            for i in range(50):
+                writer.log(f'@task-{n}', 'SUCCESS', f'{n}-{i} ' + 'x' * 200, timestamp='2025-01-01T00:00:00Z')
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rows = _rows(path)
+    assert rows[0] == DECISION_HEADER
+    assert len(rows) == 201
+    assert all(len(row) == len(DECISION_HEADER) for row in rows)
+
+
+def test_append_repairs_a_missing_trailing_newline(tmp_path):
+    path = tmp_path / 'decision-log.csv'
+    path.write_text(','.join(DECISION_HEADER) + '\n2025-01-01T00:00:00Z,demo,,@task-a,m,SUCCESS', encoding='utf-8')
+
+    append_rows(str(path), [['2025-01-02T00:00:00Z', 'demo', '', '@task-b', 'm', 'FAIL']], DECISION_HEADER)
+
+    assert [row[3] for row in _rows(path)[1:]] == ['@task-a', '@task-b']
+
+
+def test_compact_sorts_dedupes_drops_malformed_and_archives(tmp_path):
+    path = tmp_path / 'decision-log.csv'
+    path.write_text('\n'.join([
+        ','.join(DECISION_HEADER),
+        '2999-01-02T00:00:00Z,demo,,@task-b,m,SUCCESS',
+        '2999-01-01T00:00:00Z,demo,,@task-a,m,SUCCESS',
+        '2999-01-01T00:00:00Z,demo,,@task-a,m,SUCCESS',
+        '2000-01-01T00:00:00Z,demo,,@task-old,m,SUCCESS',
+        'broken,row',
+        '2999-01-03T00:00:00Z,demo,,,m,SUCCESS',
+    ]) + '\n', encoding='utf-8')
+
+    stats = compact(str(path), dedupe=True, max_age_days=365)
+
+    assert stats == {'rows_in': 6, 'rows_out': 2, 'malformed': 2, 'duplicates': 1, 'archived': 1}
+    assert [row[3] for row in _rows(path)[1:]] == ['@task-a', '@task-b']
+    assert [row[3] for row in _rows(tmp_path / 'decision-log-archive.csv')[1:]] == ['@task-old']
@@ -0,0 +1,41 @@
+import threading
+import time
+
+import pytest
+
+from file_lock import FileLock, LockTimeout
+
+
+def test_second_holder_times_out_while_the_lock_is_held(tmp_path):
+    path = str(tmp_path / 'locks' / 'x.lock')
+
+    with FileLock(path) as held:
+        assert held.locked
+        with pytest.raises(LockTimeout):
+            FileLock(path, timeout=0.1).acquire()
+
+    with FileLock(path, timeout=0.1) as again:
+        assert again.locked
+    assert not again.locked
+
+
+def test_lock_serializes_threads(tmp_path):
+    path = str(tmp_path / 'x.lock')
+    inside = []
+    overlaps = []
+
+    def worker():
+        with FileLock(path, timeout=10, poll_interval=0.005):
+            inside.append(1)
+            if len(inside) > 1:
+                overlaps.append(True)
+            time.sleep(0.02)
+            inside.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
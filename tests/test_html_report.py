@@ -0,0 +1,83 @@
+import json
+
+from html_report import CsvPivot, generate_report, update_pivot
+
+REPO_HEADER = 'repo,task name,status\n'
+SOLUTION_HEADER = 'repo,solution,task name,status\n'
+
+
+def test_pivot_keeps_the_last_status_per_cell_and_waits_for_complete_lines(tmp_path):
+    path = tmp_path / 'repo_result.csv'
+    path.write_text(REPO_HEADER + 'demo,task-clone-repo,FAILED\ndemo,task-clone-repo,SUCCESS\nother,task-find', encoding='utf-8')
+
+    pivot, action = update_pivot(str(path), None, 1)
+
+    assert action == 'FULL'
+    assert pivot.rows == {('demo',): {'task-clone-repo': 'SUCCESS'}}
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('-solutions,SKIPPED\n')
+    pivot, action = update_pivot(str(path), pivot, 1)
+    assert action == 'APPENDED'
+    assert pivot.rows[('other',)] == {'task-find-solutions': 'SKIPPED'}
+    assert update_pivot(str(path), pivot, 1)[1] == 'UNCHANGED'
+
+
+def test_rewritten_csv_triggers_a_full_reread(tmp_path):
+    path = tmp_path / 'repo_result.csv'
+    path.write_text(REPO_HEADER + 'demo,task-clone-repo,FAILED\n', encoding='utf-8')
+    pivot, _ = update_pivot(str(path), None, 1)
+
+    path.write_text(REPO_HEADER + 'fresh,task-clone-repo,SUCCESS\nmore,task-clone-repo,SUCCESS\n', encoding='utf-8')
+    pivot, action = update_pivot(str(path), CsvPivot.from_state(1, pivot.to_state()), 1)
+
+    assert action == 'FULL'
+    assert sorted(pivot.rows) == [('fresh',), ('more',)]
+
+
+def test_report_is_escaped_and_only_rewritten_when_inputs_change(tmp_path):
+    (tmp_path / 'repo_result.csv').write_text(REPO_HEADER + '<demo>,task-clone-repo,SUCCESS\n', encoding='utf-8')
+    (tmp_path / 'solution_result.csv').write_text(SOLUTION_HEADER + 'demo,App,task-build-solution,FAILED\n', encoding='utf-8')
+
+    first = generate_report(str(tmp_path))
+    html = (tmp_path / 'execution_results.html').read_text(encoding='utf-8')
+
+    assert first['written'] and (first['repositories'], first['solutions']) == (1, 1)
+    assert '<td class="repo-name">&lt;demo&gt;</td>' in html
+    assert '<td class="status-failed">FAILED</td>' in html
+    assert generate_report(str(tmp_path))['written'] is False
+
+    with open(tmp_path / 'solution_result.csv', 'a', encoding='utf-8') as f:
+        f.write('demo,Lib,task-build-solution,SUCCESS\n')
+    third = generate_report(str(tmp_path))
+    state = json.loads((tmp_path / 'execution_results.html.state.json').read_text(encoding='utf-8'))
+    assert third['actions'] == {'repo': 'UNCHANGED', 'solution': 'APPENDED'}
+    assert third['written'] and third['solutions'] == 2
+    assert len(state['solution']['rows']) == 2
+
+
+def test_same_length_edit_past_the_first_block_is_detected(tmp_path):
+    rows = [f'repo{i:03d},task-clone-repo,SUCCESS\n' for i in range(300)]
+    path = tmp_path / 'repo_result.csv'
+    path.write_text(REPO_HEADER + ''.join(rows), encoding='utf-8')
+    assert path.stat().st_size > 4096
+    generate_report(str(tmp_path))
+
+    path.write_text(REPO_HEADER + ''.join(rows[:-1]) + 'repo299,task-clone-repo,FAILED \n', encoding='utf-8')
+    result = generate_report(str(tmp_path))
+
+    assert result['actions']['repo'] == 'FULL'
+    assert result['written'] is True
+    assert '<td class="status-failed">FAILED</td>' in (tmp_path / 'execution_results.html').read_text(encoding='utf-8')
+
+
+def test_removed_csv_rerenders_the_report_without_its_rows(tmp_path):
+    (tmp_path / 'repo_result.csv').write_text(REPO_HEADER + 'demo,task-clone-repo,SUCCESS\n', encoding='utf-8')
+    generate_report(str(tmp_path))
+
+    (tmp_path / 'repo_result.csv').unlink()
+    result = generate_report(str(tmp_path))
+
+    assert result['actions']['repo'] == 'MISSING'
+    assert result['written'] is True and result['repositories'] == 0
+    assert 'demo' not in (tmp_path / 'execution_results.html').read_text(encoding='utf-8')
+    assert generate_report(str(tmp_path))['written'] is False
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from kb_index import KnowledgeBaseIndex, error_codes, parse_article, update_index
+
+CPM_ARTICLE = """# NU1008 Central package management version conflict
+
+## Detection Tokens
+- `NU1008`
+- PackageReference items cannot define a value for Version
+
+## Fix
+Remove the Version attribute from PackageReference items when Directory.Packages.props is used.
+"""
+
+TARGETING_ARTICLE = """# MSB3644 reference assemblies for framework not found
+
+## Detection Tokens
+- MSB3644
+- reference assemblies were not found
+
+## Fix
+Install the targeting pack for the framework.
+"""
+
+
+@pytest.fixture
+def kb(tmp_path):
+    kb_dir = tmp_path / 'kb'
+    kb_dir.mkdir()
+    (kb_dir / 'nu1008.md').write_text(CPM_ARTICLE, encoding='utf-8')
+    (kb_dir / 'msb3644.md').write_text(TARGETING_ARTICLE, encoding='utf-8')
+    (kb_dir / 'README.md').write_text('# Index of articles NU1008 MSB3644\n', encoding='utf-8')
+    return str(kb_dir), str(tmp_path / 'cache' / 'kb_index.json')
+
+
+def test_article_fields_are_parsed_and_weighted():
+    doc = parse_article(CPM_ARTICLE)
+
+    assert doc['title'] == 'NU1008 Central package management version conflict'
+    assert doc['codes'] == ['NU1008']
+    assert doc['detection_tokens'] == ['NU1008', 'PackageReference items cannot define a value for Version']
+    assert doc['terms']['nu1008'] > doc['terms']['central'] > doc['terms']['remove']
+    assert error_codes('error CS0246 and CS0246, then NETSDK1045') == ['CS0246', 'NETSDK1045']
+
+
+def test_index_updates_incrementally(kb):
+    kb_dir, index_path = kb
+
+    index, changes = update_index(kb_dir, index_path)
+    assert sorted(index['docs']) == ['msb3644.md', 'nu1008.md']
+    assert changes == {'added': 2, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    assert update_index(kb_dir, index_path)[1] == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 2}
+
+    os.remove(os.path.join(kb_dir, 'msb3644.md'))
+    with open(os.path.join(kb_dir, 'nu1008.md'), 'a', encoding='utf-8') as f:
+        f.write('Also check transitive pinning.\n')
+    index, changes = update_index(kb_dir, index_path)
+    assert changes == {'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 0}
+    assert 'transitive' in index['docs']['nu1008.md']['terms']
+
+
+def test_search_ranks_by_error_code_and_stderr_terms(kb):
+    kb_dir, index_path = kb
+    index = KnowledgeBaseIndex.load(kb_dir, index_path)
+
+    by_code = index.search(errors=['nu1008'])
+    assert [os.path.basename(a['kb_file_path']) for a in by_code['shortlist']] == ['nu1008.md']
+    assert by_code['shortlist'][0]['matched_error_codes'] == ['NU1008']
+
+    stderr = r"C:\src\app\App.csproj(12,5): error : The reference assemblies were not found for framework .NETFramework"
+    by_text = index.search(stderr=stderr, top=1)
+    assert by_text['error_codes'] == []
+    assert [os.path.basename(a['kb_file_path']) for a in by_text['shortlist']] == ['msb3644.md']
+    assert 'csproj' not in ' '.join(by_text['query_tokens'])
@@ -0,0 +1,55 @@
+import os
+import time
+
+from log_sink import LogSink
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_writes_are_buffered_until_flush(tmp_path):
+    path = tmp_path / 'run.log'
+    with LogSink(str(path), flush_interval=3600) as sink:
+        sink.reset('header\n')
+        sink.write('line\n')
+        assert _read(path) == 'header\n'
+        sink.flush()
+        assert _read(path) == 'header\nline\n'
+
+
+def test_background_flusher_flushes_quiet_sink(tmp_path):
+    path = tmp_path / 'run.log'
+    with LogSink(str(path), flush_interval=0.05) as sink:
+        sink.reset()
+        time.sleep(0.1)
+        sink.write('last words\n')
+        deadline = time.monotonic() + 5
+        while _read(path) != 'last words\n' and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert _read(path) == 'last words\n'
+
+
+def test_flush_reopens_deleted_log(tmp_path):
+    log_dir = tmp_path / 'output'
+    path = log_dir / 'run.log'
+    with LogSink(str(path), flush_interval=3600) as sink:
+        sink.reset('header\n')
+        os.remove(path)
+        os.rmdir(log_dir)
+        sink.flush()
+        sink.write('after reset\n')
+        sink.flush()
+        assert _read(path) == 'after reset\n'
+
+
+def test_shared_sinks_are_reference_counted(tmp_path):
+    path = str(tmp_path / 'run.log')
+    first, second = LogSink.shared(path), LogSink.shared(path)
+    assert first is second
+    first.write('x\n')
+    first.release()
+    assert first._handle is not None
+    second.release()
+    assert first._handle is None
@@ -0,0 +1,64 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from mirror_cache import clone_from_mirror, ensure_mirror, list_mirrors, mirror_path_for, normalize_url
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def _git(*args, cwd=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@example.com',
+               GIT_COMMITTER_NAME='t', GIT_COMMITTER_EMAIL='t@example.com')
+    return subprocess.run(['git', *args], cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def remote(tmp_path):
+    work = tmp_path / 'upstream'
+    work.mkdir()
+    _git('init', '-q', '-b', 'main', cwd=work)
+    (work / 'README.md').write_text('v1\n', encoding='utf-8')
+    _git('add', 'README.md', cwd=work)
+    _git('commit', '-q', '-m', 'v1', cwd=work)
+    return work
+
+
+def test_mirror_key_ignores_trailing_slash_and_dot_git(tmp_path):
+    root = str(tmp_path)
+
+    assert normalize_url('https://host/org/repo.git/') == 'https://host/org/repo'
+    assert mirror_path_for('https://host/org/repo.git', root) == mirror_path_for('https://host/org/repo/', root)
+    assert os.path.basename(mirror_path_for('https://host/org/repo', root)).startswith('repo-')
+
+
+def test_clone_then_refresh_through_the_mirror(tmp_path, remote):
+    url = remote.as_uri()
+    mirrors = str(tmp_path / 'mirrors')
+    dest = str(tmp_path / 'clones' / 'upstream')
+
+    first = clone_from_mirror(url, dest, mirror_root=mirrors)
+    assert (first['status'], first['operation'], first['mirror_operation']) == ('SUCCESS', 'CLONE', 'CREATED')
+    assert _git('-C', dest, 'remote', 'get-url', 'origin').strip() == url
+    assert os.path.isfile(os.path.join(dest, '.git', 'objects', 'info', 'alternates'))
+
+    (remote / 'README.md').write_text('v2\n', encoding='utf-8')
+    _git('commit', '-q', '-am', 'v2', cwd=remote)
+    (tmp_path / 'clones' / 'upstream' / 'stray.txt').write_text('x', encoding='utf-8')
+
+    assert ensure_mirror(url, mirror_root=mirrors)[1] == 'FRESH'
+    second = clone_from_mirror(url, dest, mirror_root=mirrors, fresh_seconds=0)
+    assert (second['status'], second['operation'], second['mirror_operation']) == ('SUCCESS', 'REFRESH', 'FETCHED')
+    assert open(os.path.join(dest, 'README.md'), encoding='utf-8').read() == 'v2\n'
+    assert not os.path.exists(os.path.join(dest, 'stray.txt'))
+    assert [m['repo_url'] for m in list_mirrors(mirrors)] == [url]
+
+
+def test_failed_clone_is_reported_not_raised(tmp_path):
+    result = clone_from_mirror((tmp_path / 'missing').as_uri(), str(tmp_path / 'dest'), mirror_root=str(tmp_path / 'mirrors'))
+
+    assert result['status'] == 'FAIL'
+    assert 'ERROR: git clone --mirror failed' in result['git_output']
+    assert list_mirrors(str(tmp_path / 'mirrors')) == []
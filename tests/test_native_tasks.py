@@ -0,0 +1,93 @@
+import functools
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import mirror_cache
+import native_tasks
+import stage_cache
+from native_tasks import NativeTaskRegistry, update_checklist, verify_checklist
+
+CHECKLIST = """# Task Checklist: upstream
+## Repo Tasks
+- [ ] (1) [MANDATORY] Clone → @task-clone-repo
+- [ ] (2) [MANDATORY] Find solutions → @task-find-solutions
+
+## Repo Variables Available
+- {{{{repo_url}}}} → {url}
+- {{{{repo_name}}}} → upstream
+- {{{{clone_path}}}} →
+- {{{{clone_path}}}} → stale
+
+## Notes
+- keep me
+"""
+
+
+def test_registry_normalizes_names_and_turns_exceptions_into_failures():
+    registry = NativeTaskRegistry()
+
+    @registry.register('task-explode')
+    def explode(params):
+        raise RuntimeError('boom')
+
+    registry.register('clone-repo', lambda params: (0, 'ok', ''))
+
+    assert registry.names() == ['clone-repo', 'explode']
+    assert registry.run('/task-clone-repo', {}) == (0, 'ok', '')
+    assert registry.run('explode', {}) == (1, '', 'RuntimeError: boom')
+    assert registry.run('task-unknown', {}) is None
+
+
+def test_update_checklist_marks_the_task_and_rewrites_variables_in_place(tmp_path):
+    path = tmp_path / 'upstream_repo_checklist.md'
+    path.write_text(CHECKLIST.format(url='https://example.com/upstream'), encoding='utf-8')
+    variables = {'clone_path': './clone_repos', 'repo_directory': './clone_repos/upstream'}
+
+    assert update_checklist(str(path), complete_task='clone-repo', variables=variables)
+    assert not update_checklist(str(path), complete_task='task-clone-repo', variables=variables)
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[2].startswith('- [x] (1)') and lines[3].startswith('- [ ] (2)')
+    assert lines[6:12] == [
+        '- {{repo_url}} → https://example.com/upstream',
+        '- {{repo_name}} → upstream',
+        '- {{clone_path}} → ./clone_repos',
+        '- {{repo_directory}} → ./clone_repos/upstream',
+        '',
+        '## Notes',
+    ]
+    assert verify_checklist(str(path), task='task-clone-repo', done=True, variables=variables)
+    assert not verify_checklist(str(path), task='task-find-solutions', done=True, variables={})
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+def test_native_clone_updates_checklist_and_writes_the_contract(tmp_path, monkeypatch):
+    upstream = tmp_path / 'upstream'
+    upstream.mkdir()
+    env = dict(os.environ, GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@example.com', GIT_COMMITTER_NAME='t', GIT_COMMITTER_EMAIL='t@example.com')
+    (upstream / 'App.sln').write_text('', encoding='utf-8')
+    for args in (['init', '-q'], ['add', 'App.sln'], ['commit', '-q', '-m', 'init']):
+        subprocess.run(['git', *args], cwd=upstream, env=env, check=True)
+    root = tmp_path / 'workspace'
+    (root / 'tasks').mkdir(parents=True)
+    checklist = root / 'tasks' / 'upstream_repo_checklist.md'
+    checklist.write_text(CHECKLIST.format(url=upstream.as_uri()), encoding='utf-8')
+    monkeypatch.setattr(native_tasks, 'REPO_ROOT', str(root))
+    monkeypatch.setattr(native_tasks, 'OUTPUT_DIR', str(root / 'output'))
+    monkeypatch.setattr(stage_cache, 'REPO_ROOT', str(root))
+    monkeypatch.setattr(native_tasks, 'clone_from_mirror',
+                        functools.partial(mirror_cache.clone_from_mirror, mirror_root=str(tmp_path / 'mirrors')))
+
+    exit_code, stdout, _stderr = native_tasks.get_native_registry().run(
+        'task-clone-repo', {'checklist_path': 'tasks/upstream_repo_checklist.md', 'clone_path': './clone_repos'})
+
+    contract = json.loads(stdout)
+    assert exit_code == 0
+    assert (contract['status'], contract['operation'], contract['checklist_verified']) == ('SUCCESS', 'CLONE', 'CONFIRMED')
+    assert (root / 'clone_repos' / 'upstream' / 'App.sln').is_file()
+    assert json.loads((root / 'output' / 'upstream_task1_clone-repo.json').read_text(encoding='utf-8'))['status'] == 'SUCCESS'
+    assert '- {{repo_directory}} → ./clone_repos/upstream' in checklist.read_text(encoding='utf-8')
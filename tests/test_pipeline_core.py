@@ -0,0 +1,138 @@
+import pytest
+
+from pipeline_core import _DagState, _stage_prerequisites, critical_path, plan_resume, topological_order
+
+DEPENDENCIES = {
+    'clone': [],
+    'find': ['clone'],
+    'generate': ['find'],
+    'search': ['clone'],
+    'scan': ['search'],
+}
+PIPELINE = [(prompt, {'checklist_path': 'tasks/a_repo_checklist.md'}) for prompt in DEPENDENCIES]
+
+
+def _record(state, prompt, status='SUCCESS', wall=1.0):
+    idx = state.stages[prompt][0]
+    return {'order': idx, 'prompt': prompt, 'stage_status': status, 'exit_code': 0 if status == 'SUCCESS' else 1,
+            'metrics': {'wall_seconds': wall}}
+
+
+def _run(state, outcomes):
+    """Drive the scheduler one stage at a time; returns the prompts in execution order."""
+    executed = []
+    prompt = state.take_ready()
+    while prompt is not None:
+        executed.append(prompt)
+        state.finish(_record(state, prompt, outcomes.get(prompt, 'SUCCESS')))
+        prompt = state.take_ready()
+    return executed
+
+
+def _state(continue_on_error):
+    return _DagState(PIPELINE, _stage_prerequisites(PIPELINE, DEPENDENCIES), 0, continue_on_error)
+
+
+def test_failure_blocks_only_dependents_with_continue_on_error():
+    state = _state(continue_on_error=True)
+
+    executed = _run(state, {'find': 'FAIL'})
+
+    assert executed == ['clone', 'find', 'search', 'scan']
+    assert [b['prompt'] for b in state.blocked] == ['generate']
+    assert state.blocked[0]['blocked_by'] == ['find']
+    assert state.blocked[0]['stage_status'] == 'BLOCKED'
+
+
+def test_blocking_is_transitive():
+    state = _state(continue_on_error=True)
+
+    executed = _run(state, {'clone': 'FAIL'})
+
+    assert executed == ['clone']
+    assert sorted(b['prompt'] for b in state.blocked) == ['find', 'generate', 'scan', 'search']
+
+
+def test_failure_stops_scheduling_without_continue_on_error():
+    state = _state(continue_on_error=False)
+
+    executed = _run(state, {'find': 'FAIL'})
+
+    assert executed == ['clone', 'find']
+    assert state.stopped
+
+
+def test_prerequisites_outside_the_run_count_as_satisfied():
+    pipeline = PIPELINE[1:]  # clone skipped by plan_resume
+    state = _DagState(pipeline, _stage_prerequisites(pipeline, DEPENDENCIES), 1, True)
+
+    assert state.take_ready() == 'find'
+    assert state.stages['find'][0] == 2
+
+
+def test_dag_requires_unique_prompts_and_no_cycles():
+    with pytest.raises(ValueError):
+        _stage_prerequisites(PIPELINE + PIPELINE[:1], DEPENDENCIES)
+    with pytest.raises(ValueError):
+        topological_order(['a', 'b'], {'a': ['b'], 'b': ['a']})
+
+
+def test_critical_path_of_linear_pipeline_with_repeated_prompt():
+    results = [
+        {'order': 1, 'prompt': 'task-build-solution', 'metrics': {'wall_seconds': 2.0}},
+        {'order': 2, 'prompt': 'task-apply-knowledge-base-fix', 'metrics': {'wall_seconds': 1.0}},
+        {'order': 3, 'prompt': 'task-build-solution', 'metrics': {'wall_seconds': 4.0}},
+    ]
+
+    path = critical_path(results)
+
+    assert path == {'stages': ['task-build-solution', 'task-apply-knowledge-base-fix', 'task-build-solution'], 'seconds': 7.0}
+
+
+def test_critical_path_follows_the_slowest_branch():
+    state = _state(continue_on_error=True)
+    walls = {'clone': 1.0, 'find': 1.0, 'generate': 1.0, 'search': 5.0, 'scan': 0.5}
+    prompt = state.take_ready()
+    while prompt is not None:
+        record = _record(state, prompt, wall=walls[prompt])
+        state.finish(record)
+        prompt = state.take_ready()
+
+    assert critical_path(state.results) == {'stages': ['clone', 'search', 'scan'], 'seconds': 6.5}
+
+
+def _write_checklist(tmp_path, tasks):
+    path = tmp_path / 'repo_checklist.md'
+    lines = ['# Repo Checklist', '## Repo Tasks']
+    lines += [f"- [{'x' if done else ' '}] {name} @{name}" for name, done in tasks]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_plan_resume_skips_the_completed_prefix(tmp_path):
+    path = _write_checklist(tmp_path, [('task-clone-repo', True), ('task-find-solutions', True), ('task-execute-readme', False)])
+    pipeline = [('task-clone-repo', {}), ('/task-find-solutions', {}), ('task-execute-readme', {}), ('task-build', {})]
+
+    remaining, skipped = plan_resume(pipeline, path)
+
+    assert remaining == pipeline[2:]
+    assert [(r['order'], r['prompt'], r['stage_status']) for r in skipped] == [
+        (1, 'task-clone-repo', 'SKIPPED'),
+        (2, '/task-find-solutions', 'SKIPPED'),
+    ]
+
+
+def test_plan_resume_stops_at_the_first_incomplete_or_unknown_task(tmp_path):
+    path = _write_checklist(tmp_path, [('task-clone-repo', False), ('task-find-solutions', True)])
+    pipeline = [('task-clone-repo', {}), ('task-find-solutions', {})]
+
+    assert plan_resume(pipeline, path) == (pipeline, [])
+    assert plan_resume([('task-unlisted', {}), ('task-find-solutions', {})], path)[1] == []
+
+
+def test_plan_resume_reruns_everything_when_all_tasks_are_complete(tmp_path):
+    path = _write_checklist(tmp_path, [('task-clone-repo', True), ('task-find-solutions', True)])
+    pipeline = [('task-clone-repo', {}), ('task-find-solutions', {})]
+
+    assert plan_resume(pipeline, path) == (pipeline, [])
+    assert plan_resume(pipeline, str(tmp_path / 'missing.md')) == (pipeline, [])
@@ -0,0 +1,59 @@
+from pipeline_metrics import merge_rollups, per_prompt_rollup, rollup_stages, write_prometheus_textfile
+
+
+def _stage(prompt, wall, rss=None, cpu=0.5, stdout=100):
+    return {'prompt': prompt, 'metrics': {
+        'wall_seconds': wall, 'queue_wait_seconds': 0.25, 'cpu_user_seconds': cpu,
+        'cpu_system_seconds': 0.1, 'max_rss_kb': rss, 'stdout_bytes': stdout, 'stderr_bytes': 0,
+    }}
+
+
+STAGES = [
+    _stage('task-clone-repo', 2.0, rss=1000),
+    _stage('execute-repo-task', 10.0, rss=5000),
+    _stage('task-clone-repo', 1.0),
+    {'prompt': 'task-find-solutions', 'stage_status': 'SKIPPED'},
+]
+
+
+def test_rollup_sums_counters_and_keeps_maxima():
+    rollup = rollup_stages(STAGES)
+
+    assert rollup['stage_count'] == 3
+    assert rollup['wall_seconds'] == 13.0
+    assert rollup['queue_wait_seconds'] == 0.75
+    assert rollup['cpu_user_seconds'] == 1.5
+    assert rollup['stdout_bytes'] == 300
+    assert rollup['max_rss_kb'] == 5000
+    assert rollup['max_stage_wall_seconds'] == 10.0
+
+
+def test_merge_of_rollups_equals_rollup_of_all_stages():
+    merged = merge_rollups([rollup_stages(STAGES[:1]), rollup_stages(STAGES[1:])])
+
+    assert merged == rollup_stages(STAGES)
+    assert rollup_stages([])['max_rss_kb'] is None
+
+
+def test_per_prompt_rollup_is_ordered_by_wall_time():
+    rollups = per_prompt_rollup(STAGES)
+
+    assert list(rollups) == ['execute-repo-task', 'task-clone-repo', 'task-find-solutions']
+    assert rollups['task-clone-repo']['stage_count'] == 2
+    assert rollups['task-find-solutions']['stage_count'] == 0
+
+
+def test_prometheus_textfile_labels_and_skips_missing_values(tmp_path):
+    path = tmp_path / 'metrics' / 'pipeline.prom'
+    run = rollup_stages(STAGES)
+    repos = {'my"repo': rollup_stages(STAGES[:1]), 'empty': rollup_stages([])}
+
+    write_prometheus_textfile(str(path), run, repos, per_prompt_rollup(STAGES))
+    lines = path.read_text(encoding='utf-8').splitlines()
+
+    assert '# TYPE copilot_pipeline_run_wall_seconds gauge' in lines
+    assert 'copilot_pipeline_run_wall_seconds 13.0' in lines
+    assert 'copilot_pipeline_repo_max_rss_kb{repo="my\\"repo"} 1000' in lines
+    assert 'copilot_pipeline_prompt_stage_count{prompt="execute-repo-task"} 1' in lines
+    assert not any(line.startswith('copilot_pipeline_repo_max_rss_kb{repo="empty"}') for line in lines)
+    assert [p.name for p in path.parent.iterdir()] == ['pipeline.prom']
@@ -0,0 +1,151 @@
+import json
+import os
+
+import pytest
+
+import prompt_memo
+import stage_cache
+from prompt_memo import PromptMemo, memo_result
+
+CHECKLIST = 'tasks/alpha_repo_checklist.md'
+PARAMS = {'checklist_path': CHECKLIST}
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_memo, 'REPO_ROOT', str(tmp_path))
+    monkeypatch.setattr(stage_cache, 'REPO_ROOT', str(tmp_path))
+    (tmp_path / 'tasks').mkdir()
+    (tmp_path / 'output').mkdir()
+    _write(tmp_path, CHECKLIST, 'Generated: 2025-01-01T00:00:00Z\n- [ ] (4) search readme\n')
+    return tmp_path
+
+
+def _write(root, rel, text):
+    with open(os.path.join(root, rel), 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def _read(root, rel):
+    with open(os.path.join(root, rel), encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_key_ignores_generated_line_and_tracks_checklist_content(root):
+    memo = PromptMemo(str(root / 'memo'))
+    key = memo.key_for('task-search-readme', PARAMS, 'model-a')
+
+    _write(root, CHECKLIST, 'Generated: 2030-01-01T00:00:00Z\n- [ ] (4) search readme\n')
+    assert memo.key_for('task-search-readme', PARAMS, 'model-a') == key
+    assert memo.key_for('task-search-readme', PARAMS, 'model-b') != key
+
+    _write(root, CHECKLIST, 'Generated: 2030-01-01T00:00:00Z\n- [x] (4) search readme\n')
+    assert memo.key_for('task-search-readme', PARAMS, 'model-a') != key
+
+
+def test_key_tracks_param_input_files(root):
+    memo = PromptMemo(str(root / 'memo'))
+    _write(root, 'repos.txt', 'https://example.com/alpha\n')
+    key = memo.key_for('generate-repo-task-checklists', {'input': 'repos.txt'}, 'm')
+
+    _write(root, 'repos.txt', 'https://example.com/alpha\nhttps://example.com/beta\n')
+
+    assert memo.key_for('generate-repo-task-checklists', {'input': 'repos.txt'}, 'm') != key
+
+
+@pytest.mark.parametrize('prompt', ['task-clone-repo', 'clone-repo', 'task-execute-readme', 'execute-repo-task'])
+def test_non_replayable_prompts_have_no_key(root, prompt):
+    assert PromptMemo(str(root / 'memo')).key_for(prompt, PARAMS, 'm') is None
+
+
+def test_missing_checklist_has_no_key(root):
+    memo = PromptMemo(str(root / 'memo'))
+    assert memo.key_for('task-search-readme', {'checklist_path': 'tasks/missing_repo_checklist.md'}, 'm') is None
+
+
+def test_store_and_replay_scoped_mutations(root):
+    memo = PromptMemo(str(root / 'memo'))
+    _write(root, 'tasks/alpha_stale.md', 'stale')
+    key = memo.key_for('task-search-readme', PARAMS, 'm')
+    before = memo.snapshot(PARAMS)
+
+    # The call: marks the checklist, writes its contract, deletes a file; another worker writes beta output.
+    _write(root, CHECKLIST, 'Generated: 2025-01-01T00:00:00Z\n- [x] (4) search readme\n- {{readme_content}} → found\n')
+    _write(root, 'output/alpha_task2_search-readme.json', '{"readme_filename": "README.md"}')
+    _write(root, 'output/beta_task2_search-readme.json', '{}')
+    _write(root, 'output/alpha_run.log', 'log lines')
+    os.remove(root / 'tasks' / 'alpha_stale.md')
+    assert memo.store(key, 'task-search-readme', PARAMS, 'm', (0, 'done', ''), before)
+
+    entry = memo.lookup(key)
+    assert sorted(entry['files']) == ['output/alpha_task2_search-readme.json', CHECKLIST]
+    assert entry['deleted'] == ['tasks/alpha_stale.md']
+    assert memo_result(entry) == (0, 'done', '')
+
+    # Next run: fresh checklist with a new Generated line, no contract, stale file back.
+    _write(root, CHECKLIST, 'Generated: 2030-01-01T00:00:00Z\n- [ ] (4) search readme\n')
+    os.remove(root / 'output' / 'alpha_task2_search-readme.json')
+    _write(root, 'tasks/alpha_stale.md', 'stale')
+
+    memo.replay(entry)
+
+    assert _read(root, CHECKLIST) == 'Generated: 2030-01-01T00:00:00Z\n- [x] (4) search readme\n- {{readme_content}} → found\n'
+    assert json.loads(_read(root, 'output/alpha_task2_search-readme.json')) == {'readme_filename': 'README.md'}
+    assert not (root / 'tasks' / 'alpha_stale.md').exists()
+
+
+def test_failed_calls_are_not_stored(root):
+    memo = PromptMemo(str(root / 'memo'))
+    key = memo.key_for('task-search-readme', PARAMS, 'm')
+    assert not memo.store(key, 'task-search-readme', PARAMS, 'm', (1, '', 'boom'), memo.snapshot(PARAMS))
+    assert memo.lookup(key) is None
+    assert memo.stats()['misses'] == 1
+
+
+def test_expired_entries_are_misses(root):
+    memo = PromptMemo(str(root / 'memo'), ttl_seconds=0)
+    key = memo.key_for('task-search-readme', PARAMS, 'm')
+    memo.store(key, 'task-search-readme', PARAMS, 'm', (0, '', ''), memo.snapshot(PARAMS))
+    assert memo.lookup(key) is None
+
+
+def _repo_checklist(root, **variables):
+    lines = ['Generated: 2025-01-01T00:00:00Z', '- [ ] (4) search readme', '', '## Repo Variables Available']
+    lines += [f"- {{{{{name}}}}} → {value}" for name, value in variables.items()]
+    _write(root, CHECKLIST, '\n'.join(lines) + '\n')
+
+
+def _fake_clone(root, rel, sha):
+    git = root / rel / '.git'
+    (git / 'refs' / 'heads').mkdir(parents=True, exist_ok=True)
+    _write(root, f"{rel}/.git/HEAD", 'ref: refs/heads/main\n')
+    _write(root, f"{rel}/.git/refs/heads/main", sha + '\n')
+
+
+def test_key_tracks_the_cloned_repo_head(root):
+    memo = PromptMemo(str(root / 'memo'))
+    _fake_clone(root, 'clone_repos/alpha', 'a' * 40)
+    _repo_checklist(root, repo_directory='clone_repos/alpha')
+    key = memo.key_for('task-search-readme', PARAMS, 'm')
+    assert key is not None
+
+    _fake_clone(root, 'clone_repos/alpha', 'b' * 40)
+
+    assert memo.key_for('task-search-readme', PARAMS, 'm') != key
+
+
+def test_clone_without_readable_head_is_not_memoized(root):
+    (root / 'clone_repos' / 'alpha').mkdir(parents=True)
+    _repo_checklist(root, repo_directory='clone_repos/alpha')
+    assert PromptMemo(str(root / 'memo')).key_for('task-search-readme', PARAMS, 'm') is None
+
+
+def test_key_tracks_files_named_by_checklist_variables(root):
+    memo = PromptMemo(str(root / 'memo'))
+    _write(root, 'output/alpha_solutions.json', '{"solutions": []}')
+    _repo_checklist(root, solutions_json='output/alpha_solutions.json')
+    key = memo.key_for('task-generate-solution-task-checklists', PARAMS, 'm')
+
+    _write(root, 'output/alpha_solutions.json', '{"solutions": [{"name": "App"}]}')
+
+    assert memo.key_for('task-generate-solution-task-checklists', PARAMS, 'm') != key
@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+
+import prompt_registry
+from prompt_registry import PromptRegistry, PromptValidationError, parse_front_matter
+
+CLONE_PROMPT = """---
+temperature: 0.1
+mode: agent
+---
+# Clone a repository
+"""
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    prompts = tmp_path / '.github' / 'prompts'
+    prompts.mkdir(parents=True)
+    (prompts / 'task-clone-repo.prompt.md').write_text(CLONE_PROMPT, encoding='utf-8')
+    (prompts / 'execute-repo-task.prompt.md').write_text('# Execute\n', encoding='utf-8')
+    (prompts / 'README.md').write_text('not a prompt\n', encoding='utf-8')
+    monkeypatch.setattr(prompt_registry, 'REPO_ROOT', str(tmp_path))
+    return PromptRegistry(str(prompts))
+
+
+def test_registry_indexes_prompt_files_with_hash_and_front_matter(registry):
+    info = registry.require('task-clone-repo')
+
+    assert sorted(registry.prompts) == ['execute-repo-task', 'task-clone-repo']
+    assert info.sha256 == hashlib.sha256(CLONE_PROMPT.encode('utf-8')).hexdigest()
+    assert info.temperature == 0.1
+    assert info.front_matter['mode'] == 'agent'
+    assert registry.get('execute-repo-task').temperature is None
+
+
+def test_rewrite_references_uses_repo_relative_paths(registry):
+    text = registry.rewrite_references("/task-clone-repo clone_path='./clone_repos' then /execute-repo-task")
+
+    assert text == (
+        "Follow instructions in #file: .github/prompts/task-clone-repo.prompt.md clone_path='./clone_repos' "
+        "then Follow instructions in #file: .github/prompts/execute-repo-task.prompt.md"
+    )
+    with pytest.raises(FileNotFoundError):
+        registry.rewrite_references('/task-missing')
+
+
+def test_validate_fails_on_missing_rewritable_prompts_and_warns_on_native_commands(registry):
+    assert registry.validate(['task-clone-repo', 'generate-repo-task-checklists']) == ['generate-repo-task-checklists']
+    with pytest.raises(PromptValidationError, match='task-missing.prompt.md'):
+        registry.validate(['task-clone-repo', 'task-missing', 'task-missing'])
+
+
+def test_front_matter_must_be_closed_and_near_the_top():
+    assert parse_front_matter('---\ntemperature: 0\nenabled: true\n---\n') == {'temperature': 0, 'enabled': True}
+    assert parse_front_matter('---\ntemperature: 0.2\n') == {}
+    assert parse_front_matter('\n' * 12 + '---\ntemperature: 0.2\n---\n') == {}
@@ -0,0 +1,51 @@
+import pytest
+
+from rate_limiter import FAILED, OK, THROTTLED, RateLimiter, classify_result, retry_after_hint
+
+
+@pytest.mark.parametrize('stderr', [
+    'Error: 429 Too Many Requests',
+    '✗ Error: rate limit exceeded, please slow down',
+    'FetchError: request to https://api.example.com failed, reason: read ECONNRESET',
+    'some context\nError: Request failed with status code 503\n',
+    '  error: secondary rate limit',
+])
+def test_copilot_error_lines_on_stderr_are_throttled(stderr):
+    assert classify_result(1, '', stderr) == THROTTLED
+
+
+@pytest.mark.parametrize('stdout', [
+    'Restoring packages...\nerror NU1301: Unable to load the service index (503 Service Unavailable)\n',
+    'README: the API enforces a rate limit of 100 calls\n',
+    'Error: 429 Too Many Requests\n',  # transcript lines never count, even copilot-shaped ones
+])
+def test_transcript_on_stdout_is_never_scanned(stdout):
+    assert classify_result(1, stdout, '') == FAILED
+
+
+@pytest.mark.parametrize('stderr', [
+    'Build failed: 502 errors in project',
+    'C:\\src\\app.csproj : error : Response status code does not indicate success: 503',
+    'warning: rate limit header missing',
+])
+def test_non_error_or_unanchored_stderr_lines_are_failures(stderr):
+    assert classify_result(1, '', stderr) == FAILED
+
+
+def test_success_is_ok_regardless_of_output():
+    assert classify_result(0, 'Error: 429', 'Error: 429 Too Many Requests') == OK
+
+
+def test_retry_after_hint_reads_the_stderr_header():
+    assert retry_after_hint('Error: 429 Too Many Requests; Retry-After: 12') == 12.0
+    assert retry_after_hint('Error: 429 Too Many Requests') is None
+
+
+def test_throttling_halves_the_limit_and_successes_do_not_grow_it_without_demand():
+    limiter = RateLimiter(max_concurrency=8, cooldown_seconds=0)
+    ticket = limiter.acquire()
+    limiter.release(ticket, THROTTLED)
+    assert limiter.limit == 4
+    for _ in range(10):
+        limiter.release(limiter.acquire(), OK)
+    assert limiter.limit == 4
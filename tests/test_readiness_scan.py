@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+import readiness_scan
+from checklist_utils import clear_checklist_cache
+
+REPO_CHECKLIST = """# Task Checklist: demo
+## Repo Tasks
+- [x] [MANDATORY] Clone @task-clone-repo
+- [x] [MANDATORY] Find solutions @task-find-solutions
+
+## Repo Variables Available
+- {{repo_name}} → demo
+- {{solutions}} → App.sln
+"""
+
+SOLUTION_CHECKLIST = """# Solution Checklist: App
+## Solution Tasks
+- [x] [MANDATORY] Restore @task-restore-solution
+- [ ] [MANDATORY] Build @task-build-solution
+
+## Solution Variables Available
+- {{restore_status}} → SUCCESS
+- {{build_status}} → (blank)
+"""
+
+
+@pytest.fixture
+def tasks_dir(tmp_path):
+    clear_checklist_cache()
+    (tmp_path / 'demo_repo_checklist.md').write_text(REPO_CHECKLIST, encoding='utf-8')
+    (tmp_path / 'demo_App_solution_checklist.md').write_text(SOLUTION_CHECKLIST, encoding='utf-8')
+    nested = tmp_path / 'nested'
+    nested.mkdir()
+    (nested / 'other_repo_checklist.md').write_text(REPO_CHECKLIST.replace('demo', 'other'), encoding='utf-8')
+    (tmp_path / 'notes.md').write_text('not a checklist\n', encoding='utf-8')
+    yield tmp_path
+    clear_checklist_cache()
+
+
+def test_discovery_is_recursive_and_only_matches_checklists(tasks_dir):
+    names = [p[len(str(tasks_dir)) + 1:] for p in readiness_scan.discover_checklists(str(tasks_dir))]
+
+    assert names == ['demo_App_solution_checklist.md', 'demo_repo_checklist.md', 'nested/other_repo_checklist.md']
+
+
+def test_scan_aggregates_repo_and_solution_results(tasks_dir):
+    report = readiness_scan.scan(str(tasks_dir), workers=1)
+    by_name = {r['name']: r for r in report['results']}
+    counts = report['counts']
+
+    assert by_name['demo']['ready'] is True
+    assert by_name['App']['status'] == 'NOT_READY'
+    assert by_name['App']['missing_tasks'] == ['task-build-solution']
+    assert by_name['other']['missing_solution_checklists'] == ['missing_solution_checklist:other_App_solution_checklist.md']
+    assert (counts['total'], counts['ready'], counts['not_ready']) == (3, 1, 2)
+    assert counts['repo'] == {'total': 2, 'ready': 1}
+    assert counts['solution'] == {'total': 1, 'ready': 0}
+    assert counts['by_status'] == {'OK': 1, 'NOT_READY': 2}
+
+
+def test_process_pool_gives_the_same_results(tasks_dir, monkeypatch):
+    serial = readiness_scan.scan(str(tasks_dir), workers=1)
+    monkeypatch.setattr(readiness_scan, 'MIN_FILES_FOR_POOL', 0)
+    pooled = readiness_scan.scan(str(tasks_dir), workers=2)
+
+    assert pooled['results'] == serial['results']
+    assert pooled['counts'] == serial['counts']
+
+
+def test_jsonl_report_ends_with_the_counts_line(tasks_dir, tmp_path):
+    report = readiness_scan.scan(str(tasks_dir), workers=1)
+    target = tmp_path / 'out' / 'report.jsonl'
+
+    readiness_scan.write_report(report, jsonl_path=str(target))
+    lines = [json.loads(line) for line in target.read_text(encoding='utf-8').splitlines()]
+
+    assert lines[:-1] == report['results']
+    assert lines[-1]['counts'] == report['counts']
+    assert readiness_scan.main(['--dir', str(tasks_dir), '--jsonl', str(target), '--quiet']) == 1
@@ -0,0 +1,38 @@
+import json
+
+from run_events import EventLog, read_events, write_index
+
+
+def test_index_folds_stage_outcomes(tmp_path):
+    events_path = tmp_path / 'events.jsonl'
+    with EventLog(str(events_path), run_id='run-1', truncate=True) as events:
+        events.emit('run_start', mode='steps', jobs=1)
+        attempt = events.bind(repo='alpha', **{'pass': 1})
+        attempt.emit('attempt_start')
+        attempt.emit('stage_finish', prompt='task-clone-repo', stage_status='SUCCESS', wall_seconds=1.5)
+        attempt.emit('stage_finish', prompt='task-find-solutions', stage_status='FAIL', wall_seconds=0.5)
+        attempt.emit('readiness', exit_code=1, readiness='FAIL')
+        events.emit('run_finish', overall_status='FAIL')
+
+    index = write_index(str(events_path), str(tmp_path / 'index.json'))
+
+    assert index['status'] == 'FAIL'
+    assert index['repos']['alpha']['attempts'] == [
+        {'pass': 1, 'stages': 2, 'failed': ['task-find-solutions'], 'wall_seconds': 2.0, 'exit_code': 1, 'readiness': 'FAIL'}
+    ]
+    assert index['prompts']['task-clone-repo']['count'] == 1
+
+
+def test_read_events_skips_torn_line(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    path.write_text(json.dumps({'event': 'run_start'}) + '\n{"event": "stage_', encoding='utf-8')
+    assert [e['event'] for e in read_events(str(path))] == ['run_start']
+
+
+def test_write_index_survives_missing_event_file(tmp_path):
+    index_path = tmp_path / 'out' / 'index.json'
+
+    index = write_index(str(tmp_path / 'missing.jsonl'), str(index_path), run_id='run-1')
+
+    assert index['events_missing'] is True
+    assert json.loads(index_path.read_text(encoding='utf-8'))['run_id'] == 'run-1'
@@ -0,0 +1,107 @@
+import datetime
+import json
+
+import pytest
+
+from run_history import RunHistory, checklist_identity
+
+
+def _ts(minutes_ago=0):
+    moment = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=minutes_ago)
+    return moment.isoformat(timespec='seconds')
+
+
+def _summary(*stages, status='SUCCESS'):
+    return {'overall_status': status, 'elapsed_seconds': 1.0, 'pipeline': [
+        {'prompt': prompt, 'order': idx, 'stage_status': 'SUCCESS' if code == 0 else 'FAIL', 'exit_code': code,
+         'timestamp': _ts(), 'cache_status': cache, 'metrics': {'wall_seconds': wall}}
+        for idx, (prompt, code, wall, cache) in enumerate(stages, start=1)
+    ]}
+
+
+@pytest.fixture
+def history(tmp_path):
+    with RunHistory(str(tmp_path / 'history' / 'runs.sqlite')) as history:
+        yield history
+
+
+def test_attempts_and_stages_are_recorded_per_run(history):
+    run_id = history.start_run('run_all_repos', 'steps', {'jobs': 2})
+    recorder = history.attempt(run_id, kind='repo', checklist_path='tasks/demo_repo_checklist.md', attempt=1)
+    recorder.record_pipeline(1, _summary(('task-clone-repo', 0, 2.0, None), ('task-find-solutions', 1, 4.0, None), status='FAIL'))
+    recorder.record_readiness(False)
+    history.record_readiness(run_id, kind='repo', checklist_path='tasks/demo_repo_checklist.md', final_readiness='FAIL', attempts=1)
+    history.finish_run(run_id, 'FAIL')
+
+    runs = history.recent_runs()
+    assert [(r['run_id'], r['overall_status'], r['attempts'], r['stages']) for r in runs] == [(run_id, 'FAIL', 1, 2)]
+    attempt = history.query('SELECT repo, exit_code, readiness FROM attempts')[0]
+    assert attempt == {'repo': 'demo', 'exit_code': 1, 'readiness': 'FAIL'}
+    assert history.query('SELECT repo, final_readiness FROM readiness') == [{'repo': 'demo', 'final_readiness': 'FAIL'}]
+
+
+def test_reports_rank_prompts_and_repos(history):
+    run_id = history.start_run('run_all_repos')
+    for attempt, (code, readiness) in enumerate([(0, False), (0, True)], start=1):
+        recorder = history.attempt(run_id, kind='repo', checklist_path='tasks/flaky_repo_checklist.md', attempt=attempt)
+        recorder.record_pipeline(code, _summary(('task-clone-repo', 0, 1.0, None), ('execute-repo-task', 0, 9.0, None)))
+        recorder.record_readiness(readiness)
+    stable = history.attempt(run_id, kind='repo', checklist_path='tasks/stable_repo_checklist.md', attempt=1)
+    stable.record_pipeline(0, _summary(('execute-repo-task', 0, 0.0, 'HIT')))
+    stable.record_readiness(True)
+
+    slowest = history.slowest_prompts()
+    assert [(p['prompt'], p['runs'], p['avg_seconds']) for p in slowest] == [('execute-repo-task', 2, 9.0), ('task-clone-repo', 2, 1.0)]
+    assert [(r['repo'], r['attempts'], r['failed_attempts'], r['failure_rate']) for r in history.flaky_repos()] == [('flaky', 2, 1, 0.5)]
+    assert history.failure_rate()[0]['stages'] == 5
+
+
+def test_summary_import_is_idempotent(history, tmp_path):
+    path = tmp_path / 'demo_pipeline_summary.json'
+    summary = _summary(('task-clone-repo', 0, 1.0, None))
+    summary['pipeline'][0]['params'] = {'checklist_path': 'tasks/demo_repo_checklist.md'}
+    path.write_text(json.dumps(summary), encoding='utf-8')
+
+    assert history.import_summary(str(path)) == 1
+    assert history.import_summary(str(path)) == 0
+    assert history.query('SELECT orchestrator, overall_status FROM runs') == [{'orchestrator': 'import', 'overall_status': 'SUCCESS'}]
+
+
+def test_decision_import_skips_duplicate_rows(history, tmp_path):
+    path = tmp_path / 'decision-log.csv'
+    path.write_text(
+        'timestamp,repo_name,solution_name,task,message,status\n'
+        '2025-01-01T00:00:00Z,demo,,task-clone-repo,cloned,SUCCESS\n'
+        '2025-01-01T00:01:00Z,demo,App,task-build-solution,built,SUCCESS\n',
+        encoding='utf-8',
+    )
+
+    assert history.import_decisions(str(path)) == 2
+    assert history.import_decisions(str(path)) == 0
+
+
+def test_solution_attempts_are_recorded_under_the_parent_repo(history, tmp_path):
+    checklist = tmp_path / 'foo_App_solution_checklist.md'
+    checklist.write_text(
+        '# Solution Checklist: App\nRepository: https://example.com/org/foo.git\n\n'
+        '### Solution Variables\n- solution_name: App\n- parent_repo: foo\n', encoding='utf-8')
+    run_id = history.start_run('run_single_file')
+    repo_attempt = history.attempt(run_id, kind='repo', checklist_path='tasks/foo_repo_checklist.md', attempt=1)
+    repo_attempt.record_pipeline(0, _summary(('task-clone-repo', 0, 1.0, None)))
+    recorder = history.attempt(run_id, kind='solution', checklist_path=str(checklist), attempt=1)
+    recorder.record_pipeline(1, _summary(('solution-build', 1, 3.0, None), status='FAIL'))
+    recorder.record_readiness(False)
+    history.record_readiness(run_id, kind='solution', checklist_path=str(checklist), final_readiness='FAIL', attempts=1)
+
+    assert history.query('SELECT repo, checklist_path FROM repos') == [
+        {'repo': 'foo', 'checklist_path': 'tasks/foo_repo_checklist.md'}]
+    assert history.query("SELECT repo, solution FROM attempts WHERE kind = 'solution'") == [{'repo': 'foo', 'solution': 'App'}]
+    assert history.query('SELECT repo, solution FROM readiness') == [{'repo': 'foo', 'solution': 'App'}]
+    assert [(r['repo'], r['kind']) for r in history.flaky_repos()] == [('foo', 'solution')]
+
+
+def test_solution_identity_falls_back_to_the_repository_header(tmp_path):
+    checklist = tmp_path / 'foo_App_solution_checklist.md'
+    checklist.write_text('# Solution Checklist: App\nRepository: https://example.com/org/foo.git\n', encoding='utf-8')
+    assert checklist_identity(str(checklist)) == ('foo', 'App')
+    assert checklist_identity('tasks/bar_repo_checklist.md') == ('bar', None)
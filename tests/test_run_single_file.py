@@ -0,0 +1,73 @@
+import argparse
+
+import pytest
+
+import run_single_file
+from run_single_file import run_checklists_pipelined
+
+
+@pytest.fixture
+def tasks(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_single_file, 'REPO_ROOT', str(tmp_path))
+    tasks_dir = tmp_path / 'tasks'
+    tasks_dir.mkdir()
+    for repo in ('alpha', 'beta'):
+        header = f"Repository: https://example.com/{repo}\n"
+        (tasks_dir / f"{repo}_repo_checklist.md").write_text(f"# Task Checklist: {repo}\n{header}", encoding='utf-8')
+        (tasks_dir / f"{repo}_App_solution_checklist.md").write_text(f"# Solution Checklist: App\n{header}", encoding='utf-8')
+    return ['tasks/alpha_repo_checklist.md', 'tasks/beta_repo_checklist.md']
+
+
+def _runners(ready_repos):
+    ran = []
+
+    def run_repo(path):
+        return any(f"/{name}_" in path for name in ready_repos), 0
+
+    def run_solution(path):
+        ran.append(path)
+        return True, 0
+
+    return run_repo, run_solution, ran
+
+
+def test_pipelined_run_skips_solutions_of_repos_that_failed_readiness(tasks):
+    run_repo, run_solution, ran = _runners({'alpha'})
+
+    repo_results, solution_results, skipped = run_checklists_pipelined(
+        tasks, run_repo=run_repo, run_solution=run_solution, repo_jobs=2, solution_jobs=1,
+    )
+
+    assert [(path, ready) for path, ready, _ in repo_results] == [(tasks[0], True), (tasks[1], False)]
+    assert ran == ['tasks/alpha_App_solution_checklist.md']
+    assert [path for path, _, _ in solution_results] == ran
+    assert skipped == [(tasks[1], ['tasks/beta_App_solution_checklist.md'])]
+
+
+def test_phased_run_keeps_legacy_behaviour(tasks):
+    run_repo, run_solution, ran = _runners({'alpha'})
+
+    _repo_results, _solution_results, skipped = run_checklists_pipelined(
+        tasks, run_repo=run_repo, run_solution=run_solution,
+    )
+
+    assert sorted(ran) == ['tasks/alpha_App_solution_checklist.md', 'tasks/beta_App_solution_checklist.md']
+    assert skipped == []
+
+
+def _run_repo_checklist(monkeypatch, tmp_path, checklist_path):
+    monkeypatch.setattr(run_single_file, 'execute_pipeline', lambda **kwargs: (0, {}))
+    ready, _exit_code = run_single_file.run_pipeline_for_checklist(
+        checklist_path, args=argparse.Namespace(continue_on_error=False), mode='steps', step_by_step=False,
+        base_dir=str(tmp_path), stem='run', ext='.log', per_attempt_logs=[], pipeline_step=[], pipeline_all=[],
+        readiness_checker=lambda path: True, checklist_label='repository',
+    )
+    return ready
+
+
+def test_repo_readiness_requires_its_own_solution_checklists(tasks, tmp_path, monkeypatch):
+    (tmp_path / 'tasks' / 'gamma_repo_checklist.md').write_text(
+        "# Task Checklist: gamma\nRepository: https://example.com/gamma\n", encoding='utf-8')
+
+    assert _run_repo_checklist(monkeypatch, tmp_path, tasks[0]) is True
+    assert _run_repo_checklist(monkeypatch, tmp_path, 'tasks/gamma_repo_checklist.md') is False
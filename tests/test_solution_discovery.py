@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from solution_discovery import SolutionCache, discover_many, discover_solutions, find_solutions, head_commit
+
+SHA_A = 'a' * 40
+SHA_B = 'b' * 40
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / 'repo'
+    for rel in ('Root.SLN', 'src/App/App.sln', 'src/Lib/deep/Lib.sln', 'bin/Debug/Copy.sln',
+                'node_modules/pkg/Pkg.sln', 'src/obj/Gen.sln', 'docs/readme.md'):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('', encoding='utf-8')
+    git = root / '.git'
+    (git / 'refs' / 'heads').mkdir(parents=True)
+    (git / 'HEAD').write_text('ref: refs/heads/main\n', encoding='utf-8')
+    (git / 'refs' / 'heads' / 'main').write_text(SHA_A + '\n', encoding='utf-8')
+    (git / 'Hidden.sln').write_text('', encoding='utf-8')
+    return root
+
+
+def _names(paths, root):
+    return [os.path.relpath(p, root).replace(os.sep, '/') for p in paths]
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_walk_prunes_build_and_vendor_directories(repo, jobs):
+    assert _names(find_solutions(str(repo), jobs=jobs), repo) == ['Root.SLN', 'src/App/App.sln', 'src/Lib/deep/Lib.sln']
+
+
+def test_head_commit_reads_loose_packed_and_detached_refs(repo):
+    assert head_commit(str(repo)) == SHA_A
+
+    os.remove(repo / '.git' / 'refs' / 'heads' / 'main')
+    (repo / '.git' / 'packed-refs').write_text(f"# pack-refs\n{SHA_B} refs/heads/main\n", encoding='utf-8')
+    assert head_commit(str(repo)) == SHA_B
+
+    (repo / '.git' / 'HEAD').write_text(SHA_A + '\n', encoding='utf-8')
+    assert head_commit(str(repo)) == SHA_A
+
+
+def test_cache_is_keyed_on_head(repo, tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache' / 'solutions.json'))
+
+    first = discover_solutions(str(repo), cache=cache)
+    (repo / 'src' / 'New.sln').write_text('', encoding='utf-8')
+    second = discover_solutions(str(repo), cache=cache)
+    (repo / '.git' / 'refs' / 'heads' / 'main').write_text(SHA_B + '\n', encoding='utf-8')
+    third = discover_solutions(str(repo), cache=cache)
+
+    assert (first['cache'], second['cache'], third['cache']) == ('MISS', 'HIT', 'MISS')
+    assert second['solutions'] == first['solutions']
+    assert third['solution_count'] == first['solution_count'] + 1
+    assert discover_solutions(str(repo))['cache'] == 'OFF'
+
+
+def test_discover_many_keeps_order_and_reports_missing_directories(repo, tmp_path):
+    results = discover_many([str(tmp_path / 'missing'), str(repo)], jobs=2)
+
+    assert results[0]['error'].startswith('NotADirectoryError')
+    assert results[1]['solution_count'] == 3
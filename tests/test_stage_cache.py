@@ -0,0 +1,123 @@
+import json
+import os
+
+import pytest
+
+import stage_cache
+from file_lock import FileLock
+from stage_cache import StageCache, referenced_outputs
+
+CHECKLIST = """# Task Checklist: alpha
+Repository: https://example.com/alpha
+Generated: {generated}
+
+## Repo Tasks (Sequential Pipeline - Complete in Order)
+- [{mark}] (2) [MANDATORY] [SCRIPTABLE] Find all solution files in repository → @task-find-solutions
+
+## Repo Variables Available
+- {{{{solutions_json}}}} → {solutions_json}
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(stage_cache, 'REPO_ROOT', str(tmp_path))
+    (tmp_path / 'tasks').mkdir()
+    (tmp_path / 'output').mkdir()
+    return tmp_path
+
+
+def _write_checklist(root, generated='2025-01-01T00:00:00Z', mark=' ', solutions_json=''):
+    path = root / 'tasks' / 'alpha_repo_checklist.md'
+    path.write_text(CHECKLIST.format(generated=generated, mark=mark, solutions_json=solutions_json), encoding='utf-8')
+    return path
+
+
+def _params(path):
+    return {'checklist_path': str(path)}
+
+
+def test_key_ignores_generated_line_but_tracks_content_params_and_model(workspace):
+    cache = StageCache(str(workspace / 'cache'), model='model-a')
+    path = _write_checklist(workspace)
+    key = cache.key_for('task-find-solutions', _params(path))
+
+    _write_checklist(workspace, generated='2030-06-01T12:00:00Z')
+    assert cache.key_for('task-find-solutions', _params(path)) == key
+
+    assert cache.key_for('task-find-solutions', dict(_params(path), extra='1')) != key
+    assert StageCache(str(workspace / 'cache'), model='model-b').key_for('task-find-solutions', _params(path)) != key
+    _write_checklist(workspace, mark='x')
+    assert cache.key_for('task-find-solutions', _params(path)) != key
+
+
+@pytest.mark.parametrize('prompt', [
+    'task-clone-repo',
+    'generate-solution-task-checklists',
+    'task-generate-solution-task-checklists',
+    'task-execute-readme',
+    'task-build-solution',
+])
+def test_stages_with_external_effects_are_uncacheable(workspace, prompt):
+    cache = StageCache(str(workspace / 'cache'), model='m')
+    assert cache.key_for(prompt, _params(_write_checklist(workspace))) is None
+
+
+def test_key_requires_an_existing_checklist(workspace):
+    cache = StageCache(str(workspace / 'cache'), model='m')
+    assert cache.key_for('task-find-solutions', {}) is None
+    assert cache.key_for('task-find-solutions', {'checklist_path': str(workspace / 'missing.md')}) is None
+
+
+def test_hit_replays_referenced_output_files(workspace):
+    cache = StageCache(str(workspace / 'cache'), model='m')
+    path = _write_checklist(workspace)
+    key = cache.key_for('task-find-solutions', _params(path))
+    contract = workspace / 'output' / 'alpha_task5_find-solutions.json'
+    contract.write_text(json.dumps({'solutions': ['a.sln']}), encoding='utf-8')
+    _write_checklist(workspace, mark='x', solutions_json='output/alpha_task5_find-solutions.json')
+    cache.store(key, 'task-find-solutions', _params(path), 0)
+
+    # Next run: ./output was reset and the checklist regenerated.
+    os.remove(contract)
+    _write_checklist(workspace, generated='2030-06-01T12:00:00Z')
+    entry = cache.lookup(cache.key_for('task-find-solutions', _params(path)))
+
+    assert entry is not None and cache.apply(entry, _params(path))
+    assert json.loads(contract.read_text(encoding='utf-8')) == {'solutions': ['a.sln']}
+    restored = path.read_text(encoding='utf-8')
+    assert 'Generated: 2030-06-01T12:00:00Z' in restored and '- [x] (2)' in restored
+
+
+def test_entry_without_recorded_output_is_not_applied_when_file_is_gone(workspace):
+    cache = StageCache(str(workspace / 'cache'), model='m')
+    path = _write_checklist(workspace)
+    key = cache.key_for('task-find-solutions', _params(path))
+    _write_checklist(workspace, mark='x', solutions_json='output/alpha_task5_find-solutions.json')
+    cache.store(key, 'task-find-solutions', _params(path), 0)  # output file never written
+
+    assert not cache.apply(cache.lookup(key), _params(path))
+
+
+def test_failed_stages_are_not_stored(workspace):
+    cache = StageCache(str(workspace / 'cache'), model='m')
+    path = _write_checklist(workspace)
+    key = cache.key_for('task-find-solutions', _params(path))
+    cache.store(key, 'task-find-solutions', _params(path), 1)
+    assert cache.lookup(key) is None
+
+
+def test_referenced_outputs_only_matches_repo_relative_output_paths():
+    text = ('- {{readme_content}} → output/a_task2_search-readme.json (field=readme_content)\n'
+            '- {{solutions_json}} → output/a_task5_find-solutions.json\n'
+            '- {{other}} → clone_repos/a/output/b.json\n')
+    assert referenced_outputs(text) == ['output/a_task2_search-readme.json', 'output/a_task5_find-solutions.json']
+
+
+def test_evict_skips_while_another_worker_holds_the_lock(workspace):
+    cache = StageCache(str(workspace / 'cache'), model='m', max_entries=0)
+    (workspace / 'cache' / 'stale.json').write_text('{}', encoding='utf-8')
+    with FileLock(str(workspace / 'cache' / '.evict.lock'), timeout=0):
+        assert cache.evict() == 0
+    assert (workspace / 'cache' / 'stale.json').exists()
+    assert cache.evict() == 1
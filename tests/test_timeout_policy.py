@@ -0,0 +1,65 @@
+import json
+
+from timeout_policy import TimeoutPolicy, collect_stage_durations, percentile
+
+
+def _summary(tmp_path, name, walls, prompt='execute-repo-task'):
+    path = tmp_path / name
+    stages = [{'prompt': prompt, 'timestamp': f"t{i}", 'params': {}, 'metrics': {'wall_seconds': w}} for i, w in enumerate(walls)]
+    path.write_text(json.dumps({'pipeline': stages}), encoding='utf-8')
+    return str(path)
+
+
+def test_explicit_values_win_over_the_default():
+    policy = TimeoutPolicy(100, idle_timeout=30, prompt_timeouts={'task-clone-repo': 10}, prompt_idle_timeouts={'task-build': 0})
+
+    assert policy.timeout_for('task-clone-repo') == 10
+    assert policy.timeout_for('task-build') == 100
+    assert policy.timeout_for(None) == 100
+    assert policy.idle_timeout_for('task-clone-repo') == 30
+    assert policy.idle_timeout_for('task-build') is None  # 0 disables the watchdog for this prompt
+
+
+def test_from_file_reads_scalar_and_object_entries(tmp_path):
+    path = tmp_path / 'policy.json'
+    path.write_text(json.dumps({
+        'default': 900,
+        'prompts': {'task-clone-repo': 300, 'execute-repo-task': {'timeout': 5400, 'idle_timeout': 1200}},
+    }), encoding='utf-8')
+
+    policy = TimeoutPolicy.from_file(str(path), idle_timeout=60)
+
+    assert policy.timeout_for('task-clone-repo') == 300
+    assert policy.timeout_for('execute-repo-task') == 5400
+    assert policy.timeout_for('other') == 900
+    assert policy.idle_timeout_for('execute-repo-task') == 1200
+    assert policy.idle_timeout_for('other') == 60
+
+
+def test_history_derives_clamped_p95_for_prompts_without_explicit_values(tmp_path):
+    paths = [
+        _summary(tmp_path, 'a_pipeline_summary.json', [100.0] * 19 + [400.0]),
+        _summary(tmp_path, 'b_pipeline_summary.json', [1.0] * 5, prompt='task-clone-repo'),
+        _summary(tmp_path, 'c_pipeline_summary.json', [50.0] * 4, prompt='task-find-solutions'),
+        _summary(tmp_path, 'd_pipeline_summary.json', [9999.0] * 5, prompt='task-build'),
+    ]
+    policy = TimeoutPolicy(1800, prompt_timeouts={'task-build': 60})
+
+    derived = policy.apply_history(paths, min_samples=5, min_timeout=120, max_timeout=7200)
+
+    assert derived == {'execute-repo-task': 150, 'task-clone-repo': 120}  # p95=100 x1.5; 1.5 clamped up
+    assert policy.timeout_for('task-find-solutions') == 1800  # fewer than min_samples
+    assert policy.timeout_for('task-build') == 60  # explicit value is kept
+    assert policy.sources['execute-repo-task'].startswith('history p95=100.0s n=20')
+
+
+def test_stage_durations_skip_cache_hits_and_repeated_records(tmp_path):
+    stage = {'prompt': 'task-clone-repo', 'timestamp': 't0', 'params': {'repo': 'x'}, 'metrics': {'wall_seconds': 3.0}}
+    hit = dict(stage, timestamp='t1', cache_status='HIT')
+    all_repos = tmp_path / 'all_repos_pipeline_summary.json'
+    all_repos.write_text(json.dumps({'pipeline': [stage, hit], 'details': [{'attempts': [{'stages': [stage]}]}]}), encoding='utf-8')
+    (tmp_path / 'broken.json').write_text('{', encoding='utf-8')
+
+    assert collect_stage_durations([str(all_repos), str(tmp_path / 'broken.json')]) == {'task-clone-repo': [3.0]}
+    assert percentile([5, 1, 3, 2, 4], 95) == 5
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
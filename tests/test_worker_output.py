@@ -0,0 +1,50 @@
+import io
+import sys
+import threading
+
+from worker_output import PrefixedStream, current_prefix, worker_prefix
+
+
+def test_lines_are_prefixed_per_thread_and_partial_lines_buffered(monkeypatch):
+    target = io.StringIO()
+    stream = PrefixedStream(target)
+    monkeypatch.setattr(sys, 'stdout', stream)
+
+    with worker_prefix('[w1:alpha] '):
+        stream.write('hel')
+        assert target.getvalue() == ''
+        stream.write('lo\nwor')
+    assert target.getvalue() == '[w1:alpha] hello\n[w1:alpha] wor\n'
+
+    stream.write('unprefixed\n')
+    assert target.getvalue().endswith('unprefixed\n')
+
+
+def test_concurrent_workers_never_interleave_within_a_line(monkeypatch):
+    target = io.StringIO()
+    stream = PrefixedStream(target)
+    monkeypatch.setattr(sys, 'stdout', stream)
+
+    def worker(name):
+        with worker_prefix(f"[{name}] "):
+            for i in range(200):
+                stream.write(f"{name} line ")
+                stream.write(f"{i}\n")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in ('a', 'b', 'c')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    lines = target.getvalue().splitlines()
+    assert len(lines) == 600
+    assert all(line.startswith(f"[{line[1]}] {line[1]} line ") for line in lines)
+
+
+def test_nested_prefixes_restore_the_outer_one():
+    with worker_prefix('[outer] '):
+        with worker_prefix(current_prefix() + '[inner] '):
+            assert current_prefix() == '[outer] [inner] '
+        assert current_prefix() == '[outer] '
+    assert current_prefix() == ''
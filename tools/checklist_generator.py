@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""Deterministic Checklist Generator
+
+Renders the canonical checklist templates of task-generate-repo-task-checklists and
+task-generate-solution-task-checklists without involving Copilot.
+
+    - Repository lists are parsed exactly as the prompt specifies: blank and `#` lines are
+      skipped, only HTTPS URLs are kept (others are reported as ignored_input_lines),
+      duplicates are detected case-insensitively, entries are sorted by repo name.
+    - Checklists are only (re)written when their content changed; the `Generated:` line is
+      ignored for the comparison, so a rerun over an unchanged list touches no file.
+      Every write is atomic (temp file + os.replace).
+    - Reset mode performs the prompt's Step 1 reset: output/ and temp-script/ are emptied
+      and tasks/ keeps only the repo checklists of the list and the master checklist (stale
+      repo checklists, solution checklists and any other files are removed); append mode
+      keeps existing checklists and master-checklist states, adding new repositories and
+      refreshing checklists whose URL changed.
+    - Skipping unchanged checklists only spares files that already match the template: in
+      reset mode (what the orchestrators always run) a checklist with progress differs
+      from the fresh template and is always rewritten. Only --append keeps progress and
+      refreshes just the changed entries.
+
+The task-generate-repo-task-checklists and task-generate-solution-task-checklists native
+handlers (tools/native_tasks.py) call generate_repo_checklists() and
+generate_solution_checklists().
+
+CLI (prints the JSON contract):
+    python tools/checklist_generator.py repos --input repositories_small.txt [--append]
+    python tools/checklist_generator.py solutions tasks/*_repo_checklist.md
+"""
+from __future__ import annotations
+import argparse, datetime, json, os, re, shutil, sys, tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from checklist_utils import ChecklistDocument
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+TASKS_DIR = os.path.join(REPO_ROOT, 'tasks')
+OUTPUT_DIR = os.path.join(REPO_ROOT, 'output')
+TEMP_SCRIPT_DIR = os.path.join(REPO_ROOT, 'temp-script')
+PROMPTS_DIR = os.path.join(REPO_ROOT, '.github', 'prompts')
+MASTER_CHECKLIST = 'all_repository_checklist.md'
+REPO_VARIABLES_HEADER = '## Repo Variables Available'
+
+REPO_CHECKLIST_TEMPLATE = """# Task Checklist: {repo_name}
+Repository: {repo_url}
+Generated: {timestamp}
+
+## Repo Tasks (Sequential Pipeline - Complete in Order)
+- [ ] (1) [MANDATORY] [SCRIPTABLE] Clone repository to local directory → @task-clone-repo (see details in #file: .github/prompts/task-clone-repo.prompt.md)
+- [ ] (2) [MANDATORY] [SCRIPTABLE] Find all solution files in repository → @task-find-solutions (see details in #file: .github/prompts/task-find-solutions.prompt.md)
+- [ ] (3) [MANDATORY] [SCRIPTABLE] Generate per-solution checklist files → @task-generate-solution-task-checklists (see details in #file: .github/prompts/task-generate-solution-task-checklists.prompt.md)
+- [ ] (4) [MANDATORY] [SCRIPTABLE] Search for README file in repository → @task-search-readme (see details in #file: .github/prompts/task-search-readme.prompt.md)
+- [ ] (5) [MANDATORY] [NON-SCRIPTABLE] Scan README and extract setup commands → @task-scan-readme (see details in #file: .github/prompts/task-scan-readme.prompt.md)
+- [ ] (6) [MANDATORY] [NON-SCRIPTABLE] Execute safe commands from README → @task-execute-readme (see details in #file: .github/prompts/task-execute-readme.prompt.md)
+
+## Repo Variables Available
+- {{{{repo_url}}}} → {repo_url}
+- {{{{repo_name}}}} → {repo_name}
+- {{{{clone_path}}}} →
+- {{{{repo_directory}}}} →
+- {{{{solutions_json}}}} →
+- {{{{readme_content}}}} →
+- {{{{readme_filename}}}} →
+- {{{{commands_extracted}}}} →
+- {{{{executed_commands}}}} →
+- {{{{skipped_commands}}}} →
+
+## For Agents Resuming Work
+Follow these rules *exactly* when resuming execution:
+
+1. Identify the **first `[ ]` task** in the checklist.
+2. [MANDATORY] tasks must be completed in numbered order (1 → 2 → 3 → 4 → 5 → 6)
+3. Execute its corresponding prompt file (from `@task-...`).
+4. After successful completion, update this checklist and mark `[x]`.
+5. Do **not** end the run until all required tasks are completed.
+
+## Execution Notes
+- [SCRIPTABLE] tasks: clone, search-readme, find-solutions, generate-solution-task-checklists
+- [NON-SCRIPTABLE] tasks: scan-readme, execute-readme
+- Mark completed tasks with [x]
+- Each referenced `@task-*` file is an independent prompt that must be executed completely before continuing.
+"""
+
+SOLUTION_CHECKLIST_TEMPLATE = """# Solution Checklist: {solution_name}
+Repository: {repo_url}
+Generated: {timestamp}
+
+## Solution: {solution_name}
+
+### Solution Tasks
+- [ ] (1) [MANDATORY] [SCRIPTABLE] Restore NuGet packages → @task-restore-solution (see details in #file: .github/prompts/task-restore-solution.prompt.md)
+- [ ] (2) [MANDATORY] [SCRIPTABLE] Build solution (Clean + Build) → @task-build-solution (see details in #file: .github/prompts/task-build-solution.prompt.md)
+- [ ] (3) [MANDATORY] [SCRIPTABLE] Validate build artifacts  → @task-validate-build-artifacts (see details in #file: .github/prompts/task-validate-build-artifacts.prompt.md)
+- [ ] (4) [MANDATORY] [SCRIPTABLE] Dotnet Build solution → @task-dotnet-build-solution (see details in #file: .github/prompts/task-dotnet-build-solution.prompt.md)
+- [ ] (5) [MANDATORY] [NON-SCRIPTABLE] Search knowledge base for error fix → @task-search-knowledge-base (see details in #file: .github/prompts/task-search-knowledge-base.prompt.md)
+- [ ] (6) [MANDATORY] [NON-SCRIPTABLE] Create new knowledge base for error → @task-create-knowledge-base (see details in #file: .github/prompts/task-create-knowledge-base.prompt.md)
+- [ ] (7) [MANDATORY] [NON-SCRIPTABLE] Apply fix from knowledge base → @task-apply-knowledge-base-fix (see details in #file: .github/prompts/task-apply-knowledge-base-fix.prompt.md)
+- [ ] (8) [MANDATORY] [SCRIPTABLE] Build solution (Clean + Build) → @task-build-solution retry (see details in #file: .github/prompts/task-build-solution.prompt.md)
+
+### Solution Variables
+- solution_name: {solution_name}
+- solution_path: {solution_path}
+- parent_repo: {repo_name}
+- restore_status: (blank)
+- build_count: 0
+- build_status: (blank)
+- verify_status: (blank)
+- expected_artifacts: (blank)
+- missing_artifacts: (blank)
+- verified_artifacts: (blank)
+- dotnetbuild_status: (blank)
+
+** Knowledge base **
+- kb_search_status: (blank)
+- kb_file_path: (blank)
+- kb_article_status: (blank)
+- kb_create_status: (blank)
+- last_option_applied: 0
+- fix_status = (blank)
+- fix_applied_attempt_1: (blank)
+- kb_option_applied_attempt_1: (blank)
+- retry_build_status_attempt_1: (blank)
+
+## For Agents Resuming Work
+1. Start at the first unchecked task in order.
+2. Update build status/timestamp variables after each build.
+3. Record any KB article references inline below tasks.
+"""
+
+MASTER_HEADER = """# All Repository Checklist
+Generated: {timestamp}
+
+## Repositories
+"""
+
+MASTER_LINE_PATTERN = re.compile(r"^- \[( |x)\] (\S+) \[(.*)\]$")
+UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+RepoEntry = Tuple[str, str]  # (repo_name, repo_url)
+
+
+def _utc_now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _atomic_write(path: str, text: str) -> None:
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _without_generated(text: str) -> List[str]:
+    return [line.rstrip() for line in text.splitlines() if not line.startswith('Generated:')]
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    """Atomically write ``text`` unless ``path`` already holds it (ignoring `Generated:`); True if written."""
+    existing = _read(path)
+    if existing is not None and _without_generated(existing) == _without_generated(text):
+        return False
+    _atomic_write(path, text)
+    return True
+
+
+def repo_name_from_url(url: str) -> str:
+    """Friendly repo name: the segment after `/_git/`, else the last path segment, without `.git`."""
+    url = url.strip().rstrip('/')
+    if '/_git/' in url:
+        url = url.split('/_git/', 1)[1].strip('/')
+    name = url.rsplit('/', 1)[-1]
+    return name[:-4] if name.lower().endswith('.git') else name
+
+
+def sanitize_name(name: str) -> str:
+    return UNSAFE_NAME_CHARS.sub('_', name)
+
+
+def resolve_input_file(input_file: str) -> Optional[str]:
+    """Locate a repository list as given, under the repo root, or under .github/prompts."""
+    candidates = [input_file]
+    if not os.path.isabs(input_file):
+        candidates += [os.path.join(REPO_ROOT, input_file), os.path.join(PROMPTS_DIR, input_file)]
+    return next((c for c in candidates if os.path.isfile(c)), None)
+
+
+def read_repository_list(path: str) -> Tuple[List[RepoEntry], List[str]]:
+    """Return (sorted unique (repo_name, repo_url) entries, ignored non-HTTPS lines)."""
+    entries: Dict[str, RepoEntry] = {}
+    ignored: List[str] = []
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith('#'):
+                continue
+            if not line.lower().startswith('https://'):
+                ignored.append(line)
+                continue
+            url = line.rstrip('/')
+            entries.setdefault(url.lower(), (repo_name_from_url(url), url))
+    unique: Dict[str, RepoEntry] = {}
+    for name, url in sorted(entries.values(), key=lambda e: (e[0].lower(), e[1].lower())):
+        unique.setdefault(name.lower(), (name, url))
+    return list(unique.values()), ignored
+
+
+def _purge_directory(directory: str, keep: Iterable[str] = ()) -> List[str]:
+    """Remove every entry of ``directory`` except the names in ``keep``; returns the removed names."""
+    keep = set(keep)
+    removed = []
+    for name in sorted(os.listdir(directory)):
+        if name in keep:
+            continue
+        path = os.path.join(directory, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        removed.append(name)
+    return removed
+
+
+def render_repo_checklist(repo_name: str, repo_url: str, timestamp: str) -> str:
+    return REPO_CHECKLIST_TEMPLATE.format(repo_name=repo_name, repo_url=repo_url, timestamp=timestamp)
+
+
+def render_solution_checklist(solution_name: str, solution_path: str, repo_name: str, repo_url: str, timestamp: str) -> str:
+    return SOLUTION_CHECKLIST_TEMPLATE.format(
+        solution_name=solution_name, solution_path=solution_path,
+        repo_name=repo_name, repo_url=repo_url or '<unknown>', timestamp=timestamp,
+    )
+
+
+def _validate_repo_checklist(text: str) -> Optional[str]:
+    """Post-write checks of Step 5/6; returns a problem description or None."""
+    if text.count('# Task Checklist:') != 1 or text.count(REPO_VARIABLES_HEADER) != 1:
+        return 'heading count mismatch'
+    tasks = [line for line in text.splitlines() if line.startswith('- [') and '@task-' in line]
+    if len(tasks) != len(set(tasks)):
+        return 'duplicated task lines'
+    for name in ('repo_url', 'repo_name'):
+        if sum(line.startswith(f"- {{{{{name}}}}} →") for line in text.splitlines()) != 1:
+            return f"variable {name} not present exactly once"
+    return None
+
+
+def _read_master(path: str) -> List[Tuple[str, str, str]]:
+    """(state, repo_name, repo_url) for each repository line of the master checklist."""
+    text = _read(path) or ''
+    return [m.groups() for m in map(MASTER_LINE_PATTERN.match, text.splitlines()) if m]
+
+
+def _render_master(lines: List[Tuple[str, str, str]], timestamp: str) -> str:
+    body = ''.join(f"- [{state}] {name} [{url}]\n" for state, name, url in lines)
+    return MASTER_HEADER.format(timestamp=timestamp) + body
+
+
+def _append_master(path: str, new_entries: List[RepoEntry], new_urls: Dict[str, str], timestamp: str) -> str:
+    """Existing master text with new repo lines after the last repo line, URLs of the repos
+    in ``new_urls`` replaced (checkbox state kept) and Generated refreshed."""
+    lines = (_read(path) or '').splitlines()
+    last = 0
+    for idx, line in enumerate(lines):
+        match = MASTER_LINE_PATTERN.match(line)
+        if match:
+            state, name, url = match.groups()
+            lines[idx] = f"- [{state}] {name} [{new_urls.get(name, url)}]"
+            last = idx
+    lines[last + 1:last + 1] = [f"- [ ] {name} [{url}]" for name, url in new_entries]
+    lines = [f"Generated: {timestamp}" if line.startswith('Generated:') else line.rstrip() for line in lines]
+    return '\n'.join(lines).rstrip('\n') + '\n'
+
+
+def generate_repo_checklists(
+    input_file: str = 'repositories.txt',
+    *,
+    append: bool = False,
+    tasks_dir: str = TASKS_DIR,
+    output_dir: str = OUTPUT_DIR,
+    temp_script_dir: str = TEMP_SCRIPT_DIR,
+) -> Dict:
+    """Steps 1-7 of task-generate-repo-task-checklists; returns the output contract.
+
+    Never raises for bad input: problems are collected in verification_errors and the
+    contract JSON is always written to output/{mode}_task5_generate-repo-checklists.json.
+    Reset mode empties ``output_dir`` and ``temp_script_dir``, so callers must not hold
+    files open there across this call.
+    """
+    mode = 'append' if append else 'reset'
+    timestamp = _utc_now()
+    errors: List[Dict[str, str]] = []
+    for directory in (tasks_dir, output_dir, temp_script_dir):
+        os.makedirs(directory, exist_ok=True)
+    master_path = os.path.join(tasks_dir, MASTER_CHECKLIST)
+
+    entries: List[RepoEntry] = []
+    ignored: List[str] = []
+    resolved = resolve_input_file(input_file)
+    if resolved is None:
+        errors.append({'type': 'MissingInput', 'target': input_file, 'detail': 'input file not found'})
+    else:
+        entries, ignored = read_repository_list(resolved)
+
+    removed: List[str] = []
+    if not append:
+        # Step 1 reset. Listed repo checklists and the master stay in place so that
+        # write_if_changed leaves identical ones untouched; everything else goes.
+        keep = {f"{name}_repo_checklist.md" for name, _url in entries} | {MASTER_CHECKLIST}
+        for directory, kept in ((tasks_dir, keep), (output_dir, ()), (temp_script_dir, ())):
+            try:
+                purged = _purge_directory(directory, kept)
+            except OSError as err:
+                errors.append({'type': 'ResetFailed', 'target': directory, 'detail': str(err)})
+                continue
+            if directory == tasks_dir:
+                removed = purged
+
+    existing_master = _read_master(master_path) if append else []
+    known = {name.lower(): url for _state, name, url in existing_master}
+    to_process = [e for e in entries if e[0].lower() not in known] if append else list(entries)
+    # Append mode refreshes listed repositories whose URL changed since they were generated.
+    changed = [(n, u) for n, u in entries if n.lower() in known and known[n.lower()] != u] if append else []
+    to_process += changed
+
+    written, unchanged, generated_paths = [], [], []
+    for name, url in to_process:
+        path = os.path.join(tasks_dir, f"{name}_repo_checklist.md")
+        if append and (name, url) not in changed and os.path.isfile(path):
+            unchanged.append(name)
+            generated_paths.append(os.path.relpath(path, REPO_ROOT).replace('\\', '/'))
+            continue
+        text = render_repo_checklist(name, url, timestamp)
+        problem = _validate_repo_checklist(text)
+        if problem:
+            errors.append({'type': 'InvalidChecklist', 'target': path, 'detail': problem})
+            continue
+        try:
+            (written if write_if_changed(path, text) else unchanged).append(name)
+        except OSError as err:
+            errors.append({'type': 'WriteFailed', 'target': path, 'detail': str(err)})
+            continue
+        generated_paths.append(os.path.relpath(path, REPO_ROOT).replace('\\', '/'))
+
+    if append and existing_master:
+        new_entries = [e for e in to_process if e[0].lower() not in known]
+        if new_entries or changed:
+            _atomic_write(master_path, _append_master(master_path, new_entries, dict(changed), timestamp))
+    else:
+        write_if_changed(master_path, _render_master([(' ', n, u) for n, u in entries], timestamp))
+
+    contract = {
+        'input_file': input_file,
+        'append_mode': append,
+        'repositories_total': len(entries),
+        'repositories_processed': len(to_process),
+        'repositories_skipped': len(entries) - len(to_process),
+        'repositories_written': len(written),
+        'repositories_unchanged': len(unchanged),
+        'stale_task_files_removed': removed,
+        'ignored_input_lines': ignored,
+        'generated_checklist_paths': generated_paths,
+        'master_checklist_path': os.path.relpath(master_path, REPO_ROOT).replace('\\', '/'),
+        'status': 'FAIL' if errors else 'SUCCESS',
+        'timestamp': timestamp,
+        'verification_errors': errors,
+        'mode': mode,
+    }
+    _atomic_write(os.path.join(output_dir, f"{mode}_task5_generate-repo-checklists.json"), json.dumps(contract, indent=2) + '\n')
+    print(f"[checklists] {mode}: {len(entries)} repositories, {len(written)} written, "
+          f"{len(unchanged)} unchanged, {len(removed)} removed -> {contract['status']}")
+    return contract
+
+
+def generate_solution_checklists(repo_checklist: str, *, tasks_dir: Optional[str] = None) -> Dict:
+    """Steps 1-3 of task-generate-solution-task-checklists for one repo checklist.
+
+    Reads {{repo_name}}, {{repo_url}}, {{repo_directory}} and {{solutions_json}}, writes
+    tasks/{repo_name}_{solution}_solution_checklist.md for each solution (unchanged files are
+    left alone) and returns {repo_name, repo_directory, solutions_total, checklist_paths,
+    generated_files, skipped_solutions, errors}. Marking the repo task and writing the
+    output JSON are left to the caller.
+    """
+    values = ChecklistDocument.from_file(repo_checklist).variables([REPO_VARIABLES_HEADER])
+    repo_name = values.get('repo_name', '').strip()
+    repo_url = values.get('repo_url', '').strip()
+    repo_directory = values.get('repo_directory', '').strip()
+    solutions_json = values.get('solutions_json', '').strip()
+    tasks_dir = tasks_dir or os.path.dirname(os.path.abspath(repo_checklist))
+    result = {
+        'repo_name': repo_name,
+        'repo_directory': repo_directory,
+        'solutions_total': 0,
+        'checklist_paths': [],
+        'generated_files': [],
+        'skipped_solutions': [],
+        'errors': [],
+    }
+    missing = [name for name in ('repo_name', 'repo_directory', 'solutions_json') if not values.get(name, '').strip()]
+    if missing:
+        result['errors'].append(f"blank variables: {', '.join(missing)}")
+        return result
+    json_path = solutions_json if os.path.isabs(solutions_json) else os.path.join(REPO_ROOT, solutions_json)
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            solutions = json.load(f).get('solutions') or []
+    except (OSError, ValueError, AttributeError) as err:
+        result['errors'].append(f"cannot load {solutions_json}: {err}")
+        return result
+    timestamp = _utc_now()
+    result['solutions_total'] = len(solutions)
+    for solution_path in solutions:
+        base = os.path.basename(str(solution_path).replace('\\', '/'))
+        solution_name = base[:-4] if base.lower().endswith('.sln') else base
+        path = os.path.join(tasks_dir, f"{repo_name}_{sanitize_name(solution_name)}_solution_checklist.md")
+        try:
+            if write_if_changed(path, render_solution_checklist(solution_name, solution_path, repo_name, repo_url, timestamp)):
+                result['generated_files'].append(os.path.basename(path))
+        except OSError as err:
+            result['skipped_solutions'].append(solution_name)
+            result['errors'].append(f"{path}: {err}")
+            continue
+        result['checklist_paths'].append(os.path.relpath(path, REPO_ROOT).replace('\\', '/'))
+    return result
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Render repository and solution checklists from their canonical templates.')
+    sub = p.add_subparsers(dest='command', required=True)
+    repos = sub.add_parser('repos', help='Generate repo checklists and the master checklist from a repository list.')
+    repos.add_argument('--input', default='repositories.txt', help='Repository list (default repositories.txt; .github/prompts is searched too).')
+    repos.add_argument('--append', action='store_true', help='Keep existing checklists; only add new or changed repositories.')
+    solutions = sub.add_parser('solutions', help='Generate solution checklists for repo checklists with {{solutions_json}} set.')
+    solutions.add_argument('checklists', nargs='+', help='Repo checklist paths.')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.command == 'repos':
+        contract = generate_repo_checklists(args.input, append=args.append)
+        print(json.dumps(contract, indent=2))
+        return 0 if contract['status'] == 'SUCCESS' else 1
+    results = [generate_solution_checklists(path) for path in args.checklists]
+    print(json.dumps(results, indent=2))
+    return 0 if not any(r['errors'] for r in results) else 1
+
+
+__all__ = [
+    'generate_repo_checklists',
+    'generate_solution_checklists',
+    'read_repository_list',
+    'repo_name_from_url',
+    'sanitize_name',
+    'render_repo_checklist',
+    'render_solution_checklist',
+    'write_if_changed',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
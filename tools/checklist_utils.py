@@ -1,32 +1,189 @@
 #!/usr/bin/env python3
-"""Shared helpers for checklist readiness utilities."""
+"""Shared helpers for checklist readiness utilities.
+
+ChecklistDocument parses a checklist once into an index of sections (with line offsets);
+task and variable lookups are then served from that index and memoized per document.
+load_checklist() returns documents from a process-wide cache keyed on
+(path, mtime, size), so repeated readiness checks of unchanged files do not reread or
+reparse them. The line-based helpers below are kept for callers holding raw lines.
+"""
 from __future__ import annotations
-import re
+import os, re, threading
+from collections import OrderedDict
 from typing import Iterable, List, Optional, Sequence, Tuple, Dict, Callable
 
 _SECTION_PREFIXES = ("## ", "### ")
 _VAR_ARROW_PATTERN = re.compile(r"^- \{(?:\{)?([a-zA-Z0-9_]+)\}(?:\})? *(?:→|->) *(.*)$")
 _VAR_COLON_PATTERN = re.compile(r"^- *([a-zA-Z0-9_]+)\s*[:=]\s*(.*)$")
 _BLANK_VALUE_MARKERS = {'', '(blank)', 'blank', 'n/a', 'na', '(none)'}
+_ANY_TASK_PATTERN = re.compile(r"^- \[(x| )\].*?@([a-zA-Z0-9\-]+)")
+_DOCUMENT_CACHE_SIZE = 4096
+
+# (line_index, done, task_name)
+TaskEntry = Tuple[int, bool, str]
+# (line_index, name, value)
+VariableEntry = Tuple[int, str, str]
+
+
+class ChecklistDocument:
+    """Checklist parsed once into a section index with memoized task/variable lookups.
+
+    Attributes:
+        path: Source file path (None for documents built from raw lines).
+        lines: Tuple of lines without trailing newlines.
+        sections: List of (header_lowercase, header_line_index, end_line_index) in file order;
+            a section's content is lines[header_line_index + 1:end_line_index].
+    """
+
+    def __init__(self, lines: Sequence[str], path: Optional[str] = None):
+        self.path = path
+        self.lines: Tuple[str, ...] = tuple(lines)
+        self.sections: List[Tuple[str, int, int]] = []
+        headers: List[Tuple[str, int]] = []
+        for idx, line in enumerate(self.lines):
+            stripped = line.strip()
+            if stripped.startswith(_SECTION_PREFIXES):
+                headers.append((stripped.lower(), idx))
+        for pos, (header, idx) in enumerate(headers):
+            end = headers[pos + 1][1] if pos + 1 < len(headers) else len(self.lines)
+            self.sections.append((header, idx, end))
+        self._memo: Dict[tuple, object] = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ChecklistDocument':
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return cls([l.rstrip('\n') for l in f], path=path)
+
+    def _memoized(self, key: tuple, compute: Callable[[], object]):
+        with self._memo_lock:
+            if key in self._memo:
+                return self._memo[key]
+        value = compute()
+        with self._memo_lock:
+            self._memo.setdefault(key, value)
+            return self._memo[key]
+
+    def section_line_indexes(self, headers: Iterable[str]) -> List[int]:
+        """Line indexes of the first section matching any header prefix (same rules as collect_section_lines)."""
+        header_variants = tuple(h.lower() for h in headers)
+
+        def compute() -> List[int]:
+            indexes: List[int] = []
+            in_section = False
+            for header, start, end in self.sections:
+                if header.startswith(header_variants):
+                    in_section = True
+                    indexes.extend(range(start + 1, end))
+                elif in_section:
+                    break
+            return indexes
+
+        return self._memoized(('section', header_variants), compute)
+
+    def section_lines(self, headers: Iterable[str]) -> List[str]:
+        return [self.lines[i] for i in self.section_line_indexes(headers)]
+
+    def task_entries(self, headers: Optional[Iterable[str]], pattern: re.Pattern[str]) -> List[TaskEntry]:
+        """All (line_index, done, task_name) matches of ``pattern`` in a section (or whole file when headers is None)."""
+        header_key = tuple(h.lower() for h in headers) if headers is not None else None
+
+        def compute() -> List[TaskEntry]:
+            indexes = self.section_line_indexes(header_key) if header_key is not None else range(len(self.lines))
+            entries: List[TaskEntry] = []
+            for idx in indexes:
+                match = pattern.match(self.lines[idx].strip())
+                if match:
+                    done_flag, task_name = match.groups()
+                    entries.append((idx, done_flag == 'x', task_name))
+            return entries
+
+        return self._memoized(('tasks', header_key, pattern.pattern), compute)
+
+    def tasks(
+        self,
+        headers: Iterable[str],
+        mandatory_pattern: re.Pattern[str],
+        *,
+        normalize: Optional[Callable[[str], str]] = None,
+        relaxed_pattern: Optional[re.Pattern[str]] = None,
+    ) -> Dict[str, bool]:
+        """Same contract as extract_tasks, served from the document index."""
+        headers = tuple(headers)
+        entries = self.task_entries(headers, mandatory_pattern)
+        if not entries and relaxed_pattern:
+            entries = self.task_entries(headers, relaxed_pattern)
+        tasks: Dict[str, bool] = {}
+        for _idx, done, task_name in entries:
+            key = normalize(task_name) if normalize else task_name
+            if key not in tasks:
+                tasks[key] = done
+        return tasks
+
+    def task_states(self) -> Dict[str, bool]:
+        """{task_handle: done} for every checkbox line referencing an @task in the file."""
+        states: Dict[str, bool] = {}
+        for _idx, done, task_name in self.task_entries(None, _ANY_TASK_PATTERN):
+            states.setdefault(task_name, done)
+        return states
+
+    def variable_entries(self, headers: Iterable[str]) -> List[VariableEntry]:
+        header_key = tuple(h.lower() for h in headers)
+
+        def compute() -> List[VariableEntry]:
+            entries: List[VariableEntry] = []
+            for idx in self.section_line_indexes(header_key):
+                parsed = parse_variable_line(self.lines[idx])
+                if parsed:
+                    entries.append((idx, parsed[0], parsed[1].strip()))
+            return entries
+
+        return self._memoized(('vars', header_key), compute)
+
+    def variables(self, headers: Iterable[str]) -> Dict[str, str]:
+        """Same contract as extract_variables, served from the document index."""
+        values: Dict[str, str] = {}
+        for _idx, name, value in self.variable_entries(headers):
+            values.setdefault(name, value)
+        return values
+
+
+_document_cache: "OrderedDict[str, Tuple[int, int, ChecklistDocument]]" = OrderedDict()
+_document_cache_lock = threading.Lock()
+
+
+def load_checklist(path: str) -> Optional[ChecklistDocument]:
+    """Return a parsed ChecklistDocument for ``path`` (None if missing), cached on (path, mtime, size)."""
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        return None
+    with _document_cache_lock:
+        cached = _document_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            _document_cache.move_to_end(key)
+            return cached[2]
+    try:
+        doc = ChecklistDocument.from_file(key)
+    except OSError:
+        return None
+    with _document_cache_lock:
+        _document_cache[key] = (st.st_mtime_ns, st.st_size, doc)
+        _document_cache.move_to_end(key)
+        while len(_document_cache) > _DOCUMENT_CACHE_SIZE:
+            _document_cache.popitem(last=False)
+    return doc
+
+
+def clear_checklist_cache() -> None:
+    with _document_cache_lock:
+        _document_cache.clear()
 
 
 def collect_section_lines(lines: Sequence[str], headers: Iterable[str]) -> List[str]:
     """Collect lines belonging to the first section whose header matches any provided prefix."""
-    header_variants = tuple(h.lower() for h in headers)
-    content: List[str] = []
-    in_section = False
-    for line in lines:
-        stripped = line.strip()
-        if any(stripped.startswith(prefix) for prefix in _SECTION_PREFIXES):
-            lower = stripped.lower()
-            if any(lower.startswith(h) for h in header_variants):
-                in_section = True
-                continue
-            if in_section:
-                break
-        elif in_section:
-            content.append(line)
-    return content
+    return ChecklistDocument(lines).section_lines(headers)
 
 
 def parse_variable_line(line: str) -> Optional[Tuple[str, str]]:
@@ -63,38 +220,29 @@ def extract_tasks(
     relaxed_pattern: Optional[re.Pattern[str]] = None,
 ) -> Dict[str, bool]:
     """Extract mandatory tasks from the specified section using provided patterns."""
-    section = collect_section_lines(lines, headers)
-    tasks: Dict[str, bool] = {}
-    for line in section:
-        match = mandatory_pattern.match(line.strip())
-        if match:
-            done_flag, task_name = match.groups()
-            key = normalize(task_name) if normalize else task_name
-            if key not in tasks:
-                tasks[key] = (done_flag == 'x')
+    return ChecklistDocument(lines).tasks(
+        headers,
+        mandatory_pattern,
+        normalize=normalize,
+        relaxed_pattern=relaxed_pattern,
+    )
+
+
+def read_task_states(checklist_path: str) -> Dict[str, bool]:
+    """Return {task_handle: done} for every `- [ ] ... @task` line in a checklist file (empty if missing)."""
+    doc = load_checklist(checklist_path)
+    return doc.task_states() if doc else {}
+
 
-    if not tasks and relaxed_pattern:
-        for line in section:
-            match = relaxed_pattern.match(line.strip())
-            if match:
-                done_flag, task_name = match.groups()
-                key = normalize(task_name) if normalize else task_name
-                if key not in tasks:
-                    tasks[key] = (done_flag == 'x')
-    return tasks
+def task_key(name: str) -> str:
+    """Normalize a prompt or @task handle for matching (`task-foo` and `foo` are equivalent)."""
+    name = name.strip().lstrip('@/').lower()
+    return name[len('task-'):] if name.startswith('task-') else name
 
 
 def extract_variables(lines: Sequence[str], headers: Iterable[str]) -> Dict[str, str]:
     """Return a mapping of variable names to their recorded values from the given sections."""
-    section = collect_section_lines(lines, headers)
-    values: Dict[str, str] = {}
-    for line in section:
-        parsed = parse_variable_line(line)
-        if parsed:
-            name, value = parsed
-            if name not in values:
-                values[name] = value.strip()
-    return values
+    return ChecklistDocument(lines).variables(headers)
 
 
 def classify_variables(
@@ -117,10 +265,15 @@ def classify_variables(
 
 
 __all__ = [
+    'ChecklistDocument',
+    'load_checklist',
+    'clear_checklist_cache',
     'collect_section_lines',
     'parse_variable_line',
     'is_blank_value',
     'extract_tasks',
     'extract_variables',
     'classify_variables',
+    'read_task_states',
+    'task_key',
 ]
@@ -3,7 +3,8 @@
 Copilot Command Executor
 
 This module provides utilities for executing GitHub Copilot commands via subprocess.
-All command output is logged to a specified log file for debugging and audit purposes.
+All command output is streamed line-by-line to a specified log file for debugging and
+audit purposes; callers receive bounded head/tail excerpts of stdout/stderr.
 
 Usage:
     from copilot_executor import CopilotExecutor
@@ -13,33 +14,321 @@ Usage:
         prompt_name='task-clone-repo',
         params={'repo_url': 'https://github.com/...', 'clone_dir': './repos'}
     )
+
+    # Asyncio variant (shares a per-event-loop concurrency semaphore):
+    exit_code, stdout, stderr = await executor.execute_prompt_async('task-clone-repo', {...})
+
+Timeouts: each prompt's hard timeout and output-inactivity (idle) timeout come from a
+TimeoutPolicy (see timeout_policy.py; set process-wide with set_timeout_policy). Commands
+run in their own process group / session so that a timeout or idle-watchdog trip kills
+the whole process tree (copilot and anything it spawned), not just the shell.
+
+Memoization: with a PromptMemo (see prompt_memo.py; set process-wide with set_prompt_memo),
+execute_prompt* answers a call identical to a previous successful one by replaying its
+recorded file mutations instead of launching copilot; last_metrics['memo'] is HIT or MISS.
+
+Rate limiting: with a RateLimiter (see rate_limiter.py; set process-wide with set_rate_limiter),
+every launch is admitted by a token bucket and an adaptive (AIMD) concurrency limit, and
+throttled calls are retried after a backoff instead of being reported as task failures.
 """
 
+import asyncio
+import codecs
+import collections
 import datetime
 import os
-import re
+import signal
 import subprocess
+import sys
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Tuple, Dict, Optional
+from types import SimpleNamespace
+from typing import Deque, List, Tuple, Dict, Optional
+
+try:
+    import resource  # POSIX only; child CPU/RSS metrics are omitted elsewhere
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from log_sink import LogSink
+from prompt_memo import PromptMemo, memo_result
+from prompt_registry import get_registry
+from rate_limiter import FAILED, THROTTLED, RateLimiter, classify_result
+from timeout_policy import TimeoutPolicy
 
 # Default model constant injected per user request
 MODEL = "gpt-5.1-codex"
 
+# Default timeout applied to a copilot invocation (seconds); per-prompt values come from the TimeoutPolicy
+COMMAND_TIMEOUT = 1800
+
+# How often the timeout/idle watchdog checks a running command (seconds, upper bound)
+WATCHDOG_POLL_SECONDS = 1.0
+
+# Maximum number of copilot subprocesses in flight per event loop for the async API
+DEFAULT_ASYNC_CONCURRENCY = 8
+
+# Bounded in-memory excerpt retained per stream (full output only goes to the log file)
+EXCERPT_HEAD_CHARS = 4000
+EXCERPT_TAIL_LINES = 200
+EXCERPT_MAX_LINE_CHARS = 2000
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+_async_limit = DEFAULT_ASYNC_CONCURRENCY
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+_timeout_policy = TimeoutPolicy(COMMAND_TIMEOUT)
+
+
+def set_timeout_policy(policy: TimeoutPolicy) -> None:
+    """Set the process-wide timeout policy used by executors without an explicit policy."""
+    global _timeout_policy
+    _timeout_policy = policy
+
+
+def get_timeout_policy() -> TimeoutPolicy:
+    return _timeout_policy
+
+
+_prompt_memo: Optional[PromptMemo] = None
+
+
+def set_prompt_memo(memo: Optional[PromptMemo]) -> None:
+    """Set the process-wide prompt memo used by executors without an explicit memo (None disables)."""
+    global _prompt_memo
+    _prompt_memo = memo
+
+
+def get_prompt_memo() -> Optional[PromptMemo]:
+    return _prompt_memo
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Set the process-wide rate limiter applied to every copilot launch (None disables)."""
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    return _rate_limiter
+
+
+def _process_group_kwargs() -> Dict[str, object]:
+    """Popen/create_subprocess kwargs that start the command in its own process group."""
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def _kill_process_tree(pid: int) -> None:
+    """Kill a command started with _process_group_kwargs() together with all of its descendants."""
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _watchdog_interval(timeout: float, idle_timeout: Optional[float]) -> float:
+    return min(WATCHDOG_POLL_SECONDS, timeout / 4, (idle_timeout or timeout) / 4)
+
+
+class _Activity:
+    """Monotonic timestamp of the last output seen from a command (either stream)."""
+
+    def __init__(self):
+        self.last = time.monotonic()
+
+    def touch(self):
+        self.last = time.monotonic()
+
+    def check(self, started: float, timeout: float, idle_timeout: Optional[float]) -> Optional[str]:
+        """Return 'timeout' or 'idle' when a limit has been exceeded, else None."""
+        now = time.monotonic()
+        if now - started >= timeout:
+            return 'timeout'
+        if idle_timeout and now - self.last >= idle_timeout:
+            return 'idle'
+        return None
+
+
+def set_async_concurrency(limit: int) -> None:
+    """Set the shared limit of concurrent async copilot subprocesses (applies to new event loops)."""
+    global _async_limit
+    if limit < 1:
+        raise ValueError("async concurrency limit must be >= 1")
+    _async_limit = limit
+    _async_semaphores.clear()
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore shared by all executors running on the current event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_async_limit)
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+def _rss_kb(maxrss: int) -> int:
+    """Normalize ru_maxrss to kilobytes (macOS reports bytes, Linux kilobytes)."""
+    return maxrss // 1024 if sys.platform == 'darwin' else maxrss
+
+
+def _children_usage():
+    return resource.getrusage(resource.RUSAGE_CHILDREN) if resource is not None else None
+
+
+def _usage_delta(before):
+    """Reaped-children CPU usage accumulated since ``before`` (max RSS is the lifetime peak)."""
+    if before is None:
+        return None
+    after = _children_usage()
+    return SimpleNamespace(
+        ru_utime=after.ru_utime - before.ru_utime,
+        ru_stime=after.ru_stime - before.ru_stime,
+        ru_maxrss=after.ru_maxrss,
+    )
+
+
+def command_metrics(
+    queued: float,
+    started: float,
+    finished: float,
+    usage,
+    stdout: 'OutputExcerpt',
+    stderr: 'OutputExcerpt',
+    *,
+    rusage_scope: Optional[str],
+) -> Dict[str, object]:
+    """Build the per-command metrics dictionary stored in CopilotExecutor.last_metrics."""
+    return {
+        'wall_seconds': round(finished - started, 3),
+        'queue_wait_seconds': round(started - queued, 3),
+        'cpu_user_seconds': round(usage.ru_utime, 3) if usage is not None else None,
+        'cpu_system_seconds': round(usage.ru_stime, 3) if usage is not None else None,
+        'max_rss_kb': _rss_kb(usage.ru_maxrss) if usage is not None else None,
+        'stdout_bytes': stdout.total_bytes,
+        'stderr_bytes': stderr.total_bytes,
+        'rusage_scope': rusage_scope,
+    }
+
+
+class OutputExcerpt:
+    """Bounded head/tail capture of a line stream.
+
+    Keeps the first ``head_chars`` characters and the last ``tail_lines`` lines (each
+    clipped to EXCERPT_MAX_LINE_CHARS); everything in between is only counted. Memory
+    use is therefore flat regardless of output size.
+    """
+
+    def __init__(self, head_chars: int = EXCERPT_HEAD_CHARS, tail_lines: int = EXCERPT_TAIL_LINES):
+        self.head_chars = head_chars
+        self._head: List[str] = []
+        self._head_size = 0
+        self._tail: Deque[str] = collections.deque(maxlen=tail_lines)
+        self.total_lines = 0
+        self.total_chars = 0
+        self.total_bytes = 0
+        self._omitted_lines = 0
+
+    def append(self, line: str, nbytes: Optional[int] = None):
+        self.total_lines += 1
+        self.total_chars += len(line)
+        self.total_bytes += nbytes if nbytes is not None else len(line.encode('utf-8', errors='ignore'))
+        if self._head_size < self.head_chars:
+            room = self.head_chars - self._head_size
+            self._head.append(line[:room])
+            self._head_size += min(len(line), room)
+            if len(line) <= room:
+                return
+            line = line[room:]
+        if len(line) > EXCERPT_MAX_LINE_CHARS:
+            line = line[:EXCERPT_MAX_LINE_CHARS] + ' ...[line truncated]\n'
+        if len(self._tail) == self._tail.maxlen:
+            self._omitted_lines += 1
+        self._tail.append(line)
+
+    def text(self) -> str:
+        """Return head + tail, with a marker when lines in between were dropped."""
+        head = ''.join(self._head)
+        tail = ''.join(self._tail)
+        if self._omitted_lines:
+            return f"{head}\n... [{self._omitted_lines} lines omitted] ...\n{tail}"
+        return head + tail
+
 
 class CopilotExecutor:
     """Executor for GitHub Copilot commands with logging support."""
     
-    def __init__(self, log_file: str = './copilot_executor.log', debug: bool = False):
+    def __init__(
+        self,
+        log_file: str = './copilot_executor.log',
+        debug: bool = False,
+        timeout_policy: Optional[TimeoutPolicy] = None,
+        prompt_memo: Optional[PromptMemo] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         """
         Initialize the Copilot executor.
         
         Args:
             log_file: Path to the log file where all command output will be written
             debug: If True, print debug messages to console
+            timeout_policy: Per-prompt hard/idle timeouts (default: the process-wide policy)
+            prompt_memo: Memo of successful prompt calls (default: the process-wide memo, if any)
+            rate_limiter: Admission control for copilot launches (default: the process-wide limiter, if any)
         """
         self.log_file = Path(log_file)
         self.debug = debug
-        self.prompts_root = Path('.github/prompts')
+        self.registry = get_registry()
+        self.prompts_root = Path(self.registry.prompts_dir)
+        self._sink: Optional[LogSink] = None
+        # Metrics of the most recent execute_command* call (see command_metrics)
+        self.last_metrics: Optional[Dict[str, object]] = None
+        self._timeout_policy = timeout_policy
+        self._prompt_memo = prompt_memo
+        self._rate_limiter = rate_limiter
+
+    @property
+    def timeout_policy(self) -> TimeoutPolicy:
+        return self._timeout_policy or _timeout_policy
+
+    @property
+    def prompt_memo(self) -> Optional[PromptMemo]:
+        return self._prompt_memo or _prompt_memo
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._rate_limiter or _rate_limiter
+
+    def __enter__(self) -> 'CopilotExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def sink(self) -> LogSink:
+        """Buffered log sink for this executor's log file (shared with other executors on the same path)."""
+        if self._sink is None:
+            self._sink = LogSink.shared(str(self.log_file))
+        return self._sink
+
+    def close(self):
+        """Flush and release the log sink."""
+        if self._sink is not None:
+            self._sink.release()
+            self._sink = None
         
     def _debug_print(self, message: str):
         """Print debug message if debug mode is enabled."""
@@ -47,71 +336,344 @@ class CopilotExecutor:
             print(f"[debug][copilot-executor] {message}")
     
     def _log_to_file(self, message: str):
-        """Append message to log file."""
-        with open(self.log_file, 'a', encoding='utf-8') as log:
-            log.write(message)
+        """Append message to the buffered log sink."""
+        self.sink.write(message)
     
-    def execute_command(self, command: str) -> Tuple[int, str, str]:
-        """
-        Execute a raw copilot command using subprocess.
-        Logs all output to the configured log file.
-        
-        Args:
-            command: The full command string to execute
-            
-        Returns:
-            Tuple of (exit_code, stdout, stderr)
-        """
-        self._debug_print(f"executing: {command}")
-        
-        # Log command to file
+    def _log_command_start(self, command: str):
+        """Write the command banner that precedes every execution in the log."""
         timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
         self._log_to_file(f"\n{'='*80}\n")
         self._log_to_file(f"[{timestamp}] Executing command:\n")
         self._log_to_file(f"{command}\n")
         self._log_to_file(f"{'='*80}\n\n")
-        
-        # Execute command
-        try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=1800  # 30 minute timeout
-            )
-        except subprocess.TimeoutExpired:
-            self._log_to_file(f"ERROR: Command timed out after 1800 seconds\n\n")
-            self._debug_print("command timed out after 30 minutes")
-            return -1, "", "Command timed out after 1800 seconds"
-        
-        # Log output to file
-        self._log_to_file(f"Exit Code: {result.returncode}\n\n")
 
-        if result.stdout:
-            self._log_to_file("STDOUT:\n")
-            self._log_to_file(result.stdout)
-            self._log_to_file("\n\n")
+    def _log_timeout(self, reason: str, limit: float) -> Tuple[int, str, str]:
+        """Log a command killed by the watchdog ('timeout' or 'idle') and return the result tuple."""
+        if reason == 'idle':
+            message = f"Command produced no output for {limit:g} seconds; process tree killed by idle watchdog"
+        else:
+            message = f"Command timed out after {limit:g} seconds; process tree killed"
+        self._log_to_file(f"ERROR: {message}\n\n")
+        self.sink.flush()
+        print(f"[error][copilot-executor] {message}")
+        return -1, "", message
 
-        if result.stderr:
-            self._log_to_file("STDERR:\n")
-            self._log_to_file(result.stderr)
-            self._log_to_file("\n\n")
+    def _log_stream_line(self, stream_name: str, line: str):
+        """Write one streamed output line to the log (stderr lines are tagged)."""
+        if not line.endswith('\n'):
+            line += '\n'
+        if stream_name == 'stderr':
+            self._log_to_file(f"[stderr] {line}")
+        else:
+            self._log_to_file(line)
 
-        if result.returncode != 0:
+    def _log_command_result(self, returncode: int, stdout: OutputExcerpt, stderr: OutputExcerpt):
+        """Log exit code and output totals after streaming, echoing failures to the console."""
+        self._log_to_file(
+            f"\n--- end of output (stdout: {stdout.total_lines} lines/{stdout.total_bytes} bytes, "
+            f"stderr: {stderr.total_lines} lines/{stderr.total_bytes} bytes) ---\n"
+        )
+        self._log_to_file(f"Exit Code: {returncode}\n\n")
+        self.sink.flush()
+
+        if returncode != 0:
             print(
                 (
                     "[error][copilot-executor] command failed with exit code "
-                    f"{result.returncode}"
+                    f"{returncode}"
                 )
             )
-            if result.stderr:
+            stderr_text = stderr.text()
+            if stderr_text:
                 print("[error][copilot-executor] stderr:")
-                print(result.stderr.strip())
+                print(stderr_text.strip())
+
+    def _pump_stream(self, stream_name: str, pipe, excerpt: OutputExcerpt, activity: _Activity):
+        """Reader-thread body: stream lines from a binary child pipe to the log and excerpt buffer."""
+        try:
+            for raw in iter(pipe.readline, b''):
+                activity.touch()
+                line = raw.decode('utf-8', errors='ignore').replace('\r\n', '\n')
+                self._log_stream_line(stream_name, line)
+                excerpt.append(line, len(raw))
+        finally:
+            pipe.close()
+
+    @staticmethod
+    def _wait_for_exit(process: subprocess.Popen):
+        """Wait for the child and return its resource usage (None where wait4 is unavailable)."""
+        if hasattr(os, 'wait4'):
+            try:
+                _pid, status, usage = os.wait4(process.pid, 0)
+            except ChildProcessError:
+                process.wait()
+                return None
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return usage
+        process.wait()
+        return None
+
+    def _watch_command(self, process: subprocess.Popen, activity: _Activity, started: float,
+                       timeout: float, idle_timeout: Optional[float], done: threading.Event, outcome: List[str]):
+        """Watchdog-thread body: kill the process tree on hard timeout or output inactivity."""
+        interval = _watchdog_interval(timeout, idle_timeout)
+        while not done.wait(interval):
+            reason = activity.check(started, timeout, idle_timeout)
+            if reason:
+                outcome.append(reason)
+                _kill_process_tree(process.pid)
+                return
+
+    def execute_command(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> Tuple[int, str, str]:
+        """
+        Execute a raw copilot command using subprocess.
+
+        With a RateLimiter (see rate_limiter.py; set process-wide with set_rate_limiter)
+        the launch waits for a concurrency slot and a token (reported as queue time), and
+        a call whose stderr reports throttling is retried after a backoff; the retry count
+        is stored in ``self.last_metrics['throttle_retries']``.
+
+        Child stdout/stderr are streamed line-by-line into the configured log file while
+        the command runs (so the log can be tailed live). Only a bounded head/tail
+        excerpt of each stream is kept in memory and returned. Timing, child CPU/RSS and
+        output volume of the call are stored in ``self.last_metrics``.
+
+        A watchdog kills the command's whole process tree when it runs longer than
+        ``timeout`` or produces no output for ``idle_timeout`` seconds (the watch
+        continues until both output pipes close, so descendants that outlive the shell
+        are covered too).
+        
+        Args:
+            command: The full command string to execute
+            timeout: Hard timeout in seconds (default: the policy default)
+            idle_timeout: Output-inactivity limit in seconds (default: the policy idle timeout; None/0 disables)
+            
+        Returns:
+            Tuple of (exit_code, stdout_excerpt, stderr_excerpt)
+        """
+        policy = self.timeout_policy
+        timeout = timeout or policy.timeout_for(None)
+        idle_timeout = idle_timeout if idle_timeout is not None else policy.idle_timeout_for(None)
+        self.last_metrics = None
+        limiter = self.rate_limiter
+        if limiter is None:
+            return self._run_command(command, timeout, idle_timeout, time.perf_counter())
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            ticket = limiter.acquire()
+            try:
+                result = self._run_command(command, timeout, idle_timeout, queued)
+            except BaseException:
+                limiter.release(ticket, FAILED)
+                raise
+            delay = self._settle_rate_limit(limiter, ticket, result, attempt)
+            if delay is None:
+                return result
+            time.sleep(delay)
+            attempt += 1
+
+    def _run_command(self, command: str, timeout: float, idle_timeout: Optional[float], queued: float) -> Tuple[int, str, str]:
+        """Launch one copilot command (see execute_command); ``queued`` is when the call started waiting."""
+        self._debug_print(f"executing: {command} (timeout={timeout:g}s idle_timeout={idle_timeout or 'off'})")
+        self._log_command_start(command)
+        self._log_to_file("--- streamed output (stderr lines prefixed with [stderr]) ---\n")
+
+        stdout_excerpt = OutputExcerpt()
+        stderr_excerpt = OutputExcerpt()
+        activity = _Activity()
+        started = time.perf_counter()
+        started_monotonic = time.monotonic()
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **_process_group_kwargs(),
+        )
+        readers = [
+            threading.Thread(target=self._pump_stream, args=('stdout', process.stdout, stdout_excerpt, activity), daemon=True),
+            threading.Thread(target=self._pump_stream, args=('stderr', process.stderr, stderr_excerpt, activity), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        done = threading.Event()
+        outcome: List[str] = []
+        watchdog = threading.Thread(
+            target=self._watch_command,
+            args=(process, activity, started_monotonic, timeout, idle_timeout, done, outcome),
+            daemon=True,
+        )
+        watchdog.start()
+        try:
+            usage = self._wait_for_exit(process)
+            for reader in readers:
+                reader.join()
+        except BaseException:
+            # Interrupted (e.g. Ctrl+C): the child runs in its own session, so take it down explicitly.
+            _kill_process_tree(process.pid)
+            raise
+        finally:
+            done.set()
+        watchdog.join()
+        self.last_metrics = command_metrics(
+            queued, started, time.perf_counter(), usage, stdout_excerpt, stderr_excerpt,
+            rusage_scope='child' if usage is not None else None,
+        )
+        self.last_metrics['termination'] = outcome[0] if outcome else None
+        if outcome:
+            return self._log_timeout(outcome[0], timeout if outcome[0] == 'timeout' else idle_timeout)
+
+        self._log_command_result(process.returncode, stdout_excerpt, stderr_excerpt)
+        return process.returncode, stdout_excerpt.text(), stderr_excerpt.text()
+
+    async def _pump_stream_async(self, stream_name: str, reader: asyncio.StreamReader, excerpt: OutputExcerpt, activity: _Activity):
+        """Async counterpart of _pump_stream; reads in chunks so long lines never overrun."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        pending = ''
+        while True:
+            chunk = await reader.read(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            activity.touch()
+            excerpt.total_bytes += len(chunk)
+            pending += decoder.decode(chunk).replace('\r\n', '\n')
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                self._log_stream_line(stream_name, line)
+                excerpt.append(line + '\n', 0)
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            self._log_stream_line(stream_name, pending)
+            excerpt.append(pending, 0)
+
+    @staticmethod
+    async def _watch_command_async(activity: _Activity, started: float, timeout: float, idle_timeout: Optional[float]) -> str:
+        """Return 'timeout' or 'idle' once a limit is exceeded (cancelled when the command finishes)."""
+        interval = _watchdog_interval(timeout, idle_timeout)
+        while True:
+            await asyncio.sleep(interval)
+            reason = activity.check(started, timeout, idle_timeout)
+            if reason:
+                return reason
+
+    async def execute_command_async(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> Tuple[int, str, str]:
+        """
+        Asyncio counterpart of execute_command.
+
+        The subprocess is started only once a slot in the shared per-loop semaphore is
+        available (see set_async_concurrency) and, with a rate limiter, admitted by it;
+        the wait is reported as queue time in ``self.last_metrics``. Streaming, throttle
+        retries, logging, the timeout/idle watchdog and the return contract are identical
+        to execute_command. CPU figures are the delta of this process's reaped-children
+        usage, so they are approximate when several commands overlap. If the awaiting
+        task is cancelled, the child process tree is killed, the cancellation is logged
+        and CancelledError is re-raised.
+
+        Args:
+            command: The full command string to execute
+            timeout: Hard timeout in seconds (default: the policy default)
+            idle_timeout: Output-inactivity limit in seconds (default: the policy idle timeout; None/0 disables)
+
+        Returns:
+            Tuple of (exit_code, stdout_excerpt, stderr_excerpt)
+        """
+        policy = self.timeout_policy
+        timeout = timeout or policy.timeout_for(None)
+        idle_timeout = idle_timeout if idle_timeout is not None else policy.idle_timeout_for(None)
+        self.last_metrics = None
+        limiter = self.rate_limiter
+        if limiter is None:
+            return await self._run_command_async(command, timeout, idle_timeout, time.perf_counter())
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            ticket = await limiter.acquire_async()
+            try:
+                result = await self._run_command_async(command, timeout, idle_timeout, queued)
+            except BaseException:
+                limiter.release(ticket, FAILED)
+                raise
+            delay = self._settle_rate_limit(limiter, ticket, result, attempt)
+            if delay is None:
+                return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _run_command_async(self, command: str, timeout: float, idle_timeout: Optional[float], queued: float) -> Tuple[int, str, str]:
+        """Launch one copilot command (see execute_command_async); ``queued`` is when the call started waiting."""
+        async with _get_async_semaphore():
+            self._debug_print(f"executing (async): {command} (timeout={timeout:g}s idle_timeout={idle_timeout or 'off'})")
+            self._log_command_start(command)
+            self._log_to_file("--- streamed output (stderr lines prefixed with [stderr]) ---\n")
+            stdout_excerpt = OutputExcerpt()
+            stderr_excerpt = OutputExcerpt()
+            activity = _Activity()
+            usage_before = _children_usage()
+            started = time.perf_counter()
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **_process_group_kwargs(),
+            )
+            work = asyncio.ensure_future(asyncio.gather(
+                self._pump_stream_async('stdout', process.stdout, stdout_excerpt, activity),
+                self._pump_stream_async('stderr', process.stderr, stderr_excerpt, activity),
+                process.wait(),
+            ))
+            watchdog = asyncio.ensure_future(self._watch_command_async(activity, time.monotonic(), timeout, idle_timeout))
+            reason: Optional[str] = None
+            try:
+                await asyncio.wait({work, watchdog}, return_when=asyncio.FIRST_COMPLETED)
+                if watchdog.done():
+                    reason = watchdog.result()
+                    _kill_process_tree(process.pid)
+                    # Pipes close once the tree is gone, so the pumps finish promptly.
+                    await work
+                else:
+                    watchdog.cancel()
+                    await work
+            except asyncio.CancelledError:
+                watchdog.cancel()
+                work.cancel()
+                await self._kill_async_process(process)
+                await asyncio.wait({work})
+                if not work.cancelled():
+                    work.exception()  # retrieve the pumps' CancelledError so it is not reported as unhandled
+                self._log_to_file("ERROR: Command cancelled\n\n")
+                self.sink.flush()
+                self._debug_print("command cancelled")
+                raise
 
-        return result.returncode, result.stdout, result.stderr
+            self.last_metrics = command_metrics(
+                queued, started, time.perf_counter(), _usage_delta(usage_before), stdout_excerpt, stderr_excerpt,
+                rusage_scope='children-delta' if usage_before is not None else None,
+            )
+            self.last_metrics['termination'] = reason
+            if reason:
+                return self._log_timeout(reason, timeout if reason == 'timeout' else idle_timeout)
+            returncode = process.returncode if process.returncode is not None else -1
+            self._log_command_result(returncode, stdout_excerpt, stderr_excerpt)
+            return returncode, stdout_excerpt.text(), stderr_excerpt.text()
+
+    @staticmethod
+    async def _kill_async_process(process: "asyncio.subprocess.Process"):
+        """Kill an asyncio child process tree (if still running) and reap it."""
+        if process.returncode is None:
+            _kill_process_tree(process.pid)
+        await process.wait()
     
     def execute_prompt(
         self, 
@@ -137,6 +699,108 @@ class CopilotExecutor:
             )
             # Executes: copilot --prompt "/execute-repo-task repo_checklist=\"...\" clone=\"...\"" --allow-all-tools
         """
+        command = self.build_prompt_command(prompt_name, params, allow_all_tools)
+        memo, key, hit = self._memo_lookup(prompt_name, params)
+        if hit is not None:
+            return self._replay_memo(memo, hit, command)
+        before = memo.snapshot(params or {}) if key else None
+        policy = self.timeout_policy
+        result = self.execute_command(command, policy.timeout_for(prompt_name), policy.idle_timeout_for(prompt_name))
+        self._memo_store(memo, key, prompt_name, params, result, before)
+        return result
+
+    async def execute_prompt_async(
+        self,
+        prompt_name: str,
+        params: Optional[Dict[str, str]] = None,
+        allow_all_tools: bool = True
+    ) -> Tuple[int, str, str]:
+        """Asyncio counterpart of execute_prompt (see execute_command_async)."""
+        command = self.build_prompt_command(prompt_name, params, allow_all_tools)
+        memo, key, hit = self._memo_lookup(prompt_name, params)
+        if hit is not None:
+            return self._replay_memo(memo, hit, command)
+        before = memo.snapshot(params or {}) if key else None
+        policy = self.timeout_policy
+        result = await self.execute_command_async(command, policy.timeout_for(prompt_name), policy.idle_timeout_for(prompt_name))
+        self._memo_store(memo, key, prompt_name, params, result, before)
+        return result
+
+    def _settle_rate_limit(self, limiter: RateLimiter, ticket, result: Tuple[int, str, str], attempt: int) -> Optional[float]:
+        """Release a limiter slot with the call's outcome; return the retry delay for a throttled call, else None."""
+        exit_code, stdout, stderr = result
+        outcome = classify_result(exit_code, stdout, stderr)
+        limiter.release(ticket, outcome)
+        if self.last_metrics is not None:
+            self.last_metrics['throttle_retries'] = attempt
+            self.last_metrics['concurrency_limit'] = limiter.limit
+        if outcome != THROTTLED or attempt >= limiter.max_retries:
+            return None
+        delay = limiter.backoff(attempt, stderr)
+        self._log_to_file(f"[rate-limit] throttled (attempt {attempt + 1}/{limiter.max_retries}); retrying in {delay:.1f}s, concurrency limit now {limiter.limit}\n\n")
+        print(f"[rate-limit] copilot call throttled; retry {attempt + 1}/{limiter.max_retries} in {delay:.1f}s (concurrency limit {limiter.limit})")
+        return delay
+
+    def _memo_lookup(self, prompt_name: str, params: Optional[Dict[str, str]]):
+        """Return (memo, key, entry); key is None for uncacheable calls, entry None on a miss."""
+        memo = self.prompt_memo
+        key = memo.key_for(prompt_name, params or {}, MODEL) if memo is not None else None
+        if key is None:
+            return memo, None, None
+        return memo, key, memo.lookup(key)
+
+    def _replay_memo(self, memo: PromptMemo, entry: Dict, command: str) -> Tuple[int, str, str]:
+        """Apply a memo hit: replay its file mutations, log it and report zero-cost metrics."""
+        started = time.perf_counter()
+        memo.replay(entry)
+        self._log_command_start(command)
+        self._log_to_file(
+            f"[prompt-memo] HIT {entry['key'][:12]} (recorded {entry.get('created')}); "
+            f"replayed {len(entry.get('files', {}))} file(s), {len(entry.get('deleted', []))} deletion(s)\n"
+        )
+        self._log_to_file(f"Exit Code: {entry.get('exit_code', 0)}\n\n")
+        self.sink.flush()
+        print(f"[prompt-memo] HIT /{entry.get('prompt')}; copilot not launched.")
+        exit_code, stdout, stderr = memo_result(entry)
+        self.last_metrics = {
+            'wall_seconds': round(time.perf_counter() - started, 3),
+            'queue_wait_seconds': 0.0,
+            'cpu_user_seconds': None,
+            'cpu_system_seconds': None,
+            'max_rss_kb': None,
+            'stdout_bytes': 0,
+            'stderr_bytes': 0,
+            'rusage_scope': None,
+            'termination': None,
+            'memo': 'HIT',
+        }
+        return exit_code, stdout, stderr
+
+    def _memo_store(self, memo: Optional[PromptMemo], key: Optional[str], prompt_name: str,
+                    params: Optional[Dict[str, str]], result: Tuple[int, str, str], before) -> None:
+        if key is None:
+            return
+        memo.store(key, prompt_name, params or {}, MODEL, result, before)
+        if self.last_metrics is not None:
+            self.last_metrics['memo'] = 'MISS'
+
+    def build_prompt_command(
+        self,
+        prompt_name: str,
+        params: Optional[Dict[str, str]] = None,
+        allow_all_tools: bool = True
+    ) -> str:
+        """
+        Build the copilot command line for a prompt with parameters.
+        
+        Args:
+            prompt_name: Name of the prompt (e.g., 'task-clone-repo', 'execute-repo-task')
+            params: Dictionary of parameter name-value pairs to pass to the prompt
+            allow_all_tools: If True, adds --allow-all-tools flag
+            
+        Returns:
+            The full shell command string
+        """
         # Read copilot-instructions.md content
         instructions_content = """*** Important *** 1. Execute the tasks in the markdown file one task at a time. Do not skip any task. Do not group scriptable and non scriptable tasks in 1 script."""
         
@@ -177,27 +841,11 @@ class CopilotExecutor:
             command += ' --allow-all-tools'
         command += ' --allow-all-paths'
         
-        return self.execute_command(command)
+        return command
 
     def _rewrite_prompt_references(self, prompt_text: str) -> str:
         """Replace /task-* or /execute-* tokens with #file references if prompt files exist."""
-        pattern = re.compile(r"/(task-[A-Za-z0-9_-]+|execute-[A-Za-z0-9_-]+)")
-
-        def replace(match: re.Match) -> str:
-            prompt_key = match.group(1)
-            prompt_file = self.prompts_root / f"{prompt_key}.prompt.md"
-            if not prompt_file.exists():
-                raise FileNotFoundError(
-                    f"Prompt file not found for '{prompt_key}' at {prompt_file}"
-                )
-            file_path = prompt_file.as_posix()
-            replacement = f"Follow instructions in #file: {file_path}"
-            self._debug_print(
-                f"rewriting /{prompt_key} to '{replacement}'"
-            )
-            return replacement
-
-        return pattern.sub(replace, prompt_text)
+        return self.registry.rewrite_references(prompt_text, debug=self._debug_print)
     
     def initialize_log(self, header: str):
         """
@@ -206,13 +854,8 @@ class CopilotExecutor:
         Args:
             header: Header text to write at the beginning of the log file
         """
-        # Ensure parent directory exists to avoid FileNotFoundError when logs dir was cleaned.
-        parent = self.log_file.parent
-        if parent and not parent.exists():
-            parent.mkdir(parents=True, exist_ok=True)
-        with open(self.log_file, 'w', encoding='utf-8') as log:
-            log.write(header)
-            log.write(f"\n{'='*80}\n\n")
+        # The sink creates the parent directory if the logs dir was cleaned.
+        self.sink.reset(f"{header}\n{'='*80}\n\n")
 
 
 # Convenience function for backwards compatibility
@@ -232,8 +875,8 @@ def execute_copilot_command(
     Returns:
         Tuple of (exit_code, stdout, stderr)
     """
-    executor = CopilotExecutor(log_file=log_file, debug=debug)
-    return executor.execute_command(command)
+    with CopilotExecutor(log_file=log_file, debug=debug) as executor:
+        return executor.execute_command(command)
 
 
 if __name__ == '__main__':
@@ -249,8 +892,8 @@ if __name__ == '__main__':
     # Auto-inject model flag for raw command usage if invoking copilot
     if command.startswith("copilot ") and "--model" not in command:
         command += f" --model {MODEL}"
-    executor = CopilotExecutor()
-    exit_code, stdout, stderr = executor.execute_command(command)
+    with CopilotExecutor() as executor:
+        exit_code, stdout, stderr = executor.execute_command(command)
     
     print(f"\nExit Code: {exit_code}")
     if stdout:
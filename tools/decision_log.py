@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Decision Log Writer
+
+Buffered, concurrency-safe writer for results/decision-log.csv (the log maintained by
+task-update-decision-log) plus a compaction step.
+
+    - Rows are validated (timestamp, task and status are required), CSV-escaped with the
+      csv module and buffered; a batch is appended when batch_size rows are pending,
+      flush_interval seconds passed, or on flush()/close().
+    - Every append and every compaction holds an advisory FileLock on
+      `<log>.lock`, so threads and processes can log in parallel without interleaved or
+      torn rows. The header is written when the file is created; a missing trailing
+      newline left by another writer is repaired before appending.
+    - compact(): rewrites the log atomically with a normalized header, malformed rows
+      dropped, rows ordered by timestamp (stable), optionally exact duplicates removed
+      and old rows moved to an archive CSV.
+
+Header: timestamp,repo_name,solution_name,task,message,status
+
+CLI (prints the task's output contract as JSON):
+    python tools/decision_log.py append --task @task-build-solution --status FAIL \\
+        --repo-name my_repo --solution-name MySln --message "Build failed with 3 errors"
+    python tools/decision_log.py append-batch rows.jsonl      # one JSON object per line ('-' = stdin)
+    python tools/decision_log.py compact [--dedupe] [--max-age-days 90]
+
+`append` also writes the results/solution-results.csv row of Step 5 when both
+repo_name and solution_name are given (disable with --no-solution-results).
+"""
+from __future__ import annotations
+import argparse, csv, datetime, io, json, os, sys, tempfile, threading, time
+from typing import Dict, Iterable, List, Optional
+
+from file_lock import FileLock
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_LOG_PATH = os.path.join(REPO_ROOT, 'results', 'decision-log.csv')
+DEFAULT_SOLUTION_RESULTS_PATH = os.path.join(REPO_ROOT, 'results', 'solution-results.csv')
+DECISION_HEADER = ['timestamp', 'repo_name', 'solution_name', 'task', 'message', 'status']
+SOLUTION_RESULTS_HEADER = ['timestamp', 'repo_name', 'solution_name', 'task_name', 'status', 'symbol']
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 2.0
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def utc_timestamp() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _format_rows(rows: Iterable[List[str]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+
+def append_rows(path: str, rows: List[List[str]], header: List[str], *, lock_timeout: float = LOCK_TIMEOUT_SECONDS) -> int:
+    """Append ``rows`` to the CSV at ``path`` under its file lock; returns rows written."""
+    if not rows:
+        return 0
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with FileLock(path + '.lock', timeout=lock_timeout):
+        prefix = ''
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        if size == 0:
+            prefix = _format_rows([header])
+        else:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) not in (b'\n', b'\r'):
+                    prefix = '\n'
+        data = (prefix + _format_rows(rows)).encode('utf-8')
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    return len(rows)
+
+
+class DecisionLogWriter:
+    """Thread-safe buffered appender for the decision log."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LOG_PATH,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        lock_timeout: float = LOCK_TIMEOUT_SECONDS,
+    ):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.lock_timeout = lock_timeout
+        self.written = 0
+        self._pending: List[List[str]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def log(self, task: str, status: str, message: str = '', *, repo_name: str = '', solution_name: str = '',
+            timestamp: Optional[str] = None) -> None:
+        """Queue one decision row; raises ValueError when a required field is empty."""
+        timestamp = timestamp or utc_timestamp()
+        for name, value in (('timestamp', timestamp), ('task', task), ('status', status)):
+            if not str(value or '').strip():
+                raise ValueError(f"decision log field '{name}' must not be empty")
+        row = [timestamp, repo_name or '', solution_name or '', task, message or '', status]
+        with self._lock:
+            self._pending.append([str(value) for value in row])
+            due = len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Append every pending row in one locked write; returns rows written."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if not rows:
+                return 0
+            try:
+                written = append_rows(self.path, rows, DECISION_HEADER, lock_timeout=self.lock_timeout)
+            except BaseException:
+                self._pending[:0] = rows  # keep rows for the next attempt
+                raise
+            self.written += written
+            return written
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'DecisionLogWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _timestamp_key(value: str) -> str:
+    return value.strip().replace(' ', 'T')
+
+
+def compact(
+    path: str = DEFAULT_LOG_PATH,
+    *,
+    dedupe: bool = False,
+    max_age_days: Optional[float] = None,
+    archive_path: Optional[str] = None,
+    lock_timeout: float = LOCK_TIMEOUT_SECONDS,
+) -> Dict[str, int]:
+    """Rewrite the log atomically (see module docstring); returns row counts."""
+    stats = {'rows_in': 0, 'rows_out': 0, 'malformed': 0, 'duplicates': 0, 'archived': 0}
+    if not os.path.isfile(path):
+        return stats
+    cutoff = None
+    if max_age_days is not None:
+        cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=max_age_days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    with FileLock(path + '.lock', timeout=lock_timeout):
+        with open(path, 'r', encoding='utf-8-sig', errors='ignore', newline='') as f:
+            reader = csv.reader(f)
+            first = next(reader, None)
+            rows = [] if first is None or [c.strip() for c in first] == DECISION_HEADER else [first]
+            rows.extend(reader)
+        kept: List[List[str]] = []
+        old: List[List[str]] = []
+        seen = set()
+        for row in rows:
+            stats['rows_in'] += 1
+            if len(row) != len(DECISION_HEADER) or not row[0].strip() or not row[3].strip() or not row[5].strip():
+                stats['malformed'] += 1
+                continue
+            if dedupe:
+                key = tuple(row)
+                if key in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(key)
+            if cutoff is not None and _timestamp_key(row[0]) < cutoff:
+                old.append(row)
+                continue
+            kept.append(row)
+        kept.sort(key=lambda r: _timestamp_key(r[0]))
+        if old:
+            old.sort(key=lambda r: _timestamp_key(r[0]))
+            append_rows(archive_path or path.replace('.csv', '') + '-archive.csv', old, DECISION_HEADER, lock_timeout=lock_timeout)
+            stats['archived'] = len(old)
+        directory = os.path.dirname(path) or '.'
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.csv')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(_format_rows([DECISION_HEADER] + kept))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        stats['rows_out'] = len(kept)
+    return stats
+
+
+def _contract(status: str, path: str, logged: bool, error: Optional[str] = None, **extra) -> Dict:
+    result = {'log_status': status, 'log_file_path': os.path.abspath(path), 'entry_logged': logged, 'error_message': error}
+    result.update(extra)
+    return result
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Append to or compact results/decision-log.csv.')
+    p.add_argument('--log', default=DEFAULT_LOG_PATH, help='Decision log path (default ./results/decision-log.csv).')
+    sub = p.add_subparsers(dest='command', required=True)
+    append = sub.add_parser('append', help='Append one decision row.')
+    append.add_argument('--task', required=True)
+    append.add_argument('--status', required=True)
+    append.add_argument('--message', default='')
+    append.add_argument('--repo-name', default='')
+    append.add_argument('--solution-name', default='')
+    append.add_argument('--timestamp', help='ISO 8601 timestamp (default: now, UTC).')
+    append.add_argument('--solution-results', default=DEFAULT_SOLUTION_RESULTS_PATH, help='solution-results.csv path.')
+    append.add_argument('--no-solution-results', action='store_true', help='Do not write the solution-results.csv row.')
+    batch = sub.add_parser('append-batch', help='Append rows given as JSON lines (keys as in the CSV header).')
+    batch.add_argument('source', help="JSONL file, or '-' for stdin.")
+    comp = sub.add_parser('compact', help='Normalize, sort and optionally dedupe/archive the log.')
+    comp.add_argument('--dedupe', action='store_true', help='Drop exact duplicate rows (the log keeps duplicates by default).')
+    comp.add_argument('--max-age-days', type=float, help='Move rows older than this to <log>-archive.csv.')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.command == 'compact':
+        stats = compact(args.log, dedupe=args.dedupe, max_age_days=args.max_age_days)
+        print(json.dumps(_contract('SUCCESS', args.log, False, **stats), indent=2))
+        return 0
+    writer = DecisionLogWriter(args.log, batch_size=sys.maxsize, flush_interval=float('inf'))
+    try:
+        if args.command == 'append':
+            timestamp = args.timestamp or utc_timestamp()
+            writer.log(args.task, args.status, args.message, repo_name=args.repo_name,
+                       solution_name=args.solution_name, timestamp=timestamp)
+            writer.flush()
+            if args.repo_name and args.solution_name and not args.no_solution_results:
+                append_rows(args.solution_results, [[timestamp, args.repo_name, args.solution_name,
+                                                     '@task-update-decision-log', 'SUCCESS', '✓']], SOLUTION_RESULTS_HEADER)
+        else:
+            stream = sys.stdin if args.source == '-' else open(args.source, 'r', encoding='utf-8')
+            try:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    writer.log(row.get('task', ''), row.get('status', ''), row.get('message', ''),
+                               repo_name=row.get('repo_name', ''), solution_name=row.get('solution_name', ''),
+                               timestamp=row.get('timestamp'))
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+            writer.flush()
+    except (ValueError, OSError) as err:
+        print(json.dumps(_contract('FAIL', args.log, False, str(err)), indent=2))
+        return 1
+    print(json.dumps(_contract('SUCCESS', args.log, writer.written > 0, rows_written=writer.written), indent=2))
+    return 0
+
+
+__all__ = ['DecisionLogWriter', 'append_rows', 'compact', 'DECISION_HEADER', 'DEFAULT_LOG_PATH']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
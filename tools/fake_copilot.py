@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Fake Copilot CLI for Benchmarks
+
+Stand-in for the `copilot` binary used by run_benchmarks.py. It accepts the same command
+line the orchestrators build (`copilot --prompt "<text>" --model ... --allow-all-tools`),
+resolves the prompt name and params, then simulates the call:
+
+    - latency drawn from a configurable distribution (fixed | uniform | lognormal),
+      optionally per prompt
+    - output volume (stdout lines of a given width, optional stderr lines)
+    - failures at a configurable rate (exit code 1, no checklist change); failure_message
+      sets their stderr line, e.g. "Error: 429 Too Many Requests" to exercise throttle handling
+    - checklist mutations that mirror the real prompts closely enough for readiness
+      checks to pass:
+        * generate-repo-task-checklists: writes tasks/<repo>_repo_checklist.md for each
+          URL in the input file (canonical template)
+        * task-generate-solution-task-checklists: writes a solution checklist
+        * any other prompt with a checklist param: marks its `@<prompt>` task [x]
+          (execute-repo-task / execute-solution-task mark every task); once no open
+          task remains, every empty `→` variable is filled in
+
+Configuration is read from the JSON file named by $FAKE_COPILOT_CONFIG:
+    {
+      "latency": {"distribution": "lognormal", "median_ms": 20, "sigma": 0.5, "max_ms": 5000},
+      "prompt_latency": {"task-execute-readme": {"distribution": "fixed", "median_ms": 200}},
+      "output_lines": 20, "line_bytes": 80, "stderr_lines": 0,
+      "failure_rate": 0.0, "failure_message": "fake copilot: simulated failure",
+      "mutate": true,
+      "calls_log": "/path/to/calls.jsonl"
+    }
+Each call appends {prompt, latency_ms, exit_code, pid} to calls_log when set.
+"""
+from __future__ import annotations
+import datetime, json, math, os, random, re, sys, time
+from typing import Dict, Optional, Tuple
+
+PROMPT_FILE_PATTERN = re.compile(r"#file:\s*\S*?([A-Za-z0-9_-]+)\.prompt\.md")
+SLASH_PROMPT_PATTERN = re.compile(r"^\s*/([A-Za-z0-9_-]+)")
+PARAM_PATTERN = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)='((?:[^'\\]|\\.)*)'")
+CHECKLIST_PARAM_KEYS = ('checklist_path', 'repo_checklist', 'solution_checklist_path', 'solution_checklist')
+GENERATE_REPO_PROMPTS = ('generate-repo-task-checklists', 'task-generate-repo-task-checklists')
+GENERATE_SOLUTION_PROMPTS = ('generate-solution-task-checklists', 'task-generate-solution-task-checklists')
+MARK_ALL_PROMPTS = ('execute-repo-task', 'execute-solution-task')
+BENCH_SOLUTION = 'Bench'
+
+REPO_CHECKLIST_TEMPLATE = """# Task Checklist: {repo_name}
+Repository: {repo_url}
+Generated: {timestamp}
+
+## Repo Tasks (Sequential Pipeline - Complete in Order)
+- [ ] (1) [MANDATORY] [SCRIPTABLE] Clone repository to local directory → @task-clone-repo (see details in #file: .github/prompts/task-clone-repo.prompt.md)
+- [ ] (2) [MANDATORY] [SCRIPTABLE] Find all solution files in repository → @task-find-solutions (see details in #file: .github/prompts/task-find-solutions.prompt.md)
+- [ ] (3) [MANDATORY] [SCRIPTABLE] Generate per-solution checklist files → @task-generate-solution-task-checklists (see details in #file: .github/prompts/task-generate-solution-task-checklists.prompt.md)
+- [ ] (4) [MANDATORY] [SCRIPTABLE] Search for README file in repository → @task-search-readme (see details in #file: .github/prompts/task-search-readme.prompt.md)
+- [ ] (5) [MANDATORY] [NON-SCRIPTABLE] Scan README and extract setup commands → @task-scan-readme (see details in #file: .github/prompts/task-scan-readme.prompt.md)
+- [ ] (6) [MANDATORY] [NON-SCRIPTABLE] Execute safe commands from README → @task-execute-readme (see details in #file: .github/prompts/task-execute-readme.prompt.md)
+
+## Repo Variables Available
+- {{{{repo_url}}}} → {repo_url}
+- {{{{repo_name}}}} → {repo_name}
+- {{{{clone_path}}}} →
+- {{{{repo_directory}}}} →
+- {{{{solutions_json}}}} →
+- {{{{readme_content}}}} →
+- {{{{readme_filename}}}} →
+- {{{{commands_extracted}}}} →
+- {{{{executed_commands}}}} →
+- {{{{skipped_commands}}}} →
+
+## For Agents Resuming Work
+1. Identify the **first `[ ]` task** in the checklist.
+"""
+
+SOLUTION_CHECKLIST_TEMPLATE = """# Solution Checklist: {solution_name}
+Repository: {repo_name}
+Generated: {timestamp}
+
+## Solution Tasks
+- [ ] (1) [MANDATORY] [SCRIPTABLE] Restore NuGet packages → @task-restore-solution
+- [ ] (2) [MANDATORY] [SCRIPTABLE] Build solution (Clean + Build) → @task-build-solution
+- [ ] (3) [MANDATORY] [SCRIPTABLE] Validate build artifacts → @task-verify-build-artifacts
+
+## Solution Variables Available
+- {{{{solution_name}}}} → {solution_name}
+- {{{{restore_status}}}} →
+- {{{{build_status}}}} →
+- {{{{verify_status}}}} →
+"""
+
+
+def _load_config() -> Dict:
+    path = os.environ.get('FAKE_COPILOT_CONFIG')
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_prompt(text: str) -> Tuple[str, Dict[str, str]]:
+    """Return (prompt_name, params) for a rewritten (#file:) or slash-command prompt."""
+    match = PROMPT_FILE_PATTERN.search(text) or SLASH_PROMPT_PATTERN.search(text)
+    name = match.group(1) if match else '<unknown>'
+    params = {key: value.replace("\\'", "'") for key, value in PARAM_PATTERN.findall(text)}
+    return name, params
+
+
+def sample_latency_ms(spec: Dict, rng: random.Random) -> float:
+    median = float(spec.get('median_ms', 20))
+    distribution = spec.get('distribution', 'lognormal')
+    if distribution == 'fixed':
+        value = median
+    elif distribution == 'uniform':
+        value = rng.uniform(float(spec.get('min_ms', 0)), float(spec.get('max_ms', 2 * median)))
+    else:
+        value = rng.lognormvariate(math.log(max(median, 0.001)), float(spec.get('sigma', 0.5)))
+    return min(value, float(spec.get('max_ms', value)))
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
+
+def _write(path: str, text: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.fake-{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _repo_name_from_url(url: str) -> str:
+    url = url.rstrip('/')
+    if '/_git/' in url:
+        url = url.split('/_git/', 1)[1]
+    name = url.rsplit('/', 1)[-1]
+    return name[:-4] if name.endswith('.git') else name
+
+
+def generate_repo_checklists(params: Dict[str, str]) -> int:
+    """Write a repo checklist per HTTPS URL in the input file; returns the count written."""
+    input_name = params.get('input', 'repositories.txt')
+    candidates = [input_name, os.path.join('.github', 'prompts', input_name)]
+    input_path = next((c for c in candidates if os.path.isfile(c)), None)
+    if input_path is None:
+        return 0
+    written = 0
+    with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+        urls = sorted({line.strip().rstrip('/') for line in f if line.strip().startswith('https://')})
+    for url in urls:
+        repo_name = _repo_name_from_url(url)
+        content = REPO_CHECKLIST_TEMPLATE.format(repo_name=repo_name, repo_url=url, timestamp=_now())
+        _write(os.path.join('tasks', f"{repo_name}_repo_checklist.md"), content)
+        written += 1
+    return written
+
+
+def _checklist_path(params: Dict[str, str]) -> Optional[str]:
+    for key in CHECKLIST_PARAM_KEYS:
+        if params.get(key):
+            return params[key].replace('\\', '/')
+    return None
+
+
+def mutate_checklist(prompt: str, path: str) -> None:
+    """Mark the prompt's task done; fill empty variables once every task is done."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+    except OSError:
+        return
+    # Orchestrators may invoke a task without its `task-` prefix (e.g. generate-solution-task-checklists).
+    marker = re.compile(rf"@(?:task-)?{re.escape(prompt)}(?![A-Za-z0-9-])")
+    for idx, line in enumerate(lines):
+        if line.startswith('- [ ]') and (prompt in MARK_ALL_PROMPTS or marker.search(line)):
+            lines[idx] = '- [x]' + line[5:]
+            if prompt not in MARK_ALL_PROMPTS:
+                break
+    if not any(line.startswith('- [ ]') for line in lines):
+        lines = [f"{line.rstrip()} bench-value" if line.startswith('- {') and line.rstrip().endswith('→') else line for line in lines]
+    if prompt in GENERATE_SOLUTION_PROMPTS or prompt == 'execute-repo-task':
+        repo_name = os.path.basename(path).replace('_repo_checklist.md', '')
+        solution_path = os.path.join(os.path.dirname(path), f"{repo_name}_{BENCH_SOLUTION}_solution_checklist.md")
+        _write(solution_path, SOLUTION_CHECKLIST_TEMPLATE.format(
+            solution_name=BENCH_SOLUTION, repo_name=repo_name, timestamp=_now()))
+    _write(path, '\n'.join(lines))
+
+
+def main(argv) -> int:
+    config = _load_config()
+    text = argv[argv.index('--prompt') + 1] if '--prompt' in argv else ''
+    prompt, params = parse_prompt(text)
+    rng = random.Random()
+    spec = dict(config.get('latency') or {})
+    spec.update((config.get('prompt_latency') or {}).get(prompt, {}))
+    latency_ms = sample_latency_ms(spec, rng)
+    time.sleep(latency_ms / 1000)
+
+    line = 'x' * max(int(config.get('line_bytes', 80)) - 1, 0)
+    out = sys.stdout
+    out.write(f"fake copilot: {prompt}\n")
+    for _ in range(int(config.get('output_lines', 20))):
+        out.write(line + '\n')
+    out.flush()
+    for _ in range(int(config.get('stderr_lines', 0))):
+        sys.stderr.write(line + '\n')
+
+    exit_code = 0
+    if rng.random() < float(config.get('failure_rate', 0.0)):
+        sys.stderr.write(str(config.get('failure_message', 'fake copilot: simulated failure')) + '\n')
+        exit_code = 1
+    elif config.get('mutate', True):
+        if prompt in GENERATE_REPO_PROMPTS:
+            out.write(f"fake copilot: generated {generate_repo_checklists(params)} checklist(s)\n")
+        else:
+            checklist = _checklist_path(params)
+            if checklist:
+                mutate_checklist(prompt, checklist)
+
+    calls_log = config.get('calls_log')
+    if calls_log:
+        record = {'prompt': prompt, 'latency_ms': round(latency_ms, 3), 'exit_code': exit_code, 'pid': os.getpid()}
+        fd = os.open(calls_log, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(record) + '\n').encode('utf-8'))
+        finally:
+            os.close(fd)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Cross-Process File Lock
+
+Advisory exclusive lock on a lock file, usable between threads and between processes
+(each FileLock opens its own descriptor): fcntl.flock on POSIX, msvcrt.locking on Windows.
+
+Usage:
+    from file_lock import FileLock
+    with FileLock('.cache/stage_cache/.evict.lock', timeout=600):
+        ...   # critical section
+
+Raises:
+    LockTimeout when the lock cannot be acquired within ``timeout`` seconds.
+"""
+from __future__ import annotations
+import os, time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_POLL_INTERVAL = 0.05
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a FileLock is not acquired within its timeout."""
+
+
+class FileLock:
+    """Exclusive advisory lock held on ``path`` (created if missing)."""
+
+    def __init__(self, path: str, timeout: Optional[float] = None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                os.close(fd)
+                raise LockTimeout(f"Timed out after {self.timeout}s waiting for lock {self.path}")
+            time.sleep(self.poll_interval)
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+__all__ = ['FileLock', 'LockTimeout']
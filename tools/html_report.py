@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Execution Results HTML Report
+
+Native replacement for the script that generate-html-reports.prompt.md asks the model to
+write: pivots results/repo_result.csv (repo,task name,status) into a repo x task matrix
+and results/solution_result.csv (repo,solution,task name,status) into a
+(repo, solution) x task matrix and renders both into results/execution_results.html
+(same layout, headings, CSS classes and status colours as the prompt's template).
+
+    - CSV rows are streamed (csv.reader) into dict-based pivots; a later row for the same
+      cell overwrites an earlier one, as in the template.
+    - Incremental regeneration: the pivots, the consumed byte offset of each CSV and a
+      sha256 of the consumed bytes are kept in a state file next to the report. When a
+      CSV only grew (its previously read prefix hashes the same) just the appended
+      complete lines are parsed; any other change triggers a full re-read. When neither
+      CSV changed and the report exists, nothing is rewritten; a CSV that disappeared
+      after rows were read re-renders the report without them.
+    - All values are HTML-escaped; the report is written atomically.
+
+Usage:
+    python tools/html_report.py                      # results/*.csv -> results/execution_results.html
+    python tools/html_report.py --full               # ignore the incremental state
+    python tools/html_report.py --results-dir <dir> --output <file.html>
+"""
+from __future__ import annotations
+import argparse, csv, datetime, hashlib, html, io, json, os, sys, tempfile, time
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, 'results')
+REPO_CSV = 'repo_result.csv'
+SOLUTION_CSV = 'solution_result.csv'
+REPORT_NAME = 'execution_results.html'
+STATE_SUFFIX = '.state.json'
+STATE_VERSION = 1
+_READ_CHUNK = 1024 * 1024
+
+STATUS_CLASSES = {
+    'SUCCESS': 'status-success',
+    'FAILED': 'status-failed',
+    'SKIPPED': 'status-skipped',
+    'NOT_FOUND': 'status-not-found',
+    'NOT_EXECUTED': 'status-not-executed',
+}
+
+CSS = """<style>
+body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background-color: #f5f5f5; }
+h1 { color: #333; border-bottom: 3px solid #0078d4; padding-bottom: 10px; }
+.timestamp, .stats { color: #666; font-size: 0.9em; margin-bottom: 20px; }
+.table-wrap { overflow-x: auto; max-height: 80vh; margin-bottom: 30px; }
+table { border-collapse: collapse; width: 100%; background-color: white; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+th { background-color: #0078d4; color: white; padding: 12px; text-align: left; font-weight: bold; position: sticky; top: 0; }
+td { padding: 10px; border: 1px solid #ddd; }
+tr:nth-child(even) { background-color: #f9f9f9; }
+tr:hover { background-color: #f0f0f0; }
+tr.repo-group-start td { border-top: 3px solid #0078d4; }
+.status-success { background-color: #d4edda; color: #155724; font-weight: bold; }
+.status-failed { background-color: #f8d7da; color: #721c24; font-weight: bold; }
+.status-skipped { background-color: #fff3cd; color: #856404; }
+.status-not-found { background-color: #ffeaa7; color: #d63031; }
+.status-not-executed { background-color: #e9ecef; color: #6c757d; }
+.status-unknown { background-color: #f8f9fa; color: #333; }
+.repo-name { font-weight: bold; color: #0078d4; }
+.solution-name { font-family: 'Courier New', monospace; color: #333; }
+</style>"""
+
+
+def status_class(status: str) -> str:
+    return STATUS_CLASSES.get(status, 'status-unknown')
+
+
+class CsvPivot:
+    """Pivot of one results CSV: row key (first ``key_width`` columns) -> {task: status}."""
+
+    def __init__(self, key_width: int):
+        self.key_width = key_width
+        self.rows: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        self.tasks: set = set()
+        self.offset = 0          # bytes consumed (always at a line boundary)
+        self.header_seen = False
+        self.prefix_sha = ''     # sha256 of the first ``offset`` bytes
+
+    def add_rows(self, text: str) -> int:
+        added = 0
+        width = self.key_width + 2
+        for row in csv.reader(io.StringIO(text)):
+            if not self.header_seen:
+                self.header_seen = True  # the first row is the column header
+                continue
+            if len(row) < width:
+                continue
+            key = tuple(cell.strip() for cell in row[:self.key_width])
+            task, status = row[self.key_width].strip(), row[self.key_width + 1].strip()
+            self.tasks.add(task)
+            self.rows.setdefault(key, {})[task] = status
+            added += 1
+        return added
+
+    def to_state(self) -> Dict:
+        return {
+            'offset': self.offset,
+            'header_seen': self.header_seen,
+            'prefix_sha': self.prefix_sha,
+            'rows': [[list(key), cells] for key, cells in self.rows.items()],
+        }
+
+    @classmethod
+    def from_state(cls, key_width: int, state: Dict) -> 'CsvPivot':
+        pivot = cls(key_width)
+        pivot.offset = int(state.get('offset', 0))
+        pivot.header_seen = bool(state.get('header_seen'))
+        pivot.prefix_sha = state.get('prefix_sha', '')
+        for key, cells in state.get('rows', []):
+            pivot.rows[tuple(key)] = dict(cells)
+            pivot.tasks.update(cells)
+        return pivot
+
+
+def _prefix_hash(path: str, length: int):
+    """sha256 object fed with the first ``length`` bytes of ``path``."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while length > 0:
+            chunk = f.read(min(length, _READ_CHUNK))
+            if not chunk:
+                break
+            digest.update(chunk)
+            length -= len(chunk)
+    return digest
+
+
+def update_pivot(path: str, pivot: Optional[CsvPivot], key_width: int) -> Tuple[CsvPivot, str]:
+    """Bring ``pivot`` up to date with the CSV at ``path``.
+
+    Returns (pivot, action) where action is MISSING | UNCHANGED | APPENDED | FULL.
+    """
+    if not os.path.isfile(path):
+        return CsvPivot(key_width), 'MISSING'
+    size = os.path.getsize(path)
+    action = 'FULL'
+    digest = None
+    if pivot is not None and pivot.offset and pivot.offset <= size:
+        digest = _prefix_hash(path, pivot.offset)
+        if digest.hexdigest() != pivot.prefix_sha:
+            digest = None
+    if digest is not None:
+        if pivot.offset == size:
+            return pivot, 'UNCHANGED'
+        action = 'APPENDED'
+    else:
+        pivot = CsvPivot(key_width)
+        digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        f.seek(pivot.offset)
+        data = f.read(size - pivot.offset)
+    end = data.rfind(b'\n') + 1  # only consume complete lines; a partial last line waits for the next run
+    if end == 0:
+        return pivot, 'UNCHANGED' if action == 'APPENDED' else action
+    encoding = 'utf-8-sig' if pivot.offset == 0 else 'utf-8'
+    pivot.add_rows(data[:end].decode(encoding, errors='ignore'))
+    pivot.offset += end
+    digest.update(data[:end])
+    pivot.prefix_sha = digest.hexdigest()
+    return pivot, action
+
+
+def _cell(status: str) -> str:
+    return f'<td class="{status_class(status)}">{html.escape(status)}</td>'
+
+
+def render_repo_table(pivot: CsvPivot) -> str:
+    tasks = sorted(pivot.tasks)
+    parts = ['<h2>Repository-Level Execution Results</h2>', '<div class="table-wrap"><table>', '<thead><tr><th>Repository</th>']
+    parts.extend(f'<th>{html.escape(task)}</th>' for task in tasks)
+    parts.append('</tr></thead>\n<tbody>')
+    for key in sorted(pivot.rows):
+        cells = pivot.rows[key]
+        parts.append(f'\n<tr><td class="repo-name">{html.escape(key[0])}</td>')
+        parts.extend(_cell(cells.get(task, '')) for task in tasks)
+        parts.append('</tr>')
+    parts.append('\n</tbody></table></div>')
+    return ''.join(parts)
+
+
+def render_solution_table(pivot: CsvPivot) -> str:
+    tasks = sorted(pivot.tasks)
+    parts = ['<h2>Solution-Level Execution Results</h2>', '<div class="table-wrap"><table>',
+             '<thead><tr><th>Repository</th><th>Solution</th>']
+    parts.extend(f'<th>{html.escape(task)}</th>' for task in tasks)
+    parts.append('</tr></thead>\n<tbody>')
+    previous_repo = None
+    for key in sorted(pivot.rows):
+        repo, solution = key
+        cells = pivot.rows[key]
+        group = ' class="repo-group-start"' if repo != previous_repo and previous_repo is not None else ''
+        previous_repo = repo
+        parts.append(f'\n<tr{group}><td class="repo-name">{html.escape(repo)}</td><td class="solution-name">{html.escape(solution)}</td>')
+        parts.extend(_cell(cells.get(task, '')) for task in tasks)
+        parts.append('</tr>')
+    parts.append('\n</tbody></table></div>')
+    return ''.join(parts)
+
+
+def _stats(pivot: CsvPivot, label: str) -> str:
+    counts: Dict[str, int] = {}
+    for cells in pivot.rows.values():
+        for status in cells.values():
+            counts[status] = counts.get(status, 0) + 1
+    detail = ', '.join(f"{html.escape(status)}: {count}" for status, count in sorted(counts.items()))
+    return f'<div class="stats">{label}: {len(pivot.rows)} &middot; task columns: {len(pivot.tasks)}{" &middot; " + detail if detail else ""}</div>'
+
+
+def render_report(repo_pivot: CsvPivot, solution_pivot: CsvPivot) -> str:
+    generated = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return '\n'.join([
+        '<!DOCTYPE html>',
+        '<html lang="en">',
+        '<head>',
+        '<meta charset="UTF-8">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
+        '<title>Execution Results</title>',
+        CSS,
+        '</head>',
+        '<body>',
+        '<h1>Build Repository Execution Results</h1>',
+        f'<div class="timestamp">Generated: {generated}</div>',
+        render_repo_table(repo_pivot),
+        _stats(repo_pivot, 'Repositories'),
+        '<br>',
+        render_solution_table(solution_pivot),
+        _stats(solution_pivot, 'Solutions'),
+        '</body>',
+        '</html>',
+        '',
+    ])
+
+
+def _atomic_write(path: str, text: str) -> None:
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _load_state(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if state.get('version') == STATE_VERSION else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def generate_report(results_dir: str = DEFAULT_RESULTS_DIR, output_path: Optional[str] = None, *, full: bool = False) -> Dict:
+    """Regenerate the HTML report (incrementally unless ``full``); returns a result dict."""
+    started = time.perf_counter()
+    output_path = output_path or os.path.join(results_dir, REPORT_NAME)
+    state_path = output_path + STATE_SUFFIX
+    state = {} if full else _load_state(state_path)
+    pivots = {}
+    actions = {}
+    vanished = False
+    for name, csv_name, key_width in (('repo', REPO_CSV, 1), ('solution', SOLUTION_CSV, 2)):
+        previous = CsvPivot.from_state(key_width, state[name]) if name in state else None
+        pivots[name], actions[name] = update_pivot(os.path.join(results_dir, csv_name), previous, key_width)
+        # A CSV removed after rows were read must not leave those rows in the report.
+        vanished = vanished or (actions[name] == 'MISSING' and previous is not None and bool(previous.rows))
+    unchanged = (all(action in ('UNCHANGED', 'MISSING') for action in actions.values()) and not vanished
+                 and state and os.path.isfile(output_path))
+    if not unchanged:
+        _atomic_write(output_path, render_report(pivots['repo'], pivots['solution']))
+        _atomic_write(state_path, json.dumps(
+            {'version': STATE_VERSION, **{name: pivot.to_state() for name, pivot in pivots.items()}},
+            separators=(',', ':')))
+    return {
+        'output': output_path,
+        'written': not unchanged,
+        'actions': actions,
+        'repositories': len(pivots['repo'].rows),
+        'solutions': len(pivots['solution'].rows),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Render results/*.csv into results/execution_results.html.')
+    p.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR, help='Directory with repo_result.csv / solution_result.csv.')
+    p.add_argument('--output', help='Report path (default <results-dir>/execution_results.html).')
+    p.add_argument('--full', action='store_true', help='Re-read both CSVs instead of only appended rows.')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    result = generate_report(args.results_dir, args.output, full=args.full)
+    print(
+        f"[html-report] repo_result.csv={result['actions']['repo']} solution_result.csv={result['actions']['solution']} "
+        f"repositories={result['repositories']} solutions={result['solutions']} elapsed={result['elapsed_ms']}ms"
+    )
+    print(f"[html-report] {'Generated' if result['written'] else 'Up to date'}: {result['output']}")
+    return 0
+
+
+__all__ = ['generate_report', 'update_pivot', 'render_report', 'CsvPivot']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Knowledge Base Search Index for task-search-knowledge-base
+
+Builds a local inverted index (TF-IDF) over the articles in ./knowledge_base_markdown so a
+build failure is matched against a ranked shortlist instead of every article being read.
+The prompt still makes the semantic decision; this module only narrows the candidates.
+
+    - Each article contributes weighted terms from its error codes (NU1008, MSB3644, CS0246,
+      NETSDK1045, ...), its `## Detection Tokens` bullets, its `# Title` line and its body.
+    - The index is persisted as JSON (default ./.cache/kb_index.json) and refreshed
+      incrementally: only articles whose size or mtime changed are re-parsed, removed articles
+      are dropped, and the file is rewritten atomically only when something changed. Updates
+      hold a FileLock so parallel solution workers share one index.
+    - Queries combine errors[] (strongest signal) with build_stderr (truncated to 5000 chars;
+      paths and line/column numbers stripped). Scores are cosine-normalized TF-IDF with a
+      bonus per exactly matching error code.
+
+CLI (prints JSON):
+    python tools/kb_index.py build [--full]
+    python tools/kb_index.py search --errors NU1008 MSB3644 [--stderr-file build.log | --stderr TEXT] [--top 5]
+"""
+from __future__ import annotations
+import argparse, json, math, os, re, sys, tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from file_lock import FileLock
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_KB_DIR = os.path.join(REPO_ROOT, 'knowledge_base_markdown')
+DEFAULT_INDEX_PATH = os.path.join(REPO_ROOT, '.cache', 'kb_index.json')
+INDEX_VERSION = 1
+STDERR_LIMIT = 5000
+DEFAULT_TOP = 5
+LOCK_TIMEOUT_SECONDS = 120
+EXCLUDED_FILES = {'readme.md'}
+FIELD_WEIGHTS = {'code': 4.0, 'detection': 2.5, 'title': 2.0, 'body': 1.0}
+CODE_MATCH_BONUS = 0.25
+
+_CODE_RE = re.compile(r'\b([A-Z]{2,7}\d{3,5})\b')
+_WORD_RE = re.compile(r'[a-z][a-z0-9_.+#-]*[a-z0-9+#]|[a-z]')
+_PATH_RE = re.compile(r'(?:[A-Za-z]:)?(?:[\\/][^\\/\s:"\'<>|]+){2,}')
+_LINE_COL_RE = re.compile(r'\(\d+(?:,\d+)*\)')
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does error errors for from has have if in into is it its
+may more must no not of on or should so such that the their then there these this to use used using was
+were when which will with warning warnings you your project projects file files build failed
+""".split())
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercase word terms with stopwords, very short tokens and numbers removed."""
+    return [t for t in _WORD_RE.findall(text.lower()) if len(t) > 2 and t not in _STOPWORDS]
+
+
+def error_codes(text: str) -> List[str]:
+    """Distinct diagnostic codes (NU1008, MSB3644, ...) in order of first appearance."""
+    return list(dict.fromkeys(_CODE_RE.findall(text)))
+
+
+def parse_article(text: str) -> Dict:
+    """Extract title, error codes, detection tokens and weighted term frequencies."""
+    title = ''
+    detection: List[str] = []
+    body_lines: List[str] = []
+    section = ''
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('# ') and not title:
+            title = stripped[2:].strip()
+            continue
+        if stripped.startswith('## '):
+            section = stripped[3:].strip().lower()
+            continue
+        if section.startswith('detection') and stripped.startswith(('-', '*')):
+            token = stripped[1:].strip().strip('`').strip()
+            if token:
+                detection.append(token)
+            continue
+        body_lines.append(line)
+    body = '\n'.join(body_lines)
+    codes = error_codes(' '.join([title, *detection, body]))
+    weights: Dict[str, float] = {}
+
+    def add(terms: Iterable[str], weight: float) -> None:
+        for term in terms:
+            weights[term] = weights.get(term, 0.0) + weight
+
+    add((c.lower() for c in codes), FIELD_WEIGHTS['code'])
+    add((t for token in detection for t in _terms(token)), FIELD_WEIGHTS['detection'])
+    add(_terms(title), FIELD_WEIGHTS['title'])
+    add(_terms(body), FIELD_WEIGHTS['body'])
+    # Sublinear TF keeps long articles from dominating on repetition alone.
+    terms = {term: round(1.0 + math.log(w), 4) for term, w in weights.items() if w >= 1.0}
+    return {'title': title, 'codes': codes, 'detection_tokens': detection, 'terms': terms}
+
+
+def _list_articles(kb_dir: str) -> Dict[str, os.stat_result]:
+    articles: Dict[str, os.stat_result] = {}
+    if not os.path.isdir(kb_dir):
+        return articles
+    with os.scandir(kb_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith('.md') and entry.name.lower() not in EXCLUDED_FILES:
+                articles[entry.name] = entry.stat()
+    return articles
+
+
+def _load(index_path: str, kb_dir: str) -> Dict:
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION and index.get('kb_dir') == os.path.abspath(kb_dir):
+            return index
+    except (OSError, ValueError):
+        pass
+    return {'version': INDEX_VERSION, 'kb_dir': os.path.abspath(kb_dir), 'docs': {}}
+
+
+def _save(index: Dict, index_path: str) -> None:
+    directory = os.path.dirname(index_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-kb-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp, index_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def update_index(kb_dir: str = DEFAULT_KB_DIR, index_path: str = DEFAULT_INDEX_PATH, *, full: bool = False) -> Tuple[Dict, Dict[str, int]]:
+    """Bring the persisted index up to date with ``kb_dir``; returns (index, change counts)."""
+    changes = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    with FileLock(index_path + '.lock', timeout=LOCK_TIMEOUT_SECONDS):
+        index = {'version': INDEX_VERSION, 'kb_dir': os.path.abspath(kb_dir), 'docs': {}} if full else _load(index_path, kb_dir)
+        docs = index['docs']
+        current = _list_articles(kb_dir)
+        for name in list(docs):
+            if name not in current:
+                del docs[name]
+                changes['removed'] += 1
+        for name, st in sorted(current.items()):
+            stamp = [st.st_size, st.st_mtime_ns]
+            previous = docs.get(name)
+            if previous is not None and previous.get('stamp') == stamp:
+                changes['unchanged'] += 1
+                continue
+            try:
+                with open(os.path.join(kb_dir, name), 'r', encoding='utf-8', errors='ignore') as f:
+                    doc = parse_article(f.read())
+            except OSError:
+                continue
+            doc['stamp'] = stamp
+            docs[name] = doc
+            changes['updated' if previous is not None else 'added'] += 1
+        if full or changes['added'] or changes['updated'] or changes['removed'] or not os.path.isfile(index_path):
+            _save(index, index_path)
+    return index, changes
+
+
+class KnowledgeBaseIndex:
+    """In-memory inverted index over a loaded KB index document."""
+
+    def __init__(self, index: Dict):
+        self.kb_dir = index['kb_dir']
+        self.docs: Dict[str, Dict] = index['docs']
+        self.postings: Dict[str, List[str]] = {}
+        for name, doc in self.docs.items():
+            for term in doc['terms']:
+                self.postings.setdefault(term, []).append(name)
+        total = len(self.docs)
+        self.idf = {term: math.log((1 + total) / (1 + len(names))) + 1.0 for term, names in self.postings.items()}
+        self.norms = {
+            name: math.sqrt(sum((tf * self.idf[term]) ** 2 for term, tf in doc['terms'].items())) or 1.0
+            for name, doc in self.docs.items()
+        }
+
+    @classmethod
+    def load(cls, kb_dir: str = DEFAULT_KB_DIR, index_path: str = DEFAULT_INDEX_PATH) -> 'KnowledgeBaseIndex':
+        """Update the persisted index incrementally and return it ready for queries."""
+        index, _ = update_index(kb_dir, index_path)
+        return cls(index)
+
+    def search(self, errors: Optional[Iterable[str]] = None, stderr: str = '', top: int = DEFAULT_TOP) -> Dict:
+        """Rank articles for a build failure; returns query tokens and the shortlist."""
+        stderr = _LINE_COL_RE.sub(' ', _PATH_RE.sub(' ', (stderr or '')[:STDERR_LIMIT]))
+        codes = list(dict.fromkeys([c.strip().upper() for c in errors or [] if c.strip()] + error_codes(stderr)))
+        query: Dict[str, float] = {}
+        for code in codes:
+            query[code.lower()] = query.get(code.lower(), 0.0) + FIELD_WEIGHTS['code']
+        for term in _terms(stderr):
+            query[term] = query.get(term, 0.0) + FIELD_WEIGHTS['body']
+        scores: Dict[str, float] = {}
+        matched: Dict[str, List[str]] = {}
+        for term, weight in query.items():
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            qw = (1.0 + math.log(weight)) * idf
+            for name in self.postings[term]:
+                scores[name] = scores.get(name, 0.0) + qw * self.docs[name]['terms'][term] * idf
+                matched.setdefault(name, []).append(term)
+        shortlist = []
+        for name, score in scores.items():
+            doc = self.docs[name]
+            code_hits = [c for c in doc['codes'] if c in codes]
+            final = score / self.norms[name] / (math.sqrt(len(query)) or 1.0) + CODE_MATCH_BONUS * len(code_hits)
+            shortlist.append({
+                'kb_file_path': os.path.join(self.kb_dir, name),
+                'title': doc['title'],
+                'score': round(final, 4),
+                'matched_error_codes': code_hits,
+                'matched_terms': sorted(matched[name], key=lambda t: -query[t])[:10],
+                'detection_tokens': doc['detection_tokens'],
+            })
+        shortlist.sort(key=lambda item: (-item['score'], item['kb_file_path']))
+        distinctive = sorted((t for t in query if t in self.idf), key=lambda t: -(query[t] * self.idf[t]))
+        return {
+            'error_codes': codes,
+            'query_tokens': distinctive[:20],
+            'articles_indexed': len(self.docs),
+            'shortlist': shortlist[:max(0, top)],
+        }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Local search index for knowledge_base_markdown.')
+    p.add_argument('--kb-dir', default=DEFAULT_KB_DIR, help='Knowledge base directory (default ./knowledge_base_markdown).')
+    p.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Index file (default ./.cache/kb_index.json).')
+    sub = p.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Create or incrementally refresh the index.')
+    build.add_argument('--full', action='store_true', help='Re-parse every article.')
+    search = sub.add_parser('search', help='Rank KB articles for a build failure.')
+    search.add_argument('--errors', nargs='*', default=[], help='Diagnostic codes from the build (errors[]).')
+    search.add_argument('--stderr', default='', help='Build stderr text.')
+    search.add_argument('--stderr-file', help="Read build stderr from this file ('-' = stdin).")
+    search.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'Shortlist size (default {DEFAULT_TOP}).')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.command == 'build':
+        index, changes = update_index(args.kb_dir, args.index, full=args.full)
+        print(json.dumps({'kb_dir': index['kb_dir'], 'index_path': os.path.abspath(args.index),
+                          'articles_indexed': len(index['docs']), **changes}, indent=2))
+        return 0
+    stderr = args.stderr
+    if args.stderr_file:
+        if args.stderr_file == '-':
+            stderr = sys.stdin.read()
+        else:
+            with open(args.stderr_file, 'r', encoding='utf-8', errors='ignore') as f:
+                stderr = f.read(STDERR_LIMIT * 4)
+    kb = KnowledgeBaseIndex.load(args.kb_dir, args.index)
+    result = kb.search(args.errors, stderr, top=args.top)
+    print(json.dumps({'kb_dir': kb.kb_dir, 'kb_dir_exists': os.path.isdir(kb.kb_dir), **result}, indent=2))
+    return 0
+
+
+__all__ = ['KnowledgeBaseIndex', 'update_index', 'parse_article', 'error_codes', 'DEFAULT_KB_DIR', 'DEFAULT_INDEX_PATH']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Buffered Log Sink
+
+Provides a persistent, thread-safe, buffered writer for the plain-text execution logs
+produced by CopilotExecutor. Instead of reopening the log file for every message, a
+sink keeps one buffered handle open for its lifetime:
+
+  - writes are serialized with a lock, so several threads (stream readers, parallel
+    pipelines sharing a log) never interleave partial messages;
+  - the buffer is flushed explicitly (e.g. on command completion), on writes once
+    ``flush_interval`` has elapsed, and by a background flusher thread that flushes
+    pending output of quiet sinks, so logs stay tail-able during long runs;
+  - like logging.handlers.WatchedFileHandler, a flush reopens the file when it was
+    deleted or replaced (prompts that reset ./output remove logs of the running
+    orchestrator); output buffered since the last flush goes to the old file;
+  - sinks are context managers; ``LogSink.shared(path)`` returns a reference-counted
+    instance per resolved path so concurrent executors on the same file share a handle.
+
+Usage:
+    from log_sink import LogSink
+
+    with LogSink.shared('./output/run.log') as sink:
+        sink.write('hello\n')
+        sink.flush()
+
+Open sinks are flushed and closed at interpreter exit.
+"""
+from __future__ import annotations
+import atexit, os, threading, time, weakref
+from typing import Dict, Optional, TextIO, Tuple
+
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+_registry: Dict[str, 'LogSink'] = {}
+_registry_lock = threading.Lock()
+_open_sinks: 'weakref.WeakSet[LogSink]' = weakref.WeakSet()
+_flusher: Optional[threading.Thread] = None
+
+
+class LogSink:
+    """Thread-safe buffered append-only text log."""
+
+    def __init__(self, path: str, *, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.path = os.path.abspath(str(path))
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._handle: Optional[TextIO] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._refcount = 0
+
+    @classmethod
+    def shared(cls, path: str) -> 'LogSink':
+        """Return the process-wide sink for ``path``, incrementing its reference count."""
+        key = os.path.abspath(str(path))
+        with _registry_lock:
+            sink = _registry.get(key)
+            if sink is None:
+                sink = cls(key)
+                _registry[key] = sink
+            sink._refcount += 1
+            return sink
+
+    def _open(self, mode: str) -> TextIO:
+        parent = os.path.dirname(self.path)
+        if parent and not os.path.isdir(parent):
+            os.makedirs(parent, exist_ok=True)
+        handle = open(self.path, mode, encoding='utf-8', buffering=DEFAULT_BUFFER_SIZE)
+        stat = os.fstat(handle.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        _start_flusher()
+        _open_sinks.add(self)
+        return handle
+
+    def _file_replaced(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def reset(self, header: str = '') -> None:
+        """Truncate the log and optionally write a header."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = self._open('w')
+            if header:
+                self._handle.write(header)
+            self.flush()
+
+    def write(self, message: str) -> None:
+        """Append ``message``; flushes when the flush interval has elapsed."""
+        with self._lock:
+            if self._handle is None:
+                self._handle = self._open('a')
+            self._handle.write(message)
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """Flush buffered output; reopen the path in append mode if the file was deleted or replaced."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+                if self._file_replaced():
+                    self._handle.close()
+                    self._handle = self._open('a')
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    def flush_if_due(self) -> None:
+        """Flush pending output older than ``flush_interval`` (called by the background flusher)."""
+        with self._lock:
+            if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def close(self) -> None:
+        """Flush and close the handle (the sink reopens in append mode if written again)."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+                self._handle.close()
+                self._handle = None
+            self._dirty = False
+            _open_sinks.discard(self)
+
+    def release(self) -> None:
+        """Drop one shared reference; the sink is closed when the last holder releases it."""
+        with _registry_lock:
+            self._refcount -= 1
+            if self._refcount > 0:
+                return
+            self._refcount = 0
+            if _registry.get(self.path) is self:
+                del _registry[self.path]
+        self.close()
+
+    def __enter__(self) -> 'LogSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._refcount:
+            self.release()
+        else:
+            self.close()
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(DEFAULT_FLUSH_INTERVAL / 2)
+        for sink in list(_open_sinks):
+            try:
+                sink.flush_if_due()
+            except Exception:  # pragma: no cover - a failing sink must not stop the others
+                pass
+
+
+def _start_flusher() -> None:
+    global _flusher
+    with _registry_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name='log-sink-flusher', daemon=True)
+            _flusher.start()
+
+
+def _close_all() -> None:
+    with _registry_lock:
+        sinks = list(_registry.values())
+        _registry.clear()
+    for sink in sinks:
+        try:
+            sink.close()
+        except Exception:  # pragma: no cover - best effort at shutdown
+            pass
+
+
+atexit.register(_close_all)
+
+__all__ = ['LogSink']
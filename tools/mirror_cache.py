@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Git Mirror Cache for task-clone-repo
+
+Keeps one bare mirror per remote URL under ./.cache/git_mirrors (outside the directories
+purged by the orchestrators) and creates working trees from it, so repeated clones of the
+same repository only transfer new objects.
+
+    - Mirrors are created with `git clone --mirror` into a temp dir and renamed into place.
+    - Existing mirrors are refreshed with an incremental `git fetch --prune`, skipped when
+      the last fetch is younger than --fresh-seconds (default 300s; retries in the same run
+      do not hit the remote again).
+    - New working trees are `git clone --shared` from the mirror (objects are borrowed via
+      .git/objects/info/alternates, nothing is copied) and `origin` is pointed back at the
+      real remote URL. Mirrors set gc.pruneExpire=never so borrowed objects are never
+      pruned; use --dissociate for a fully independent copy.
+    - Existing working trees are refreshed from the mirror: fetch, `reset --hard` to the
+      mirror's default branch, `clean -fd` (same outcome as reset/clean/pull).
+    - Every mirror operation holds a per-mirror FileLock, so parallel workers and
+      processes share mirrors safely.
+
+CLI (prints a JSON result; exit code 0 on success):
+    python tools/mirror_cache.py clone <repo_url> <dest_dir> [--dissociate]
+    python tools/mirror_cache.py fetch <repo_url>
+    python tools/mirror_cache.py list
+
+Works with any git remote, including file:// URLs (useful for tests and benchmarks).
+"""
+from __future__ import annotations
+import argparse, datetime, hashlib, json, os, re, shutil, subprocess, sys, tempfile, time
+from typing import Dict, List, Optional, Tuple
+
+from file_lock import FileLock
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_MIRROR_ROOT = os.path.join(REPO_ROOT, '.cache', 'git_mirrors')
+DEFAULT_FRESH_SECONDS = 300
+LOCK_TIMEOUT_SECONDS = 1800
+_FETCH_STAMP = 'mirror-fetched'
+_GIT_ENV = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+
+
+class MirrorError(RuntimeError):
+    """Raised when a git operation against a mirror or working tree fails."""
+
+
+def _git(args: List[str], log: List[str], cwd: Optional[str] = None) -> str:
+    """Run git, appending the command and its output to ``log``; raises MirrorError on failure."""
+    proc = subprocess.run(
+        ['git', *args], cwd=cwd, env=_GIT_ENV,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding='utf-8', errors='ignore',
+    )
+    log.append(f"$ git {' '.join(args)}\n{proc.stdout}")
+    if proc.returncode != 0:
+        raise MirrorError(f"git {' '.join(args[:2])} failed with exit code {proc.returncode}")
+    return proc.stdout
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the mirror key (trailing slashes and .git ignored)."""
+    url = url.strip().rstrip('/')
+    return url[:-4] if url.endswith('.git') else url
+
+
+def mirror_path_for(url: str, mirror_root: str = DEFAULT_MIRROR_ROOT) -> str:
+    key = normalize_url(url)
+    digest = hashlib.sha256(key.lower().encode('utf-8')).hexdigest()[:16]
+    name = re.sub(r'[^A-Za-z0-9._-]+', '-', key.rsplit('/', 1)[-1]).strip('-') or 'repo'
+    return os.path.join(mirror_root, f"{name}-{digest}.git")
+
+
+def _fetched_age(mirror: str) -> Optional[float]:
+    try:
+        return time.time() - os.path.getmtime(os.path.join(mirror, _FETCH_STAMP))
+    except OSError:
+        return None
+
+
+def _stamp(mirror: str) -> None:
+    with open(os.path.join(mirror, _FETCH_STAMP), 'w', encoding='utf-8') as f:
+        f.write(datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds') + '\n')
+
+
+def _ensure_mirror_locked(url: str, mirror: str, fresh_seconds: float, log: List[str]) -> str:
+    """Create or refresh ``mirror`` (caller holds its lock); returns CREATED | FETCHED | FRESH."""
+    if os.path.isdir(mirror):
+        age = _fetched_age(mirror)
+        if age is not None and age < fresh_seconds:
+            return 'FRESH'
+        _git(['--git-dir', mirror, 'fetch', '--prune', '--tags', 'origin'], log)
+        _stamp(mirror)
+        return 'FETCHED'
+    parent = os.path.dirname(mirror)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix='.tmp-mirror-', dir=parent)
+    try:
+        _git(['clone', '--mirror', url, tmp], log)
+        # Working trees borrow objects through alternates; never prune them from the mirror.
+        _git(['--git-dir', tmp, 'config', 'gc.pruneExpire', 'never'], log)
+        _stamp(tmp)
+        os.replace(tmp, mirror)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 'CREATED'
+
+
+def ensure_mirror(url: str, *, mirror_root: str = DEFAULT_MIRROR_ROOT, fresh_seconds: float = DEFAULT_FRESH_SECONDS,
+                  log: Optional[List[str]] = None) -> Tuple[str, str]:
+    """Create or refresh the mirror for ``url``; returns (mirror_path, mirror_operation)."""
+    log = log if log is not None else []
+    mirror = mirror_path_for(url, mirror_root)
+    with FileLock(mirror + '.lock', timeout=LOCK_TIMEOUT_SECONDS):
+        return mirror, _ensure_mirror_locked(url, mirror, fresh_seconds, log)
+
+
+def _default_branch(mirror: str, log: List[str]) -> Optional[str]:
+    try:
+        return _git(['--git-dir', mirror, 'symbolic-ref', '--short', 'HEAD'], log).strip() or None
+    except MirrorError:
+        return None
+
+
+def clone_from_mirror(
+    url: str,
+    dest: str,
+    *,
+    mirror_root: str = DEFAULT_MIRROR_ROOT,
+    fresh_seconds: float = DEFAULT_FRESH_SECONDS,
+    dissociate: bool = False,
+) -> Dict[str, object]:
+    """Clone (or refresh) ``dest`` from the mirror of ``url``.
+
+    Returns a result dict with repo_url, repo_directory, mirror_path, operation
+    (CLONE | REFRESH), mirror_operation (CREATED | FETCHED | FRESH), status
+    (SUCCESS | FAIL), git_output and timestamp.
+    """
+    log: List[str] = []
+    dest = os.path.abspath(dest)
+    operation = 'REFRESH' if os.path.exists(dest) else 'CLONE'
+    result: Dict[str, object] = {
+        'repo_url': url,
+        'repo_directory': dest,
+        'mirror_path': mirror_path_for(url, mirror_root),
+        'operation': operation,
+        'mirror_operation': None,
+        'status': 'FAIL',
+    }
+    try:
+        mirror = result['mirror_path']
+        with FileLock(mirror + '.lock', timeout=LOCK_TIMEOUT_SECONDS):
+            result['mirror_operation'] = _ensure_mirror_locked(url, mirror, fresh_seconds, log)
+            branch = _default_branch(mirror, log)
+            if operation == 'CLONE':
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                args = ['clone', '--dissociate', '--reference', mirror] if dissociate else ['clone', '--shared']
+                _git([*args, mirror, dest], log)
+                _git(['-C', dest, 'remote', 'set-url', 'origin', url], log)
+            else:
+                if not os.path.isdir(os.path.join(dest, '.git')):
+                    raise MirrorError(f"{dest} exists but is not a git working tree")
+                _git(['-C', dest, 'fetch', '--prune', mirror, '+refs/heads/*:refs/remotes/origin/*'], log)
+                _git(['-C', dest, 'reset', '--hard', f"origin/{branch}" if branch else 'HEAD'], log)
+                _git(['-C', dest, 'clean', '-fd'], log)
+        result['status'] = 'SUCCESS'
+    except (MirrorError, OSError) as err:
+        log.append(f"ERROR: {err}\n")
+    result['git_output'] = ''.join(log)
+    result['timestamp'] = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    return result
+
+
+def list_mirrors(mirror_root: str = DEFAULT_MIRROR_ROOT) -> List[Dict[str, object]]:
+    mirrors: List[Dict[str, object]] = []
+    if not os.path.isdir(mirror_root):
+        return mirrors
+    for name in sorted(os.listdir(mirror_root)):
+        path = os.path.join(mirror_root, name)
+        if not name.endswith('.git') or not os.path.isdir(path):
+            continue
+        log: List[str] = []
+        try:
+            url = _git(['--git-dir', path, 'config', '--get', 'remote.origin.url'], log).strip()
+        except MirrorError:
+            url = None
+        mirrors.append({'mirror_path': path, 'repo_url': url, 'fetched_age_seconds': _fetched_age(path)})
+    return mirrors
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Shared bare-mirror cache for repository clones.')
+    p.add_argument('--mirror-root', default=DEFAULT_MIRROR_ROOT, help='Mirror directory (default ./.cache/git_mirrors).')
+    p.add_argument('--fresh-seconds', type=float, default=DEFAULT_FRESH_SECONDS, help='Skip fetching mirrors refreshed within this many seconds.')
+    sub = p.add_subparsers(dest='command', required=True)
+    clone = sub.add_parser('clone', help='Clone or refresh a working tree from the mirror.')
+    clone.add_argument('repo_url')
+    clone.add_argument('dest')
+    clone.add_argument('--dissociate', action='store_true', help='Copy objects instead of borrowing them from the mirror.')
+    fetch = sub.add_parser('fetch', help='Create or refresh a mirror.')
+    fetch.add_argument('repo_url')
+    sub.add_parser('list', help='List mirrors.')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.command == 'clone':
+        result = clone_from_mirror(args.repo_url, args.dest, mirror_root=args.mirror_root,
+                                   fresh_seconds=args.fresh_seconds, dissociate=args.dissociate)
+        print(json.dumps(result, indent=2))
+        return 0 if result['status'] == 'SUCCESS' else 1
+    if args.command == 'fetch':
+        log: List[str] = []
+        try:
+            mirror, operation = ensure_mirror(args.repo_url, mirror_root=args.mirror_root, fresh_seconds=args.fresh_seconds, log=log)
+        except MirrorError as err:
+            print(json.dumps({'repo_url': args.repo_url, 'status': 'FAIL', 'error': str(err), 'git_output': ''.join(log)}, indent=2))
+            return 1
+        print(json.dumps({'repo_url': args.repo_url, 'mirror_path': mirror, 'mirror_operation': operation, 'status': 'SUCCESS'}, indent=2))
+        return 0
+    print(json.dumps(list_mirrors(args.mirror_root), indent=2))
+    return 0
+
+
+__all__ = ['ensure_mirror', 'clone_from_mirror', 'mirror_path_for', 'list_mirrors', 'MirrorError', 'DEFAULT_MIRROR_ROOT']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""Native Task Handlers
+
+Registry of Python implementations for prompts that declare themselves SCRIPTABLE.
+pipeline_core.execute_pipeline consults the registry (when one is passed) before invoking
+Copilot: a stage with a registered handler runs in-process, and only if the handler fails
+is the stage re-run through the Copilot prompt, so the prompt stays the reference
+behaviour and the fallback.
+
+Handler contract:
+    handler(params) -> (exit_code, stdout, stderr)
+    - params are the stage params the prompt would receive.
+    - The handler performs the same file effects as the prompt (checklist edits, output
+      JSON) and returns the prompt's JSON contract as stdout.
+    - exit_code 0 means the task succeeded; anything else (or an exception) triggers the
+      Copilot fallback.
+
+Registered handlers:
+    task-clone-repo   clone/refresh through mirror_cache, set {{clone_path}} and
+                      {{repo_directory}} under `## Repo Variables Available`, mark the task
+                      [x], write output/{repo_name}_task1_clone-repo.json and verify.
+    task-find-solutions solution_discovery (pruned scandir walk, cached on HEAD), write
+                      output/{repo_name}_task5_find-solutions.json, set {{solutions_json}}
+                      and {{solutions}} (`A.sln; B.sln`, read by repo readiness), mark [x].
+    task-generate-repo-task-checklists
+                      checklist_generator: render the canonical repo checklists and the
+                      master checklist from the `input` list, rewriting only changed files;
+                      write output/{mode}_task5_generate-repo-checklists.json.
+    task-generate-solution-task-checklists
+                      checklist_generator: one solution checklist per {{solutions_json}}
+                      entry, mark [x], write output/{repo_name}_task5_generate-solution-checklists.json.
+
+Orchestrators enable the registry by default; --no-native forces every stage through Copilot.
+
+CLI (runs one handler outside a pipeline; prints its stdout):
+    python tools/native_tasks.py list
+    python tools/native_tasks.py run task-clone-repo clone_path=./clone_repos checklist_path=tasks/x_repo_checklist.md
+"""
+from __future__ import annotations
+import datetime, json, os, re, sys, tempfile, threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from checklist_utils import ChecklistDocument, parse_variable_line, task_key
+from checklist_generator import generate_repo_checklists, generate_solution_checklists
+from mirror_cache import clone_from_mirror
+from solution_discovery import SolutionCache, discover_solutions
+from stage_cache import resolve_checklist_path
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+OUTPUT_DIR = os.path.join(REPO_ROOT, 'output')
+REPO_VARIABLES_HEADER = '## Repo Variables Available'
+
+NativeResult = Tuple[int, str, str]
+Handler = Callable[[Dict[str, str]], NativeResult]
+
+# Native handlers and Copilot-driven stages may edit the same checklist concurrently
+# (DAG stages of one repo); serialize the read-modify-write cycles made in this process.
+_checklist_lock = threading.Lock()
+
+
+class NativeTaskRegistry:
+    """Maps prompt names (with or without the `task-` prefix) to native handlers."""
+
+    def __init__(self):
+        self._handlers: Dict[str, Handler] = {}
+
+    def register(self, prompt: str, handler: Optional[Handler] = None):
+        """Register ``handler`` for ``prompt``; usable as a decorator when handler is omitted."""
+        if handler is None:
+            return lambda fn: self.register(prompt, fn)
+        self._handlers[task_key(prompt)] = handler
+        return handler
+
+    def handler_for(self, prompt: str) -> Optional[Handler]:
+        return self._handlers.get(task_key(prompt))
+
+    def names(self) -> List[str]:
+        return sorted(self._handlers)
+
+    def run(self, prompt: str, params: Dict[str, str]) -> Optional[NativeResult]:
+        """Run the handler for ``prompt`` (None when not registered); exceptions become exit code 1."""
+        handler = self.handler_for(prompt)
+        if handler is None:
+            return None
+        try:
+            return handler(params)
+        except Exception as err:  # the Copilot prompt is the fallback for any handler error
+            return 1, '', f"{type(err).__name__}: {err}"
+
+
+_registry = NativeTaskRegistry()
+
+
+def get_native_registry() -> NativeTaskRegistry:
+    """Process-wide registry holding the handlers defined in this module."""
+    return _registry
+
+
+def native_task(prompt: str):
+    """Decorator registering a handler in the process-wide registry."""
+    return _registry.register(prompt)
+
+
+def _utc_now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _atomic_write(path: str, text: str) -> None:
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_output_json(filename: str, payload: Dict) -> str:
+    """Write a task's structured output under ./output atomically; returns the path."""
+    path = os.path.join(OUTPUT_DIR, filename)
+    _atomic_write(path, json.dumps(payload, indent=2) + '\n')
+    return path
+
+
+def _task_pattern(task: str) -> re.Pattern:
+    return re.compile(rf"@(?:task-)?{re.escape(task_key(task))}(?![A-Za-z0-9-])")
+
+
+def _variable_line(name: str, value: str) -> str:
+    return f"- {{{{{name}}}}} → {value}".rstrip()
+
+
+def update_checklist(
+    path: str,
+    *,
+    complete_task: Optional[str] = None,
+    variables: Optional[Dict[str, Optional[str]]] = None,
+    section: str = REPO_VARIABLES_HEADER,
+) -> bool:
+    """Mark ``complete_task`` [x] and set ``variables`` in ``section``; returns True if the file changed.
+
+    Existing variable lines are rewritten in place (later duplicates are dropped); missing
+    ones are added after the section's last variable line; a value of None removes the
+    variable's lines. The file is replaced atomically.
+    """
+    with _checklist_lock:
+        with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+            original = f.read()
+        lines = original.split('\n')
+        if complete_task:
+            pattern = _task_pattern(complete_task)
+            for idx, line in enumerate(lines):
+                if line.lstrip().startswith('- [ ]') and pattern.search(line):
+                    lines[idx] = line.replace('- [ ]', '- [x]', 1)
+                    break
+        if variables:
+            lines = _set_variables(lines, variables, section)
+        updated = '\n'.join(lines)
+        if updated == original:
+            return False
+        _atomic_write(path, updated)
+        return True
+
+
+def _set_variables(lines: List[str], variables: Dict[str, Optional[str]], section: str) -> List[str]:
+    header = section.strip().lower()
+    start = next((i for i, line in enumerate(lines) if line.strip().lower().startswith(header)), None)
+    if start is None:
+        if lines and lines[-1] == '':
+            lines = lines[:-1]
+        lines = lines + ['', section] + [_variable_line(n, v) for n, v in variables.items() if v is not None] + ['']
+        return lines
+    end = next((i for i in range(start + 1, len(lines)) if lines[i].lstrip().startswith('#')), len(lines))
+    seen = set()
+    result = lines[:start + 1]
+    last_var = start
+    for idx in range(start + 1, end):
+        parsed = parse_variable_line(lines[idx])
+        if parsed and parsed[0] in variables:
+            if parsed[0] in seen or variables[parsed[0]] is None:
+                seen.add(parsed[0])
+                continue
+            seen.add(parsed[0])
+            result.append(_variable_line(parsed[0], variables[parsed[0]]))
+        else:
+            result.append(lines[idx])
+        if parsed:
+            last_var = len(result) - 1
+    missing = [_variable_line(n, v) for n, v in variables.items() if n not in seen and v is not None]
+    result[last_var + 1:last_var + 1] = missing
+    return result + lines[end:]
+
+
+def verify_checklist(path: str, *, task: Optional[str], done: bool, variables: Dict[str, Optional[str]],
+                     section: str = REPO_VARIABLES_HEADER) -> bool:
+    """Re-read ``path`` and confirm the task state and that each variable appears once with its value."""
+    try:
+        doc = ChecklistDocument.from_file(path)
+    except OSError:
+        return False
+    if task:
+        pattern = _task_pattern(task)
+        states = [line.lstrip().startswith('- [x]') for line in doc.lines if pattern.search(line) and line.lstrip().startswith('- [')]
+        if not states or states[0] != done:
+            return False
+    entries = doc.variable_entries([section])
+    for name, value in variables.items():
+        values = [v for _i, n, v in entries if n == name]
+        if values != ([] if value is None else [value.strip()]):
+            return False
+    return True
+
+
+def _repo_variables(path: str) -> Dict[str, str]:
+    return ChecklistDocument.from_file(path).variables([REPO_VARIABLES_HEADER])
+
+
+def _resolve(path: str) -> str:
+    path = path.replace('\\', '/')
+    return path if os.path.isabs(path) else os.path.join(REPO_ROOT, path)
+
+
+@native_task('task-clone-repo')
+def clone_repo(params: Dict[str, str]) -> NativeResult:
+    """Native task-clone-repo (Steps 1-6 of the prompt)."""
+    checklist = resolve_checklist_path(params)
+    if not checklist or not os.path.isfile(checklist):
+        return 1, '', f"checklist not found: {params.get('checklist_path')}"
+    values = _repo_variables(checklist)
+    repo_url, repo_name = values.get('repo_url', '').strip(), values.get('repo_name', '').strip()
+    if not repo_url or not repo_name:
+        return 1, '', f"repo_url/repo_name missing in {checklist}"
+    clone_path = (params.get('clone_path') or './clone_repos').replace('\\', '/').rstrip('/')
+    repo_directory = f"{clone_path}/{repo_name}"
+    result = clone_from_mirror(repo_url, _resolve(repo_directory))
+    success = result['status'] == 'SUCCESS'
+    variables = {'clone_path': clone_path, 'repo_directory': repo_directory}
+    update_checklist(checklist, complete_task='task-clone-repo' if success else None, variables=variables)
+    verified = verify_checklist(checklist, task='task-clone-repo', done=success, variables=variables)
+    contract = {
+        'repo_url': repo_url,
+        'clone_path': clone_path,
+        'repo_name': repo_name,
+        'repo_directory': repo_directory,
+        'operation': result['operation'],
+        'clone_status': result['status'],
+        'status': 'SUCCESS' if success and verified else 'FAIL',
+        'timestamp': _utc_now(),
+        'git_output': result.get('git_output', ''),
+        'checklist_verified': 'CONFIRMED' if verified else 'FAIL',
+    }
+    write_output_json(f"{repo_name}_task1_clone-repo.json", contract)
+    print(f"[native] task-clone-repo {repo_name}: {result['operation']} via mirror "
+          f"({result.get('mirror_operation')}) -> {contract['status']}")
+    stdout = json.dumps(contract, indent=2)
+    if contract['status'] != 'SUCCESS':
+        return 1, stdout, result.get('git_output', '')[-2000:] or 'checklist verification failed'
+    return 0, stdout, ''
+
+
+@native_task('task-find-solutions')
+def find_solutions_task(params: Dict[str, str]) -> NativeResult:
+    """Native task-find-solutions (Steps 1-6 of the prompt)."""
+    checklist = resolve_checklist_path(params)
+    if not checklist or not os.path.isfile(checklist):
+        return 1, '', f"checklist not found: {params.get('checklist_path')}"
+    values = _repo_variables(checklist)
+    repo_name, repo_directory = values.get('repo_name', '').strip(), values.get('repo_directory', '').strip()
+    if not repo_name or not repo_directory:
+        return 1, '', f"repo_name/repo_directory missing in {checklist}"
+    local_path = _resolve(repo_directory)
+    if not os.path.isdir(local_path):
+        return 1, '', f"repo_directory does not exist: {local_path}"
+    discovery = discover_solutions(local_path, cache=SolutionCache())
+    solutions = discovery['solutions']
+    output_rel = f"output/{repo_name}_task5_find-solutions.json"
+    contract = {
+        'local_path': discovery['repo_directory'],
+        'repo_name': repo_name,
+        'solutions': solutions,
+        'solution_count': len(solutions),
+        'status': 'SUCCESS',
+        'timestamp': _utc_now(),
+    }
+    write_output_json(os.path.basename(output_rel), contract)
+    names = [os.path.basename(path) for path in solutions]
+    variables = {'solutions_json': output_rel, 'solutions': '; '.join(names) if names else None}
+    update_checklist(checklist, complete_task='task-find-solutions', variables=variables)
+    if not verify_checklist(checklist, task='task-find-solutions', done=True, variables=variables):
+        return 1, json.dumps(contract, indent=2), 'checklist verification failed'
+    print(f"[native] task-find-solutions {repo_name}: {len(solutions)} solution(s) "
+          f"(cache {discovery['cache']}, {discovery['elapsed_seconds']}s)")
+    return 0, json.dumps(contract, indent=2), ''
+
+
+@native_task('task-generate-repo-task-checklists')
+def generate_repo_checklists_task(params: Dict[str, str]) -> NativeResult:
+    """Native task-generate-repo-task-checklists (Steps 1-7 of the prompt)."""
+    append = (params.get('append') or '').strip().lower() in ('1', 'true', 'yes')
+    contract = generate_repo_checklists(params.get('input') or 'repositories.txt', append=append)
+    stdout = json.dumps(contract, indent=2)
+    if contract['status'] != 'SUCCESS':
+        return 1, stdout, '; '.join(f"{e['type']}: {e['target']}" for e in contract['verification_errors'])
+    return 0, stdout, ''
+
+
+@native_task('task-generate-solution-task-checklists')
+def generate_solution_checklists_task(params: Dict[str, str]) -> NativeResult:
+    """Native task-generate-solution-task-checklists (Steps 1-6 of the prompt)."""
+    checklist = resolve_checklist_path(params)
+    if not checklist or not os.path.isfile(checklist):
+        return 1, '', f"checklist not found: {params.get('checklist_path')}"
+    result = generate_solution_checklists(checklist)
+    success = not result['errors'] and len(result['checklist_paths']) == result['solutions_total']
+    task = 'task-generate-solution-task-checklists'
+    if success:
+        update_checklist(checklist, complete_task=task)
+    verified = verify_checklist(checklist, task=task, done=success, variables={})
+    contract = {
+        'repo_name': result['repo_name'],
+        'repo_directory': result['repo_directory'],
+        'solutions_total': result['solutions_total'],
+        'checklist_paths': result['checklist_paths'],
+        'status': 'SUCCESS' if success and verified else 'FAIL',
+        'timestamp': _utc_now(),
+        'generated_files': result['generated_files'],
+        'skipped_solutions': result['skipped_solutions'],
+    }
+    if result['repo_name']:
+        write_output_json(f"{result['repo_name']}_task5_generate-solution-checklists.json", contract)
+    print(f"[native] {task} {result['repo_name']}: {len(result['checklist_paths'])}/{result['solutions_total']} "
+          f"checklist(s), {len(result['generated_files'])} written -> {contract['status']}")
+    stdout = json.dumps(contract, indent=2)
+    if contract['status'] != 'SUCCESS':
+        return 1, stdout, '; '.join(result['errors']) or 'checklist verification failed'
+    return 0, stdout, ''
+
+
+def add_native_arguments(parser) -> None:
+    """Register the native-handler flag shared by the orchestrators."""
+    parser.add_argument('--no-native', action='store_true', help='Run every stage through Copilot, ignoring native handlers for scriptable tasks.')
+
+
+def native_tasks_from_args(args) -> Optional[NativeTaskRegistry]:
+    """The process-wide registry, or None when --no-native was given."""
+    if getattr(args, 'no_native', False):
+        print('[native] disabled; all stages run through Copilot.')
+        return None
+    print(f"[native] handlers enabled: {', '.join(_registry.names())}")
+    return _registry
+
+
+def _parse_params(pairs: Iterable[str]) -> Dict[str, str]:
+    params: Dict[str, str] = {}
+    for pair in pairs:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise ValueError(f"expected key=value, got {pair!r}")
+        params[key] = value
+    return params
+
+
+def main(argv: List[str]) -> int:
+    if not argv or argv[0] not in ('list', 'run') or (argv[0] == 'run' and len(argv) < 2):
+        print('usage: native_tasks.py list | run <prompt> key=value ...', file=sys.stderr)
+        return 2
+    if argv[0] == 'list':
+        print('\n'.join(_registry.names()))
+        return 0
+    result = _registry.run(argv[1], _parse_params(argv[2:]))
+    if result is None:
+        print(f"[native] no handler registered for {argv[1]}", file=sys.stderr)
+        return 2
+    exit_code, stdout, stderr = result
+    if stdout:
+        print(stdout)
+    if stderr:
+        print(stderr, file=sys.stderr)
+    return exit_code
+
+
+__all__ = [
+    'NativeTaskRegistry',
+    'get_native_registry',
+    'native_task',
+    'update_checklist',
+    'verify_checklist',
+    'write_output_json',
+    'add_native_arguments',
+    'native_tasks_from_args',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -4,8 +4,12 @@
 Provides shared functionality to execute a sequence of Copilot prompts as a pipeline
 with consistent logging and summary output.
 
-Function:
-    execute_pipeline(pipeline, log_file, continue_on_error, step_by_step, mode, summary_path)
+Functions:
+    execute_pipeline(pipeline, log_file, continue_on_error, step_by_step, mode, summary_path,
+                     stage_cache=None, skipped_stages=None, dependencies=None, max_parallel=1,
+                     events=None, history=None, native_tasks=None)
+    execute_pipeline_async(...)  -- same parameters, awaitable; uses the asyncio executor API
+    topological_order(prompts, prerequisites), critical_path(stage_records)
 
 Parameters:
     pipeline: List of tuples (prompt_name, params_dict) to execute in order.
@@ -14,67 +18,275 @@ Parameters:
     step_by_step: If True, display parameters for each stage (interactive verbosity).
     mode: String describing execution mode (passed through to summary for traceability).
     summary_path: Path to write JSON summary. If None, summary is not written.
+    skipped_stages: Optional records of stages skipped before execution (see plan_resume);
+        written to the summary and used to offset the order of executed stages.
+    stage_cache: Optional StageCache; when provided, stages whose prompt, params, model and
+        pre-stage checklist content match a previous successful run are skipped and the
+        cached post-stage checklist is applied instead (see stage_cache.py).
+    dependencies: Optional stage dependency graph {prompt: [prerequisite prompts]}. When
+        given, stages are scheduled as a DAG: a stage starts once all prerequisites that
+        are part of this run have succeeded (prerequisites absent from the pipeline, e.g.
+        skipped by plan_resume, count as satisfied). A failed stage blocks only its
+        downstream stages (recorded in `blocked_stages`) when continue_on_error is set;
+        otherwise no new stages are started. When omitted, stages run strictly in list
+        order exactly as before.
+    max_parallel: Upper bound on concurrently running stages of a DAG pipeline (default 1:
+        topological order, one stage at a time). Concurrent stages usually edit the same
+        checklist; the stage cache is bypassed while more than one stage may run.
+    events: Optional run_events emitter (EventLog or a bound view); receives pipeline_start,
+        stage_start, stage_finish, stage_blocked and pipeline_finish as they happen.
+    history: Optional run_history.AttemptRecorder; the finished attempt and its stages are
+        stored in the SQLite run-history database.
+    native_tasks: Optional native_tasks.NativeTaskRegistry; stages with a registered handler
+        run in-process (record `runner: native`, no stage cache) and fall back to the Copilot
+        prompt when the handler fails (record `native_fallback: true`).
 
 Return:
     (exit_code, summary_dict) where exit_code is 0 on success and >0 on failure.
+    The summary reports the critical path (longest chain of dependent stage durations)
+    next to the pipeline's elapsed wall time.
+
+Each stage record carries a `metrics` dict (wall/queue seconds, child CPU user/sys
+seconds, peak RSS in KB, stdout/stderr bytes); the summary's `metrics` is their rollup.
+When the executor has a prompt memo, `metrics.memo` is HIT or MISS and the summary's
+`prompt_memo` reports hits, misses and the hit ratio. When a rate limiter retried
+throttled copilot calls, `metrics.throttle_retries` counts them and the summary's
+`throttle_retries` is their total.
 """
 from __future__ import annotations
-import os, json, datetime
-from typing import List, Tuple, Dict, Optional
+import os, json, datetime, time, asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Tuple, Dict, Optional
 
 # Dynamic import to avoid circular path issues
 try:
     from copilot_executor import CopilotExecutor
+    from stage_cache import StageCache, cached_stage_result, resolve_checklist_path
+    from checklist_utils import read_task_states, task_key
+    from pipeline_metrics import rollup_stages
+    from worker_output import current_prefix, install_prefixed_stdout, worker_prefix
 except ImportError:
     # Allow relative execution if path not yet injected
     raise
 
 UTC = datetime.timezone.utc
 
-def execute_pipeline(
-    pipeline: List[Tuple[str, Dict[str, str]]],
-    log_file: str,
-    continue_on_error: bool,
-    step_by_step: bool,
-    mode: str,
-    summary_path: Optional[str]
-) -> Tuple[int, Dict]:
-    """Execute a linear sequence of Copilot prompts and produce a structured summary."""
-    executor = CopilotExecutor(log_file=log_file, debug=False)
-    executor.initialize_log('Pipeline Execution Log')
 
-    results: List[Dict] = []
-    overall_status = 'SUCCESS'
+def _announce_stage(idx: int, total: int, prompt: str, params: Dict[str, str], step_by_step: bool) -> str:
+    """Print the stage banner and return the stage start timestamp."""
+    ts = datetime.datetime.now(UTC).isoformat(timespec='seconds')
+    print(f"\n[stage {idx}/{total}] /{prompt}")
+    if step_by_step:
+        print("  Parameters:")
+        for k, v in params.items():
+            print(f"    - {k} = {v}")
+    print(f"[execute] Executing /{prompt} ...")
+    return ts
 
-    print(f"[mode] Execution mode: {mode}")
-    for idx, (prompt, params) in enumerate(pipeline, start=1):
-        ts = datetime.datetime.now(UTC).isoformat(timespec='seconds')
-        print(f"\n[stage {idx}/{len(pipeline)}] /{prompt}")
-        if step_by_step:
-            print("  Parameters:")
-            for k, v in params.items():
-                print(f"    - {k} = {v}")
-        print(f"[execute] Executing /{prompt} ...")
-        exit_code, stdout, stderr = executor.execute_prompt(prompt_name=prompt, params=params)
-        stage_status = 'SUCCESS' if exit_code == 0 else 'FAIL'
-        results.append({
+
+def _stage_metrics(executor: CopilotExecutor, stage_started: float, executed: bool) -> Dict:
+    """Metrics for a finished stage: the executor's command metrics, or wall time only for skipped execution."""
+    if executed and executor.last_metrics:
+        return dict(executor.last_metrics)
+    return {
+        'wall_seconds': round(time.perf_counter() - stage_started, 3),
+        'queue_wait_seconds': 0.0,
+        'cpu_user_seconds': None,
+        'cpu_system_seconds': None,
+        'max_rss_kb': None,
+        'stdout_bytes': 0,
+        'stderr_bytes': 0,
+        'rusage_scope': None,
+    }
+
+
+def _run_native(native_tasks, prompt: str, params: Dict[str, str]) -> Tuple[Optional[Tuple[int, str, str]], bool]:
+    """Return (native_result, fell_back); the result is None when Copilot must run the stage."""
+    if native_tasks is None or native_tasks.handler_for(prompt) is None:
+        return None, False
+    result = native_tasks.run(prompt, params)
+    if result[0] == 0:
+        print(f"[native] /{prompt} completed without Copilot.")
+        return result, False
+    detail = (result[2] or '').strip().splitlines()
+    print(f"[native] /{prompt} failed natively (exit_code={result[0]}{': ' + detail[-1] if detail else ''}); falling back to the Copilot prompt.")
+    return None, True
+
+
+def _stage_record(
+    idx: int,
+    prompt: str,
+    params: Dict[str, str],
+    ts: str,
+    exit_code: int,
+    stdout: str,
+    stderr: str,
+    metrics: Optional[Dict] = None,
+) -> Dict:
+    """Build the summary record for a finished stage."""
+    return {
+        'order': idx,
+        'prompt': prompt,
+        'params': params,
+        'exit_code': exit_code,
+        'timestamp': ts,
+        'stage_status': 'SUCCESS' if exit_code == 0 else 'FAIL',
+        'stdout_excerpt': (stdout[:400] if stdout else ''),
+        'stderr_excerpt': (stderr[:400] if stderr else ''),
+        'metrics': metrics or {},
+    }
+
+
+def plan_resume(
+    pipeline: List[Tuple[str, Dict[str, str]]],
+    checklist_path: Optional[str] = None,
+) -> Tuple[List[Tuple[str, Dict[str, str]]], List[Dict]]:
+    """Split a pipeline into (remaining_stages, skipped_records) for a retry pass.
+
+    Leading stages whose checklist task (`@task-*` line matching the prompt name) is
+    already marked `[x]` are skipped; execution resumes at the first stage whose task is
+    incomplete or not present in the checklist. If every stage is already complete the
+    full pipeline is returned, since completed tasks alone did not produce readiness.
+    """
+    if not pipeline:
+        return pipeline, []
+    path = checklist_path or resolve_checklist_path(pipeline[0][1])
+    states = {task_key(name): done for name, done in read_task_states(path).items()} if path else {}
+    resume_at = 0
+    for prompt, _params in pipeline:
+        if not states.get(task_key(prompt)):
+            break
+        resume_at += 1
+    if resume_at == len(pipeline):
+        print("[resume] All pipeline tasks already marked complete; rerunning full pipeline.")
+        return pipeline, []
+    skipped = [
+        {
             'order': idx,
             'prompt': prompt,
             'params': params,
-            'exit_code': exit_code,
-            'timestamp': ts,
-            'stage_status': stage_status,
-            'stdout_excerpt': (stdout[:400] if stdout else ''),
-            'stderr_excerpt': (stderr[:400] if stderr else ''),
-        })
-        if exit_code != 0:
-            print(f"[error] Prompt /{prompt} failed (exit_code={exit_code}).")
-            overall_status = 'FAIL'
-            if not continue_on_error:
-                break
-            else:
-                print('[warn] continue-on-error enabled; proceeding to next prompt.')
+            'stage_status': 'SKIPPED',
+            'reason': 'task already marked [x] in checklist',
+        }
+        for idx, (prompt, params) in enumerate(pipeline[:resume_at], start=1)
+    ]
+    for record in skipped:
+        print(f"[resume] Skipping /{record['prompt']} (task already complete).")
+    return pipeline[resume_at:], skipped
+
+
+def _check_stage_cache(
+    stage_cache: Optional[StageCache],
+    prompt: str,
+    params: Dict[str, str],
+) -> Tuple[Optional[str], Optional[Tuple[int, str, str]]]:
+    """Return (cache_key, cached_result); cached_result is set only on a verified hit."""
+    if stage_cache is None:
+        return None, None
+    key = stage_cache.key_for(prompt, params)
+    if key is None:
+        return None, None
+    entry = stage_cache.lookup(key)
+    if entry is None:
+        return key, None
+    if not stage_cache.apply(entry, params):
+        print(f"[stage-cache] cached post-state for /{prompt} failed verification; executing stage.")
+        return key, None
+    print(f"[stage-cache] HIT /{prompt}; cached post-stage checklist applied, execution skipped.")
+    return key, cached_stage_result(entry)
 
+
+def _record_cache_status(record: Dict, stage_cache: Optional[StageCache], key: Optional[str], cached: bool) -> None:
+    if stage_cache is None:
+        return
+    record['cache_status'] = 'HIT' if cached else ('MISS' if key else 'UNCACHEABLE')
+
+
+def _record_runner(record: Dict, native: bool, fell_back: bool) -> None:
+    if native:
+        record['runner'] = 'native'
+    elif fell_back:
+        record['native_fallback'] = True
+
+
+Dependencies = Dict[str, List[str]]
+
+
+def topological_order(prompts: List[str], prerequisites: Dependencies) -> List[str]:
+    """Order prompts so prerequisites come first, keeping list order among independent stages.
+
+    Raises:
+        ValueError: if the dependency graph has a cycle.
+    """
+    remaining = list(prompts)
+    done: set = set()
+    ordered: List[str] = []
+    while remaining:
+        ready = next((p for p in remaining if all(d in done for d in prerequisites.get(p, []))), None)
+        if ready is None:
+            raise ValueError(f"Stage dependency cycle among: {', '.join(map(str, remaining))}")
+        remaining.remove(ready)
+        done.add(ready)
+        ordered.append(ready)
+    return ordered
+
+
+def _stage_prerequisites(pipeline: List[Tuple[str, Dict[str, str]]], dependencies: Dependencies) -> Dependencies:
+    """Prerequisites per stage restricted to stages present in this run (validated acyclic)."""
+    prompts = [prompt for prompt, _ in pipeline]
+    if len(set(prompts)) != len(prompts):
+        raise ValueError('Dependency-scheduled pipelines require unique prompt names per stage.')
+    present = set(prompts)
+    prerequisites = {p: [d for d in dependencies.get(p, []) if d in present] for p in prompts}
+    topological_order(prompts, prerequisites)
+    return prerequisites
+
+
+def critical_path(results: List[Dict]) -> Dict:
+    """Longest chain of dependent executed stages by wall time.
+
+    Stages are keyed by their `order` index, so a pipeline may run the same prompt more
+    than once. Stages without a `depends_on` field are treated as depending on the
+    previous stage (linear pipelines), so the critical path of a linear pipeline is the
+    whole pipeline; `depends_on` prompt names (DAG pipelines, unique prompts) are resolved
+    to the index of the stage running that prompt.
+    """
+    ordered_records = sorted(results, key=lambda r: r['order'])
+    by_order = {r['order']: r for r in ordered_records}
+    order_of_prompt = {r['prompt']: r['order'] for r in ordered_records}
+    prerequisites: Dict[int, List[int]] = {}
+    previous: Optional[int] = None
+    for record in ordered_records:
+        if 'depends_on' in record:
+            deps = [order_of_prompt[d] for d in record['depends_on'] if d in order_of_prompt]
+        else:
+            deps = [previous] if previous is not None else []
+        prerequisites[record['order']] = deps
+        previous = record['order']
+    best: Dict[int, Tuple[float, List[int]]] = {}
+    for order in topological_order(list(by_order), prerequisites):
+        wall = (by_order[order].get('metrics') or {}).get('wall_seconds') or 0.0
+        base_seconds, base_path = max(
+            (best[d] for d in prerequisites[order] if d in best), key=lambda item: item[0], default=(0.0, [])
+        )
+        best[order] = (base_seconds + wall, base_path + [order])
+    seconds, path = max(best.values(), key=lambda item: item[0], default=(0.0, []))
+    return {'stages': [by_order[order]['prompt'] for order in path], 'seconds': round(seconds, 3)}
+
+
+def _finish_pipeline(
+    results: List[Dict],
+    overall_status: str,
+    mode: str,
+    summary_path: Optional[str],
+    stage_cache: Optional[StageCache] = None,
+    skipped_stages: Optional[List[Dict]] = None,
+    blocked_stages: Optional[List[Dict]] = None,
+    elapsed_seconds: Optional[float] = None,
+    max_parallel: int = 1,
+) -> Tuple[int, Dict]:
+    """Assemble the pipeline summary, optionally write it, and derive the exit code."""
+    results = sorted(results, key=lambda r: r['order'])
     summary = {
         'pipeline': results,
         'overall_status': overall_status,
@@ -82,7 +294,36 @@ def execute_pipeline(
         'failed_stages': [r for r in results if r['stage_status'] == 'FAIL'],
         'timestamp': datetime.datetime.now(UTC).isoformat(timespec='seconds'),
         'mode': mode,
+        'metrics': rollup_stages(results),
+        'critical_path': critical_path(results),
+        'max_parallel': max_parallel,
     }
+    if elapsed_seconds is not None:
+        summary['elapsed_seconds'] = round(elapsed_seconds, 3)
+    if skipped_stages:
+        summary['skipped_stages'] = skipped_stages
+    if blocked_stages:
+        summary['blocked_stages'] = blocked_stages
+    native = sum(1 for r in results if r.get('runner') == 'native')
+    fallbacks = sum(1 for r in results if r.get('native_fallback'))
+    if native or fallbacks:
+        summary['native_tasks'] = {'completed': native, 'fallbacks': fallbacks}
+    if stage_cache is not None:
+        summary['stage_cache'] = {
+            'hits': sum(1 for r in results if r.get('cache_status') == 'HIT'),
+            'misses': sum(1 for r in results if r.get('cache_status') == 'MISS'),
+        }
+    memo_hits = sum(1 for r in results if (r.get('metrics') or {}).get('memo') == 'HIT')
+    memo_misses = sum(1 for r in results if (r.get('metrics') or {}).get('memo') == 'MISS')
+    if memo_hits or memo_misses:
+        summary['prompt_memo'] = {
+            'hits': memo_hits,
+            'misses': memo_misses,
+            'hit_ratio': round(memo_hits / (memo_hits + memo_misses), 3),
+        }
+    throttle_retries = sum((r.get('metrics') or {}).get('throttle_retries') or 0 for r in results)
+    if throttle_retries:
+        summary['throttle_retries'] = throttle_retries
 
     if summary_path:
         os.makedirs(os.path.dirname(summary_path), exist_ok=True)
@@ -93,4 +334,371 @@ def execute_pipeline(
     exit_code_final = 0 if overall_status == 'SUCCESS' else 1
     return exit_code_final, summary
 
-__all__ = ['execute_pipeline']
+
+def _emit_stage_start(events, idx: int, prompt: str, params: Dict[str, str]) -> None:
+    if events is not None:
+        events.emit('stage_start', order=idx, prompt=prompt, params=params)
+
+
+def _emit_stage_finish(events, record: Dict) -> None:
+    if events is not None:
+        events.emit(
+            'stage_finish',
+            order=record['order'],
+            prompt=record['prompt'],
+            stage_status=record['stage_status'],
+            exit_code=record['exit_code'],
+            cache_status=record.get('cache_status'),
+            runner=record.get('runner', 'copilot'),
+            wall_seconds=(record.get('metrics') or {}).get('wall_seconds'),
+            termination=(record.get('metrics') or {}).get('termination'),
+        )
+
+
+def _run_stage(
+    executor: CopilotExecutor,
+    idx: int,
+    total: int,
+    prompt: str,
+    params: Dict[str, str],
+    step_by_step: bool,
+    stage_cache: Optional[StageCache],
+    events=None,
+    native_tasks=None,
+) -> Dict:
+    """Execute (natively, from cache or through Copilot) one stage and return its summary record."""
+    ts = _announce_stage(idx, total, prompt, params, step_by_step)
+    _emit_stage_start(events, idx, prompt, params)
+    stage_started = time.perf_counter()
+    native, fell_back = _run_native(native_tasks, prompt, params)
+    cache_key, cached = (None, None) if native is not None else _check_stage_cache(stage_cache, prompt, params)
+    if native is not None:
+        exit_code, stdout, stderr = native
+    elif cached is not None:
+        exit_code, stdout, stderr = cached
+    else:
+        exit_code, stdout, stderr = executor.execute_prompt(prompt_name=prompt, params=params)
+        if cache_key is not None:
+            stage_cache.store(cache_key, prompt, params, exit_code)
+    metrics = _stage_metrics(executor, stage_started, executed=native is None and cached is None)
+    record = _stage_record(idx, prompt, params, ts, exit_code, stdout, stderr, metrics)
+    _record_runner(record, native is not None, fell_back)
+    if native is None:
+        _record_cache_status(record, stage_cache, cache_key, cached is not None)
+    _emit_stage_finish(events, record)
+    # Stage boundary: flush the log, reopening it if the stage reset ./output.
+    executor.sink.flush()
+    return record
+
+
+async def _run_stage_async(
+    executor: CopilotExecutor,
+    idx: int,
+    total: int,
+    prompt: str,
+    params: Dict[str, str],
+    step_by_step: bool,
+    stage_cache: Optional[StageCache],
+    events=None,
+    native_tasks=None,
+) -> Dict:
+    """Asyncio counterpart of _run_stage (native handlers run in the default thread pool)."""
+    ts = _announce_stage(idx, total, prompt, params, step_by_step)
+    _emit_stage_start(events, idx, prompt, params)
+    stage_started = time.perf_counter()
+    native, fell_back = None, False
+    if native_tasks is not None and native_tasks.handler_for(prompt) is not None:
+        native, fell_back = await asyncio.get_running_loop().run_in_executor(None, _run_native, native_tasks, prompt, params)
+    cache_key, cached = (None, None) if native is not None else _check_stage_cache(stage_cache, prompt, params)
+    if native is not None:
+        exit_code, stdout, stderr = native
+    elif cached is not None:
+        exit_code, stdout, stderr = cached
+    else:
+        exit_code, stdout, stderr = await executor.execute_prompt_async(prompt_name=prompt, params=params)
+        if cache_key is not None:
+            stage_cache.store(cache_key, prompt, params, exit_code)
+    metrics = _stage_metrics(executor, stage_started, executed=native is None and cached is None)
+    record = _stage_record(idx, prompt, params, ts, exit_code, stdout, stderr, metrics)
+    _record_runner(record, native is not None, fell_back)
+    if native is None:
+        _record_cache_status(record, stage_cache, cache_key, cached is not None)
+    _emit_stage_finish(events, record)
+    # Stage boundary: flush the log, reopening it if the stage reset ./output.
+    executor.sink.flush()
+    return record
+
+
+class _DagState:
+    """Bookkeeping shared by the thread and asyncio DAG schedulers."""
+
+    def __init__(self, pipeline: List[Tuple[str, Dict[str, str]]], prerequisites: Dependencies,
+                 offset: int, continue_on_error: bool, events=None):
+        self.stages = {prompt: (idx, prompt, params) for idx, (prompt, params) in enumerate(pipeline, start=offset + 1)}
+        self.prerequisites = prerequisites
+        self.pending: List[str] = topological_order([p for p, _ in pipeline], prerequisites)
+        self.continue_on_error = continue_on_error
+        self.events = events
+        self.succeeded: set = set()
+        self.unusable: set = set()  # failed or blocked
+        self.results: List[Dict] = []
+        self.blocked: List[Dict] = []
+        self.stopped = False
+
+    def take_ready(self) -> Optional[str]:
+        """Pop the next stage whose prerequisites all succeeded, blocking doomed stages first."""
+        for prompt in list(self.pending):
+            failed_deps = [d for d in self.prerequisites[prompt] if d in self.unusable]
+            if failed_deps:
+                self.pending.remove(prompt)
+                self.unusable.add(prompt)
+                idx, _, params = self.stages[prompt]
+                self.blocked.append({
+                    'order': idx,
+                    'prompt': prompt,
+                    'params': params,
+                    'stage_status': 'BLOCKED',
+                    'blocked_by': failed_deps,
+                })
+                print(f"[dag] /{prompt} blocked by failed prerequisite(s): {', '.join(failed_deps)}")
+                if self.events is not None:
+                    self.events.emit('stage_blocked', order=idx, prompt=prompt, blocked_by=failed_deps)
+        if self.stopped:
+            return None
+        for prompt in self.pending:
+            if all(d in self.succeeded for d in self.prerequisites[prompt]):
+                self.pending.remove(prompt)
+                return prompt
+        return None
+
+    def finish(self, record: Dict) -> None:
+        prompt = record['prompt']
+        record['depends_on'] = self.prerequisites[prompt]
+        self.results.append(record)
+        if record['stage_status'] == 'SUCCESS':
+            self.succeeded.add(prompt)
+            return
+        self.unusable.add(prompt)
+        print(f"[error] Prompt /{prompt} failed (exit_code={record['exit_code']}).")
+        if self.continue_on_error:
+            print('[warn] continue-on-error enabled; blocking dependent stages, independent branches continue.')
+        else:
+            self.stopped = True
+
+
+def _execute_dag(
+    executor: CopilotExecutor,
+    state: _DagState,
+    max_parallel: int,
+    run_stage: Callable[[CopilotExecutor, int, str, Dict[str, str]], Dict],
+) -> None:
+    """Thread-based DAG scheduler; each concurrent stage gets its own executor (shared log sink)."""
+    if max_parallel <= 1:
+        prompt = state.take_ready()
+        while prompt is not None:
+            idx, _, params = state.stages[prompt]
+            state.finish(run_stage(executor, idx, prompt, params))
+            prompt = state.take_ready()
+        return
+
+    install_prefixed_stdout()
+    parent_prefix = current_prefix()
+
+    def run_in_worker(idx: int, prompt: str, params: Dict[str, str]) -> Dict:
+        with worker_prefix(f"{parent_prefix}[{prompt}] "), CopilotExecutor(log_file=str(executor.log_file), debug=False) as stage_executor:
+            return run_stage(stage_executor, idx, prompt, params)
+
+    running: Dict = {}
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix='stage-worker') as pool:
+        while True:
+            while len(running) < max_parallel:
+                prompt = state.take_ready()
+                if prompt is None:
+                    break
+                idx, _, params = state.stages[prompt]
+                running[pool.submit(run_in_worker, idx, prompt, params)] = prompt
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                state.finish(future.result())
+
+
+async def _execute_dag_async(
+    executor: CopilotExecutor,
+    state: _DagState,
+    max_parallel: int,
+    run_stage,
+) -> None:
+    """Asyncio DAG scheduler; concurrent stages use their own executors (shared log sink)."""
+
+    async def run_in_task(idx: int, prompt: str, params: Dict[str, str]) -> Dict:
+        if max_parallel <= 1:
+            return await run_stage(executor, idx, prompt, params)
+        with CopilotExecutor(log_file=str(executor.log_file), debug=False) as stage_executor:
+            return await run_stage(stage_executor, idx, prompt, params)
+
+    running: Dict = {}
+    try:
+        while True:
+            while len(running) < max(1, max_parallel):
+                prompt = state.take_ready()
+                if prompt is None:
+                    break
+                idx, _, params = state.stages[prompt]
+                running[asyncio.ensure_future(run_in_task(idx, prompt, params))] = prompt
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.pop(task)
+                state.finish(task.result())
+    except asyncio.CancelledError:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
+
+
+def _effective_stage_cache(stage_cache: Optional[StageCache], dependencies: Optional[Dependencies], max_parallel: int) -> Optional[StageCache]:
+    if stage_cache is not None and dependencies is not None and max_parallel > 1:
+        print('[stage-cache] bypassed: concurrent stages share one checklist, so pre-stage content is not a stable key.')
+        return None
+    return stage_cache
+
+
+def execute_pipeline(
+    pipeline: List[Tuple[str, Dict[str, str]]],
+    log_file: str,
+    continue_on_error: bool,
+    step_by_step: bool,
+    mode: str,
+    summary_path: Optional[str],
+    stage_cache: Optional[StageCache] = None,
+    skipped_stages: Optional[List[Dict]] = None,
+    dependencies: Optional[Dependencies] = None,
+    max_parallel: int = 1,
+    events=None,
+    history=None,
+    native_tasks=None,
+) -> Tuple[int, Dict]:
+    """Execute Copilot prompts (in order, or as a dependency DAG) and produce a structured summary."""
+    results: List[Dict] = []
+    blocked: List[Dict] = []
+    overall_status = 'SUCCESS'
+    started = time.perf_counter()
+    stage_cache = _effective_stage_cache(stage_cache, dependencies, max_parallel)
+    prerequisites = _stage_prerequisites(pipeline, dependencies) if dependencies is not None else None
+
+    with CopilotExecutor(log_file=log_file, debug=False) as executor:
+        executor.initialize_log('Pipeline Execution Log')
+        print(f"[mode] Execution mode: {mode}")
+        offset = len(skipped_stages or [])
+        total = offset + len(pipeline)
+        if events is not None:
+            events.emit('pipeline_start', mode=mode, stages=[p for p, _ in pipeline],
+                        skipped=[s['prompt'] for s in skipped_stages or []], max_parallel=max_parallel)
+        if prerequisites is not None:
+            if max_parallel > 1:
+                print(f"[dag] Scheduling {len(pipeline)} stage(s) with up to {max_parallel} in parallel.")
+            state = _DagState(pipeline, prerequisites, offset, continue_on_error, events)
+            _execute_dag(
+                executor, state, max_parallel,
+                lambda ex, idx, prompt, params: _run_stage(ex, idx, total, prompt, params, step_by_step, stage_cache, events, native_tasks),
+            )
+            results, blocked = state.results, state.blocked
+            if any(r['stage_status'] == 'FAIL' for r in results):
+                overall_status = 'FAIL'
+        else:
+            for idx, (prompt, params) in enumerate(pipeline, start=offset + 1):
+                record = _run_stage(executor, idx, total, prompt, params, step_by_step, stage_cache, events, native_tasks)
+                results.append(record)
+                if record['exit_code'] != 0:
+                    print(f"[error] Prompt /{prompt} failed (exit_code={record['exit_code']}).")
+                    overall_status = 'FAIL'
+                    if not continue_on_error:
+                        break
+                    else:
+                        print('[warn] continue-on-error enabled; proceeding to next prompt.')
+
+    if events is not None:
+        events.emit('pipeline_finish', overall_status=overall_status, elapsed_seconds=round(time.perf_counter() - started, 3))
+    exit_code, summary = _finish_pipeline(
+        results, overall_status, mode, summary_path, stage_cache, skipped_stages,
+        blocked, time.perf_counter() - started, max_parallel,
+    )
+    if history is not None:
+        history.record_pipeline(exit_code, summary, summary_path)
+    return exit_code, summary
+
+
+async def execute_pipeline_async(
+    pipeline: List[Tuple[str, Dict[str, str]]],
+    log_file: str,
+    continue_on_error: bool,
+    step_by_step: bool,
+    mode: str,
+    summary_path: Optional[str],
+    stage_cache: Optional[StageCache] = None,
+    skipped_stages: Optional[List[Dict]] = None,
+    dependencies: Optional[Dependencies] = None,
+    max_parallel: int = 1,
+    events=None,
+    history=None,
+    native_tasks=None,
+) -> Tuple[int, Dict]:
+    """Asyncio variant of execute_pipeline.
+
+    Without dependencies, stages of one pipeline run in order; concurrency comes from
+    awaiting many pipelines together (e.g. with asyncio.gather), bounded by the executor's
+    shared async semaphore. With dependencies, independent stages run as concurrent tasks
+    (up to max_parallel). Cancelling the task kills the in-flight copilot processes.
+    """
+    results: List[Dict] = []
+    blocked: List[Dict] = []
+    overall_status = 'SUCCESS'
+    started = time.perf_counter()
+    stage_cache = _effective_stage_cache(stage_cache, dependencies, max_parallel)
+    prerequisites = _stage_prerequisites(pipeline, dependencies) if dependencies is not None else None
+
+    with CopilotExecutor(log_file=log_file, debug=False) as executor:
+        executor.initialize_log('Pipeline Execution Log')
+        print(f"[mode] Execution mode: {mode}")
+        offset = len(skipped_stages or [])
+        total = offset + len(pipeline)
+        if events is not None:
+            events.emit('pipeline_start', mode=mode, stages=[p for p, _ in pipeline],
+                        skipped=[s['prompt'] for s in skipped_stages or []], max_parallel=max_parallel)
+        if prerequisites is not None:
+            state = _DagState(pipeline, prerequisites, offset, continue_on_error, events)
+            await _execute_dag_async(
+                executor, state, max_parallel,
+                lambda ex, idx, prompt, params: _run_stage_async(ex, idx, total, prompt, params, step_by_step, stage_cache, events, native_tasks),
+            )
+            results, blocked = state.results, state.blocked
+            if any(r['stage_status'] == 'FAIL' for r in results):
+                overall_status = 'FAIL'
+        else:
+            for idx, (prompt, params) in enumerate(pipeline, start=offset + 1):
+                record = await _run_stage_async(executor, idx, total, prompt, params, step_by_step, stage_cache, events, native_tasks)
+                results.append(record)
+                if record['exit_code'] != 0:
+                    print(f"[error] Prompt /{prompt} failed (exit_code={record['exit_code']}).")
+                    overall_status = 'FAIL'
+                    if not continue_on_error:
+                        break
+                    else:
+                        print('[warn] continue-on-error enabled; proceeding to next prompt.')
+
+    if events is not None:
+        events.emit('pipeline_finish', overall_status=overall_status, elapsed_seconds=round(time.perf_counter() - started, 3))
+    exit_code, summary = _finish_pipeline(
+        results, overall_status, mode, summary_path, stage_cache, skipped_stages,
+        blocked, time.perf_counter() - started, max_parallel,
+    )
+    if history is not None:
+        history.record_pipeline(exit_code, summary, summary_path)
+    return exit_code, summary
+
+__all__ = ['execute_pipeline', 'execute_pipeline_async', 'plan_resume', 'topological_order', 'critical_path']
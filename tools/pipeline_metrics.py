@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Pipeline Metrics Rollups
+
+Aggregates the per-stage `metrics` records produced by pipeline_core (wall time, queue
+wait, child CPU user/sys time, peak RSS, stdout/stderr bytes) into per-pipeline,
+per-repository and per-run totals, and exports them as a Prometheus textfile
+(node_exporter textfile-collector format).
+
+Functions:
+    rollup_stages(stages) -> Dict            totals for a list of stage records
+    merge_rollups(rollups) -> Dict           combine several rollups
+    per_prompt_rollup(stages) -> Dict        totals keyed by prompt name
+    write_prometheus_textfile(path, run_metrics, repo_metrics)
+"""
+from __future__ import annotations
+import os, tempfile
+from typing import Dict, Iterable, List, Optional
+
+# Summed counters; max_rss_kb is a maximum and stage_count a count.
+SUM_FIELDS = (
+    'wall_seconds',
+    'queue_wait_seconds',
+    'cpu_user_seconds',
+    'cpu_system_seconds',
+    'stdout_bytes',
+    'stderr_bytes',
+)
+
+
+def _empty_rollup() -> Dict:
+    rollup: Dict = {field: 0.0 for field in SUM_FIELDS}
+    rollup['stdout_bytes'] = 0
+    rollup['stderr_bytes'] = 0
+    rollup['max_rss_kb'] = None
+    rollup['max_stage_wall_seconds'] = 0.0
+    rollup['stage_count'] = 0
+    return rollup
+
+
+def _add(rollup: Dict, metrics: Dict, stage_wall: float) -> None:
+    for field in SUM_FIELDS:
+        value = metrics.get(field)
+        if value is not None:
+            rollup[field] += value
+    rss = metrics.get('max_rss_kb')
+    if rss is not None:
+        rollup['max_rss_kb'] = rss if rollup['max_rss_kb'] is None else max(rollup['max_rss_kb'], rss)
+    rollup['max_stage_wall_seconds'] = max(rollup['max_stage_wall_seconds'], stage_wall)
+
+
+def _finalize(rollup: Dict) -> Dict:
+    for field in ('wall_seconds', 'queue_wait_seconds', 'cpu_user_seconds', 'cpu_system_seconds', 'max_stage_wall_seconds'):
+        rollup[field] = round(rollup[field], 3)
+    return rollup
+
+
+def rollup_stages(stages: Iterable[Dict]) -> Dict:
+    """Sum the metrics of stage records (records without metrics are ignored)."""
+    rollup = _empty_rollup()
+    for stage in stages:
+        metrics = stage.get('metrics')
+        if not metrics:
+            continue
+        rollup['stage_count'] += 1
+        _add(rollup, metrics, metrics.get('wall_seconds') or 0.0)
+    return _finalize(rollup)
+
+
+def merge_rollups(rollups: Iterable[Dict]) -> Dict:
+    """Combine rollups produced by rollup_stages/merge_rollups."""
+    merged = _empty_rollup()
+    for rollup in rollups:
+        merged['stage_count'] += rollup.get('stage_count', 0)
+        _add(merged, rollup, rollup.get('max_stage_wall_seconds', 0.0))
+    return _finalize(merged)
+
+
+def per_prompt_rollup(stages: Iterable[Dict]) -> Dict[str, Dict]:
+    """Rollups keyed by prompt name, ordered by total wall time (descending)."""
+    grouped: Dict[str, List[Dict]] = {}
+    for stage in stages:
+        grouped.setdefault(stage.get('prompt', '<unknown>'), []).append(stage)
+    rollups = {prompt: rollup_stages(items) for prompt, items in grouped.items()}
+    return dict(sorted(rollups.items(), key=lambda kv: kv[1]['wall_seconds'], reverse=True))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_PROM_FIELDS = (
+    ('wall_seconds', 'Total stage wall-clock seconds'),
+    ('queue_wait_seconds', 'Total seconds stages waited before starting'),
+    ('cpu_user_seconds', 'Total child user CPU seconds'),
+    ('cpu_system_seconds', 'Total child system CPU seconds'),
+    ('max_rss_kb', 'Peak child resident set size in kilobytes'),
+    ('stdout_bytes', 'Total stdout bytes produced'),
+    ('stderr_bytes', 'Total stderr bytes produced'),
+    ('stage_count', 'Number of executed stages'),
+)
+
+
+def write_prometheus_textfile(
+    path: str,
+    run_metrics: Dict,
+    repo_metrics: Optional[Dict[str, Dict]] = None,
+    prompt_metrics: Optional[Dict[str, Dict]] = None,
+) -> None:
+    """Atomically write run/repo/prompt rollups as Prometheus gauges to ``path``."""
+    lines: List[str] = []
+    scopes = (
+        ('run', None, {'all': run_metrics}),
+        ('repo', 'repo', repo_metrics or {}),
+        ('prompt', 'prompt', prompt_metrics or {}),
+    )
+    for field, help_text in _PROM_FIELDS:
+        for scope, label, items in scopes:
+            metric = f"copilot_pipeline_{scope}_{field}"
+            lines.append(f"# HELP {metric} {help_text} ({scope}).")
+            lines.append(f"# TYPE {metric} gauge")
+            for key, rollup in items.items():
+                value = rollup.get(field)
+                if value is None:
+                    continue
+                labels = f'{{{label}="{_escape_label(key)}"}}' if label else ''
+                lines.append(f"{metric}{labels} {value}")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.prom')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp, path)
+
+
+__all__ = ['rollup_stages', 'merge_rollups', 'per_prompt_rollup', 'write_prometheus_textfile']
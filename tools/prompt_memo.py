@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""Prompt Invocation Memoization
+
+Opt-in cache used by CopilotExecutor.execute_prompt / execute_prompt_async: a prompt call
+identical to a previous successful one is answered from disk instead of launching copilot.
+
+Memo key (sha256 over):
+    - prompt name and content hash of its prompt file
+    - call params (sorted JSON) and Copilot model name
+    - content hashes of the call's input files: the referenced checklist (volatile
+      "Generated:" line ignored), every param value naming an existing file
+      (e.g. input='repositories_small.txt', resolved like the prompt does) and every
+      checklist variable naming an existing file (e.g. {{solutions_json}})
+    - the HEAD commit of the checklist's {{repo_directory}} working tree, so README and
+      solution lookups are not replayed after the clone moved; a working tree whose
+      HEAD cannot be read makes the call unmemoizable
+
+Memo value: exit code, stdout/stderr excerpts and the file mutations the call made in
+tasks/ and output/ (written/created file contents and deleted paths). Mutations are
+found by diffing (size, mtime_ns) snapshots taken before and after the call; calls with
+a checklist only watch files whose name starts with the checklist's repo/solution stem,
+so concurrent workers on other repositories do not leak into each other's entries.
+Logs, event streams, lock and temp files are never recorded.
+
+Only successful calls are stored, and prompts whose effects live outside tasks/ and
+output/ (cloning, builds, README command execution, knowledge-base writes, combined
+execute-* prompts; see NON_REPLAYABLE_PROMPTS) are never memoized. On a hit the recorded
+mutations are replayed atomically (keeping each file's current "Generated:" line) and
+the recorded result is returned.
+
+Entries are JSON files under the cache directory, written atomically, so any number of
+threads and processes can share one cache. Eviction (serialized by a FileLock; a busy
+lock means another worker is already evicting):
+    - TTL: entries older than ttl_seconds are ignored and removed.
+    - LRU: a hit refreshes the entry's mtime; after a store the least recently used
+      entries are removed until the directory is within max_bytes.
+
+Usage:
+    from prompt_memo import PromptMemo
+    from copilot_executor import set_prompt_memo
+    set_prompt_memo(PromptMemo())             # default dir ./.cache/prompt_memo
+
+CLI:
+    python tools/prompt_memo.py stats [--memo-dir DIR]
+    python tools/prompt_memo.py evict [--memo-dir DIR] [--memo-ttl-hours H] [--memo-max-mb MB]
+    python tools/prompt_memo.py clear [--memo-dir DIR]
+"""
+from __future__ import annotations
+import argparse, datetime, hashlib, json, os, re, sys, tempfile, threading, time
+from typing import Dict, List, Optional, Tuple
+
+from checklist_utils import is_blank_value, load_checklist, task_key
+from file_lock import FileLock, LockTimeout
+from prompt_registry import get_registry
+from solution_discovery import head_commit
+from stage_cache import resolve_checklist_path
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_MEMO_DIR = os.path.join(REPO_ROOT, '.cache', 'prompt_memo')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 24 * 3600
+MAX_FILE_BYTES = 2 * 1024 * 1024
+WATCHED_DIRS = ('tasks', 'output')
+IGNORED_SUFFIXES = ('.log', '.jsonl', '.lock', '.part', '.sqlite', '.prom')
+INPUT_SEARCH_DIRS = ('', os.path.join('.github', 'prompts'))
+CHECKLIST_VARIABLE_HEADERS = ('## Repo Variables Available', '## Solution Variables', '### Solution Variables')
+
+# Prompts (task_key form) whose effects are not confined to tasks/ and output/.
+NON_REPLAYABLE_PROMPTS = frozenset({
+    'clone-repo',
+    'execute-readme',
+    'restore-solution',
+    'build-solution',
+    'dotnet-build-solution',
+    'verify-build-artifacts',
+    'validate-build-artifacts',
+    'apply-knowledge-base-fix',
+    'create-knowledge-base',
+    'update-decision-log',
+    'update-knowledgebase-log',
+    'generate-html-reports',
+    'execute-repo-task',
+    'execute-solution-task',
+})
+
+_GENERATED_LINE = re.compile(r"^Generated:.*$", re.MULTILINE)
+_CHECKLIST_SUFFIX = re.compile(r"_(?:repo|solution)_checklist\.md$")
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path: str, *, normalize_generated: bool = False) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if normalize_generated:
+        data = _GENERATED_LINE.sub('Generated:', data.decode('utf-8', errors='ignore')).encode('utf-8')
+    return _sha256_bytes(data)
+
+
+def _atomic_write(path: str, text: str) -> None:
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _input_files(params: Dict[str, str]) -> Dict[str, str]:
+    """{param: path} for params naming an existing file (repo root, then .github/prompts)."""
+    found: Dict[str, str] = {}
+    for name, value in params.items():
+        value = str(value).replace('\\', '/')
+        if not value or len(value) > 1024:
+            continue
+        candidates = [value] if os.path.isabs(value) else [os.path.join(REPO_ROOT, d, value) for d in INPUT_SEARCH_DIRS]
+        path = next((c for c in candidates if os.path.isfile(c)), None)
+        if path:
+            found[name] = path
+    return found
+
+
+def _resolve(value: str) -> str:
+    value = value.replace('\\', '/')
+    return value if os.path.isabs(value) else os.path.join(REPO_ROOT, value)
+
+
+def _checklist_inputs(checklist: str) -> Optional[Dict[str, Optional[str]]]:
+    """Hashes of the files named by checklist variables plus the repo working tree HEAD.
+
+    Returns None when {{repo_directory}} names a directory whose HEAD cannot be read.
+    """
+    doc = load_checklist(checklist)
+    if doc is None:
+        return {}
+    inputs: Dict[str, Optional[str]] = {}
+    for name, value in doc.variables(CHECKLIST_VARIABLE_HEADERS).items():
+        value = value.strip()
+        if is_blank_value(value) or len(value) > 1024 or '\n' in value:
+            continue
+        path = _resolve(value)
+        if name == 'repo_directory' and os.path.isdir(path):
+            head = head_commit(path)
+            if head is None:
+                return None
+            inputs['repo_head'] = head
+        elif os.path.isfile(path):
+            inputs[f"var:{name}"] = _file_sha256(path, normalize_generated=path.endswith('.md'))
+    return inputs
+
+
+def _scope_prefix(params: Dict[str, str]) -> Optional[str]:
+    """File-name prefix of the artefacts owned by a checklist call (its repo/solution stem)."""
+    checklist = resolve_checklist_path(params)
+    if not checklist:
+        return None
+    stem = _CHECKLIST_SUFFIX.sub('', os.path.basename(checklist))
+    return stem if stem != os.path.basename(checklist) else None
+
+
+class PromptMemo:
+    """On-disk memo of successful prompt calls and the file mutations they made."""
+
+    def __init__(
+        self,
+        memo_dir: str = DEFAULT_MEMO_DIR,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.memo_dir = memo_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.uncacheable = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        os.makedirs(memo_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.memo_dir, f"{key}.json")
+
+    def key_for(self, prompt: str, params: Dict[str, str], model: str) -> Optional[str]:
+        """Memo key of a prompt call, or None when the call must not be memoized."""
+        if task_key(prompt) in NON_REPLAYABLE_PROMPTS:
+            return None
+        inputs: Dict[str, Optional[str]] = {}
+        checklist = resolve_checklist_path(params)
+        if checklist:
+            inputs['checklist'] = _file_sha256(checklist, normalize_generated=True)
+            if inputs['checklist'] is None:
+                return None
+            referenced = _checklist_inputs(checklist)
+            if referenced is None:
+                return None
+            inputs.update(referenced)
+        for name, path in _input_files(params).items():
+            inputs[name] = _file_sha256(path, normalize_generated=path.endswith('.md'))
+        prompt_info = get_registry().get(prompt)
+        material = {
+            'prompt': prompt,
+            'prompt_sha256': prompt_info.sha256 if prompt_info else None,
+            'params': params,
+            'model': model,
+            'inputs': inputs,
+        }
+        return _sha256_bytes(json.dumps(material, sort_keys=True).encode('utf-8'))
+
+    def snapshot(self, params: Dict[str, str]) -> Snapshot:
+        """(size, mtime_ns) of every watched file a call with ``params`` may mutate."""
+        prefix = _scope_prefix(params)
+        state: Snapshot = {}
+        for rel_dir in WATCHED_DIRS:
+            directory = os.path.join(REPO_ROOT, rel_dir)
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith('.') or name.endswith(IGNORED_SUFFIXES):
+                        continue
+                    if prefix and not name.startswith(prefix):
+                        continue
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat()
+                            state[f"{rel_dir}/{name}"] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        return state
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Return the entry for ``key`` (refreshing its LRU position) or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+        if time.time() - entry.get('created_epoch', 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count('misses')
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._count('hits')
+        return entry
+
+    def replay(self, entry: Dict) -> None:
+        """Re-apply the recorded file mutations of ``entry``."""
+        for rel, text in entry.get('files', {}).items():
+            path = os.path.join(REPO_ROOT, rel)
+            current = None
+            try:
+                with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+                    current = f.read()
+            except OSError:
+                pass
+            generated = _GENERATED_LINE.search(current) if current else None
+            if generated:
+                text = _GENERATED_LINE.sub(lambda _m: generated.group(0), text, count=1)
+            _atomic_write(path, text)
+        for rel in entry.get('deleted', []):
+            try:
+                os.remove(os.path.join(REPO_ROOT, rel))
+            except OSError:
+                pass
+
+    def store(self, key: str, prompt: str, params: Dict[str, str], model: str,
+              result: Tuple[int, str, str], before: Snapshot) -> bool:
+        """Record a successful call and the mutations since ``before``; returns True if stored."""
+        exit_code, stdout, stderr = result
+        if exit_code != 0:
+            return False
+        after = self.snapshot(params)
+        files: Dict[str, str] = {}
+        for rel, stat in after.items():
+            if before.get(rel) == stat:
+                continue
+            if stat[0] > MAX_FILE_BYTES:
+                self._count('uncacheable')
+                return False
+            try:
+                with open(os.path.join(REPO_ROOT, rel), 'rb') as f:
+                    files[rel] = f.read().decode('utf-8')
+            except (OSError, UnicodeDecodeError):
+                self._count('uncacheable')
+                return False
+        entry = {
+            'key': key,
+            'prompt': prompt,
+            'params': params,
+            'model': model,
+            'exit_code': exit_code,
+            'stdout': stdout,
+            'stderr': stderr,
+            'files': files,
+            'deleted': sorted(rel for rel in before if rel not in after),
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'created_epoch': time.time(),
+        }
+        _atomic_write(self._entry_path(key), json.dumps(entry))
+        self._count('stored')
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Remove expired entries, then least recently used ones until within max_bytes."""
+        try:
+            with FileLock(os.path.join(self.memo_dir, '.evict.lock'), timeout=0):
+                removed = self._evict_locked()
+        except LockTimeout:
+            return 0
+        with self._lock:
+            self.evicted += removed
+        return removed
+
+    def _evict_locked(self) -> int:
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.memo_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.memo_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _mtime, size, _path in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if total > self.max_bytes or now - mtime > self.ttl_seconds:
+                if self._remove(path):
+                    removed += 1
+                    total -= size
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for name in os.listdir(self.memo_dir):
+            if name.endswith('.json') and self._remove(os.path.join(self.memo_dir, name)):
+                removed += 1
+        return removed
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'stored': self.stored,
+                'uncacheable': self.uncacheable,
+                'evicted': self.evicted,
+            }
+
+
+def memo_result(entry: Dict) -> Tuple[int, str, str]:
+    """The (exit_code, stdout, stderr) tuple reported for a memo hit."""
+    return entry.get('exit_code', 0), entry.get('stdout', ''), entry.get('stderr', '')
+
+
+def add_memo_arguments(parser) -> None:
+    """Register the prompt-memo command line flags shared by the orchestrators."""
+    parser.add_argument('--prompt-memo', action='store_true', help='Answer prompt calls identical to a previous successful call from the memo (opt-in).')
+    parser.add_argument('--memo-dir', default=DEFAULT_MEMO_DIR, help='Prompt memo directory (default ./.cache/prompt_memo).')
+    parser.add_argument('--memo-ttl-hours', type=float, default=DEFAULT_TTL_SECONDS / 3600, help='Prompt memo entry time-to-live in hours.')
+    parser.add_argument('--memo-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024), help='Prompt memo size bound in MB (LRU eviction).')
+
+
+def prompt_memo_from_args(args) -> Optional[PromptMemo]:
+    """Build a PromptMemo from parsed orchestrator flags, or None when memoization is off (or --no-cache)."""
+    if getattr(args, 'no_cache', False) or not getattr(args, 'prompt_memo', False):
+        return None
+    memo = PromptMemo(
+        args.memo_dir,
+        max_bytes=int(args.memo_max_mb * 1024 * 1024),
+        ttl_seconds=args.memo_ttl_hours * 3600,
+    )
+    print(f"[prompt-memo] enabled dir={memo.memo_dir} max_mb={args.memo_max_mb:g} ttl_hours={args.memo_ttl_hours:g}")
+    return memo
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(description='Inspect or maintain the prompt memo.')
+    p.add_argument('command', choices=['stats', 'evict', 'clear'])
+    p.add_argument('--memo-dir', default=DEFAULT_MEMO_DIR)
+    p.add_argument('--memo-ttl-hours', type=float, default=DEFAULT_TTL_SECONDS / 3600)
+    p.add_argument('--memo-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024))
+    args = p.parse_args(argv)
+    memo = PromptMemo(args.memo_dir, max_bytes=int(args.memo_max_mb * 1024 * 1024), ttl_seconds=args.memo_ttl_hours * 3600)
+    if args.command == 'evict':
+        print(f"[prompt-memo] evicted {memo.evict()} entr(ies)")
+    elif args.command == 'clear':
+        print(f"[prompt-memo] removed {memo.clear()} entr(ies)")
+    entries = [n for n in os.listdir(memo.memo_dir) if n.endswith('.json')]
+    size = sum(os.path.getsize(os.path.join(memo.memo_dir, n)) for n in entries)
+    print(json.dumps({'memo_dir': memo.memo_dir, 'entries': len(entries), 'bytes': size}, indent=2))
+    return 0
+
+
+__all__ = [
+    'PromptMemo',
+    'memo_result',
+    'add_memo_arguments',
+    'prompt_memo_from_args',
+    'NON_REPLAYABLE_PROMPTS',
+    'DEFAULT_MEMO_DIR',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Prompt Registry
+
+Indexes every `*.prompt.md` file under `.github/prompts` once (name, repository-relative
+path, content hash and front matter such as `temperature`) and serves the
+`/task-*` / `/execute-*` -> `#file:` prompt rewrites used by CopilotExecutor from memory.
+
+The prompts directory is resolved from the repository root (the parent of `tools/`),
+not from the current working directory. Pipelines can be validated up front so a
+missing prompt fails at startup instead of mid-run.
+
+Usage:
+    from prompt_registry import get_registry
+
+    registry = get_registry()
+    registry.validate(['task-clone-repo', 'execute-repo-task'])   # raises PromptValidationError
+    text = registry.rewrite_references("/task-clone-repo clone_path='./clone_repos'")
+"""
+from __future__ import annotations
+import hashlib, os, re, threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+PROMPTS_DIR = os.path.join(REPO_ROOT, '.github', 'prompts')
+PROMPT_SUFFIX = '.prompt.md'
+
+# Prompt tokens that are rewritten to #file references (all others pass through to copilot unchanged)
+PROMPT_REFERENCE_PATTERN = re.compile(r"/(task-[A-Za-z0-9_-]+|execute-[A-Za-z0-9_-]+)")
+_REWRITABLE_NAME = re.compile(r"^(task-|execute-)[A-Za-z0-9_-]+$")
+# Front matter must open within the first few lines of a prompt file
+_FRONT_MATTER_SEARCH_LINES = 10
+
+
+class PromptValidationError(ValueError):
+    """Raised when pipelines reference prompt files that do not exist."""
+
+
+class PromptInfo:
+    """Metadata for a single prompt file."""
+
+    def __init__(self, name: str, path: str, sha256: str, front_matter: Dict[str, object]):
+        self.name = name
+        self.path = path
+        self.sha256 = sha256
+        self.front_matter = front_matter
+
+    @property
+    def reference_path(self) -> str:
+        """Repository-relative POSIX path used in `#file:` references."""
+        return os.path.relpath(self.path, REPO_ROOT).replace(os.sep, '/')
+
+    @property
+    def temperature(self) -> Optional[float]:
+        value = self.front_matter.get('temperature')
+        return value if isinstance(value, float) else None
+
+
+def _parse_scalar(value: str) -> object:
+    lowered = value.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    try:
+        return float(value) if '.' in value else int(value)
+    except ValueError:
+        return value.strip('"\'')
+
+
+def parse_front_matter(text: str) -> Dict[str, object]:
+    """Parse the first `---` delimited `key: value` block near the top of a prompt."""
+    lines = text.splitlines()
+    start = None
+    for idx, line in enumerate(lines[:_FRONT_MATTER_SEARCH_LINES]):
+        if line.strip() == '---':
+            start = idx
+            break
+    if start is None:
+        return {}
+    values: Dict[str, object] = {}
+    for line in lines[start + 1:]:
+        stripped = line.strip()
+        if stripped == '---':
+            return values
+        key, sep, value = stripped.partition(':')
+        if sep and key and ' ' not in key.strip():
+            values[key.strip()] = _parse_scalar(value.strip())
+    return {}
+
+
+def is_rewritable(prompt_name: str) -> bool:
+    """True for prompt names that CopilotExecutor rewrites into `#file:` references."""
+    return bool(_REWRITABLE_NAME.match(prompt_name))
+
+
+class PromptRegistry:
+    """In-memory index of the prompt files in a prompts directory."""
+
+    def __init__(self, prompts_dir: str = PROMPTS_DIR):
+        self.prompts_dir = prompts_dir
+        self.prompts: Dict[str, PromptInfo] = {}
+        self.load()
+
+    def load(self) -> None:
+        prompts: Dict[str, PromptInfo] = {}
+        try:
+            entries = sorted(os.listdir(self.prompts_dir))
+        except OSError:
+            entries = []
+        for fname in entries:
+            if not fname.endswith(PROMPT_SUFFIX):
+                continue
+            path = os.path.join(self.prompts_dir, fname)
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            text = raw.decode('utf-8', errors='ignore')
+            name = fname[:-len(PROMPT_SUFFIX)]
+            prompts[name] = PromptInfo(name, path, hashlib.sha256(raw).hexdigest(), parse_front_matter(text))
+        self.prompts = prompts
+
+    def get(self, prompt_name: str) -> Optional[PromptInfo]:
+        return self.prompts.get(prompt_name)
+
+    def require(self, prompt_name: str) -> PromptInfo:
+        info = self.prompts.get(prompt_name)
+        if info is None:
+            expected = os.path.join(self.prompts_dir, f"{prompt_name}{PROMPT_SUFFIX}")
+            raise FileNotFoundError(f"Prompt file not found for '{prompt_name}' at {expected}")
+        return info
+
+    def rewrite_references(self, prompt_text: str, debug: Optional[Callable[[str], None]] = None) -> str:
+        """Replace /task-* or /execute-* tokens with #file references (raises if a prompt is unknown)."""
+
+        def replace(match: re.Match) -> str:
+            prompt_key = match.group(1)
+            replacement = f"Follow instructions in #file: {self.require(prompt_key).reference_path}"
+            if debug:
+                debug(f"rewriting /{prompt_key} to '{replacement}'")
+            return replacement
+
+        return PROMPT_REFERENCE_PATTERN.sub(replace, prompt_text)
+
+    def validate(self, prompt_names: Iterable[str]) -> List[str]:
+        """Check that every rewritable prompt exists.
+
+        Names outside the `/task-*` / `/execute-*` convention are passed to copilot as
+        native slash commands; they are returned as warnings when no prompt file exists.
+
+        Raises:
+            PromptValidationError: listing every missing rewritable prompt.
+        Returns:
+            Names that have no prompt file but are not rewritten (warnings).
+        """
+        missing: List[str] = []
+        warnings: List[str] = []
+        for name in dict.fromkeys(prompt_names):
+            if name in self.prompts:
+                continue
+            (missing if is_rewritable(name) else warnings).append(name)
+        if missing:
+            raise PromptValidationError(
+                f"Missing prompt file(s) in {self.prompts_dir}: "
+                + ', '.join(f"{n}{PROMPT_SUFFIX}" for n in missing)
+            )
+        return warnings
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> PromptRegistry:
+    """Return the process-wide registry, loading it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PromptRegistry()
+        return _registry
+
+
+def validate_pipeline_prompts(prompt_names: Iterable[str]) -> bool:
+    """Validate prompts for an orchestrator at startup; prints results and returns False on failure."""
+    registry = get_registry()
+    try:
+        warnings = registry.validate(prompt_names)
+    except PromptValidationError as err:
+        print(f"[fatal] {err}")
+        return False
+    for name in warnings:
+        print(f"[warn] No prompt file for /{name}; it will be sent to copilot as a native slash command.")
+    print(f"[prompts] {len(registry.prompts)} prompt file(s) indexed; pipeline prompts validated.")
+    return True
+
+
+__all__ = [
+    'PromptInfo',
+    'PromptRegistry',
+    'PromptValidationError',
+    'get_registry',
+    'validate_pipeline_prompts',
+    'parse_front_matter',
+    'is_rewritable',
+]
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""Copilot Call Rate Limiter
+
+Admission control in front of CopilotExecutor.execute_command / execute_command_async.
+Every copilot launch first takes a concurrency slot and a token:
+
+    - Token bucket: at most ``calls_per_minute`` launches per minute with bursts up to
+      ``burst`` (0 = no rate cap).
+    - AIMD concurrency: the number of copilot processes allowed in flight starts at
+      ``initial_concurrency`` and is
+        * halved (multiplicative decrease, floor ``min_concurrency``) when a call fails
+          with throttling or a transient backend error (an error line of the copilot
+          CLI itself on stderr matching THROTTLE_PATTERN; stdout is the agent transcript
+          with build logs and README text and is never scanned),
+          at most once per ``cooldown_seconds``;
+        * raised by 1 (additive increase, up to ``max_concurrency``) after ``limit``
+          consecutive successes, but only while calls are actually queueing for a slot,
+          so the limit grows where demand exceeds it instead of drifting to the cap.
+      The limit therefore settles where the backend stops throttling; stats() reports the
+      measured throughput and the concurrency it sustains (Little's law: throughput x
+      mean latency) next to the current limit.
+    - Throttled calls are retried after an exponential backoff with jitter (honouring a
+      "retry after N seconds" hint) up to ``max_retries`` times, so throttling no longer
+      surfaces as a task failure that triggers the orchestrators' retry passes.
+
+Shared mode (``shared_dir``): the bucket and the AIMD limit live in a JSON state file and
+slots are lock files (slot-<n>.lock), all guarded by FileLock, so every orchestrator process
+using the same directory shares one budget.
+
+Usage:
+    from rate_limiter import RateLimiter
+    from copilot_executor import set_rate_limiter
+    set_rate_limiter(RateLimiter(calls_per_minute=30, max_concurrency=8))
+"""
+from __future__ import annotations
+import asyncio, json, math, os, random, re, threading, time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from file_lock import FileLock, LockTimeout
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_SHARED_DIR = os.path.join(REPO_ROOT, '.cache', 'rate_limiter')
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 120.0
+DEFAULT_COOLDOWN_SECONDS = 5.0
+THROUGHPUT_WINDOW_SECONDS = 300.0
+POLL_SECONDS = 0.05
+
+# A copilot CLI error line ("Error: 429 Too Many Requests", "✗ Error: rate limit exceeded",
+# "FetchError: read ECONNRESET") naming throttling or a transient backend/network failure.
+THROTTLE_PATTERN = re.compile(
+    r"^[ \t]*(?:[✗×!][ \t]*)?\w*error[ \t]*:[^\n]*?"
+    r"(?:\b429\b|too many requests|rate[ -]?limit|throttl|quota exceeded|secondary rate|"
+    r"\b50[234]\b|service unavailable|bad gateway|gateway time-?out|temporarily unavailable|"
+    r"overloaded|econnreset|etimedout|socket hang up)",
+    re.IGNORECASE | re.MULTILINE,
+)
+RETRY_AFTER_PATTERN = re.compile(r"retry[- ]after[:\s]+(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+OK, THROTTLED, FAILED = 'ok', 'throttled', 'failed'
+
+
+def classify_result(exit_code: int, stdout: str, stderr: str) -> str:
+    """OK for exit code 0, THROTTLED when a failed call's stderr has a copilot throttling/transient
+    error line, else FAILED. ``stdout`` (the agent transcript) is deliberately ignored."""
+    if exit_code == 0:
+        return OK
+    if THROTTLE_PATTERN.search(stderr or ''):
+        return THROTTLED
+    return FAILED
+
+
+def retry_after_hint(stderr: str) -> Optional[float]:
+    match = RETRY_AFTER_PATTERN.search(stderr or '')
+    return float(match.group(1)) if match else None
+
+
+class _Ticket:
+    __slots__ = ('started', 'slot_lock')
+
+    def __init__(self, slot_lock: Optional[FileLock] = None):
+        self.started = time.monotonic()
+        self.slot_lock = slot_lock
+
+
+class RateLimiter:
+    """Token bucket plus AIMD concurrency limit shared by all executors of a process (or directory)."""
+
+    def __init__(
+        self,
+        *,
+        calls_per_minute: float = 0,
+        burst: Optional[int] = None,
+        initial_concurrency: Optional[int] = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        shared_dir: Optional[str] = None,
+    ):
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise ValueError('concurrency bounds must satisfy 1 <= min <= max')
+        self.rate = calls_per_minute / 60.0 if calls_per_minute and calls_per_minute > 0 else 0.0
+        self.burst = max(1, burst if burst is not None else math.ceil(max(self.rate * 10, 1)))
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.shared_dir = shared_dir
+        initial = initial_concurrency if initial_concurrency is not None else max_concurrency
+        self._limit = float(min(max(initial, min_concurrency), max_concurrency))
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._in_flight = 0
+        self._waiting = 0
+        self._streak = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._completions: Deque[Tuple[float, float]] = deque()  # (finished, latency) of successful calls
+        self._counts = {'calls': 0, OK: 0, THROTTLED: 0, FAILED: 0, 'retries': 0, 'decreases': 0, 'increases': 0}
+        self._wait_seconds = 0.0
+        self._peak_in_flight = 0
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+            self._state_path = os.path.join(shared_dir, 'state.json')
+            self._state_lock = os.path.join(shared_dir, 'state.lock')
+
+    # -- shared state -------------------------------------------------------------------
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self._state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('limit', self._limit)
+        state.setdefault('tokens', float(self.burst))
+        state.setdefault('refilled', time.time())
+        state.setdefault('last_decrease', 0.0)
+        return state
+
+    def _save_state(self, state: Dict) -> None:
+        tmp = f"{self._state_path}.{os.getpid()}.{threading.get_ident()}.part"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self._state_path)
+
+    def _shared_try_acquire(self) -> Tuple[Optional[_Ticket], float]:
+        with FileLock(self._state_lock, timeout=30):
+            state = self._load_state()
+            now = time.time()
+            if self.rate:
+                state['tokens'] = min(float(self.burst), state['tokens'] + (now - state['refilled']) * self.rate)
+                state['refilled'] = now
+                if state['tokens'] < 1:
+                    self._save_state(state)
+                    return None, (1 - state['tokens']) / self.rate
+            limit = int(state['limit'])
+            for slot in range(limit):
+                lock = FileLock(os.path.join(self.shared_dir, f"slot-{slot}.lock"), timeout=0)
+                try:
+                    lock.acquire()
+                except LockTimeout:
+                    continue
+                if self.rate:
+                    state['tokens'] -= 1
+                    self._save_state(state)
+                with self._cond:
+                    self._limit = state['limit']
+                    self._in_flight += 1
+                    self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+                return _Ticket(lock), 0.0
+            if self.rate:
+                self._save_state(state)
+            return None, POLL_SECONDS
+
+    def _shared_adjust(self, outcome: str) -> None:
+        with FileLock(self._state_lock, timeout=30):
+            state = self._load_state()
+            with self._cond:
+                state['limit'] = self._next_limit(state['limit'], outcome, state, saturated=self._waiting > 0)
+                self._limit = state['limit']
+            self._save_state(state)
+
+    # -- local state ----------------------------------------------------------------------
+
+    def _local_try_acquire(self) -> Tuple[Optional[_Ticket], float]:
+        now = time.monotonic()
+        if self.rate:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+        if self._in_flight >= int(self._limit):
+            return None, POLL_SECONDS
+        if self.rate and self._tokens < 1:
+            return None, (1 - self._tokens) / self.rate
+        if self.rate:
+            self._tokens -= 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        return _Ticket(), 0.0
+
+    def _next_limit(self, limit: float, outcome: str, clock: Dict, *, saturated: bool) -> float:
+        """AIMD step (caller holds self._cond); ``clock`` holds 'last_decrease' so decreases are rate limited."""
+        now = time.time()
+        if outcome == THROTTLED:
+            self._streak = 0
+            if now - clock.get('last_decrease', 0.0) >= self.cooldown_seconds:
+                clock['last_decrease'] = now
+                self._counts['decreases'] += 1
+                return max(float(self.min_concurrency), math.floor(limit / 2))
+            return limit
+        if outcome == OK:
+            self._streak += 1
+            if saturated and self._streak >= int(limit) and limit < self.max_concurrency:
+                self._streak = 0
+                self._counts['increases'] += 1
+                return limit + 1
+        return limit
+
+    # -- public API -------------------------------------------------------------------------
+
+    def try_acquire(self) -> Tuple[Optional[_Ticket], float]:
+        """Non-blocking admission: (ticket, 0) or (None, seconds to wait before retrying)."""
+        if self.shared_dir:
+            return self._shared_try_acquire()
+        with self._cond:
+            return self._local_try_acquire()
+
+    def acquire(self) -> _Ticket:
+        """Block until a slot and a token are available."""
+        queued = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+        try:
+            while True:
+                ticket, wait = self.try_acquire()
+                if ticket is not None:
+                    break
+                with self._cond:
+                    self._cond.wait(min(wait, 1.0))
+        finally:
+            with self._cond:
+                self._waiting -= 1
+                self._wait_seconds += time.monotonic() - queued
+        return ticket
+
+    async def acquire_async(self) -> _Ticket:
+        """Asyncio counterpart of acquire (polls without blocking the event loop)."""
+        queued = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+        try:
+            while True:
+                ticket, wait = self.try_acquire()
+                if ticket is not None:
+                    break
+                await asyncio.sleep(min(wait, 1.0))
+        finally:
+            with self._cond:
+                self._waiting -= 1
+                self._wait_seconds += time.monotonic() - queued
+        return ticket
+
+    def release(self, ticket: _Ticket, outcome: str) -> None:
+        """Return the slot and feed the call's outcome (OK / THROTTLED / FAILED) to AIMD."""
+        finished = time.monotonic()
+        with self._cond:
+            self._counts['calls'] += 1
+            self._counts[outcome] += 1
+            if outcome == OK:
+                self._completions.append((finished, finished - ticket.started))
+            while self._completions and finished - self._completions[0][0] > THROUGHPUT_WINDOW_SECONDS:
+                self._completions.popleft()
+            self._in_flight -= 1
+            if ticket.slot_lock is None:
+                clock = {'last_decrease': self._last_decrease}
+                self._limit = self._next_limit(self._limit, outcome, clock, saturated=self._waiting > 0)
+                self._last_decrease = clock['last_decrease']
+            self._cond.notify_all()
+        if ticket.slot_lock is not None:
+            ticket.slot_lock.release()
+            self._shared_adjust(outcome)
+
+    def backoff(self, attempt: int, stderr: str = '') -> float:
+        """Delay before retrying a throttled call (attempt starts at 0)."""
+        with self._cond:
+            self._counts['retries'] += 1
+        hint = retry_after_hint(stderr)
+        delay = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * (2 ** attempt))
+        delay = delay * random.uniform(0.5, 1.0)
+        return min(MAX_BACKOFF_SECONDS, max(delay, hint or 0.0))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def stats(self) -> Dict[str, object]:
+        """Counters, current limit and measured throughput (successful calls over the last 5 minutes)."""
+        with self._cond:
+            now = time.monotonic()
+            recent = [(t, lat) for t, lat in self._completions if now - t <= THROUGHPUT_WINDOW_SECONDS]
+            span = (now - min(t - lat for t, lat in recent)) if recent else 0.0
+            throughput = len(recent) / span if span > 0 else 0.0
+            mean_latency = sum(lat for _t, lat in recent) / len(recent) if recent else 0.0
+            return dict(
+                self._counts,
+                concurrency_limit=int(self._limit),
+                peak_in_flight=self._peak_in_flight,
+                wait_seconds=round(self._wait_seconds, 3),
+                throughput_per_minute=round(throughput * 60, 2),
+                mean_latency_seconds=round(mean_latency, 3),
+                sustained_concurrency=round(throughput * mean_latency, 2),
+                calls_per_minute_cap=round(self.rate * 60, 2) or None,
+                shared_dir=self.shared_dir,
+            )
+
+
+def add_rate_limit_arguments(parser) -> None:
+    """Register the Copilot rate-limiter flags shared by the orchestrators."""
+    parser.add_argument('--max-calls-per-minute', type=float, default=0, help='Token-bucket cap on copilot launches per minute (default 0 = uncapped).')
+    parser.add_argument('--max-burst', type=int, help='Token-bucket burst size (default: 10 seconds of the rate).')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help=f'Upper bound of the adaptive copilot concurrency limit (default {DEFAULT_MAX_CONCURRENCY}).')
+    parser.add_argument('--initial-concurrency', type=int, help='Starting concurrency limit (default: --max-concurrency; halved on throttling).')
+    parser.add_argument('--throttle-retries', type=int, default=DEFAULT_MAX_RETRIES, help=f'Retries of a throttled copilot call after backoff (default {DEFAULT_MAX_RETRIES}).')
+    parser.add_argument('--rate-limit-shared', nargs='?', const=DEFAULT_SHARED_DIR, help='Share the limiter with other processes through this directory (default ./.cache/rate_limiter).')
+    parser.add_argument('--no-rate-limit', action='store_true', help='Launch copilot without admission control or throttle retries.')
+
+
+def rate_limiter_from_args(args) -> Optional[RateLimiter]:
+    """Build a RateLimiter from parsed orchestrator flags, or None with --no-rate-limit."""
+    if getattr(args, 'no_rate_limit', False):
+        return None
+    limiter = RateLimiter(
+        calls_per_minute=args.max_calls_per_minute,
+        burst=args.max_burst,
+        initial_concurrency=args.initial_concurrency,
+        max_concurrency=args.max_concurrency,
+        max_retries=args.throttle_retries,
+        shared_dir=args.rate_limit_shared,
+    )
+    print(
+        f"[rate-limit] concurrency={limiter.limit}/{limiter.max_concurrency} (AIMD) "
+        f"calls_per_minute={args.max_calls_per_minute or 'uncapped'} retries={limiter.max_retries}"
+        + (f" shared={limiter.shared_dir}" if limiter.shared_dir else '')
+    )
+    return limiter
+
+
+__all__ = [
+    'RateLimiter',
+    'classify_result',
+    'retry_after_hint',
+    'add_rate_limit_arguments',
+    'rate_limiter_from_args',
+    'THROTTLE_PATTERN',
+    'OK',
+    'THROTTLED',
+    'FAILED',
+]
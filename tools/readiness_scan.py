@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Bulk Checklist Readiness Scanner
+
+Scans an entire tasks tree for repository (`*_repo_checklist.md`) and solution
+(`*_solution_checklist.md`) checklists, evaluates each with the structured readiness
+evaluators (no per-file printing) across a process pool, and writes a machine-readable
+report.
+
+Report (JSON):
+    {
+      "tasks_dir": ..., "timestamp": ..., "duration_seconds": ...,
+      "counts": {"total", "ready", "not_ready", "repo": {...}, "solution": {...},
+                 "missing_tasks", "missing_vars", "missing_solution_checklists"},
+      "results": [ {path, kind, name, ready, status, missing_tasks, missing_vars,
+                    missing_solution_checklists, tasks_checked, variables_verified}, ... ]
+    }
+With --jsonl, one result object per line is written instead (followed by a final
+{"counts": ...} line).
+
+Usage:
+    python tools/readiness_scan.py                       # scans ./tasks
+    python tools/readiness_scan.py --dir tasks --report output/readiness_report.json
+    python tools/readiness_scan.py --jsonl output/readiness_report.jsonl --workers 8
+
+Exit code 0 if every checklist found is ready, 1 otherwise (or when none were found).
+"""
+from __future__ import annotations
+import argparse, datetime, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+TOOLS_DIR = os.path.join(REPO_ROOT, 'tools')
+if TOOLS_DIR not in sys.path:
+    sys.path.append(TOOLS_DIR)
+
+from repo_check_utils import evaluate_repo_readiness
+from solution_check_utils import evaluate_solution_readiness
+
+REPO_SUFFIX = '_repo_checklist.md'
+SOLUTION_SUFFIX = '_solution_checklist.md'
+# Below this many files a process pool costs more than it saves.
+MIN_FILES_FOR_POOL = 64
+CHUNK_SIZE = 32
+
+
+def discover_checklists(tasks_dir: str) -> List[str]:
+    """Return sorted paths of every repo/solution checklist under ``tasks_dir`` (recursive)."""
+    found: List[str] = []
+    stack = [tasks_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith((REPO_SUFFIX, SOLUTION_SUFFIX)):
+                        found.append(entry.path)
+        except OSError:
+            continue
+    return sorted(found)
+
+
+def evaluate_checklist(path: str) -> Dict:
+    """Evaluate one checklist with the evaluator matching its file name."""
+    if path.endswith(REPO_SUFFIX):
+        return evaluate_repo_readiness(path)
+    return evaluate_solution_readiness(path)
+
+
+def aggregate(results: List[Dict]) -> Dict:
+    counts: Dict = {
+        'total': len(results),
+        'ready': 0,
+        'not_ready': 0,
+        'repo': {'total': 0, 'ready': 0},
+        'solution': {'total': 0, 'ready': 0},
+        'by_status': {},
+        'missing_tasks': 0,
+        'missing_vars': 0,
+        'missing_solution_checklists': 0,
+    }
+    for r in results:
+        kind = counts[r['kind']]
+        kind['total'] += 1
+        if r['ready']:
+            counts['ready'] += 1
+            kind['ready'] += 1
+        else:
+            counts['not_ready'] += 1
+        counts['by_status'][r['status']] = counts['by_status'].get(r['status'], 0) + 1
+        counts['missing_tasks'] += len(r['missing_tasks'])
+        counts['missing_vars'] += len(r['missing_vars'])
+        counts['missing_solution_checklists'] += len(r['missing_solution_checklists'])
+    return counts
+
+
+def scan(tasks_dir: str, *, workers: Optional[int] = None) -> Dict:
+    """Scan ``tasks_dir`` and return the report dictionary (see module docstring)."""
+    started = time.perf_counter()
+    paths = discover_checklists(tasks_dir)
+    if workers == 1 or len(paths) < MIN_FILES_FOR_POOL:
+        results = [evaluate_checklist(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(evaluate_checklist, paths, chunksize=CHUNK_SIZE))
+    return {
+        'tasks_dir': os.path.abspath(tasks_dir),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'duration_seconds': round(time.perf_counter() - started, 3),
+        'counts': aggregate(results),
+        'results': results,
+    }
+
+
+def write_report(report: Dict, *, json_path: Optional[str] = None, jsonl_path: Optional[str] = None) -> None:
+    if json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if jsonl_path:
+        os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for result in report['results']:
+                f.write(json.dumps(result, separators=(',', ':')) + '\n')
+            f.write(json.dumps({'counts': report['counts'], 'timestamp': report['timestamp']}, separators=(',', ':')) + '\n')
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Bulk readiness scan of repo and solution checklists.')
+    p.add_argument('--dir', default=os.path.join(REPO_ROOT, 'tasks'), help='Tasks directory to scan (recursive).')
+    p.add_argument('--report', default=os.path.join(REPO_ROOT, 'output', 'readiness_report.json'), help='JSON report path.')
+    p.add_argument('--jsonl', help='Write a JSONL report to this path instead of the JSON report.')
+    p.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count; 1 = serial).')
+    p.add_argument('--quiet', action='store_true', help='Only print aggregate counts.')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if not os.path.isdir(args.dir):
+        print(f"[readiness-scan] <missing_dir>: DIR_NOT_FOUND path={args.dir}")
+        return 1
+    report = scan(args.dir, workers=args.workers)
+    if args.jsonl:
+        write_report(report, jsonl_path=args.jsonl)
+        target = args.jsonl
+    else:
+        write_report(report, json_path=args.report)
+        target = args.report
+    counts = report['counts']
+    if not args.quiet:
+        for r in report['results']:
+            if not r['ready']:
+                print(f"[readiness-scan] {r['kind']} {r['name']}: {r['status']} path={r['path']}")
+    print(
+        f"[readiness-scan] {counts['ready']}/{counts['total']} ready "
+        f"(repo {counts['repo']['ready']}/{counts['repo']['total']}, "
+        f"solution {counts['solution']['ready']}/{counts['solution']['total']}) "
+        f"in {report['duration_seconds']}s; report={target}"
+    )
+    return 0 if counts['total'] and counts['ready'] == counts['total'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
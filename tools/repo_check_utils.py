@@ -23,10 +23,10 @@ import os, re
 from typing import List, Dict
 
 from checklist_utils import (
-    extract_tasks,
-    extract_variables,
     classify_variables,
+    load_checklist,
 )
+from checklist_generator import sanitize_name
 
 MANDATORY_TASK_PATTERN = re.compile(r"^- \[(x| )\].*\[MANDATORY\].*?@([a-zA-Z0-9\-]+)")
 # Include generate-solution-task-checklists which may not have @task- prefix in variable definitions
@@ -59,35 +59,51 @@ def _expected_solution_checklist_filenames(solutions_line: str, repo_name: str)
         if not part:
             continue
         base = part[:-4] if part.lower().endswith('.sln') else part
-        items.append(f"{repo_name}_{base}_solution_checklist.md")
+        # Same sanitization as task-generate-solution-task-checklists (spaces/special chars -> `_`).
+        items.append(f"{repo_name}_{sanitize_name(base)}_solution_checklist.md")
     return items
 
-def check_repo_readiness(checklist_path: str) -> bool:
-    """Check if a repo checklist is ready for conditional tasks.
+def evaluate_repo_readiness(checklist_path: str) -> Dict:
+    """Evaluate a repo checklist without printing and return a structured result.
 
     Steps:
       1. Parse mandatory tasks and verify all are marked with [x].
       2. Identify variables produced by mandatory tasks from Variable Definitions.
       3. Verify those variables have non-empty values in Repo Variables Available section.
+
+    Result keys: path, kind, name, ready, status (OK | NOT_READY | FILE_NOT_FOUND |
+    NO_MANDATORY_TASKS_DETECTED), missing_tasks, missing_vars, missing_solution_checklists,
+    tasks_checked, variables_verified.
     """
-    if not os.path.isfile(checklist_path):
-        print(f"[repo readiness] <missing_file>: FILE_NOT_FOUND path={checklist_path}")
-        return False
-    with open(checklist_path, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = [l.rstrip('\n') for l in f]
+    result: Dict = {
+        'path': checklist_path,
+        'kind': 'repo',
+        'name': '<missing_file>',
+        'ready': False,
+        'status': 'FILE_NOT_FOUND',
+        'missing_tasks': [],
+        'missing_vars': [],
+        'missing_solution_checklists': [],
+        'tasks_checked': [],
+        'variables_verified': [],
+    }
+    doc = load_checklist(checklist_path)
+    if doc is None:
+        return result
+    lines = doc.lines
 
     repo_name = _get_repo_name(lines)
+    result['name'] = repo_name
 
     # Extract Repo Tasks section
     normalize = lambda name: TASK_NAME_NORMALIZE.get(name, name)
-    mandatory_tasks = extract_tasks(
-        lines,
+    mandatory_tasks = doc.tasks(
         ('## Repo Tasks',),
         MANDATORY_TASK_PATTERN,
         normalize=normalize
     )
 
-    var_values: Dict[str, str] = extract_variables(lines, ('## Repo Variables Available',))
+    var_values: Dict[str, str] = doc.variables(('## Repo Variables Available',))
 
     missing_tasks = [t for t, done in mandatory_tasks.items() if not done]
     # Treat executed_commands and skipped_commands as optional even if their producing task is mandatory.
@@ -109,26 +125,52 @@ def check_repo_readiness(checklist_path: str) -> bool:
             if not os.path.isfile(fpath):
                 additional_failures.append(f"missing_solution_checklist:{fname}")
 
+    result.update({
+        'missing_tasks': missing_tasks,
+        'missing_vars': missing_vars,
+        'missing_solution_checklists': additional_failures,
+        'tasks_checked': sorted(mandatory_tasks.keys()),
+        'variables_verified': verified_vars,
+    })
     if not mandatory_tasks:
+        result['status'] = 'NO_MANDATORY_TASKS_DETECTED'
+    elif missing_tasks or missing_vars or additional_failures:
+        result['status'] = 'NOT_READY'
+    else:
+        result['status'] = 'OK'
+        result['ready'] = True
+    return result
+
+
+def check_repo_readiness(checklist_path: str) -> bool:
+    """Check if a repo checklist is ready for conditional tasks (prints a summary; see evaluate_repo_readiness)."""
+    result = evaluate_repo_readiness(checklist_path)
+    repo_name = result['name']
+    status = result['status']
+    if status == 'FILE_NOT_FOUND':
+        print(f"[repo readiness] <missing_file>: FILE_NOT_FOUND path={checklist_path}")
+        return False
+
+    if status == 'NO_MANDATORY_TASKS_DETECTED':
         print(f"[repo readiness] {repo_name}: NO_MANDATORY_TASKS_DETECTED")
         return False
 
-    if missing_tasks or missing_vars or additional_failures:
-        if missing_tasks:
-            print(f"[repo readiness] {repo_name}: MISSING_TASKS={missing_tasks}")
-        if missing_vars:
-            print(f"[repo readiness] {repo_name}: MISSING_VARS={missing_vars}")
-        if additional_failures:
-            print(f"[repo readiness] {repo_name}: MISSING_SOLUTION_CHECKLISTS={additional_failures}")
+    if status == 'NOT_READY':
+        if result['missing_tasks']:
+            print(f"[repo readiness] {repo_name}: MISSING_TASKS={result['missing_tasks']}")
+        if result['missing_vars']:
+            print(f"[repo readiness] {repo_name}: MISSING_VARS={result['missing_vars']}")
+        if result['missing_solution_checklists']:
+            print(f"[repo readiness] {repo_name}: MISSING_SOLUTION_CHECKLISTS={result['missing_solution_checklists']}")
         return False
 
     # Successful readiness; emit detail lines to clarify what was validated.
-    verified_tasks = sorted(mandatory_tasks.keys())
+    verified_tasks = result['tasks_checked']
     if verified_tasks:
         print(f"[repo readiness detail] {repo_name}: tasks_checked={verified_tasks}")
-    if verified_vars:
-        print(f"[repo readiness detail] {repo_name}: variables_verified={verified_vars}")
+    if result['variables_verified']:
+        print(f"[repo readiness detail] {repo_name}: variables_verified={result['variables_verified']}")
     print(f"[repo readiness] {repo_name}: OK")
     return True
 
-__all__ = ["check_repo_readiness"]
+__all__ = ["check_repo_readiness", "evaluate_repo_readiness"]
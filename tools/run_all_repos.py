@@ -22,6 +22,9 @@ Notes:
 - UTF-8 encoding with errors ignored.
 - Stops on first failure unless --continue-on-error is provided.
 - Produces consolidated summary JSON at ./output/all_repos_pipeline_summary.json
+- Streams progress events (stage start/finish, readiness, retries) to ./output/all_repos_events.jsonl
+  as the run progresses (the log is opened once checklist generation has reset ./output) and folds them into ./output/all_repos_pipeline_index.json at the end
+  (see tools/run_events.py); the event log survives a crash.
 - Non-scriptable tasks are invoked by prompts themselves; this orchestrator only sequences prompt calls.
 
 Usage:
@@ -32,11 +35,53 @@ Flags:
     --log <path>             Optional log file (default ./output/all_repos_orchestrator.log)
     --continue-on-error      Continue processing other repositories even if a prompt fails
     --mode {steps,combine}   Pipeline style
+    --jobs N                 Run up to N repositories concurrently per global pass (default 1).
+                             Worker output lines are prefixed with [w<slot>:<repo>].
+    --stage-parallel N       Steps mode: run independent stages of a repo concurrently, up to N at once
+                             (default 1). With N > 1 stages follow STEP_DEPENDENCIES: solutions and
+                             README branches both start after the clone, and a failed stage blocks
+                             its dependents; at the default the stages run in list order.
+    --no-resume              Retry passes rerun every stage (default: steps mode resumes at the first
+                             checklist task not yet marked [x]; skips are recorded per attempt)
+    --stage-cache            Skip stages whose prompt/params/model/checklist match a cached successful run
+                             (clone, README execution, builds and checklist generation always run)
+    --no-cache               Disable result caches (overrides --stage-cache and --prompt-memo)
+    --cache-dir <path>       Stage cache directory (default ./.cache/stage_cache)
+    --prompt-memo            Answer prompt calls identical to a previous successful call (same prompt
+                             file, params, model and input files) by replaying its recorded file
+                             mutations instead of launching copilot (see tools/prompt_memo.py)
+    --memo-dir / --memo-ttl-hours / --memo-max-mb
+                             Prompt memo location, entry TTL (default 24h) and LRU size bound (256 MB)
+    --max-calls-per-minute N Token-bucket cap on copilot launches across all workers (default uncapped)
+    --max-concurrency N      Upper bound of the adaptive copilot concurrency limit (default 32); the limit
+                             halves when copilot reports throttling/transient errors on stderr and grows by
+                             one per window of successes while calls queue (see tools/rate_limiter.py)
+    --initial-concurrency N / --max-burst N / --throttle-retries N
+                             Starting limit (default the maximum), bucket burst, retries of throttled calls
+    --rate-limit-shared [dir]
+                             Share the limiter with other orchestrator processes via lock files in dir
+    --no-rate-limit          Launch copilot without admission control or throttle retries
+    --command-timeout <s>    Default hard timeout per copilot invocation (default 1800)
+    --timeout-policy <path>  JSON per-prompt timeout policy (see tools/timeout_policy.py)
+    --timeout-from-history   Derive per-prompt timeouts from p95 stage durations in past summaries
+    --idle-timeout <s>       Kill the copilot process tree after this long without output (default off)
+    --summary-json {pretty,compact,off}
+                             Format of the consolidated summary (default pretty); the event log and
+                             compact index are always written
+    --history-db <path>      SQLite run-history database (default ./.cache/run_history.sqlite); every
+                             attempt, stage and readiness outcome is recorded (query: tools/run_history.py)
+    --no-history             Do not record the run in the history database
+    --no-native              Run scriptable tasks (checklist generation, task-clone-repo, ...) through
+                             Copilot instead of their native handlers (tools/native_tasks.py); by default
+                             native handlers run first and fall back to the prompt on failure
+    --metrics-textfile <p>   Write run/repo/prompt timing and resource rollups as a Prometheus textfile
+                             (the summary JSON always carries per-stage `metrics` and rollups)
     (solution-level pipelines deprecated; per-solution attempts removed)
 """
 from __future__ import annotations
-import argparse, sys, os, json, datetime
-from typing import List, Dict, Tuple
+import argparse, sys, os, json, datetime, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 
 REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 TOOLS_DIR = os.path.join(REPO_ROOT, 'tools')
@@ -44,9 +89,21 @@ if TOOLS_DIR not in sys.path:
     sys.path.append(TOOLS_DIR)
 
 try:
-    from copilot_executor import CopilotExecutor
-    from pipeline_core import execute_pipeline
+    from copilot_executor import (
+        CopilotExecutor, get_prompt_memo, get_rate_limiter, set_prompt_memo, set_rate_limiter, set_timeout_policy,
+    )
+    from pipeline_core import execute_pipeline, plan_resume
     from repo_check_utils import check_repo_readiness
+    from worker_output import install_prefixed_stdout, worker_prefix
+    from stage_cache import StageCache, add_cache_arguments, stage_cache_from_args
+    from prompt_registry import validate_pipeline_prompts
+    from timeout_policy import add_timeout_arguments, timeout_policy_from_args
+    from pipeline_metrics import merge_rollups, per_prompt_rollup, write_prometheus_textfile
+    from run_events import EventLog, write_index
+    from run_history import RunHistory, add_history_arguments, run_history_from_args
+    from native_tasks import NativeTaskRegistry, add_native_arguments, native_tasks_from_args
+    from prompt_memo import add_memo_arguments, prompt_memo_from_args
+    from rate_limiter import add_rate_limit_arguments, rate_limiter_from_args
     # solution_check_utils import removed (solution-level pipelines deprecated)
 except ImportError:
     print('[fatal] Unable to import copilot_executor from tools directory.', file=sys.stderr)
@@ -54,6 +111,8 @@ except ImportError:
 
 TASKS_DIR = os.path.join(REPO_ROOT, 'tasks')
 OUTPUT_DIR = os.path.join(REPO_ROOT, 'output')
+EVENTS_FILENAME = 'all_repos_events.jsonl'
+INDEX_FILENAME = 'all_repos_pipeline_index.json'
 
 STEP_SEQUENCE = [
     ('task-clone-repo', lambda f: {'clone_path': './clone_repos', 'checklist_path': f}),
@@ -64,6 +123,16 @@ STEP_SEQUENCE = [
     ('task-execute-readme', lambda f: {'checklist_path': f}),
 ]
 
+# Prerequisites per steps-mode stage; the solution branch and the README branch are independent.
+STEP_DEPENDENCIES: Dict[str, List[str]] = {
+    'task-clone-repo': [],
+    'task-find-solutions': ['task-clone-repo'],
+    'generate-solution-task-checklists': ['task-find-solutions'],
+    'task-search-readme': ['task-clone-repo'],
+    'task-scan-readme': ['task-search-readme'],
+    'task-execute-readme': ['task-scan-readme'],
+}
+
 COMBINE_SEQUENCE = [
     ('execute-repo-task', lambda f: {'repo_checklist': f, 'clone': './clone_repos'}),
 ]
@@ -92,31 +161,215 @@ def run_solution_attempts(*args, **kwargs) -> Tuple[Dict[str, Dict], bool]:
     """(Deprecated) Solution attempts removed; return empty results and True readiness."""
     return {}, True
 
-def run_pipeline(mode: str, log_file: str, continue_on_error: bool) -> int:
-    # Ensure output directory exists
+def _run_repo_attempt(
+    repo_name: str,
+    state: Dict,
+    *,
+    sequence: List[Tuple],
+    mode: str,
+    pass_index: int,
+    continue_on_error: bool,
+    base_log_dir: str,
+    base_stem: str,
+    base_ext: str,
+    stage_cache: Optional[StageCache] = None,
+    resume: bool = True,
+    queued_at: Optional[float] = None,
+    stage_parallel: int = 1,
+    events: Optional[EventLog] = None,
+    history: Optional[RunHistory] = None,
+    native_tasks: Optional[NativeTaskRegistry] = None,
+) -> Tuple[int, Dict]:
+    """Run one repository pipeline pass and verify readiness; returns (exit_code, attempt_record).
+
+    ``queued_at`` is the perf_counter() time the attempt was submitted to the worker pool;
+    the delay until it started is recorded as the attempt's queue_wait_seconds.
+    """
+    queue_wait = round(time.perf_counter() - queued_at, 3) if queued_at is not None else 0.0
+    checklist_path = state['checklist_path']
+    full_checklist_path = os.path.join(REPO_ROOT, checklist_path.replace('/', os.sep)) if not checklist_path.startswith(REPO_ROOT) else checklist_path
+    per_repo_pipeline = [(prompt, param_fn(checklist_path)) for prompt, param_fn in sequence]
+    skipped_stages: List[Dict] = []
+    if resume and mode == 'steps' and pass_index > 1:
+        # Retry pass: resume at the first incomplete checklist task instead of rerunning everything.
+        per_repo_pipeline, skipped_stages = plan_resume(per_repo_pipeline, full_checklist_path)
+    repo_summary_path = os.path.join(OUTPUT_DIR, f"{repo_name}_pipeline_summary_pass{pass_index}.json")
+    # Derive per-repo, per-pass log file
+    repo_log_file = os.path.join(base_log_dir, f"{base_stem}_{repo_name}_pass{pass_index}{base_ext}")
+    print(f"  [repo:{repo_name}] executing pipeline (pass {pass_index}) log={repo_log_file}")
+    attempt_events = events.bind(repo=repo_name, **{'pass': pass_index}) if events is not None else None
+    if attempt_events is not None:
+        attempt_events.emit('attempt_start', checklist_path=checklist_path, queue_wait_seconds=queue_wait, log_file=repo_log_file)
+    recorder = None
+    if history is not None and events is not None:
+        recorder = history.attempt(events.run_id, repo=repo_name, kind='repo', checklist_path=checklist_path, attempt=pass_index)
+    exit_code, summary = execute_pipeline(
+        pipeline=per_repo_pipeline,
+        log_file=repo_log_file,
+        continue_on_error=continue_on_error,
+        step_by_step=(mode == 'steps'),
+        mode=mode,
+        summary_path=repo_summary_path,
+        stage_cache=stage_cache,
+        skipped_stages=skipped_stages,
+        # Dependency scheduling only when stages may overlap; sequential runs keep plain
+        # list order, where --continue-on-error runs every later stage.
+        dependencies=STEP_DEPENDENCIES if mode == 'steps' and stage_parallel > 1 else None,
+        max_parallel=stage_parallel,
+        events=attempt_events,
+        history=recorder,
+        native_tasks=native_tasks,
+    )
+    stages = summary.get('pipeline', [])
+    print(f"    [repo:{repo_name}] readiness verification ...")
+    ready = check_repo_readiness(full_checklist_path)
+    if attempt_events is not None:
+        attempt_events.emit('readiness', exit_code=exit_code, readiness='PASS' if ready else 'FAIL')
+    if recorder is not None:
+        recorder.record_readiness(ready)
+    attempt_record = {
+        'pass': pass_index,
+        'exit_code': exit_code,
+        'repo_readiness': 'PASS' if ready else 'FAIL',
+        'stages': stages,
+        'skipped_stages': skipped_stages,
+        'blocked_stages': summary.get('blocked_stages', []),
+        'critical_path': summary.get('critical_path'),
+        'queue_wait_seconds': queue_wait,
+        'metrics': summary.get('metrics', {}),
+        'log_file': os.path.abspath(repo_log_file)
+    }
+
+    combined_ready = ready
+    attempt_record['combined_readiness'] = 'PASS' if combined_ready else 'FAIL'
+    print(f"    [repo:{repo_name}] repo readiness {'PASS' if ready else 'FAIL'}.")
+    return exit_code, attempt_record
+
+
+def _run_repo_attempt_prefixed(repo_name: str, state: Dict, **kwargs) -> Tuple[int, Dict]:
+    """Worker-pool entry point: run _run_repo_attempt with this worker's output prefix."""
+    worker_id = threading.current_thread().name.rsplit('_', 1)[-1]
+    with worker_prefix(f"[w{worker_id}:{repo_name}] "):
+        return _run_repo_attempt(repo_name, state, **kwargs)
+
+
+def _apply_attempt(
+    repo_name: str,
+    state: Dict,
+    exit_code: int,
+    attempt_record: Dict,
+    pass_index: int,
+    max_passes: int,
+    continue_on_error: bool,
+    events: Optional[EventLog] = None,
+) -> bool:
+    """Record an attempt on the repo state; return True when global passes must abort."""
+    state['attempts'].append(attempt_record)
+    if exit_code != 0 and not continue_on_error:
+        print(f"    [repo:{repo_name}] aborting global passes due to failure and continue-on-error disabled.")
+        state['final_readiness'] = 'FAIL'
+        if events is not None:
+            events.emit('repo_final', repo=repo_name, final_readiness='FAIL', reason='aborted')
+        return True
+
+    if attempt_record['combined_readiness'] == 'PASS':
+        state['final_readiness'] = 'PASS'
+        print(f"    [repo:{repo_name}] overall readiness PASS.")
+    else:
+        state['final_readiness'] = 'FAIL' if pass_index == max_passes else 'PENDING'
+        msg = 'overall readiness FAIL'
+        if state['final_readiness'] == 'PENDING':
+            msg += ' (will retry if passes remain).'
+        print(f"    [repo:{repo_name}] {msg}")
+    if events is not None:
+        if state['final_readiness'] == 'PENDING':
+            events.emit('retry', repo=repo_name, next_pass=pass_index + 1)
+        else:
+            events.emit('repo_final', repo=repo_name, final_readiness=state['final_readiness'], passes=pass_index)
+    return False
+
+
+def run_pipeline(
+    mode: str,
+    log_file: str,
+    continue_on_error: bool,
+    jobs: int = 1,
+    stage_cache: Optional[StageCache] = None,
+    resume: bool = True,
+    metrics_textfile: Optional[str] = None,
+    stage_parallel: int = 1,
+    summary_json: str = 'pretty',
+    history: Optional[RunHistory] = None,
+    native_tasks: Optional[NativeTaskRegistry] = None,
+) -> int:
+    # Stage 1 runs before the event log is opened: generation resets ./output (natively or
+    # through the prompt), which would otherwise unlink the event stream mid-run.
+    gen_exit, gen_runner = _generate_repo_checklists(log_file, native_tasks)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    events = EventLog(os.path.join(OUTPUT_DIR, EVENTS_FILENAME), truncate=True)
+    if history is not None:
+        history.start_run('run_all_repos', mode, {'jobs': jobs, 'stage_parallel': stage_parallel, 'resume': resume}, run_id=events.run_id)
+    try:
+        events.emit('run_start', mode=mode, jobs=jobs, stage_parallel=stage_parallel, resume=resume)
+        events.emit('checklists_generated', exit_code=gen_exit, runner=gen_runner)
+        if gen_exit != 0:
+            print('[error] generate-repo-task-checklists failed; aborting pipeline.')
+            summary = {
+                'overall_status': 'FAIL',
+                'failed_stage': 'generate-repo-task-checklists',
+                'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'repos_processed': 0,
+                'mode': mode,
+            }
+            _finish_run(summary, events, summary_json, history)
+            return 1
+        return _run_pipeline(
+            mode, log_file, continue_on_error, jobs, stage_cache, resume, metrics_textfile,
+            stage_parallel, summary_json, events, history, native_tasks,
+        )
+    finally:
+        events.close()
+
+
+def _generate_repo_checklists(log_file: str, native_tasks: Optional[NativeTaskRegistry]) -> Tuple[int, str]:
+    """Stage 1: generate repo task checklists once; returns (exit_code, runner)."""
     # Prepare copilot executor (used for checklist generation only; per-repo pipelines use shared executor logic)
     executor = CopilotExecutor(log_file=log_file, debug=False)
-    executor.initialize_log('All Repositories Pipeline Execution Log')
-
-    # Stage 1: Generate repo task checklists once
     print('[stage 1] /generate-repo-task-checklists')
-    gen_exit, gen_out, gen_err = executor.execute_prompt(
-        prompt_name='generate-repo-task-checklists',
-        params={'input': 'repositories_small.txt'}
-    )
-    if gen_exit != 0:
-        print('[error] generate-repo-task-checklists failed; aborting pipeline.')
-        summary = {
-            'overall_status': 'FAIL',
-            'failed_stage': 'generate-repo-task-checklists',
-            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
-            'repos_processed': 0,
-            'mode': mode,
-        }
-        _write_summary(summary)
-        return 1
-
+    gen_params = {'input': 'repositories_small.txt'}
+    try:
+        native_result = native_tasks.run('generate-repo-task-checklists', gen_params) if native_tasks is not None else None
+        # Reset mode empties ./output, so the log is opened only after the native run.
+        executor.initialize_log('All Repositories Pipeline Execution Log')
+        if native_result is not None and native_result[0] == 0:
+            return native_result[0], 'native'
+        if native_result is not None:
+            print(f"[native] generate-repo-task-checklists failed ({native_result[2]}); falling back to Copilot.")
+        gen_exit, _gen_out, _gen_err = executor.execute_prompt(
+            prompt_name='generate-repo-task-checklists',
+            params=gen_params
+        )
+        # The prompt deletes ./output while it runs; flushing reopens the log at its path.
+        executor.sink.flush()
+    finally:
+        executor.close()
+    return gen_exit, 'copilot'
+
+
+def _run_pipeline(
+    mode: str,
+    log_file: str,
+    continue_on_error: bool,
+    jobs: int,
+    stage_cache: Optional[StageCache],
+    resume: bool,
+    metrics_textfile: Optional[str],
+    stage_parallel: int,
+    summary_json: str,
+    events: EventLog,
+    history: Optional[RunHistory] = None,
+    native_tasks: Optional[NativeTaskRegistry] = None,
+) -> int:
     # Discover repo checklist files AFTER generation
     repo_checklists = find_repo_checklists()
     if not repo_checklists:
@@ -128,10 +381,11 @@ def run_pipeline(mode: str, log_file: str, continue_on_error: bool) -> int:
             'mode': mode,
             'details': []
         }
-        _write_summary(summary)
+        _finish_run(summary, events, summary_json, history)
         return 0
 
     print(f'[info] Found {len(repo_checklists)} repository checklist(s).')
+    events.emit('repos_discovered', repos_total=len(repo_checklists))
 
     sequence = STEP_SEQUENCE if mode == 'steps' else COMBINE_SEQUENCE
     # Prepare base log stem for per-repo, per-pass logging
@@ -153,60 +407,58 @@ def run_pipeline(mode: str, log_file: str, continue_on_error: bool) -> int:
         'final_readiness': 'PENDING'
     } for p in repo_checklists}
 
+    if jobs > 1:
+        install_prefixed_stdout()
+        print(f"[info] Running up to {jobs} repositories concurrently.")
+
     while pass_index <= max_passes:
         print(f"\n[global-pass {pass_index}/{max_passes}] Starting pipeline pass across repositories")
-        any_pending = False
-        for repo_name, state in repo_state.items():
-            if state['final_readiness'] == 'PASS':
-                continue  # Skip already passing repos
-            any_pending = True
-            checklist_path = state['checklist_path']
-            per_repo_pipeline = [(prompt, param_fn(checklist_path)) for prompt, param_fn in sequence]
-            repo_summary_path = os.path.join(OUTPUT_DIR, f"{repo_name}_pipeline_summary_pass{pass_index}.json")
-            # Derive per-repo, per-pass log file
-            repo_log_file = os.path.join(base_log_dir, f"{base_stem}_{repo_name}_pass{pass_index}{base_ext}")
-            print(f"  [repo:{repo_name}] executing pipeline (pass {pass_index}) log={repo_log_file}")
-            exit_code, summary = execute_pipeline(
-                pipeline=per_repo_pipeline,
-                log_file=repo_log_file,
-                continue_on_error=continue_on_error,
-                step_by_step=(mode == 'steps'),
-                mode=mode,
-                summary_path=repo_summary_path
-            )
-            stages = summary.get('pipeline', [])
-            full_checklist_path = os.path.join(REPO_ROOT, checklist_path.replace('/', os.sep)) if not checklist_path.startswith(REPO_ROOT) else checklist_path
-            print(f"    [repo:{repo_name}] readiness verification ...")
-            ready = check_repo_readiness(full_checklist_path)
-            attempt_record = {
-                'pass': pass_index,
-                'exit_code': exit_code,
-                'repo_readiness': 'PASS' if ready else 'FAIL',
-                'stages': stages,
-                'log_file': os.path.abspath(repo_log_file)
-            }
-
-            combined_ready = ready
-            attempt_record['combined_readiness'] = 'PASS' if combined_ready else 'FAIL'
-            state['attempts'].append(attempt_record)
-
-            print(f"    [repo:{repo_name}] repo readiness {'PASS' if ready else 'FAIL'}.")
-            if exit_code != 0 and not continue_on_error:
-                overall_status = 'FAIL'
-                print(f"    [repo:{repo_name}] aborting global passes due to failure and continue-on-error disabled.")
-                state['final_readiness'] = 'FAIL'
-                any_pending = False
-                break
-
-            if combined_ready:
-                state['final_readiness'] = 'PASS'
-                print(f"    [repo:{repo_name}] overall readiness PASS.")
-            else:
-                state['final_readiness'] = 'FAIL' if pass_index == max_passes else 'PENDING'
-                msg = 'overall readiness FAIL'
-                if state['final_readiness'] == 'PENDING':
-                    msg += ' (will retry if passes remain).'
-                print(f"    [repo:{repo_name}] {msg}")
+        pending = [(name, state) for name, state in repo_state.items() if state['final_readiness'] != 'PASS']
+        events.emit('pass_start', pass_index=pass_index, repos=[name for name, _ in pending])
+        any_pending = bool(pending)
+        aborted = False
+        attempt_kwargs = dict(
+            sequence=sequence,
+            mode=mode,
+            pass_index=pass_index,
+            continue_on_error=continue_on_error,
+            base_log_dir=base_log_dir,
+            base_stem=base_stem,
+            base_ext=base_ext,
+            stage_cache=stage_cache,
+            resume=resume,
+            stage_parallel=stage_parallel,
+            events=events,
+            history=history,
+            native_tasks=native_tasks,
+        )
+        if jobs <= 1:
+            for repo_name, state in pending:
+                exit_code, attempt_record = _run_repo_attempt(repo_name, state, **attempt_kwargs)
+                if _apply_attempt(repo_name, state, exit_code, attempt_record, pass_index, max_passes, continue_on_error, events):
+                    aborted = True
+                    break
+        else:
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='repo-worker') as pool:
+                futures = {
+                    pool.submit(
+                        _run_repo_attempt_prefixed, repo_name, state, queued_at=time.perf_counter(), **attempt_kwargs
+                    ): (repo_name, state)
+                    for repo_name, state in pending
+                }
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    repo_name, state = futures[future]
+                    exit_code, attempt_record = future.result()
+                    if _apply_attempt(repo_name, state, exit_code, attempt_record, pass_index, max_passes, continue_on_error, events) and not aborted:
+                        aborted = True
+                        # Stop scheduling further repositories; in-flight workers finish and are recorded.
+                        for other in futures:
+                            other.cancel()
+        if aborted:
+            overall_status = 'FAIL'
+            any_pending = False
         if not any_pending:
             break
         # If all repos passed early, break
@@ -222,6 +474,7 @@ def run_pipeline(mode: str, log_file: str, continue_on_error: bool) -> int:
             'checklist_path': state['checklist_path'],
             'attempts': state['attempts'],
             'final_readiness': state['final_readiness'],
+            'metrics': merge_rollups(a.get('metrics', {}) for a in state['attempts']),
             # 'solutions' key omitted (deprecated)
         })
 
@@ -256,30 +509,81 @@ def run_pipeline(mode: str, log_file: str, continue_on_error: bool) -> int:
                 for sol_attempt in sol.get('attempts', []):
                     all_log_files.append(sol_attempt['log_file'])
 
+    repo_metrics = {r['repo_name']: r['metrics'] for r in repo_results}
+    run_metrics = merge_rollups(repo_metrics.values())
+    run_metrics['queue_wait_seconds'] = round(
+        run_metrics['queue_wait_seconds'] + sum(a.get('queue_wait_seconds', 0.0) for r in repo_results for a in r['attempts']), 3
+    )
+    prompt_metrics = per_prompt_rollup(
+        stage for r in repo_results for a in r['attempts'] for stage in a.get('stages', [])
+    )
     summary = {
         'overall_status': overall_status,
         'mode': mode,
+        'jobs': jobs,
         'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
         'repos_processed': len(repo_results),
         'repos_failed': [r for r in repo_results if _has_failed_stage(r)],
         'repos_readiness_pass': readiness_pass,
         'repos_readiness_fail': readiness_fail,
         'details': repo_results,
-        'log_files': all_log_files
+        'log_files': all_log_files,
+        'metrics': dict(run_metrics, per_prompt=prompt_metrics),
     }
-    _write_summary(summary)
-    print(f"\nPipeline complete. Overall status: {overall_status}. Summary written to ./output/all_repos_pipeline_summary.json")
+    if stage_cache is not None:
+        summary['stage_cache'] = stage_cache.stats()
+    if get_prompt_memo() is not None:
+        summary['prompt_memo'] = get_prompt_memo().stats()
+        print(f"[prompt-memo] {summary['prompt_memo']}")
+    if get_rate_limiter() is not None:
+        summary['rate_limiter'] = get_rate_limiter().stats()
+        print(f"[rate-limit] {summary['rate_limiter']}")
+    _finish_run(summary, events, summary_json, history)
+    if metrics_textfile:
+        write_prometheus_textfile(metrics_textfile, run_metrics, repo_metrics, prompt_metrics)
+        print(f"[metrics] Prometheus textfile written to {metrics_textfile}")
+    print(
+        f"[metrics] stages={run_metrics['stage_count']} wall={run_metrics['wall_seconds']}s "
+        f"queue_wait={run_metrics['queue_wait_seconds']}s cpu_user={run_metrics['cpu_user_seconds']}s "
+        f"cpu_sys={run_metrics['cpu_system_seconds']}s max_rss_kb={run_metrics['max_rss_kb']}"
+    )
+    print(f"\nPipeline complete. Overall status: {overall_status}. Index written to ./output/{INDEX_FILENAME}")
     print("[log] Per-repo pass log files:")
     for lf in summary['log_files']:
         print(f"  - {lf}")
     return 0 if overall_status == 'SUCCESS' else 1
 
 
-def _write_summary(summary: Dict) -> None:
+def _write_summary(summary: Dict, summary_json: str = 'pretty') -> None:
+    if summary_json == 'off':
+        return
     path = os.path.join(OUTPUT_DIR, 'all_repos_pipeline_summary.json')
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, 'w', encoding='utf-8', errors='ignore') as f:
-        json.dump(summary, f, indent=2)
+        if summary_json == 'compact':
+            json.dump(summary, f, separators=(',', ':'))
+        else:
+            json.dump(summary, f, indent=2)
+
+
+def _finish_run(summary: Dict, events: EventLog, summary_json: str, history: Optional[RunHistory] = None) -> None:
+    """Close the event stream with run_finish, write the summary and compact index, close the history run."""
+    events.emit(
+        'run_finish',
+        overall_status=summary.get('overall_status'),
+        repos_processed=summary.get('repos_processed'),
+        repos_readiness_pass=summary.get('repos_readiness_pass'),
+        repos_readiness_fail=summary.get('repos_readiness_fail'),
+    )
+    _write_summary(summary, summary_json)
+    if history is not None:
+        for repo in summary.get('details', []):
+            history.record_readiness(
+                events.run_id, repo=repo['repo_name'], kind='repo', checklist_path=repo['checklist_path'],
+                final_readiness=repo['final_readiness'], attempts=len(repo['attempts']),
+            )
+        history.finish_run(events.run_id, summary.get('overall_status'))
+    write_index(os.path.join(OUTPUT_DIR, EVENTS_FILENAME), os.path.join(OUTPUT_DIR, INDEX_FILENAME), run_id=events.run_id)
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
@@ -287,20 +591,61 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     p.add_argument('--log', default='./output/all_repos_orchestrator.log', help='Path to log file.')
     p.add_argument('--continue-on-error', action='store_true', help='Continue processing other repositories even if a prompt fails.')
     p.add_argument('--mode', choices=['steps','combine'], default='combine', help="Execution mode: 'steps' granular sequence; 'combine' condensed execute-repo-task.")
+    p.add_argument('--jobs', type=int, default=1, help='Number of repositories to process concurrently (default 1 = sequential).')
+    p.add_argument('--stage-parallel', type=int, default=1, help='Steps mode: max independent stages of one repo run concurrently (default 1).')
+    p.add_argument('--no-resume', action='store_true', help='On retry passes in steps mode, rerun every stage instead of resuming at the first incomplete task.')
+    p.add_argument('--summary-json', choices=['pretty', 'compact', 'off'], default='pretty', help='Consolidated summary format (event log and index are always written).')
+    p.add_argument('--metrics-textfile', help='Also write run/repo/prompt metrics as a Prometheus textfile to this path.')
+    add_cache_arguments(p)
+    add_memo_arguments(p)
+    add_rate_limit_arguments(p)
+    add_timeout_arguments(p)
+    add_history_arguments(p)
+    add_native_arguments(p)
     # include-solution flag removed (solution-level pipelines deprecated)
-    return p.parse_args(argv)
+    args = p.parse_args(argv)
+    if args.jobs < 1:
+        p.error('--jobs must be >= 1')
+    if args.stage_parallel < 1:
+        p.error('--stage-parallel must be >= 1')
+    return args
+
+
+def pipeline_prompt_names() -> List[str]:
+    """All prompts this orchestrator may invoke (validated at startup)."""
+    names = ['generate-repo-task-checklists']
+    names.extend(prompt for prompt, _ in STEP_SEQUENCE + COMBINE_SEQUENCE)
+    return names
 
 
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
+    if not validate_pipeline_prompts(pipeline_prompt_names()):
+        return 1
+    set_timeout_policy(timeout_policy_from_args(args))
+    set_prompt_memo(prompt_memo_from_args(args))
+    set_rate_limiter(rate_limiter_from_args(args))
     mode = args.mode
     # Normalize log path
     log_file = args.log.replace('\\','/')
-    return run_pipeline(
-        mode=mode,
-        log_file=log_file,
-        continue_on_error=args.continue_on_error
-    )
+    history = run_history_from_args(args)
+    try:
+        return run_pipeline(
+            mode=mode,
+            log_file=log_file,
+            continue_on_error=args.continue_on_error,
+            jobs=args.jobs,
+            stage_cache=stage_cache_from_args(args),
+            resume=not args.no_resume,
+            metrics_textfile=args.metrics_textfile,
+            stage_parallel=args.stage_parallel,
+            summary_json=args.summary_json,
+            history=history,
+            native_tasks=native_tasks_from_args(args),
+        )
+    finally:
+        if history is not None:
+            history.close()
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""Orchestrator Benchmark Harness
+
+Measures orchestration cost without the real Copilot CLI. For every (target, fleet size)
+scenario a throw-away workspace is created (copy of tools/ and .github/ in a temp
+directory), a synthetic repositories_small.txt with N repositories is written, and a
+`copilot` shim that runs tools/fake_copilot.py is put first on PATH. The target then runs
+unmodified against that workspace.
+
+Targets:
+    run_all_repos    python tools/run_all_repos.py --mode <mode> --jobs <jobs> --continue-on-error --no-native
+    run_single_file  python tools/run_single_file.py --mode <mode> --continue-on-error
+                     --repo-jobs <jobs> --solution-jobs <jobs> --no-native
+    (--no-native keeps every stage on the simulated Copilot path; the synthetic fleet's
+    repository URLs are not clonable)
+    pipeline_core    pipeline_core.execute_pipeline per repository on a <jobs>-thread pool
+                     (driven by this script in a child process, see --pipeline-core-worker)
+
+Reported per scenario (JSON report, default ./output/benchmark_report.json):
+    wall_seconds, repos_per_second, stages, stages_per_second,
+    stage_latency_ms {p50, p90, p99, max}   (from the per-stage metrics in the summaries)
+    simulated_latency_ms_mean               (sleep time injected by the fake copilot)
+    per_stage_overhead_ms                   (mean stage wall - mean simulated latency;
+                                             includes fake copilot interpreter start-up,
+                                             reported separately as fake_startup_ms)
+    peak_rss_kb, peak_fds, peak_threads     (orchestrator process; fds/threads sampled
+                                             from /proc, Linux only)
+
+With --baseline <report.json>, scenarios are compared against a previous report and the
+exit code is 1 when per-stage overhead, peak RSS or peak fds regress by more than
+--max-regression (default 0.25 = 25%).
+
+Usage:
+    python tools/run_benchmarks.py                                   # 10 and 100 repos, all targets
+    python tools/run_benchmarks.py --fleet-sizes 10,100,1000 --targets run_all_repos --jobs 8
+    python tools/run_benchmarks.py --latency-ms 200 --latency-dist lognormal --failure-rate 0.05
+    python tools/run_benchmarks.py --baseline output/benchmark_report_main.json
+"""
+from __future__ import annotations
+import argparse, datetime, glob, json, os, platform, shutil, subprocess, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+TOOLS_DIR = os.path.join(REPO_ROOT, 'tools')
+if TOOLS_DIR not in sys.path:
+    sys.path.append(TOOLS_DIR)
+
+from timeout_policy import percentile
+
+TARGETS = ('run_all_repos', 'run_single_file', 'pipeline_core')
+REPOSITORIES_FILE = 'repositories_small.txt'
+SAMPLE_INTERVAL = 0.05
+CALIBRATION_CALLS = 5
+# Regressions smaller than this many milliseconds per stage are treated as noise.
+OVERHEAD_NOISE_MS = 5.0
+
+
+class ProcessSampler:
+    """Samples fd and thread counts of a running process from /proc (no-op elsewhere)."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.peak_fds: Optional[int] = None
+        self.peak_threads: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> 'ProcessSampler':
+        if os.path.isdir(f"/proc/{self.pid}"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            try:
+                fds = len(os.listdir(f"/proc/{self.pid}/fd"))
+                with open(f"/proc/{self.pid}/status", 'r', encoding='utf-8') as f:
+                    threads = next((int(line.split()[1]) for line in f if line.startswith('Threads:')), None)
+            except (OSError, ValueError):
+                continue
+            self.peak_fds = max(self.peak_fds or 0, fds)
+            if threads is not None:
+                self.peak_threads = max(self.peak_threads or 0, threads)
+
+
+def _wait_with_usage(process: subprocess.Popen):
+    """Wait for the child; return its rusage where os.wait4 is available."""
+    if hasattr(os, 'wait4'):
+        _pid, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return usage
+    process.wait()
+    return None
+
+
+def _max_rss_kb(usage) -> Optional[int]:
+    if usage is None:
+        return None
+    return usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+
+
+def create_workspace(fleet_size: int, fake_config: Dict) -> Dict[str, str]:
+    """Build a temp workspace with a synthetic fleet and a fake copilot on PATH."""
+    root = tempfile.mkdtemp(prefix='copilot-bench-')
+    ignore = shutil.ignore_patterns('__pycache__', '*.pyc')
+    shutil.copytree(TOOLS_DIR, os.path.join(root, 'tools'), ignore=ignore)
+    shutil.copytree(os.path.join(REPO_ROOT, '.github'), os.path.join(root, '.github'), ignore=ignore)
+    with open(os.path.join(root, '.github', 'prompts', REPOSITORIES_FILE), 'w', encoding='utf-8') as f:
+        for idx in range(fleet_size):
+            f.write(f"https://bench.invalid/org/project/_git/bench-repo-{idx:05d}\n")
+    bin_dir = os.path.join(root, 'bin')
+    os.makedirs(bin_dir)
+    fake = os.path.join(root, 'tools', 'fake_copilot.py')
+    if os.name == 'nt':
+        with open(os.path.join(bin_dir, 'copilot.cmd'), 'w', encoding='utf-8') as f:
+            f.write(f'@"{sys.executable}" "{fake}" %*\n')
+    else:
+        shim = os.path.join(bin_dir, 'copilot')
+        with open(shim, 'w', encoding='utf-8') as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{fake}" "$@"\n')
+        os.chmod(shim, 0o755)
+    calls_log = os.path.join(root, 'fake_copilot_calls.jsonl')
+    config_path = os.path.join(root, 'fake_copilot.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(fake_config, calls_log=calls_log), f, indent=2)
+    env = dict(os.environ)
+    env['PATH'] = bin_dir + os.pathsep + env.get('PATH', '')
+    env['FAKE_COPILOT_CONFIG'] = config_path
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return {'root': root, 'calls_log': calls_log, 'env': env}
+
+
+def _target_command(target: str, args: argparse.Namespace) -> List[str]:
+    if target == 'run_all_repos':
+        return [sys.executable, 'tools/run_all_repos.py', '--mode', args.mode, '--jobs', str(args.jobs), '--continue-on-error', '--no-native']
+    if target == 'run_single_file':
+        return [
+            sys.executable, 'tools/run_single_file.py', '--mode', args.mode, '--continue-on-error',
+            '--repo-jobs', str(args.jobs), '--solution-jobs', str(args.jobs), '--no-native',
+        ]
+    return [sys.executable, 'tools/run_benchmarks.py', '--pipeline-core-worker', '--mode', args.mode, '--jobs', str(args.jobs)]
+
+
+def collect_stage_walls(root: str) -> List[float]:
+    """Executed stage wall times from every pipeline summary written in the workspace."""
+    walls: List[float] = []
+    seen = set()
+    for path in glob.glob(os.path.join(root, 'output', '*summary*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        stages = list(summary.get('pipeline', []) or [])
+        for repo in summary.get('details', []) or []:
+            for attempt in repo.get('attempts', []) or []:
+                stages.extend(attempt.get('stages', []) or [])
+        for stage in stages:
+            wall = (stage.get('metrics') or {}).get('wall_seconds')
+            identity = (stage.get('prompt'), stage.get('timestamp'), json.dumps(stage.get('params'), sort_keys=True))
+            if wall is None or identity in seen:
+                continue
+            seen.add(identity)
+            walls.append(wall)
+    return walls
+
+
+def _read_calls(calls_log: str) -> List[Dict]:
+    try:
+        with open(calls_log, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def measure_fake_startup(workspace: Dict[str, str]) -> float:
+    """Mean wall time (ms) of a zero-latency fake copilot call, to separate interpreter start-up."""
+    config_path = workspace['env']['FAKE_COPILOT_CONFIG']
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    calibration = os.path.join(workspace['root'], 'fake_copilot_calibration.json')
+    with open(calibration, 'w', encoding='utf-8') as f:
+        json.dump(dict(config, latency={'distribution': 'fixed', 'median_ms': 0}, calls_log=None, mutate=False, failure_rate=0), f)
+    env = dict(workspace['env'], FAKE_COPILOT_CONFIG=calibration)
+    started = time.perf_counter()
+    for _ in range(CALIBRATION_CALLS):
+        subprocess.run('copilot --prompt "/bench-calibration"', shell=True, env=env, cwd=workspace['root'],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000 / CALIBRATION_CALLS
+
+
+def run_scenario(target: str, fleet_size: int, args: argparse.Namespace, fake_config: Dict) -> Dict:
+    workspace = create_workspace(fleet_size, fake_config)
+    root = workspace['root']
+    try:
+        fake_startup_ms = measure_fake_startup(workspace)
+        log_path = os.path.join(root, 'bench_stdout.log')
+        started = time.perf_counter()
+        with open(log_path, 'wb') as log:
+            process = subprocess.Popen(_target_command(target, args), cwd=root, env=workspace['env'], stdout=log, stderr=subprocess.STDOUT)
+            with ProcessSampler(process.pid) as sampler:
+                usage = _wait_with_usage(process)
+        wall = time.perf_counter() - started
+        walls = collect_stage_walls(root)
+        calls = _read_calls(workspace['calls_log'])
+        simulated = [c['latency_ms'] for c in calls]
+        mean_wall_ms = sum(walls) * 1000 / len(walls) if walls else None
+        mean_simulated_ms = sum(simulated) / len(simulated) if simulated else None
+        result = {
+            'target': target,
+            'fleet_size': fleet_size,
+            'mode': args.mode,
+            'jobs': args.jobs,
+            'exit_code': process.returncode,
+            'wall_seconds': round(wall, 3),
+            'repos_per_second': round(fleet_size / wall, 3) if wall else None,
+            'stages': len(walls),
+            'stages_per_second': round(len(walls) / wall, 3) if wall else None,
+            'stage_latency_ms': {
+                name: round(percentile(walls, pct) * 1000, 1) if walls else None
+                for name, pct in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100))
+            },
+            'simulated_latency_ms_mean': round(mean_simulated_ms, 1) if mean_simulated_ms is not None else None,
+            'per_stage_overhead_ms': (
+                round(mean_wall_ms - mean_simulated_ms, 1) if mean_wall_ms is not None and mean_simulated_ms is not None else None
+            ),
+            'fake_startup_ms': round(fake_startup_ms, 1),
+            'fake_calls': len(calls),
+            'fake_failures': sum(1 for c in calls if c.get('exit_code')),
+            'peak_rss_kb': _max_rss_kb(usage),
+            'peak_fds': sampler.peak_fds,
+            'peak_threads': sampler.peak_threads,
+        }
+        if args.keep_workspaces:
+            result['workspace'] = root
+        return result
+    finally:
+        if not args.keep_workspaces:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def pipeline_core_worker(args: argparse.Namespace) -> int:
+    """Child-process driver for the pipeline_core target (runs inside a bench workspace)."""
+    from copilot_executor import CopilotExecutor
+    from pipeline_core import execute_pipeline
+    from run_single_file import INITIAL_PROMPT, build_repo_pipelines
+
+    output_dir = os.path.join(REPO_ROOT, 'output')
+    os.makedirs(output_dir, exist_ok=True)
+    with CopilotExecutor(log_file=os.path.join(output_dir, 'bench_initial.log')) as executor:
+        exit_code, _out, _err = executor.execute_prompt(INITIAL_PROMPT, {'input': REPOSITORIES_FILE})
+    if exit_code != 0:
+        return exit_code
+    checklists = sorted(glob.glob(os.path.join(REPO_ROOT, 'tasks', '*_repo_checklist.md')))
+
+    def run_one(path: str) -> int:
+        rel = os.path.relpath(path, REPO_ROOT).replace(os.sep, '/')
+        name = os.path.basename(path).replace('_repo_checklist.md', '')
+        steps, combined = build_repo_pipelines(rel)
+        code, _summary = execute_pipeline(
+            pipeline=steps if args.mode == 'steps' else combined,
+            log_file=os.path.join(output_dir, f"bench_{name}.log"),
+            continue_on_error=True,
+            step_by_step=False,
+            mode=args.mode,
+            summary_path=os.path.join(output_dir, f"{name}_pipeline_summary.json"),
+        )
+        return code
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        codes = list(pool.map(run_one, checklists))
+    return 0 if all(code == 0 for code in codes) else 1
+
+
+def compare_with_baseline(results: List[Dict], baseline_path: str, max_regression: float) -> List[str]:
+    """Return human-readable regressions of ``results`` against a previous report."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    key = lambda r: (r['target'], r['fleet_size'], r['mode'], r['jobs'])
+    previous = {key(r): r for r in baseline.get('results', [])}
+    regressions: List[str] = []
+    for result in results:
+        old = previous.get(key(result))
+        if not old:
+            continue
+        label = f"{result['target']} n={result['fleet_size']} jobs={result['jobs']}"
+        new_overhead, old_overhead = result.get('per_stage_overhead_ms'), old.get('per_stage_overhead_ms')
+        if new_overhead is not None and old_overhead is not None:
+            if new_overhead - old_overhead > max(abs(old_overhead) * max_regression, OVERHEAD_NOISE_MS):
+                regressions.append(f"{label}: per_stage_overhead_ms {old_overhead} -> {new_overhead}")
+        for field in ('peak_rss_kb', 'peak_fds'):
+            new, old_value = result.get(field), old.get(field)
+            if new is not None and old_value and new > old_value * (1 + max_regression) + (2 if field == 'peak_fds' else 0):
+                regressions.append(f"{label}: {field} {old_value} -> {new}")
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Benchmark orchestrator overhead against a fake copilot CLI.')
+    p.add_argument('--targets', default=','.join(TARGETS), help=f"Comma-separated targets ({', '.join(TARGETS)}).")
+    p.add_argument('--fleet-sizes', type=_int_list, default=[10, 100], help='Comma-separated synthetic fleet sizes (default 10,100).')
+    p.add_argument('--mode', choices=['steps', 'combine'], default='steps', help='Pipeline mode passed to the targets.')
+    p.add_argument('--jobs', type=int, default=4, help='Concurrent repositories (run_single_file: repo and solution checklists).')
+    p.add_argument('--latency-ms', type=float, default=20.0, help='Median simulated copilot latency in milliseconds.')
+    p.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'], default='lognormal', help='Simulated latency distribution.')
+    p.add_argument('--latency-sigma', type=float, default=0.5, help='Sigma of the lognormal latency distribution.')
+    p.add_argument('--output-lines', type=int, default=20, help='Stdout lines printed per fake copilot call.')
+    p.add_argument('--line-bytes', type=int, default=80, help='Bytes per fake output line.')
+    p.add_argument('--failure-rate', type=float, default=0.0, help='Probability that a fake copilot call fails.')
+    p.add_argument('--fake-config', help='JSON file merged into the fake copilot config (e.g. prompt_latency).')
+    p.add_argument('--report', default=os.path.join(REPO_ROOT, 'output', 'benchmark_report.json'), help='JSON report path.')
+    p.add_argument('--baseline', help='Previous report to compare against; regressions exit with code 1.')
+    p.add_argument('--max-regression', type=float, default=0.25, help='Allowed relative regression vs --baseline (default 0.25).')
+    p.add_argument('--keep-workspaces', action='store_true', help='Keep the temp workspaces for inspection.')
+    p.add_argument('--pipeline-core-worker', action='store_true', help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+    if args.jobs < 1:
+        p.error('--jobs must be >= 1')
+    unknown = set(args.targets.split(',')) - set(TARGETS)
+    if unknown:
+        p.error(f"unknown target(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.pipeline_core_worker:
+        return pipeline_core_worker(args)
+    fake_config: Dict = {
+        'latency': {'distribution': args.latency_dist, 'median_ms': args.latency_ms, 'sigma': args.latency_sigma},
+        'output_lines': args.output_lines,
+        'line_bytes': args.line_bytes,
+        'failure_rate': args.failure_rate,
+    }
+    if args.fake_config:
+        with open(args.fake_config, 'r', encoding='utf-8') as f:
+            fake_config.update(json.load(f))
+
+    results: List[Dict] = []
+    for target in args.targets.split(','):
+        for fleet_size in args.fleet_sizes:
+            print(f"[bench] {target} fleet={fleet_size} mode={args.mode} jobs={args.jobs} ...", flush=True)
+            result = run_scenario(target, fleet_size, args, fake_config)
+            results.append(result)
+            latency = result['stage_latency_ms']
+            print(
+                f"[bench] {target} fleet={fleet_size}: exit={result['exit_code']} wall={result['wall_seconds']}s "
+                f"stages={result['stages']} ({result['stages_per_second']}/s) "
+                f"stage p50/p90/p99={latency['p50']}/{latency['p90']}/{latency['p99']}ms "
+                f"overhead/stage={result['per_stage_overhead_ms']}ms (fake start-up {result['fake_startup_ms']}ms) "
+                f"rss={result['peak_rss_kb']}KB fds={result['peak_fds']} threads={result['peak_threads']}",
+                flush=True,
+            )
+
+    report = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'fake_config': fake_config,
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench] report written to {args.report}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.max_regression)
+        for line in regressions:
+            print(f"[bench][regression] {line}")
+        if regressions:
+            return 1
+        print(f"[bench] no regressions vs {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
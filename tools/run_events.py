@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Append-Only Run Event Log
+
+Crash-safe, streamable record of an orchestrator run. Every event is one compact JSON
+line appended (and flushed) as soon as it happens, so a killed run still leaves a
+complete history up to the last finished write; a torn final line is ignored on read.
+
+Event record:
+    {"seq": 12, "ts": "2025-01-01T00:00:00+00:00", "run_id": "20250101T000000Z-4242",
+     "event": "stage_finish", "repo": "my_repo", "pass": 1, ...event fields}
+
+Events written by the orchestrators / pipeline_core:
+    run_start, checklists_generated, repos_discovered, pass_start, attempt_start, pipeline_start,
+    stage_start, stage_finish, stage_blocked, pipeline_finish, readiness, retry,
+    repo_final, run_finish
+
+The compact index (build_index / write_index) folds the stream into per-repo attempt
+outcomes, per-prompt counts/wall time and the final run status without loading the
+whole file into memory.
+
+CLI:
+    python tools/run_events.py index  <events.jsonl> [--out index.json]
+    python tools/run_events.py filter <events.jsonl> [--event stage_finish] [--repo NAME]
+"""
+from __future__ import annotations
+import argparse, datetime, json, os, sys, threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_COMPACT = (',', ':')
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds')
+
+
+class EventLog:
+    """Thread-safe JSONL appender; each emit() is a single flushed line."""
+
+    def __init__(self, path: str, *, run_id: Optional[str] = None, truncate: bool = False, fsync: bool = False):
+        self.path = path
+        self.run_id = run_id or datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ') + f"-{os.getpid()}"
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._seq = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w' if truncate else 'a', encoding='utf-8', newline='\n')
+
+    def emit(self, event: str, **fields) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._seq += 1
+            record = {'seq': self._seq, 'ts': _now(), 'run_id': self.run_id, 'event': event}
+            record.update(fields)
+            self._file.write(json.dumps(record, separators=_COMPACT, default=str) + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def bind(self, **context) -> 'BoundEventLog':
+        """Return an emitter that adds ``context`` (e.g. repo, pass) to every event."""
+        return BoundEventLog(self, context)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> 'EventLog':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BoundEventLog:
+    """EventLog view with fixed context fields."""
+
+    def __init__(self, log: EventLog, context: Dict):
+        self._log = log
+        self.context = context
+
+    def emit(self, event: str, **fields) -> None:
+        self._log.emit(event, **{**self.context, **fields})
+
+    def bind(self, **context) -> 'BoundEventLog':
+        return BoundEventLog(self._log, {**self.context, **context})
+
+
+def read_events(path: str) -> Iterator[Dict]:
+    """Stream events from a JSONL file, skipping a torn (partially written) line."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def build_index(events: Iterable[Dict], run_id: Optional[str] = None) -> Dict:
+    """Fold an event stream into a compact run index (last run in the stream by default)."""
+    index: Dict = {}
+    for record in events:
+        if record.get('event') == 'run_start' and run_id is None:
+            index = {}  # a later run in the same file supersedes earlier ones
+        if run_id is not None and record.get('run_id') != run_id:
+            continue
+        if not index:
+            index = {'run_id': record.get('run_id'), 'started': record.get('ts'), 'status': 'INCOMPLETE',
+                     'events': 0, 'repos': {}, 'prompts': {}}
+        index['events'] += 1
+        index['last_event'] = record.get('ts')
+        event = record.get('event')
+        repo_name = record.get('repo')
+        repo = index['repos'].setdefault(repo_name, {'final_readiness': 'PENDING', 'attempts': []}) if repo_name else None
+        if event in ('run_start', 'repos_discovered'):
+            index.update({k: record[k] for k in ('mode', 'jobs', 'repos_total') if k in record})
+        elif event == 'attempt_start' and repo is not None:
+            repo['attempts'].append({'pass': record.get('pass'), 'stages': 0, 'failed': [], 'wall_seconds': 0.0})
+        elif event == 'stage_finish':
+            prompt = index['prompts'].setdefault(record.get('prompt'), {'count': 0, 'failures': 0, 'cache_hits': 0, 'wall_seconds': 0.0})
+            wall = float(record.get('wall_seconds') or 0.0)
+            prompt['count'] += 1
+            prompt['wall_seconds'] = round(prompt['wall_seconds'] + wall, 3)
+            prompt['failures'] += record.get('stage_status') != 'SUCCESS'
+            prompt['cache_hits'] += record.get('cache_status') == 'HIT'
+            if repo is not None and repo['attempts']:
+                attempt = repo['attempts'][-1]
+                attempt['stages'] += 1
+                attempt['wall_seconds'] = round(attempt['wall_seconds'] + wall, 3)
+                if record.get('stage_status') != 'SUCCESS':
+                    attempt['failed'].append(record.get('prompt'))
+        elif event == 'stage_blocked' and repo is not None and repo['attempts']:
+            repo['attempts'][-1].setdefault('blocked', []).append(record.get('prompt'))
+        elif event == 'readiness' and repo is not None and repo['attempts']:
+            repo['attempts'][-1].update(exit_code=record.get('exit_code'), readiness=record.get('readiness'))
+        elif event == 'repo_final' and repo is not None:
+            repo['final_readiness'] = record.get('final_readiness')
+        elif event == 'run_finish':
+            index.update(status=record.get('overall_status'), finished=record.get('ts'))
+            index.update({k: record[k] for k in ('repos_readiness_pass', 'repos_readiness_fail') if k in record})
+    return index
+
+
+def write_index(events_path: str, index_path: str, run_id: Optional[str] = None) -> Dict:
+    """Build the index for ``events_path`` and write it (compact JSON) atomically.
+
+    A missing event file (e.g. deleted by a prompt that resets ./output) yields an empty
+    index flagged ``events_missing`` instead of failing the end of the run.
+    """
+    if os.path.isfile(events_path):
+        index = build_index(read_events(events_path), run_id=run_id)
+    else:
+        index = {'run_id': run_id, 'status': 'INCOMPLETE', 'events': 0, 'repos': {}, 'prompts': {}, 'events_missing': True}
+    index['events_file'] = os.path.abspath(events_path)
+    directory = os.path.dirname(index_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{index_path}.tmp-{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=_COMPACT)
+    os.replace(tmp, index_path)
+    return index
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Inspect an orchestrator run event log.')
+    sub = p.add_subparsers(dest='command', required=True)
+    index = sub.add_parser('index', help='Build the compact run index from an event log.')
+    index.add_argument('events')
+    index.add_argument('--out', help='Write the index here instead of printing it.')
+    index.add_argument('--run-id', help='Index this run instead of the last one in the file.')
+    filt = sub.add_parser('filter', help='Print matching events as JSON lines.')
+    filt.add_argument('events')
+    filt.add_argument('--event', action='append', help='Event type to keep (repeatable).')
+    filt.add_argument('--repo', help='Only events of this repository.')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.command == 'index':
+        if args.out:
+            write_index(args.events, args.out, run_id=args.run_id)
+            print(f"[events] index written to {args.out}")
+        else:
+            print(json.dumps(build_index(read_events(args.events), run_id=args.run_id), indent=2))
+        return 0
+    for record in read_events(args.events):
+        if args.event and record.get('event') not in args.event:
+            continue
+        if args.repo and record.get('repo') != args.repo:
+            continue
+        print(json.dumps(record, separators=_COMPACT))
+    return 0
+
+
+__all__ = ['EventLog', 'BoundEventLog', 'read_events', 'build_index', 'write_index']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
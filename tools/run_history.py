@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""SQLite Run-History Store
+
+Embedded database of pipeline results across runs, kept at ./.cache/run_history.sqlite
+(outside the directories purged by the orchestrators) so months of runs can be queried
+without loading thousands of summary JSON files.
+
+Tables (all indexed on the usual filter columns):
+    runs       one row per orchestrator invocation (orchestrator, mode, status, times)
+    repos      repository name / checklist / first and last seen
+    attempts   one row per pipeline attempt (repo or solution checklist, pass/attempt no.,
+               exit code, readiness outcome); solution attempts are recorded under their
+               parent repo with the solution name in its own column
+    stages     one row per executed stage (prompt, status, cache status, termination,
+               wall / cpu / rss metrics)
+    readiness  final readiness per checklist per run
+    decisions  rows imported from results/decision-log.csv (import-decisions)
+
+Writers:
+    - execute_pipeline(..., history=recorder) stores the attempt and its stages when the
+      pipeline finishes (recorder = RunHistory.attempt(...)).
+    - run_all_repos / run_single_file open the run, record readiness and close the run.
+    Every write is one short transaction; WAL mode plus a busy timeout lets worker threads
+    and concurrent orchestrator processes share the database.
+
+Query CLI:
+    python tools/run_history.py runs            [--limit 20]
+    python tools/run_history.py slowest-prompts [--days 30] [--limit 10]
+    python tools/run_history.py flaky-repos     [--days 30] [--limit 10]
+    python tools/run_history.py failure-rate    [--days 30] [--by day|week]
+    python tools/run_history.py import-summaries <glob>...   (backfill from summary JSON files)
+    python tools/run_history.py import-decisions [results/decision-log.csv]
+    python tools/run_history.py sql "<select ...>"
+"""
+from __future__ import annotations
+import argparse, csv, datetime, glob, json, os, socket, sqlite3, sys, threading, uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from checklist_utils import load_checklist
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_DB_PATH = os.path.join(REPO_ROOT, '.cache', 'run_history.sqlite')
+DEFAULT_DECISION_LOG = os.path.join(REPO_ROOT, 'results', 'decision-log.csv')
+BUSY_TIMEOUT_MS = 30000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    orchestrator TEXT NOT NULL,
+    mode TEXT,
+    host TEXT,
+    args TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    overall_status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+
+CREATE TABLE IF NOT EXISTS repos (
+    repo TEXT PRIMARY KEY,
+    checklist_path TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS attempts (
+    attempt_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    repo TEXT,
+    solution TEXT,
+    kind TEXT NOT NULL,
+    checklist_path TEXT,
+    attempt INTEGER,
+    exit_code INTEGER,
+    overall_status TEXT,
+    readiness TEXT,
+    elapsed_seconds REAL,
+    summary_path TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_run ON attempts(run_id);
+CREATE INDEX IF NOT EXISTS idx_attempts_repo ON attempts(repo, recorded_at);
+
+CREATE TABLE IF NOT EXISTS stages (
+    stage_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    attempt_id INTEGER NOT NULL REFERENCES attempts(attempt_id),
+    run_id TEXT NOT NULL,
+    repo TEXT,
+    prompt TEXT NOT NULL,
+    stage_order INTEGER,
+    stage_status TEXT,
+    exit_code INTEGER,
+    cache_status TEXT,
+    termination TEXT,
+    wall_seconds REAL,
+    cpu_user_seconds REAL,
+    cpu_system_seconds REAL,
+    max_rss_kb INTEGER,
+    started_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stages_prompt ON stages(prompt, started_at);
+CREATE INDEX IF NOT EXISTS idx_stages_repo ON stages(repo, started_at);
+CREATE INDEX IF NOT EXISTS idx_stages_started ON stages(started_at);
+
+CREATE TABLE IF NOT EXISTS readiness (
+    run_id TEXT NOT NULL,
+    repo TEXT,
+    solution TEXT,
+    kind TEXT NOT NULL,
+    checklist_path TEXT NOT NULL,
+    final_readiness TEXT NOT NULL,
+    attempts INTEGER,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, checklist_path)
+);
+CREATE INDEX IF NOT EXISTS idx_readiness_repo ON readiness(repo, recorded_at);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    timestamp TEXT,
+    repo TEXT,
+    solution TEXT,
+    task TEXT,
+    message TEXT,
+    status TEXT,
+    UNIQUE (timestamp, repo, solution, task, message, status)
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_repo ON decisions(repo, timestamp);
+"""
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
+
+def _since(days: Optional[float]) -> str:
+    if not days:
+        return ''
+    return (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)).isoformat(timespec='seconds')
+
+
+class RunHistory:
+    """Thread-safe writer/reader for the run-history database."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+            self._conn.executescript(SCHEMA)
+
+    # -- writers -------------------------------------------------------------------
+    def _write(self, statements: Iterable[tuple]) -> List[int]:
+        """Run (sql, params) statements in one transaction; returns their lastrowids."""
+        with self._lock, self._conn:
+            return [self._conn.execute(sql, params).lastrowid for sql, params in statements]
+
+    def start_run(self, orchestrator: str, mode: Optional[str] = None, args: Optional[Dict] = None,
+                  run_id: Optional[str] = None) -> str:
+        run_id = run_id or f"{datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
+        self._write([(
+            'INSERT OR IGNORE INTO runs (run_id, orchestrator, mode, host, args, started_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (run_id, orchestrator, mode, socket.gethostname(), json.dumps(args or {}, default=str, sort_keys=True), _now()),
+        )])
+        return run_id
+
+    def finish_run(self, run_id: str, overall_status: str) -> None:
+        self._write([('UPDATE runs SET finished_at = ?, overall_status = ? WHERE run_id = ?', (_now(), overall_status, run_id))])
+
+    def attempt(self, run_id: str, *, kind: str, checklist_path: Optional[str], attempt: int,
+                repo: Optional[str] = None, solution: Optional[str] = None) -> 'AttemptRecorder':
+        """Recorder for one pipeline attempt, passed to execute_pipeline(history=...).
+
+        ``repo`` and ``solution`` default to checklist_identity(checklist_path).
+        """
+        if repo is None:
+            repo, solution = checklist_identity(checklist_path)
+        return AttemptRecorder(self, run_id, repo=repo, solution=solution, kind=kind,
+                               checklist_path=checklist_path, attempt=attempt)
+
+    def record_pipeline(self, run_id: str, *, repo: Optional[str], kind: str, checklist_path: Optional[str],
+                        attempt: int, exit_code: int, summary: Dict, summary_path: Optional[str] = None,
+                        solution: Optional[str] = None) -> int:
+        """Store an attempt row and its stage rows; returns the attempt_id."""
+        now = _now()
+        statements = []
+        if repo:
+            # Only repo checklists name the repo's checklist; solution attempts just refresh last_seen.
+            statements.append((
+                'INSERT INTO repos (repo, checklist_path, first_seen, last_seen) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(repo) DO UPDATE SET last_seen = excluded.last_seen, '
+                'checklist_path = COALESCE(excluded.checklist_path, repos.checklist_path)',
+                (repo, None if solution else checklist_path, now, now),
+            ))
+        statements.append((
+            'INSERT INTO attempts (run_id, repo, solution, kind, checklist_path, attempt, exit_code, overall_status, elapsed_seconds, summary_path, recorded_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (run_id, repo, solution, kind, checklist_path, attempt, exit_code, summary.get('overall_status'),
+             summary.get('elapsed_seconds'), summary_path, now),
+        ))
+        with self._lock, self._conn:
+            attempt_id = None
+            for sql, params in statements:
+                attempt_id = self._conn.execute(sql, params).lastrowid
+            self._conn.executemany(
+                'INSERT INTO stages (attempt_id, run_id, repo, prompt, stage_order, stage_status, exit_code, cache_status, '
+                'termination, wall_seconds, cpu_user_seconds, cpu_system_seconds, max_rss_kb, started_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [_stage_row(attempt_id, run_id, repo, stage) for stage in summary.get('pipeline', []) or []],
+            )
+        return attempt_id
+
+    def record_attempt_readiness(self, attempt_id: int, readiness: bool) -> None:
+        self._write([('UPDATE attempts SET readiness = ? WHERE attempt_id = ?', ('PASS' if readiness else 'FAIL', attempt_id))])
+
+    def record_readiness(self, run_id: str, *, kind: str, checklist_path: str, final_readiness: str,
+                         attempts: int, repo: Optional[str] = None, solution: Optional[str] = None) -> None:
+        if repo is None:
+            repo, solution = checklist_identity(checklist_path)
+        self._write([(
+            'INSERT OR REPLACE INTO readiness (run_id, repo, solution, kind, checklist_path, final_readiness, attempts, recorded_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (run_id, repo, solution, kind, checklist_path, final_readiness, attempts, _now()),
+        )])
+
+    def import_decisions(self, csv_path: str = DEFAULT_DECISION_LOG) -> int:
+        """Load decision-log rows (timestamp,repo_name,solution_name,task,message,status); returns rows added."""
+        with open(csv_path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+            rows = [
+                (r.get('timestamp'), r.get('repo_name'), r.get('solution_name'), r.get('task'), r.get('message'), r.get('status'))
+                for r in csv.DictReader(f)
+            ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany('INSERT OR IGNORE INTO decisions VALUES (?, ?, ?, ?, ?, ?)', rows)
+            return self._conn.total_changes - before
+
+    def import_summary(self, path: str) -> int:
+        """Backfill one per-pipeline summary JSON file as its own run; returns stages imported."""
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            summary = json.load(f)
+        stages = summary.get('pipeline') or []
+        if not stages:
+            return 0
+        run_id = f"import:{os.path.abspath(path)}"
+        with self._lock:
+            if self._conn.execute('SELECT 1 FROM runs WHERE run_id = ?', (run_id,)).fetchone():
+                return 0
+        checklist = next((v for s in stages for k, v in (s.get('params') or {}).items() if 'checklist' in k), None)
+        repo, solution = checklist_identity(checklist)
+        kind = 'solution' if checklist and 'solution_checklist' in checklist else 'repo'
+        self.start_run('import', summary.get('mode'), {'source': path}, run_id=run_id)
+        exit_code = 0 if summary.get('overall_status') == 'SUCCESS' else 1
+        self.record_pipeline(run_id, repo=repo, kind=kind, checklist_path=checklist, attempt=1,
+                             exit_code=exit_code, summary=summary, summary_path=path, solution=solution)
+        self._write([('UPDATE runs SET started_at = ?, finished_at = ?, overall_status = ? WHERE run_id = ?',
+                      (stages[0].get('timestamp') or _now(), summary.get('timestamp'), summary.get('overall_status'), run_id))])
+        return len(stages)
+
+    # -- queries -------------------------------------------------------------------
+    def query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def recent_runs(self, limit: int = 20) -> List[Dict]:
+        return self.query(
+            'SELECT r.run_id, r.orchestrator, r.mode, r.started_at, r.finished_at, r.overall_status, '
+            'COUNT(DISTINCT a.attempt_id) AS attempts, COUNT(s.stage_id) AS stages '
+            'FROM runs r LEFT JOIN attempts a ON a.run_id = r.run_id LEFT JOIN stages s ON s.attempt_id = a.attempt_id '
+            'GROUP BY r.run_id ORDER BY r.started_at DESC LIMIT ?', (limit,))
+
+    def slowest_prompts(self, days: Optional[float] = 30, limit: int = 10) -> List[Dict]:
+        return self.query(
+            "SELECT prompt, COUNT(*) AS runs, ROUND(AVG(wall_seconds), 3) AS avg_seconds, "
+            "ROUND(MAX(wall_seconds), 3) AS max_seconds, ROUND(SUM(wall_seconds), 3) AS total_seconds "
+            "FROM stages WHERE wall_seconds IS NOT NULL AND COALESCE(cache_status, '') != 'HIT' AND started_at >= ? "
+            "GROUP BY prompt ORDER BY avg_seconds DESC LIMIT ?", (_since(days), limit))
+
+    def flaky_repos(self, days: Optional[float] = 30, limit: int = 10) -> List[Dict]:
+        """Repos whose attempts fail most often (failed stages or readiness FAIL), retries included."""
+        return self.query(
+            "SELECT repo, kind, COUNT(*) AS attempts, "
+            "SUM(CASE WHEN exit_code != 0 OR readiness = 'FAIL' THEN 1 ELSE 0 END) AS failed_attempts, "
+            "ROUND(1.0 * SUM(CASE WHEN exit_code != 0 OR readiness = 'FAIL' THEN 1 ELSE 0 END) / COUNT(*), 3) AS failure_rate, "
+            "COUNT(DISTINCT run_id) AS runs "
+            "FROM attempts WHERE repo IS NOT NULL AND recorded_at >= ? "
+            "GROUP BY repo, kind HAVING failed_attempts > 0 ORDER BY failure_rate DESC, attempts DESC LIMIT ?",
+            (_since(days), limit))
+
+    def failure_rate(self, days: Optional[float] = 30, by: str = 'day') -> List[Dict]:
+        bucket = "strftime('%Y-W%W', started_at)" if by == 'week' else 'substr(started_at, 1, 10)'
+        return self.query(
+            f"SELECT {bucket} AS period, COUNT(*) AS stages, "
+            "SUM(CASE WHEN stage_status != 'SUCCESS' THEN 1 ELSE 0 END) AS failures, "
+            "ROUND(1.0 * SUM(CASE WHEN stage_status != 'SUCCESS' THEN 1 ELSE 0 END) / COUNT(*), 3) AS failure_rate "
+            "FROM stages WHERE started_at >= ? GROUP BY period ORDER BY period", (_since(days),))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'RunHistory':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AttemptRecorder:
+    """Binds run/repo/attempt context so execute_pipeline can store its result."""
+
+    def __init__(self, history: RunHistory, run_id: str, **context):
+        self.history = history
+        self.run_id = run_id
+        self.context = context
+        self.attempt_id: Optional[int] = None
+
+    def record_pipeline(self, exit_code: int, summary: Dict, summary_path: Optional[str] = None) -> None:
+        try:
+            self.attempt_id = self.history.record_pipeline(
+                self.run_id, exit_code=exit_code, summary=summary, summary_path=summary_path, **self.context)
+        except sqlite3.Error as err:
+            print(f"[history-warn] Unable to record pipeline attempt: {err}")
+
+    def record_readiness(self, ready: bool) -> None:
+        if self.attempt_id is None:
+            return
+        try:
+            self.history.record_attempt_readiness(self.attempt_id, ready)
+        except sqlite3.Error as err:
+            print(f"[history-warn] Unable to record readiness: {err}")
+
+
+def _stage_row(attempt_id: int, run_id: str, repo: Optional[str], stage: Dict) -> tuple:
+    metrics = stage.get('metrics') or {}
+    return (
+        attempt_id, run_id, repo, stage.get('prompt'), stage.get('order'), stage.get('stage_status'),
+        stage.get('exit_code'), stage.get('cache_status'), metrics.get('termination'), metrics.get('wall_seconds'),
+        metrics.get('cpu_user_seconds'), metrics.get('cpu_system_seconds'), metrics.get('max_rss_kb'),
+        stage.get('timestamp'),
+    )
+
+
+def checklist_identity(checklist_path: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (repo, solution) for a checklist; solution is None for repo checklists.
+
+    Solution checklists (<repo>_<solution>_solution_checklist.md) name their parent repo in
+    the `parent_repo` variable, else in the `Repository:` header URL; the file name is the
+    last resort (repo = whole stem, as the split between repo and solution is ambiguous).
+    """
+    if not checklist_path:
+        return None, None
+    name = os.path.basename(checklist_path.replace('\\', '/'))
+    if name.endswith('_repo_checklist.md'):
+        return name[: -len('_repo_checklist.md')], None
+    if not name.endswith('_solution_checklist.md'):
+        return os.path.splitext(name)[0], None
+    stem = name[: -len('_solution_checklist.md')]
+    path = checklist_path if os.path.isabs(checklist_path) else os.path.join(REPO_ROOT, checklist_path)
+    doc = load_checklist(path)
+    if doc is None:
+        return stem, None
+    variables = doc.variables(('### Solution Variables', '## Solution Variables'))
+    repo = variables.get('parent_repo', '').strip()
+    if not repo:
+        header = next((line for line in doc.lines[:10] if line.startswith('Repository:')), '')
+        url = header.split(':', 1)[1].strip().rstrip('/') if header else ''
+        repo = url.rsplit('/', 1)[-1][:-4] if url.endswith('.git') else url.rsplit('/', 1)[-1]
+    solution = variables.get('solution_name', '').strip()
+    if not solution and repo and stem.startswith(f"{repo}_"):
+        solution = stem[len(repo) + 1:]
+    return (repo or stem), (solution or None)
+
+
+def add_history_arguments(parser) -> None:
+    """Register the run-history command line flags shared by the orchestrators."""
+    parser.add_argument('--history-db', default=DEFAULT_DB_PATH, help='SQLite run-history database (default ./.cache/run_history.sqlite).')
+    parser.add_argument('--no-history', action='store_true', help='Do not record this run in the run-history database.')
+
+
+def run_history_from_args(args) -> Optional[RunHistory]:
+    """Open the RunHistory selected by parsed orchestrator flags, or None when disabled/unavailable."""
+    if getattr(args, 'no_history', False):
+        return None
+    try:
+        return RunHistory(args.history_db)
+    except sqlite3.Error as err:
+        print(f"[history-warn] Run history disabled: {err}")
+        return None
+
+
+def _print_rows(rows: List[Dict]) -> None:
+    if not rows:
+        print('(no rows)')
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(c)), *(len(str(r[c])) for r in rows)) for c in columns]
+    print('  '.join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print('  '.join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Query the pipeline run-history database.')
+    p.add_argument('--db', default=DEFAULT_DB_PATH, help='Database path (default ./.cache/run_history.sqlite).')
+    p.add_argument('--json', action='store_true', help='Print rows as JSON.')
+    sub = p.add_subparsers(dest='command', required=True)
+    runs = sub.add_parser('runs', help='Most recent runs.')
+    runs.add_argument('--limit', type=int, default=20)
+    for name, text in (('slowest-prompts', 'Prompts by average executed wall time.'),
+                       ('flaky-repos', 'Repositories by attempt failure rate.')):
+        q = sub.add_parser(name, help=text)
+        q.add_argument('--days', type=float, default=30, help='Look back this many days (0 = all).')
+        q.add_argument('--limit', type=int, default=10)
+    rate = sub.add_parser('failure-rate', help='Stage failure rate per day or week.')
+    rate.add_argument('--days', type=float, default=30, help='Look back this many days (0 = all).')
+    rate.add_argument('--by', choices=['day', 'week'], default='day')
+    imp = sub.add_parser('import-summaries', help='Backfill from per-pipeline summary JSON files.')
+    imp.add_argument('patterns', nargs='+', help='Files or glob patterns (e.g. "output/*_pipeline_summary*.json").')
+    dec = sub.add_parser('import-decisions', help='Load results/decision-log.csv rows.')
+    dec.add_argument('csv_path', nargs='?', default=DEFAULT_DECISION_LOG)
+    sql = sub.add_parser('sql', help='Run a read-only SQL query.')
+    sql.add_argument('statement')
+    return p.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    with RunHistory(args.db) as history:
+        if args.command == 'import-summaries':
+            paths = sorted({path for pattern in args.patterns for path in glob.glob(pattern)})
+            imported = sum(history.import_summary(path) for path in paths)
+            print(f"[history] imported {imported} stage(s) from {len(paths)} file(s)")
+            return 0
+        if args.command == 'import-decisions':
+            print(f"[history] imported {history.import_decisions(args.csv_path)} decision row(s)")
+            return 0
+        if args.command == 'runs':
+            rows = history.recent_runs(args.limit)
+        elif args.command == 'slowest-prompts':
+            rows = history.slowest_prompts(args.days, args.limit)
+        elif args.command == 'flaky-repos':
+            rows = history.flaky_repos(args.days, args.limit)
+        elif args.command == 'failure-rate':
+            rows = history.failure_rate(args.days, args.by)
+        else:
+            if not args.statement.lstrip().lower().startswith(('select', 'with')):
+                print('[error] Only SELECT/WITH queries are allowed.', file=sys.stderr)
+                return 2
+            rows = history.query(args.statement)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_rows(rows)
+    return 0
+
+
+__all__ = ['RunHistory', 'AttemptRecorder', 'add_history_arguments', 'run_history_from_args', 'DEFAULT_DB_PATH']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -30,10 +30,44 @@ Flags:
     --log <path>             Optional log file (default ./output/orchestrator.log)
     --continue-on-error      If set, will attempt to continue even if a prompt fails.
     --mode {combine,steps}   Execution style: 'combine' runs full pipeline automatically; 'steps' asks before each stage.
+    --stage-parallel N       Steps mode: run independent repo stages concurrently, up to N at once
+                             (default 1; dependencies in REPO_STEP_DEPENDENCIES). At the default the
+                             stages run in list order and --continue-on-error continues past failures.
+    --repo-jobs N            Repository checklists processed concurrently (default 1)
+    --solution-jobs N        Solution checklists processed concurrently (default 0 = legacy phases:
+                             solutions start after every repository finished). With N >= 1 the
+                             run is pipelined: a repository's solution checklists are scheduled as
+                             soon as that repository's pipeline and readiness check complete; those
+                             of repositories that fail readiness are skipped and listed in the summary.
+    --history-db <path>      SQLite run-history database (default ./.cache/run_history.sqlite)
+    --no-history             Do not record the run in the history database
+    --no-native              Run scriptable tasks through Copilot instead of their native handlers
+                             (tools/native_tasks.py; default: native first, prompt as fallback)
+    --no-resume              Retry attempts rerun every stage (default: steps mode resumes at the first
+                             checklist task not yet marked [x]; skips are recorded in the attempt summary)
+    --prompt-memo            Replay prompt calls identical to a previous successful call instead of
+                             launching copilot (tools/prompt_memo.py; --memo-dir, --memo-ttl-hours,
+                             --memo-max-mb; hits/misses appear in each pipeline summary)
+    --max-calls-per-minute N / --max-concurrency N / --initial-concurrency N / --max-burst N
+                             Copilot admission control (tools/rate_limiter.py): token-bucket rate cap
+                             (default uncapped) and an adaptive concurrency limit (default max 32) that
+                             halves on throttling and grows while calls queue; throttled calls are
+                             retried --throttle-retries times (default 3) after a backoff
+    --rate-limit-shared [dir]
+                             Share the limiter with other orchestrator processes via lock files in dir
+    --no-rate-limit          Launch copilot without admission control or throttle retries
+    --stage-cache            Skip stages whose prompt/params/model/checklist match a cached successful run
+                             (clone, README execution, builds and checklist generation always run)
+    --no-cache               Disable result caches (overrides --stage-cache)
+    --command-timeout <s>    Default hard timeout per copilot invocation (default 1800)
+    --timeout-policy <path>  JSON per-prompt timeout policy (see tools/timeout_policy.py)
+    --timeout-from-history   Derive per-prompt timeouts from p95 stage durations in past summaries
+    --idle-timeout <s>       Kill the copilot process tree after this long without output (default off)
 
 """
 from __future__ import annotations
-import argparse, sys, json, datetime, os, shutil, glob, re, stat
+import argparse, sys, json, datetime, os, shutil, glob, re, stat, threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List, Tuple, Dict, Optional, Callable
 
 # Ensure relative paths are resolved from repository root
@@ -43,7 +77,9 @@ if TOOLS_DIR not in sys.path:
     sys.path.append(TOOLS_DIR)
 
 try:
-    from copilot_executor import CopilotExecutor
+    from copilot_executor import (
+        CopilotExecutor, get_prompt_memo, get_rate_limiter, set_prompt_memo, set_rate_limiter, set_timeout_policy,
+    )
 except ImportError:
     print('[fatal] Unable to import copilot_executor from tools directory.', file=sys.stderr)
     sys.exit(1)
@@ -65,11 +101,22 @@ def build_repo_pipelines(checklist_path: str) -> tuple[List[tuple], List[tuple]]
     return repo_pipeline_step, repo_pipeline_all
 
 
+# Prerequisites per repo steps-mode stage; the solution branch and the README branch are independent.
+REPO_STEP_DEPENDENCIES: Dict[str, List[str]] = {
+    'task-clone-repo': [],
+    'task-find-solutions': ['task-clone-repo'],
+    'task-generate-solution-task-checklists': ['task-find-solutions'],
+    'task-search-readme': ['task-clone-repo'],
+    'task-scan-readme': ['task-search-readme'],
+    'task-execute-readme': ['task-scan-readme'],
+}
+
+
 def build_solution_pipelines(checklist_path: str) -> tuple[List[tuple], List[tuple]]:
     """Construct solution pipeline definitions for the provided checklist."""
     solution_pipeline_step = [
-        ('task-restore-solutions', {'solution_checklist_path': checklist_path}),
-        ('task-build-solutions', {'solution_checklist_path': checklist_path}),
+        ('task-restore-solution', {'solution_checklist_path': checklist_path}),
+        ('task-build-solution', {'solution_checklist_path': checklist_path}),
         ('task-verify-build-artifacts', {'solution_checklist_path': checklist_path}),
     ]
 
@@ -78,9 +125,17 @@ def build_solution_pipelines(checklist_path: str) -> tuple[List[tuple], List[tup
     ]
     return solution_pipeline_step, solution_pipeline_all
 
-from pipeline_core import execute_pipeline
+from pipeline_core import execute_pipeline, plan_resume
+from stage_cache import StageCache, add_cache_arguments, stage_cache_from_args
+from prompt_registry import validate_pipeline_prompts
+from timeout_policy import add_timeout_arguments, timeout_policy_from_args
 from repo_check_utils import check_repo_readiness
 from solution_check_utils import check_solution_readiness
+from worker_output import install_prefixed_stdout, worker_prefix
+from run_history import RunHistory, add_history_arguments, checklist_identity, run_history_from_args
+from native_tasks import NativeTaskRegistry, add_native_arguments, native_tasks_from_args
+from prompt_memo import add_memo_arguments, prompt_memo_from_args
+from rate_limiter import add_rate_limit_arguments, rate_limiter_from_args
 # Removed solution-level execution; include-solution option deprecated.
 
 
@@ -124,6 +179,9 @@ def execute_initial_tasks(
     stem: str,
     ext: str,
     per_attempt_logs: List[str],
+    history: Optional[RunHistory] = None,
+    run_id: Optional[str] = None,
+    native_tasks: Optional[NativeTaskRegistry] = None,
 ) -> int:
     """Run the bootstrap pipeline before main checklist processing."""
     if not initial_pipeline:
@@ -140,6 +198,8 @@ def execute_initial_tasks(
         step_by_step=step_by_step,
         mode=mode,
         summary_path=initial_summary,
+        history=history.attempt(run_id, kind='initial', checklist_path=None, attempt=1) if history is not None else None,
+        native_tasks=native_tasks,
     )
     per_attempt_logs.append(os.path.abspath(initial_log_file))
     return exit_code
@@ -159,8 +219,17 @@ def run_pipeline_for_checklist(
     pipeline_all: List[Tuple[str, Dict[str, str]]],
     readiness_checker: Callable[[str], bool],
     checklist_label: str,
+    stage_cache: Optional[StageCache] = None,
+    dependencies: Optional[Dict[str, List[str]]] = None,
+    history: Optional[RunHistory] = None,
+    run_id: Optional[str] = None,
+    native_tasks: Optional[NativeTaskRegistry] = None,
 ) -> Tuple[bool, Optional[int]]:
-    """Execute the appropriate pipeline for a given checklist and verify readiness."""
+    """Execute the appropriate pipeline for a given checklist and verify readiness.
+
+    ``dependencies`` (steps mode with ``--stage-parallel`` > 1 only) schedules the stages
+    as a DAG with up to that many stages running at once; otherwise stages run in order.
+    """
     selected_pipeline = pipeline_all if mode == 'combine' else pipeline_step
     slug = sanitize_slug(os.path.splitext(os.path.basename(checklist_path))[0])
     attempt = 1
@@ -172,6 +241,8 @@ def run_pipeline_for_checklist(
         if os.path.isabs(checklist_path)
         else os.path.join(REPO_ROOT, checklist_path)
     )
+    # Solution attempts are recorded under their parent repo, not "<repo>_<solution>".
+    history_repo, history_solution = checklist_identity(fs_checklist_path)
     while attempt <= max_attempts:
         attempt_log_file = os.path.join(base_dir, f"{stem}_{slug}_attempt{attempt}{ext}")
         summary_filename = f"single_file_pipeline_summary_{slug}_attempt{attempt}.json"
@@ -179,29 +250,47 @@ def run_pipeline_for_checklist(
         os.makedirs(os.path.dirname(attempt_summary_path), exist_ok=True)
         print(f"[pipeline] {checklist_label.capitalize()} checklist {slug}: attempt {attempt}/{max_attempts}")
         print(f"[log] Writing Copilot execution log to: {attempt_log_file}")
+        attempt_pipeline = [(prompt, params) for prompt, params in selected_pipeline]
+        skipped_stages: List[Dict] = []
+        if mode == 'steps' and attempt > 1 and not getattr(args, 'no_resume', False):
+            # Retry: resume at the first incomplete checklist task instead of rerunning everything.
+            attempt_pipeline, skipped_stages = plan_resume(attempt_pipeline, fs_checklist_path)
+        kind = 'repo' if checklist_label == 'repository' else checklist_label
+        recorder = history.attempt(
+            run_id, kind=kind, checklist_path=checklist_path, attempt=attempt,
+            repo=history_repo, solution=history_solution,
+        ) if history is not None else None
+        stage_parallel = getattr(args, 'stage_parallel', 1)
         last_exit_code, _summary = execute_pipeline(
-            pipeline=[(prompt, params) for prompt, params in selected_pipeline],
+            pipeline=attempt_pipeline,
             log_file=attempt_log_file,
             continue_on_error=args.continue_on_error,
             step_by_step=step_by_step,
             mode=mode,
             summary_path=attempt_summary_path,
+            stage_cache=stage_cache,
+            skipped_stages=skipped_stages,
+            dependencies=dependencies if mode == 'steps' and stage_parallel > 1 else None,
+            max_parallel=stage_parallel,
+            history=recorder,
+            native_tasks=native_tasks,
         )
         per_attempt_logs.append(os.path.abspath(attempt_log_file))
         print(f"[verification] Checking {checklist_label} readiness for {slug} (attempt {attempt}) ...")
         ready = readiness_checker(fs_checklist_path)
         if ready and checklist_label == 'repository':
-            solution_glob = os.path.join(REPO_ROOT, 'tasks', '*_solution_checklist.md')
-            solution_files = glob.glob(solution_glob)
-            if not solution_files:
+            if not solution_checklists_for_repo(checklist_path):
                 print(
-                    "[verification] repository checklist ready but no solution checklists found under tasks/."
+                    f"[verification] repository checklist ready but no solution checklists found for {slug} under tasks/."
                 )
                 ready = False
         if ready:
             print(
                 f"[verification] {checklist_label.capitalize()} readiness success for {slug} after attempt {attempt}."
             )
+        if recorder is not None:
+            recorder.record_readiness(ready)
+        if ready:
             break
         if attempt < max_attempts:
             print(
@@ -214,10 +303,145 @@ def run_pipeline_for_checklist(
         )
     repo_name = os.path.splitext(os.path.basename(checklist_path))[0]
     status = 'OK' if ready else 'FAIL'
+    if history is not None:
+        history.record_readiness(
+            run_id, kind='repo' if checklist_label == 'repository' else checklist_label, checklist_path=checklist_path,
+            final_readiness='PASS' if ready else 'FAIL', attempts=min(attempt, max_attempts),
+            repo=history_repo, solution=history_solution,
+        )
     final_message = f"[final readiness] {checklist_label}={status} [{repo_name}]"
     print(colorize(final_message, status=status))
     return ready, last_exit_code
 
+def _checklist_repository(path: str) -> Optional[str]:
+    """Return the `Repository:` header value of a checklist (normalized), if present."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for _ in range(10):
+                line = f.readline()
+                if line.startswith('Repository:'):
+                    return line.split(':', 1)[1].strip().rstrip('/') or None
+    except OSError:
+        pass
+    return None
+
+
+def solution_checklists_for_repo(repo_checklist: str) -> List[str]:
+    """Solution checklists generated for a repo checklist (matched by repository URL, else by name prefix)."""
+    repo_fs = repo_checklist if os.path.isabs(repo_checklist) else os.path.join(REPO_ROOT, repo_checklist)
+    repo_name = os.path.basename(repo_fs).replace('_repo_checklist.md', '')
+    repo_url = _checklist_repository(repo_fs)
+    matches = []
+    for path in sorted(glob.glob(os.path.join(REPO_ROOT, 'tasks', '*_solution_checklist.md'))):
+        owner = _checklist_repository(path)
+        if (repo_url and owner == repo_url) or (
+            (owner is None or owner == repo_name) and os.path.basename(path).startswith(f"{repo_name}_")
+        ):
+            matches.append(path)
+    return matches
+
+
+ChecklistRunner = Callable[[str], Tuple[bool, Optional[int]]]
+
+
+def run_checklists_pipelined(
+    repo_checklists: List[str],
+    *,
+    run_repo: ChecklistRunner,
+    run_solution: ChecklistRunner,
+    repo_jobs: int = 1,
+    solution_jobs: int = 0,
+) -> Tuple[List[Tuple[str, bool, Optional[int]]], List[Tuple[str, bool, Optional[int]]], List[Tuple[str, List[str]]]]:
+    """Process repo checklists and their solution checklists with separate concurrency limits.
+
+    With ``solution_jobs`` >= 1 a repository's solution checklists are submitted to the
+    solution pool as soon as that repository's pipeline finishes and passes readiness, so
+    builds of early repositories overlap clones/scans of later ones; solution checklists
+    of repositories that fail readiness are not run. With ``solution_jobs`` == 0 the
+    solution phase starts after every repository finished (legacy ordering). Solution
+    checklists not attributable to any repository are processed at the end.
+
+    Returns (repo_results, solution_results, skipped): results are lists of
+    (checklist, ready, last_exit_code); ``skipped`` lists (repo_checklist, solution
+    checklists not run) for each repository that failed readiness in pipelined mode.
+    """
+    repo_results: List[Tuple[str, bool, Optional[int]]] = []
+    solution_results: List[Tuple[str, bool, Optional[int]]] = []
+    skipped: List[Tuple[str, List[str]]] = []
+    pipelined = solution_jobs >= 1
+    concurrent = repo_jobs > 1 or solution_jobs > 1 or pipelined
+    if concurrent:
+        install_prefixed_stdout()
+        print(f"[schedule] repo-jobs={repo_jobs} solution-jobs={solution_jobs} ({'pipelined' if pipelined else 'phased'})")
+
+    scheduled: set = set()
+    scheduled_lock = threading.Lock()
+
+    def claim(paths: List[str]) -> List[str]:
+        with scheduled_lock:
+            fresh = [normalize_checklist_path(p) for p in paths if normalize_checklist_path(p) not in scheduled]
+            scheduled.update(fresh)
+            return fresh
+
+    def labelled(kind: str, runner: ChecklistRunner, path: str) -> Tuple[bool, Optional[int]]:
+        if not concurrent:
+            return runner(path)
+        name = os.path.basename(path).replace(f"_{kind}_checklist.md", '')
+        with worker_prefix(f"[{kind}:{name}] "):
+            return runner(path)
+
+    all_solutions = lambda: sorted(glob.glob(os.path.join(REPO_ROOT, 'tasks', '*_solution_checklist.md')))
+
+    if not concurrent:
+        for path in repo_checklists:
+            ready, code = run_repo(path)
+            repo_results.append((path, ready, code))
+        for path in claim(all_solutions()):
+            ready, code = run_solution(path)
+            solution_results.append((path, ready, code))
+        return repo_results, solution_results, skipped
+
+    with ThreadPoolExecutor(max_workers=repo_jobs, thread_name_prefix='repo-worker') as repo_pool, \
+            ThreadPoolExecutor(max_workers=max(solution_jobs, 1), thread_name_prefix='solution-worker') as solution_pool:
+        running: Dict = {}
+
+        def submit_solutions(paths: List[str]) -> None:
+            for path in claim(paths):
+                print(f"[schedule] solution checklist eligible: {path}")
+                running[solution_pool.submit(labelled, 'solution', run_solution, path)] = ('solution', path)
+
+        for path in repo_checklists:
+            running[repo_pool.submit(labelled, 'repo', run_repo, path)] = ('repo', path)
+        repos_left = len(repo_checklists)
+        if not repos_left:
+            submit_solutions(all_solutions())
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, path = running.pop(future)
+                ready, code = future.result()
+                if kind == 'solution':
+                    solution_results.append((path, ready, code))
+                    continue
+                repo_results.append((path, ready, code))
+                repos_left -= 1
+                if pipelined and ready:
+                    submit_solutions(solution_checklists_for_repo(path))
+                elif pipelined:
+                    # Claimed so the final sweep does not pick them up either.
+                    not_run = claim(solution_checklists_for_repo(path))
+                    skipped.append((path, not_run))
+                    print(f"[schedule] repository not ready; skipping {len(not_run)} solution checklist(s) of {path}")
+                if repos_left == 0:
+                    # Every repo finished: anything still unscheduled (legacy phase, orphans) runs now.
+                    submit_solutions(all_solutions())
+    order = {path: idx for idx, path in enumerate(repo_checklists)}
+    repo_results.sort(key=lambda item: order.get(item[0], 0))
+    solution_results.sort(key=lambda item: item[0])
+    skipped.sort(key=lambda item: order.get(item[0], 0))
+    return repo_results, solution_results, skipped
+
+
 def _handle_remove_readonly(func: Callable[[str], None], path: str, exc: tuple) -> None:
     """Best-effort removal helper for read-only files on Windows."""
     try:
@@ -262,11 +486,64 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     p.add_argument('--continue-on-error', action='store_true', help='Continue pipeline despite failures.')
     p.add_argument('--mode', choices=['combine','steps'], default='combine', help="Execution mode: 'combine' runs automatically; 'steps' prompts before each stage.")
     p.add_argument('--checklist', help='Path to the repository or solution checklist to drive the pipeline.')
-    return p.parse_args(argv)
+    p.add_argument('--stage-parallel', type=int, default=1, help='Steps mode: max independent repo stages run concurrently (default 1).')
+    p.add_argument('--repo-jobs', type=int, default=1, help='Repository checklists processed concurrently (default 1).')
+    p.add_argument('--solution-jobs', type=int, default=0, help='Solution checklists processed concurrently; >= 1 starts them as soon as their repo finishes (default 0 = after all repos).')
+    p.add_argument('--no-resume', action='store_true', help='On retry attempts in steps mode, rerun every stage instead of resuming at the first incomplete task.')
+    add_cache_arguments(p)
+    add_memo_arguments(p)
+    add_rate_limit_arguments(p)
+    add_timeout_arguments(p)
+    add_history_arguments(p)
+    add_native_arguments(p)
+    args = p.parse_args(argv)
+    if args.stage_parallel < 1:
+        p.error('--stage-parallel must be >= 1')
+    if args.repo_jobs < 1:
+        p.error('--repo-jobs must be >= 1')
+    if args.solution_jobs < 0:
+        p.error('--solution-jobs must be >= 0')
+    return args
+
+
+INITIAL_PROMPT = 'task-generate-repo-task-checklists'
+
+
+def pipeline_prompt_names() -> List[str]:
+    """All prompts this orchestrator may invoke (validated at startup)."""
+    names = [INITIAL_PROMPT]
+    for builder in (build_repo_pipelines, build_solution_pipelines):
+        step, combined = builder('<checklist>')
+        names.extend(prompt for prompt, _ in step + combined)
+    return names
 
 
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
+    if not validate_pipeline_prompts(pipeline_prompt_names()):
+        return 1
+    # Built before any state purge so --timeout-from-history still sees the previous summaries.
+    set_timeout_policy(timeout_policy_from_args(args))
+    set_prompt_memo(prompt_memo_from_args(args))
+    set_rate_limiter(rate_limiter_from_args(args))
+    history = run_history_from_args(args)
+    run_id = history.start_run('run_single_file', args.mode, vars(args)) if history is not None else None
+    exit_code = 1
+    try:
+        exit_code = _run_main(args, history, run_id)
+        return exit_code
+    finally:
+        if get_prompt_memo() is not None:
+            print(f"[prompt-memo] {get_prompt_memo().stats()}")
+        if get_rate_limiter() is not None:
+            print(f"[rate-limit] {get_rate_limiter().stats()}")
+        if history is not None:
+            history.finish_run(run_id, 'SUCCESS' if exit_code == 0 else 'FAIL')
+            history.close()
+
+
+def _run_main(args: argparse.Namespace, history: Optional[RunHistory], run_id: Optional[str]) -> int:
+    """Body of main() once flags are validated; returns the process exit code."""
     mode = args.mode
     step_by_step = (mode == 'steps')
     base_log_path = args.log.replace('\\', '/')
@@ -279,6 +556,8 @@ def main(argv: List[str]) -> int:
         stem, ext = base_file, '.log'
     os.makedirs(base_dir, exist_ok=True)
     per_attempt_logs: List[str] = []
+    stage_cache = stage_cache_from_args(args)
+    native_tasks = native_tasks_from_args(args)
 
     if args.checklist:
         checklist_path = normalize_checklist_path(args.checklist)
@@ -296,7 +575,7 @@ def main(argv: List[str]) -> int:
         label = 'repository' if is_repo else 'solution'
 
         if is_repo:
-            initial_pipeline = [('task-generate-repo-task-checklists', {'input': 'repositories_small.txt'})]
+            initial_pipeline = [(INITIAL_PROMPT, {'input': 'repositories_small.txt'})]
             init_exit = execute_initial_tasks(
                 initial_pipeline,
                 args=args,
@@ -306,6 +585,9 @@ def main(argv: List[str]) -> int:
                 stem=stem,
                 ext=ext,
                 per_attempt_logs=per_attempt_logs,
+                history=history,
+                run_id=run_id,
+                native_tasks=native_tasks,
             )
             if init_exit != 0 and not args.continue_on_error:
                 print(f"[fatal] Initial pipeline failed with exit code {init_exit}.")
@@ -315,9 +597,11 @@ def main(argv: List[str]) -> int:
                 return init_exit
             pipeline_step, pipeline_all = build_repo_pipelines(checklist_path)
             readiness_checker = check_repo_readiness
+            dependencies = REPO_STEP_DEPENDENCIES
         elif is_solution:
             pipeline_step, pipeline_all = build_solution_pipelines(checklist_path)
             readiness_checker = check_solution_readiness
+            dependencies = None
         else:
             print(f"[fatal] Unsupported checklist path: {checklist_path}")
             return 1
@@ -341,6 +625,11 @@ def main(argv: List[str]) -> int:
             pipeline_all=pipeline_all,
             readiness_checker=readiness_checker,
             checklist_label=label,
+            stage_cache=stage_cache,
+            dependencies=dependencies,
+            history=history,
+            run_id=run_id,
+            native_tasks=native_tasks,
         )
         print("[log] Attempt log files:")
         for path in per_attempt_logs:
@@ -349,9 +638,10 @@ def main(argv: List[str]) -> int:
             return last_exit_code
         return 0 if ready else 1
 
-    # No checklist specified: process all repo and solution checklists sequentially.
+    # No checklist specified: process all repo checklists, then (or, with --solution-jobs, as soon as
+    # their repo is done) the solution checklists.
     purge_state_directories(base_log_path, remove_output=True, remove_tasks=True)
-    initial_pipeline = [('task-generate-repo-task-checklists', {'input': 'repositories_small.txt'})]
+    initial_pipeline = [(INITIAL_PROMPT, {'input': 'repositories_small.txt'})]
     initial_exit = execute_initial_tasks(
         initial_pipeline,
         args=args,
@@ -361,6 +651,9 @@ def main(argv: List[str]) -> int:
         stem=stem,
         ext=ext,
         per_attempt_logs=per_attempt_logs,
+        history=history,
+        run_id=run_id,
+        native_tasks=native_tasks,
     )
     overall_ready = (initial_exit == 0)
     overall_exit = 0 if initial_exit == 0 else initial_exit or 1
@@ -371,16 +664,16 @@ def main(argv: List[str]) -> int:
             print(f"  - {path}")
         return initial_exit
 
-    repo_checklists = sorted(glob.glob(os.path.join(REPO_ROOT, 'tasks', '*_repo_checklist.md')))
-    repo_checked = 0
-    repo_passed = 0
-    repo_failed = 0
+    repo_checklists = [
+        normalize_checklist_path(path)
+        for path in sorted(glob.glob(os.path.join(REPO_ROOT, 'tasks', '*_repo_checklist.md')))
+    ]
     if not repo_checklists:
         print("[warn] No repository checklists found to process.")
-    for repo_file in repo_checklists:
-        rel_path = normalize_checklist_path(repo_file)
+
+    def run_repo(rel_path: str) -> Tuple[bool, Optional[int]]:
         pipeline_step, pipeline_all = build_repo_pipelines(rel_path)
-        ready, last_exit_code = run_pipeline_for_checklist(
+        return run_pipeline_for_checklist(
             rel_path,
             args=args,
             mode=mode,
@@ -393,30 +686,16 @@ def main(argv: List[str]) -> int:
             pipeline_all=pipeline_all,
             readiness_checker=check_repo_readiness,
             checklist_label='repository',
+            stage_cache=stage_cache,
+            dependencies=REPO_STEP_DEPENDENCIES,
+            history=history,
+            run_id=run_id,
+            native_tasks=native_tasks,
         )
-        repo_checked += 1
-        if ready:
-            repo_passed += 1
-        else:
-            repo_failed += 1
-        if not ready:
-            overall_ready = False
-        if last_exit_code is not None and last_exit_code != 0:
-            overall_exit = last_exit_code
-        elif last_exit_code is None and not ready:
-            overall_exit = overall_exit or 1
 
-    # After repo processing, discover solution checklists (which may have been generated).
-    solution_checklists = sorted(glob.glob(os.path.join(REPO_ROOT, 'tasks', '*_solution_checklist.md')))
-    solution_checked = 0
-    solution_passed = 0
-    solution_failed = 0
-    if not solution_checklists:
-        print("[info] No solution checklists found to process.")
-    for solution_file in solution_checklists:
-        rel_path = normalize_checklist_path(solution_file)
+    def run_solution(rel_path: str) -> Tuple[bool, Optional[int]]:
         pipeline_step, pipeline_all = build_solution_pipelines(rel_path)
-        ready, last_exit_code = run_pipeline_for_checklist(
+        return run_pipeline_for_checklist(
             rel_path,
             args=args,
             mode=mode,
@@ -429,18 +708,34 @@ def main(argv: List[str]) -> int:
             pipeline_all=pipeline_all,
             readiness_checker=check_solution_readiness,
             checklist_label='solution',
+            stage_cache=stage_cache,
+            history=history,
+            run_id=run_id,
+            native_tasks=native_tasks,
         )
-        solution_checked += 1
-        if ready:
-            solution_passed += 1
-        else:
-            solution_failed += 1
+
+    repo_results, solution_results, skipped_solutions = run_checklists_pipelined(
+        repo_checklists,
+        run_repo=run_repo,
+        run_solution=run_solution,
+        repo_jobs=args.repo_jobs,
+        solution_jobs=args.solution_jobs,
+    )
+    if not solution_results and not skipped_solutions:
+        print("[info] No solution checklists found to process.")
+    for _path, ready, last_exit_code in repo_results + solution_results:
         if not ready:
             overall_ready = False
         if last_exit_code is not None and last_exit_code != 0:
             overall_exit = last_exit_code
         elif last_exit_code is None and not ready:
             overall_exit = overall_exit or 1
+    repo_checked = len(repo_results)
+    repo_passed = sum(1 for _, ready, _ in repo_results if ready)
+    repo_failed = repo_checked - repo_passed
+    solution_checked = len(solution_results)
+    solution_passed = sum(1 for _, ready, _ in solution_results if ready)
+    solution_failed = solution_checked - solution_passed
 
     print("[log] Attempt log files:")
     for path in per_attempt_logs:
@@ -456,6 +751,12 @@ def main(argv: List[str]) -> int:
         solution_checked,
         solution_failed,
     ))
+    if skipped_solutions:
+        print("[summary] Solution checklists skipped (repository readiness FAIL): {}".format(
+            sum(len(paths) for _, paths in skipped_solutions),
+        ))
+        for repo_path, paths in skipped_solutions:
+            print(f"  - {repo_path}: {len(paths)} solution checklist(s) not run")
 
     if overall_ready:
         return overall_exit if overall_exit else 0
@@ -16,6 +16,7 @@ Assumptions (template-aligned, tolerant to evolution):
         - {{var_name}} → value
 
 Functions:
+  evaluate_solution_readiness(path) -> Dict  (structured, no printing)
   check_solution_readiness(path) -> bool
   check_all_solutions(tasks_dir) -> Dict[str,bool]
 
@@ -30,9 +31,8 @@ import os, re, sys
 from typing import List, Dict
 
 from checklist_utils import (
-    extract_tasks,
-    extract_variables,
     classify_variables,
+    load_checklist,
 )
 
 # Patterns (similar to repo_check_utils but solution-focused)
@@ -61,28 +61,42 @@ OPTIONAL_VARIABLES = {
     'last_option_applied',
 }
 
-def check_solution_readiness(solution_checklist_path: str) -> bool:
-    """Validate a single solution checklist file."""
-    if not os.path.isfile(solution_checklist_path):
-        print(f"[solution readiness] <missing_file>: FILE_NOT_FOUND path={solution_checklist_path}")
-        return False
-    with open(solution_checklist_path, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = [l.rstrip('\n') for l in f]
+def evaluate_solution_readiness(solution_checklist_path: str) -> Dict:
+    """Evaluate a single solution checklist without printing and return a structured result.
+
+    Result keys match repo_check_utils.evaluate_repo_readiness (kind='solution';
+    missing_solution_checklists is always empty).
+    """
+    result: Dict = {
+        'path': solution_checklist_path,
+        'kind': 'solution',
+        'name': '<missing_file>',
+        'ready': False,
+        'status': 'FILE_NOT_FOUND',
+        'missing_tasks': [],
+        'missing_vars': [],
+        'missing_solution_checklists': [],
+        'tasks_checked': [],
+        'variables_verified': [],
+    }
+    doc = load_checklist(solution_checklist_path)
+    if doc is None:
+        return result
+    lines = doc.lines
 
     solution_name = _get_solution_name(lines)
+    result['name'] = solution_name
 
     # Support both '## Solution Tasks' and template variant '### Tasks'
     normalize = lambda name: TASK_NAME_NORMALIZE.get(name, name)
-    mandatory_tasks = extract_tasks(
-        lines,
+    mandatory_tasks = doc.tasks(
         ('## Solution Tasks', '### Tasks'),
         MANDATORY_TASK_PATTERN,
         normalize=normalize,
         relaxed_pattern=RELAXED_TASK_PATTERN,
     )
 
-    var_values: Dict[str, str] = extract_variables(
-        lines,
+    var_values: Dict[str, str] = doc.variables(
         (
             '## Solution Variables Available',
             '## Solution Variables',
@@ -90,27 +104,48 @@ def check_solution_readiness(solution_checklist_path: str) -> bool:
         )
     )
 
-    # Emit diagnostic detail similar to repo readiness tooling.
-    tasks_checked = sorted(mandatory_tasks.keys())
     missing_vars, verified_vars = classify_variables(var_values, optional=OPTIONAL_VARIABLES)
-    verified_vars = sorted(verified_vars)
-    print(f"[solution readiness detail] {solution_name}: tasks_checked={tasks_checked}")
-    print(f"[solution readiness detail] {solution_name}: variables_verified={verified_vars}")
-
     missing_tasks = [t for t, done in mandatory_tasks.items() if not done]
-    missing_vars = sorted(missing_vars)
+    result.update({
+        'missing_tasks': missing_tasks,
+        'missing_vars': sorted(missing_vars),
+        'tasks_checked': sorted(mandatory_tasks.keys()),
+        'variables_verified': sorted(verified_vars),
+    })
 
     if not mandatory_tasks:
         # No tasks discovered at all -> cannot be ready.
+        result['status'] = 'NO_MANDATORY_TASKS_DETECTED'
+    elif missing_tasks or missing_vars:
+        result['status'] = 'NOT_READY'
+    else:
+        result['status'] = 'OK'
+        result['ready'] = True
+    return result
+
+
+def check_solution_readiness(solution_checklist_path: str) -> bool:
+    """Validate a single solution checklist file (prints a summary; see evaluate_solution_readiness)."""
+    result = evaluate_solution_readiness(solution_checklist_path)
+    if result['status'] == 'FILE_NOT_FOUND':
+        print(f"[solution readiness] <missing_file>: FILE_NOT_FOUND path={solution_checklist_path}")
+        return False
+    solution_name = result['name']
+
+    # Emit diagnostic detail similar to repo readiness tooling.
+    print(f"[solution readiness detail] {solution_name}: tasks_checked={result['tasks_checked']}")
+    print(f"[solution readiness detail] {solution_name}: variables_verified={result['variables_verified']}")
+
+    if result['status'] == 'NO_MANDATORY_TASKS_DETECTED':
         print(f"[solution readiness] {solution_name}: NO_MANDATORY_TASKS_DETECTED")
         return False
 
-    if missing_tasks or missing_vars:
+    if result['status'] == 'NOT_READY':
         parts = []
-        if missing_tasks:
-            parts.append(f"MISSING_TASKS={missing_tasks}")
-        if missing_vars:
-            parts.append(f"MISSING_VARS={missing_vars}")
+        if result['missing_tasks']:
+            parts.append(f"MISSING_TASKS={result['missing_tasks']}")
+        if result['missing_vars']:
+            parts.append(f"MISSING_VARS={result['missing_vars']}")
         summary = ' '.join(parts)
         print(f"[solution readiness] {solution_name}: {summary}")
         return False
@@ -133,4 +168,4 @@ def check_all_solutions(tasks_dir: str) -> Dict[str, bool]:
         results[fname] = ok
     return results
 
-__all__ = ["check_solution_readiness", "check_all_solutions"]
+__all__ = ["check_solution_readiness", "evaluate_solution_readiness", "check_all_solutions"]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Native Solution Discovery for task-find-solutions
+
+Finds Visual Studio solution files (`*.sln`, case-insensitive) in cloned repositories
+without involving Copilot.
+
+    - Directory walk uses os.scandir (one stat-free pass per directory) and never descends
+      into PRUNED_DIRS (.git, bin, obj, node_modules, packages, ...) or symlinked dirs.
+    - Large trees fan out: the top-level subdirectories of a repository are walked on a
+      thread pool (scandir releases the GIL); many repositories are scanned concurrently by
+      discover_many().
+    - Results are cached per repository directory in ./.cache/solution_discovery.json keyed
+      on the HEAD commit (read from .git without spawning git). Cloned trees are reset to
+      HEAD by task-clone-repo, so an unchanged HEAD means unchanged solutions; use
+      --no-cache after editing a working tree by hand.
+
+The task-find-solutions native handler (tools/native_tasks.py) uses discover_solutions()
+and writes {{solutions_json}} and {{solutions}} into the repo checklist.
+
+CLI (prints JSON):
+    python tools/solution_discovery.py clone_repos/repo_a clone_repos/repo_b [--jobs 8] [--no-cache]
+    python tools/solution_discovery.py --checklists tasks/*_repo_checklist.md [--jobs 8]
+        (runs the task-find-solutions handler for each checklist)
+"""
+from __future__ import annotations
+import argparse, contextlib, datetime, json, os, subprocess, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from file_lock import FileLock
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(REPO_ROOT, '.cache', 'solution_discovery.json')
+PRUNED_DIRS = frozenset({'.git', '.vs', '.vscode', '.idea', 'bin', 'obj', 'node_modules', 'packages', '.nuget', 'testresults'})
+DEFAULT_JOBS = 8
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def _walk(top: str) -> List[str]:
+    """Solution files under ``top`` (iterative scandir walk with pruning)."""
+    found: List[str] = []
+    stack = [top]
+    while stack:
+        path = stack.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in PRUNED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith('.sln') and entry.is_file():
+                        found.append(os.path.abspath(entry.path))
+                except OSError:
+                    continue
+    return found
+
+
+def find_solutions(root: str, jobs: int = DEFAULT_JOBS) -> List[str]:
+    """Absolute paths of all solution files under ``root``, sorted.
+
+    Raises:
+        NotADirectoryError: if ``root`` is not a directory.
+    """
+    if not os.path.isdir(root):
+        raise NotADirectoryError(root)
+    found: List[str] = []
+    subdirs: List[str] = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.lower() not in PRUNED_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.name.lower().endswith('.sln') and entry.is_file():
+                found.append(os.path.abspath(entry.path))
+    if jobs > 1 and len(subdirs) > 1:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(subdirs)), thread_name_prefix='sln-scan') as pool:
+            for paths in pool.map(_walk, subdirs):
+                found.extend(paths)
+    else:
+        for subdir in subdirs:
+            found.extend(_walk(subdir))
+    return sorted(found, key=lambda p: p.lower())
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def head_commit(repo_dir: str) -> Optional[str]:
+    """HEAD commit of a working tree read from .git (gitdir files, loose and packed refs); None if unknown."""
+    git_dir = os.path.join(repo_dir, '.git')
+    if os.path.isfile(git_dir):
+        pointer = _read_text(git_dir) or ''
+        if not pointer.startswith('gitdir:'):
+            return None
+        git_dir = os.path.normpath(os.path.join(repo_dir, pointer[len('gitdir:'):].strip()))
+    head = _read_text(os.path.join(git_dir, 'HEAD'))
+    if not head:
+        return None
+    if not head.startswith('ref:'):
+        return head
+    ref = head[len('ref:'):].strip()
+    common = _read_text(os.path.join(git_dir, 'commondir'))
+    ref_dirs = [git_dir] + ([os.path.normpath(os.path.join(git_dir, common))] if common else [])
+    for base in ref_dirs:
+        value = _read_text(os.path.join(base, *ref.split('/')))
+        if value:
+            return value
+        packed = _read_text(os.path.join(base, 'packed-refs')) or ''
+        for line in packed.splitlines():
+            sha, _, name = line.partition(' ')
+            if name == ref:
+                return sha
+    try:
+        proc = subprocess.run(['git', '-C', repo_dir, 'rev-parse', 'HEAD'], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, encoding='utf-8', errors='ignore')
+    except OSError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.strip() or None
+
+
+class SolutionCache:
+    """JSON cache {repo_dir: {head, solutions, discovered}} shared across processes via FileLock."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, repo_dir: str, head: str) -> Optional[List[str]]:
+        entry = self._load().get(repo_dir)
+        if entry and entry.get('head') == head and all(os.path.isfile(p) for p in entry.get('solutions', [])):
+            return list(entry['solutions'])
+        return None
+
+    def put(self, repo_dir: str, head: str, solutions: List[str]) -> None:
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with FileLock(self.path + '.lock', timeout=LOCK_TIMEOUT_SECONDS):
+            data = self._load()
+            data[repo_dir] = {
+                'head': head,
+                'solutions': solutions,
+                'discovered': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            }
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-sln-', suffix='.json')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=1)
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+
+
+def discover_solutions(repo_dir: str, *, cache: Optional[SolutionCache] = None, jobs: int = DEFAULT_JOBS) -> Dict:
+    """Discover solutions in ``repo_dir`` (served from ``cache`` when HEAD is unchanged).
+
+    Returns {repo_directory, head, solutions, solution_count, cache (HIT | MISS | OFF),
+    elapsed_seconds}. Raises NotADirectoryError for a missing directory.
+    """
+    started = time.perf_counter()
+    repo_dir = os.path.abspath(repo_dir)
+    if not os.path.isdir(repo_dir):
+        raise NotADirectoryError(repo_dir)
+    head = head_commit(repo_dir) if cache is not None else None
+    solutions = cache.get(repo_dir, head) if head else None
+    status = 'HIT' if solutions is not None else ('MISS' if cache is not None else 'OFF')
+    if solutions is None:
+        solutions = find_solutions(repo_dir, jobs=jobs)
+        if head:
+            cache.put(repo_dir, head, solutions)
+    return {
+        'repo_directory': repo_dir,
+        'head': head,
+        'solutions': solutions,
+        'solution_count': len(solutions),
+        'cache': status,
+        'elapsed_seconds': round(time.perf_counter() - started, 4),
+    }
+
+
+def discover_many(repo_dirs: Iterable[str], *, cache: Optional[SolutionCache] = None, jobs: int = DEFAULT_JOBS) -> List[Dict]:
+    """discover_solutions() for many repositories on a thread pool (input order preserved)."""
+    repo_dirs = list(repo_dirs)
+
+    def one(repo_dir: str, inner_jobs: int = 1) -> Dict:
+        try:
+            return discover_solutions(repo_dir, cache=cache, jobs=inner_jobs)
+        except OSError as err:
+            return {'repo_directory': os.path.abspath(repo_dir), 'error': f"{type(err).__name__}: {err}"}
+
+    if len(repo_dirs) <= 1:
+        # A single (mono)repo gets the pool for its own top-level subdirectories instead.
+        return [one(repo_dir, jobs) for repo_dir in repo_dirs]
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(repo_dirs))), thread_name_prefix='sln-repo') as pool:
+        return list(pool.map(one, repo_dirs))
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Find .sln files in cloned repositories.')
+    p.add_argument('repo_dirs', nargs='*', help='Repository working trees to scan.')
+    p.add_argument('--checklists', nargs='+', help='Repo checklists: run the task-find-solutions native handler for each.')
+    p.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help=f'Concurrent scans (default {DEFAULT_JOBS}).')
+    p.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Cache file (default ./.cache/solution_discovery.json).')
+    p.add_argument('--no-cache', action='store_true', help='Always rescan.')
+    args = p.parse_args(argv)
+    if not args.repo_dirs and not args.checklists:
+        p.error('give repository directories or --checklists')
+    return args
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    if args.checklists:
+        from native_tasks import get_native_registry
+        registry = get_native_registry()
+        # Handler progress lines go to stderr so stdout stays a single JSON document.
+        with contextlib.redirect_stdout(sys.stderr), \
+                ThreadPoolExecutor(max_workers=max(1, args.jobs), thread_name_prefix='find-solutions') as pool:
+            results = list(pool.map(
+                lambda path: registry.run('task-find-solutions', {'checklist_path': path}), args.checklists))
+        report = [
+            {'checklist_path': path, 'exit_code': code, 'result': json.loads(out) if out else None, 'error': err or None}
+            for path, (code, out, err) in zip(args.checklists, results)
+        ]
+        print(json.dumps(report, indent=2))
+        return 0 if all(item['exit_code'] == 0 for item in report) else 1
+    cache = None if args.no_cache else SolutionCache(args.cache)
+    results = discover_many(args.repo_dirs, cache=cache, jobs=args.jobs)
+    print(json.dumps(results, indent=2))
+    return 0 if all('error' not in r for r in results) else 1
+
+
+__all__ = ['find_solutions', 'discover_solutions', 'discover_many', 'head_commit', 'SolutionCache', 'PRUNED_DIRS']
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Content-Addressed Stage Result Cache
+
+Opt-in cache used by pipeline_core.execute_pipeline to skip Copilot stages whose inputs
+have not changed since a previous successful run.
+
+Cache key (sha256 over):
+    - content hash of the stage prompt file (.github/prompts/<prompt>.prompt.md)
+    - stage params (sorted JSON)
+    - content hash of the stage checklist *before* the stage runs
+      (the volatile "Generated: <timestamp>" line is ignored)
+    - Copilot model name
+
+Cached value: exit code (only successful stages are stored), the post-stage checklist
+content and its hash, and the output/*.json files the checklist references (the task
+contracts behind {{solutions_json}}, {{readme_content}}, ...). On a hit the stage is not
+executed; the recorded output files and the cached post-stage checklist are written back
+(keeping the current "Generated:" line) and verified by hash. An entry that cannot
+restore a referenced output file is treated as a miss.
+
+Stages with effects beyond those files are never cached (key_for returns None): the
+prompt memo's NON_REPLAYABLE_PROMPTS (clone, README execution, builds, ...) and the
+checklist generators, whose real output is other checklists.
+
+Entries are JSON files under the cache directory. Eviction (serialized by a FileLock; a
+busy lock means another worker is already evicting):
+    - TTL: entries created more than ttl_seconds ago are ignored and removed on lookup;
+      entries unused for longer than ttl_seconds are removed by evict().
+    - LRU: file mtime is refreshed on every hit; when more than max_entries exist the
+      least recently used entries are removed after a store.
+
+Usage:
+    from stage_cache import StageCache
+    cache = StageCache()                       # default dir ./.cache/stage_cache
+    exit_code, summary = execute_pipeline(..., stage_cache=cache)
+"""
+from __future__ import annotations
+import datetime, hashlib, json, os, re, tempfile, threading, time
+from typing import Dict, List, Optional, Tuple
+
+from checklist_utils import task_key
+from file_lock import FileLock, LockTimeout
+from prompt_registry import get_registry
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, '.cache', 'stage_cache')
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Stage params that identify the checklist a stage reads and mutates
+CHECKLIST_PARAM_KEYS = ('checklist_path', 'repo_checklist', 'solution_checklist_path', 'solution_checklist')
+_GENERATED_LINE = re.compile(r"^Generated:.*$", re.MULTILINE)
+# Repo-relative output files referenced by checklist variables, e.g. `output/x_task5_find-solutions.json`
+_OUTPUT_REFERENCE = re.compile(r"(?<![\w/.-])(output/[\w./-]+\.json)\b")
+MAX_OUTPUT_BYTES = 2 * 1024 * 1024
+# Checklist generators (task_key form): their effect is other checklists, not the stage checklist.
+GENERATOR_PROMPTS = frozenset({'generate-repo-task-checklists', 'generate-solution-task-checklists'})
+
+
+def _sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _atomic_write(path: str, text: str) -> None:
+    directory = os.path.dirname(path) or '.'
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def resolve_checklist_path(params: Dict[str, str]) -> Optional[str]:
+    """Return the filesystem path of the checklist referenced by stage params, if any."""
+    for key in CHECKLIST_PARAM_KEYS:
+        value = params.get(key)
+        if value:
+            path = str(value).replace('\\', '/')
+            return path if os.path.isabs(path) else os.path.join(REPO_ROOT, path)
+    return None
+
+
+def _normalized_checklist(text: str) -> str:
+    return _GENERATED_LINE.sub('Generated:', text)
+
+
+def referenced_outputs(checklist_text: str) -> List[str]:
+    """Sorted unique output/*.json paths (repo-relative) referenced by a checklist."""
+    return sorted(set(_OUTPUT_REFERENCE.findall(checklist_text)))
+
+
+class StageCache:
+    """On-disk content-addressed cache of successful stage results."""
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        model: Optional[str] = None,
+    ):
+        if model is None:
+            from copilot_executor import MODEL
+            model = MODEL
+        from prompt_memo import NON_REPLAYABLE_PROMPTS
+        self.uncacheable_prompts = NON_REPLAYABLE_PROMPTS | GENERATOR_PROMPTS
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def key_for(self, prompt: str, params: Dict[str, str]) -> Optional[str]:
+        """Compute the cache key for a stage, or None when the stage is not cacheable."""
+        if task_key(prompt) in self.uncacheable_prompts:
+            return None
+        checklist = resolve_checklist_path(params)
+        if not checklist:
+            return None
+        checklist_text = _read_text(checklist)
+        if checklist_text is None:
+            return None
+        prompt_info = get_registry().get(prompt)
+        material = {
+            'prompt': prompt,
+            'prompt_sha256': prompt_info.sha256 if prompt_info else None,
+            'params': params,
+            'checklist_sha256': _sha256_text(_normalized_checklist(checklist_text)),
+            'model': self.model,
+        }
+        return _sha256_text(json.dumps(material, sort_keys=True))
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for ``key`` (refreshing its LRU position) or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+        if time.time() - entry.get('created_epoch', 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count(hit=False)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry
+
+    def apply(self, entry: Dict, params: Dict[str, str]) -> bool:
+        """Restore the recorded output files and post-stage checklist and verify them.
+
+        Returns False (the stage must run) on a hash mismatch or when a referenced output
+        file is neither recorded in the entry nor present on disk.
+        """
+        checklist = resolve_checklist_path(params)
+        if not checklist:
+            return False
+        post_text: str = entry['post_checklist']
+        outputs: Dict[str, Dict[str, str]] = entry.get('outputs') or {}
+        for rel in referenced_outputs(post_text):
+            path = os.path.join(REPO_ROOT, rel)
+            recorded = outputs.get(rel)
+            if recorded is None:
+                if not os.path.isfile(path):
+                    return False
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _atomic_write(path, recorded['text'])
+            if _sha256_text(_read_text(path) or '') != recorded['sha256']:
+                return False
+        current = _read_text(checklist) or ''
+        current_generated = _GENERATED_LINE.search(current)
+        if current_generated:
+            post_text = _GENERATED_LINE.sub(lambda _m: current_generated.group(0), post_text, count=1)
+        _atomic_write(checklist, post_text)
+        written = _read_text(checklist) or ''
+        return _sha256_text(_normalized_checklist(written)) == entry['post_checklist_sha256']
+
+    def store(self, key: str, prompt: str, params: Dict[str, str], exit_code: int) -> None:
+        """Record the post-stage checklist for a successful stage and apply LRU eviction."""
+        if exit_code != 0:
+            return
+        checklist = resolve_checklist_path(params)
+        post_text = _read_text(checklist) if checklist else None
+        if post_text is None:
+            return
+        outputs: Dict[str, Dict[str, str]] = {}
+        for rel in referenced_outputs(post_text):
+            path = os.path.join(REPO_ROOT, rel)
+            try:
+                if os.path.getsize(path) > MAX_OUTPUT_BYTES:
+                    return
+            except OSError:
+                continue
+            text = _read_text(path)
+            if text is not None:
+                outputs[rel] = {'text': text, 'sha256': _sha256_text(text)}
+        entry = {
+            'key': key,
+            'prompt': prompt,
+            'params': params,
+            'model': self.model,
+            'exit_code': exit_code,
+            'post_checklist': post_text,
+            'outputs': outputs,
+            'post_checklist_sha256': _sha256_text(_normalized_checklist(post_text)),
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'created_epoch': time.time(),
+        }
+        _atomic_write(self._entry_path(key), json.dumps(entry))
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries and least recently used entries beyond max_entries."""
+        try:
+            with FileLock(os.path.join(self.cache_dir, '.evict.lock'), timeout=0):
+                return self._evict_locked()
+        except LockTimeout:
+            return 0
+
+    def _evict_locked(self) -> int:
+        entries = []
+        now = time.time()
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            entries.append((mtime, path))
+        entries.sort()
+        excess = len(entries) - self.max_entries
+        for mtime, path in entries:
+            if excess > 0 or now - mtime > self.ttl_seconds:
+                if self._remove(path):
+                    removed += 1
+                excess -= 1
+        return removed
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _count(self, *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+def add_cache_arguments(parser) -> None:
+    """Register the stage-cache command line flags shared by the orchestrators."""
+    parser.add_argument('--stage-cache', action='store_true', help='Skip stages whose inputs match a previous successful run (opt-in).')
+    parser.add_argument('--no-cache', action='store_true', help='Disable all result caches, overriding --stage-cache and --prompt-memo.')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Stage cache directory (default ./.cache/stage_cache).')
+    parser.add_argument('--cache-ttl-hours', type=float, default=DEFAULT_TTL_SECONDS / 3600, help='Stage cache entry time-to-live in hours.')
+    parser.add_argument('--cache-max-entries', type=int, default=DEFAULT_MAX_ENTRIES, help='Maximum stage cache entries kept (LRU eviction).')
+
+
+def stage_cache_from_args(args) -> Optional['StageCache']:
+    """Build a StageCache from parsed orchestrator flags, or None when caching is off."""
+    if getattr(args, 'no_cache', False) or not getattr(args, 'stage_cache', False):
+        return None
+    cache = StageCache(
+        args.cache_dir,
+        max_entries=args.cache_max_entries,
+        ttl_seconds=args.cache_ttl_hours * 3600,
+    )
+    print(f"[stage-cache] enabled dir={cache.cache_dir} max_entries={cache.max_entries} ttl_hours={args.cache_ttl_hours:g}")
+    return cache
+
+
+def cached_stage_result(entry: Dict) -> Tuple[int, str, str]:
+    """Return the (exit_code, stdout, stderr) tuple reported for a cache hit."""
+    return entry.get('exit_code', 0), f"[stage-cache] hit {entry.get('key', '')[:12]} (created {entry.get('created')})", ''
+
+
+__all__ = [
+    'StageCache',
+    'resolve_checklist_path',
+    'referenced_outputs',
+    'cached_stage_result',
+    'add_cache_arguments',
+    'stage_cache_from_args',
+    'DEFAULT_CACHE_DIR',
+]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Per-Prompt Timeout Policies
+
+Decides how long a copilot invocation may run (hard timeout) and how long it may stay
+silent (idle timeout, enforced by CopilotExecutor's output-inactivity watchdog) for
+each prompt.
+
+Resolution order for a prompt's hard timeout:
+    1. explicit per-prompt value from a policy file (--timeout-policy)
+    2. value derived from historical stage durations (--timeout-from-history):
+       p95 of `metrics.wall_seconds` in past pipeline summaries x margin, clamped
+       to [min_timeout, max_timeout]; only used with at least min_samples samples
+    3. the policy default (--command-timeout, default 1800s)
+
+Policy file (JSON):
+    {
+      "default": 1800,
+      "idle_timeout": 600,
+      "prompts": {
+        "task-clone-repo": 300,
+        "execute-repo-task": {"timeout": 5400, "idle_timeout": 1200}
+      }
+    }
+
+Usage:
+    from timeout_policy import TimeoutPolicy
+    policy = TimeoutPolicy(default_timeout=1800, idle_timeout=600)
+    policy.timeout_for('task-clone-repo')        # -> seconds
+    policy.idle_timeout_for('task-clone-repo')   # -> seconds or None (watchdog disabled)
+"""
+from __future__ import annotations
+import glob, json, math, os
+from typing import Dict, Iterable, List, Optional
+
+REPO_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_HISTORY_GLOB = os.path.join(REPO_ROOT, 'output', '*_pipeline_summary*.json')
+DEFAULT_TIMEOUT_SECONDS = 1800
+HISTORY_PERCENTILE = 95
+HISTORY_MARGIN = 1.5
+HISTORY_MIN_SAMPLES = 5
+HISTORY_MIN_TIMEOUT = 120
+HISTORY_MAX_TIMEOUT = 4 * DEFAULT_TIMEOUT_SECONDS
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _stage_records(summary: Dict) -> Iterable[Dict]:
+    """Yield stage records from a per-pipeline or an all-repos summary."""
+    yield from summary.get('pipeline', []) or []
+    for repo in summary.get('details', []) or []:
+        for attempt in repo.get('attempts', []) or []:
+            yield from attempt.get('stages', []) or []
+
+
+def collect_stage_durations(paths: Iterable[str]) -> Dict[str, List[float]]:
+    """Executed stage wall times per prompt from summary files (cache hits are ignored)."""
+    durations: Dict[str, List[float]] = {}
+    seen = set()
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for stage in _stage_records(summary):
+            metrics = stage.get('metrics') or {}
+            wall = metrics.get('wall_seconds')
+            if wall is None or stage.get('cache_status') == 'HIT':
+                continue
+            # The all-repos summary repeats the per-repo stage records; count each once.
+            identity = (stage.get('prompt'), stage.get('timestamp'), json.dumps(stage.get('params'), sort_keys=True))
+            if identity in seen:
+                continue
+            seen.add(identity)
+            durations.setdefault(stage.get('prompt', '<unknown>'), []).append(float(wall))
+    return durations
+
+
+class TimeoutPolicy:
+    """Hard and idle timeouts per prompt name."""
+
+    def __init__(
+        self,
+        default_timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        *,
+        idle_timeout: Optional[float] = None,
+        prompt_timeouts: Optional[Dict[str, float]] = None,
+        prompt_idle_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.default_timeout = default_timeout
+        self.idle_timeout = idle_timeout or None
+        self.prompt_timeouts: Dict[str, float] = dict(prompt_timeouts or {})
+        self.prompt_idle_timeouts: Dict[str, float] = dict(prompt_idle_timeouts or {})
+        # Where each per-prompt timeout came from ('config' or 'history p95=...')
+        self.sources: Dict[str, str] = {name: 'config' for name in self.prompt_timeouts}
+
+    def timeout_for(self, prompt_name: Optional[str]) -> float:
+        if prompt_name is None:
+            return self.default_timeout
+        return self.prompt_timeouts.get(prompt_name, self.default_timeout)
+
+    def idle_timeout_for(self, prompt_name: Optional[str]) -> Optional[float]:
+        if prompt_name is not None and prompt_name in self.prompt_idle_timeouts:
+            return self.prompt_idle_timeouts[prompt_name] or None
+        return self.idle_timeout
+
+    @classmethod
+    def from_file(cls, path: str, default_timeout: float = DEFAULT_TIMEOUT_SECONDS, idle_timeout: Optional[float] = None) -> 'TimeoutPolicy':
+        """Load a JSON policy file (see module docstring); file values override the arguments."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        timeouts: Dict[str, float] = {}
+        idle: Dict[str, float] = {}
+        for name, value in (data.get('prompts') or {}).items():
+            if isinstance(value, dict):
+                if value.get('timeout') is not None:
+                    timeouts[name] = float(value['timeout'])
+                if 'idle_timeout' in value:
+                    idle[name] = float(value['idle_timeout'] or 0)
+            else:
+                timeouts[name] = float(value)
+        return cls(
+            float(data.get('default', default_timeout)),
+            idle_timeout=data.get('idle_timeout', idle_timeout),
+            prompt_timeouts=timeouts,
+            prompt_idle_timeouts=idle,
+        )
+
+    def apply_history(
+        self,
+        paths: Iterable[str],
+        *,
+        pct: float = HISTORY_PERCENTILE,
+        margin: float = HISTORY_MARGIN,
+        min_samples: int = HISTORY_MIN_SAMPLES,
+        min_timeout: float = HISTORY_MIN_TIMEOUT,
+        max_timeout: float = HISTORY_MAX_TIMEOUT,
+    ) -> Dict[str, float]:
+        """Derive timeouts for prompts without an explicit value; returns the derived timeouts."""
+        derived: Dict[str, float] = {}
+        for prompt, samples in collect_stage_durations(paths).items():
+            if prompt in self.prompt_timeouts or len(samples) < min_samples:
+                continue
+            p = percentile(samples, pct)
+            derived[prompt] = round(min(max(p * margin, min_timeout), max_timeout))
+            self.prompt_timeouts[prompt] = derived[prompt]
+            self.sources[prompt] = f"history p{pct:g}={p:.1f}s n={len(samples)}"
+        return derived
+
+    def describe(self) -> List[str]:
+        idle = f"{self.idle_timeout:g}s" if self.idle_timeout else 'off'
+        lines = [f"default={self.default_timeout:g}s idle={idle}"]
+        for name in sorted(set(self.prompt_timeouts) | set(self.prompt_idle_timeouts)):
+            prompt_idle = self.idle_timeout_for(name)
+            lines.append(
+                f"{name}: timeout={self.timeout_for(name):g}s ({self.sources.get(name, 'default')}) "
+                f"idle={f'{prompt_idle:g}s' if prompt_idle else 'off'}"
+            )
+        return lines
+
+
+def add_timeout_arguments(parser) -> None:
+    """Register the timeout/watchdog command line flags shared by the orchestrators."""
+    parser.add_argument('--command-timeout', type=float, default=DEFAULT_TIMEOUT_SECONDS, help='Default hard timeout per copilot invocation in seconds.')
+    parser.add_argument('--timeout-policy', help='JSON file with per-prompt timeouts (see tools/timeout_policy.py).')
+    parser.add_argument('--timeout-from-history', action='store_true', help='Derive per-prompt timeouts from the p95 stage duration in past summaries under ./output.')
+    parser.add_argument('--idle-timeout', type=float, default=None, help='Kill a copilot process tree after this many seconds without output (default off).')
+
+
+def timeout_policy_from_args(args) -> TimeoutPolicy:
+    """Build the TimeoutPolicy selected by parsed orchestrator flags and print it."""
+    if getattr(args, 'timeout_policy', None):
+        policy = TimeoutPolicy.from_file(args.timeout_policy, args.command_timeout, args.idle_timeout)
+        if args.idle_timeout is not None:
+            policy.idle_timeout = args.idle_timeout or None
+    else:
+        policy = TimeoutPolicy(args.command_timeout, idle_timeout=args.idle_timeout)
+    if getattr(args, 'timeout_from_history', False):
+        policy.apply_history(sorted(glob.glob(DEFAULT_HISTORY_GLOB)))
+    for line in policy.describe():
+        print(f"[timeouts] {line}")
+    return policy
+
+
+__all__ = [
+    'TimeoutPolicy',
+    'collect_stage_durations',
+    'percentile',
+    'add_timeout_arguments',
+    'timeout_policy_from_args',
+    'DEFAULT_TIMEOUT_SECONDS',
+]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Per-worker console output prefixing.
+
+When repositories are processed concurrently, every worker prints through the same
+``sys.stdout``. This module installs a thread-aware stdout proxy that prefixes each
+line written by a worker thread with that worker's label, so interleaved output can
+still be attributed to its repository.
+
+Usage:
+    from worker_output import install_prefixed_stdout, worker_prefix
+
+    install_prefixed_stdout()
+    with worker_prefix('[w1:my_repo] '):
+        print('hello')   # -> "[w1:my_repo] hello"
+
+Threads that have not entered ``worker_prefix`` write through unchanged.
+"""
+from __future__ import annotations
+import sys, threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, TextIO
+
+_local = threading.local()
+_install_lock = threading.Lock()
+
+
+class PrefixedStream:
+    """Line-oriented stdout proxy that prefixes output of threads with an active prefix."""
+
+    def __init__(self, target: TextIO):
+        self._target = target
+        self._lock = threading.Lock()
+
+    def _pending(self) -> str:
+        return getattr(_local, 'pending', '')
+
+    def write(self, data: str) -> int:
+        prefix: Optional[str] = getattr(_local, 'prefix', None)
+        if not prefix:
+            with self._lock:
+                return self._target.write(data)
+        # Buffer partial lines per thread so that a prefix is only emitted at line starts
+        # and whole lines are written atomically with respect to other workers.
+        buffered = self._pending() + data
+        lines = buffered.split('\n')
+        _local.pending = lines.pop()
+        if lines:
+            text = ''.join(f"{prefix}{line}\n" for line in lines)
+            with self._lock:
+                self._target.write(text)
+        return len(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._target.flush()
+
+    def flush_pending(self) -> None:
+        """Emit any partial line buffered for the calling thread."""
+        pending = self._pending()
+        prefix = getattr(_local, 'prefix', '') or ''
+        if pending:
+            _local.pending = ''
+            with self._lock:
+                self._target.write(f"{prefix}{pending}\n")
+
+    def isatty(self) -> bool:
+        return self._target.isatty()
+
+    def __getattr__(self, name: str):
+        return getattr(self._target, name)
+
+
+def install_prefixed_stdout() -> PrefixedStream:
+    """Replace ``sys.stdout`` with a PrefixedStream (idempotent) and return it."""
+    with _install_lock:
+        if not isinstance(sys.stdout, PrefixedStream):
+            sys.stdout = PrefixedStream(sys.stdout)
+        return sys.stdout
+
+
+def current_prefix() -> str:
+    """Prefix active for the calling thread ('' when none); lets nested workers extend it."""
+    return getattr(_local, 'prefix', None) or ''
+
+
+@contextmanager
+def worker_prefix(prefix: str) -> Iterator[None]:
+    """Prefix every line the current thread prints while the context is active."""
+    previous = getattr(_local, 'prefix', None)
+    _local.prefix = prefix
+    try:
+        yield
+    finally:
+        stream = sys.stdout
+        if isinstance(stream, PrefixedStream):
+            stream.flush_pending()
+        _local.prefix = previous
+
+
+__all__ = ['PrefixedStream', 'install_prefixed_stdout', 'worker_prefix', 'current_prefix']